@@ -1,54 +1,33 @@
-import requests
+import os
+import argparse
 import time
-import math
+
+from nav_cache import NavCache
+from nav_client import NavApiClient
+from route_progress import RouteProgress
+from gps_sim import GpsSimulator, SpeedProfile, VirtualClock
+import pi_path  # noqa: F401  (Pixel_Code/src/src_refactoring/pi 공용 모듈)
+from pi.route_hint import RouteHintPublisher
 
 # 기본 설정
 APP_KEY = "4Gqu3WNznX1o60OkPK5Lo360oUutv4NNaVOWX1Xb"
+BASE_URL = os.environ.get("TMAP_BASE_URL", "https://apis.openapi.sk.com")
 
-def search_place(keyword):
-    url = "https://apis.openapi.sk.com/tmap/pois?version=1"
-    params = {
-        "searchKeyword": keyword,
-        "resCoordType": "WGS84GEO",
-        "reqCoordType": "WGS84GEO",
-        "count": 10
-    }
-    headers = {
-        "appKey": APP_KEY
-    }
-
-    response = requests.get(url, headers=headers, params=params)
-    
-    if response.status_code != 200:
-        print("API 호출 실패:", response.status_code)
-        return []
-
-    pois = response.json()["searchPoiInfo"]["pois"]["poi"]
-    results = []
-    for poi in pois:
-        name = poi["name"]
-        address = f'{poi["upperAddrName"]} {poi["middleAddrName"]} {poi["lowerAddrName"]} {poi["detailAddrName"]}'
-        lat = float(poi["frontLat"])
-        lon = float(poi["frontLon"])
-        results.append({
-            "name": name,
-            "address": address,
-            "lat": lat,
-            "lon": lon
-        })
-    return results
-
-def select_location(prompt):
-    keyword = input(f"{prompt} 위치를 입력하세요: ")
-    results = search_place(keyword)
+# 응답 캐시 (같은 검색어/출발·도착이면 API 재호출 안 함). 클라이언트는 main()에서 옵션대로 만듦
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nav_cache.sqlite")
+client = None
 
+# 검색 결과 출력 후 번호 선택. on_show: 목록을 보여준 직후 호출 (사용자가 고르는 동안 미리 할 일)
+def select_location(prompt, results, on_show=None):
     if not results:
-        print("검색 결과가 없습니다.")
+        print(f"[{prompt}] 검색 결과가 없습니다.")
         return None
 
-    print("\n[검색 결과]")
+    print(f"\n[{prompt} 검색 결과]")
     for idx, place in enumerate(results):
         print(f"{idx+1}. {place['name']} - {place['address']}")
+    if on_show is not None:
+        on_show(results)
 
     while True:
         try:
@@ -65,127 +44,145 @@ def select_location(prompt):
         except ValueError:
             print("숫자를 입력해주세요.")
 
-# 출발지와 도착지 설정
-start_location = select_location("출발")
-if not start_location:
-    exit()
-
-end_location = select_location("도착")
-if not end_location:
-    exit()
-
-startX = start_location["lon"]
-startY = start_location["lat"]
-endX = end_location["lon"]
-endY = end_location["lat"]
-
-# 거리 계산 함수
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371000  # 지구 반지름 (m)
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lon2 - lon1)
-
-    a = math.sin(d_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-    return R * c  # 거리 (미터)
-
-# 경로 요청 API 호출
-url = "https://apis.openapi.sk.com/tmap/routes/pedestrian?version=1"
-headers = {
-    "appKey": APP_KEY,
-    "Content-Type": "application/json"
-}
-payload = {
-    "startX": str(startX),
-    "startY": str(startY),
-    "endX": str(endX),
-    "endY": str(endY),
-    "reqCoordType": "WGS84GEO",
-    "resCoordType": "WGS84GEO",
-    "startName": "출발지",
-    "endName": "도착지"
-}
-
-response = requests.post(url, headers=headers, json=payload)
-
-if response.status_code != 200:
-    print("Error:", response.status_code, response.text)
-    exit()
-
-data = response.json()
-features = data["features"]
+# 경로 요청 API 호출 → features (실패 시 None)
+def request_route(startX, startY, endX, endY):
+    return client.route(startX, startY, endX, endY)
 
 # 회전 포인트 저장
-waypoints = []
-for feature in features:
-    properties = feature["properties"]
-    geometry = feature["geometry"]
-    coords = geometry["coordinates"]
-    
-    if "turnType" in properties and properties["turnType"] != 0:
-        if geometry["type"] == "Point":
-            lon, lat = coords
-        else:
-            lon, lat = coords[0]
-        
-        waypoints.append({
-            "lat": lat,
-            "lon": lon,
-            "turnType": properties["turnType"]
-        })
-
-print(f"회전 포인트 개수: {len(waypoints)}개")
-
-# moving simulation
-current_lat = startY
-current_lon = startX
-
-# 첫 이동 방향 설정
-if waypoints:
-    next_target = waypoints[0]
-else:
-    next_target = {"lat": endY, "lon": endX}
-
-step_lat = (next_target["lat"] - current_lat) / 50
-step_lon = (next_target["lon"] - current_lon) / 50
-
-# calculate distance to next target
-while True:
-    dist = haversine(current_lat, current_lon, next_target["lat"], next_target["lon"])
-    print(f"현재 위치: ({current_lat:.6f}, {current_lon:.6f}), 다음 지점까지 거리: {dist:.2f}m")
-
-    if dist < 5:  # 5m 이내로 가까워지면
-        if "turnType" in next_target:
-            turnType = next_target["turnType"]
-            if turnType == 211:
-                print("우회전")
-            elif turnType == 212:
-                print("좌회전")
+def extract_waypoints(features):
+    waypoints = []
+    for feature in features:
+        properties = feature["properties"]
+        geometry = feature["geometry"]
+        coords = geometry["coordinates"]
+
+        if "turnType" in properties and properties["turnType"] != 0:
+            if geometry["type"] == "Point":
+                lon, lat = coords
             else:
-                print(f"{turnType}")
-
-            waypoints.pop(0)  # 해당 회전 포인트 제거
-
-        if waypoints:
-            next_target = waypoints[0]
-        else:
-            next_target = {"lat": endY, "lon": endX}
+                lon, lat = coords[0]
+
+            waypoints.append({
+                "lat": lat,
+                "lon": lon,
+                "turnType": properties["turnType"]
+            })
+    return waypoints
+
+def announce_turn(turnType):
+    if turnType == 211:
+        print("우회전")
+    elif turnType == 212:
+        print("좌회전")
+    else:
+        print(f"{turnType}")
 
-        # 새로운 방향 다시 설정
-        step_lat = (next_target["lat"] - current_lat) / 50
-        step_lon = (next_target["lon"] - current_lon) / 50
-
-    # 도착지점에 거의 도달했으면 종료
-    final_dist = haversine(current_lat, current_lon, endY, endX)
-    if final_dist < 5:
-        print("도착")
-        break
-
-    # 이동
-    current_lat += step_lat
-    current_lon += step_lon
-
-    time.sleep(1)  # 이동 속도 조정 (빠르게 하고 싶으면 줄여도 됨)
\ No newline at end of file
+# moving simulation
+# 위치 fix는 gps_sim.GpsSimulator (속도 프로파일/잡음/끊김, 가상 시계), 진행도/회전 판정은 RouteProgress
+# warp: 실제 시간 대비 배속 (0이면 대기 없이 최대 속도), 출력은 가상 시간 print_s 초마다
+# hint_pub: 있으면 매 fix의 다음 회전까지 거리/방향을 판단 프로세스로 송신 (pi/route_hint.py)
+def simulate(startX, startY, endX, endY, features, speed_mps=4.0, rate_hz=10.0, warp=5.0,
+             noise_m=2.5, dropout_p=0.005, seed=None, print_s=1.0, hint_pub=None):
+    prog = RouteProgress.from_features(features)
+    sim = GpsSimulator.from_features(features, rate_hz=rate_hz, profile=SpeedProfile(cruise_mps=speed_mps),
+                                     noise_m=noise_m, dropout_p=dropout_p, seed=seed,
+                                     clock=VirtualClock(warp=warp))
+    t_print = 0.0
+
+    for fix in sim.fixes():
+        if not fix["valid"]:
+            continue
+        st = prog.update(fix["lat"], fix["lon"])
+        for ev in st["events"]:
+            announce_turn(ev["turnType"])
+        if hint_pub is not None:
+            hint_pub.publish(time.time(), st["dist_to_turn"], st["turn_type"],
+                             st["dist_to_dest"], fix["v_mps"], on_route=st["cross_track_m"] < prog.reacquire_m)
+
+        if fix["t"] >= t_print:
+            t_print = fix["t"] + print_s
+            dist = st["dist_to_next_turn"] if st["dist_to_next_turn"] is not None else st["dist_to_dest"]
+            print(f"[{fix['t']:6.1f}s] 현재 위치: ({fix['lat']:.6f}, {fix['lon']:.6f}), "
+                  f"다음 지점까지 거리: {dist:.2f}m, 도착까지: {st['dist_to_dest']:.1f}m, "
+                  f"속도: {fix['v_mps']:.1f}m/s")
+
+        # 도착지점에 거의 도달했으면 종료
+        if st["dist_to_dest"] < 5:
+            print("도착")
+            return True
+    print("도착 판정 실패")
+    return False
+
+
+def main():
+    global BASE_URL, client
+    ap = argparse.ArgumentParser(description="TMap 보행자 경로 안내 시뮬레이션")
+    ap.add_argument("--base-url", default=BASE_URL, help="API 주소 (로컬 대역: nav_mock_server.py)")
+    ap.add_argument("--cache", default=CACHE_PATH, help="응답 캐시 SQLite 경로")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--cache-ttl-h", type=float, default=24 * 7, help="캐시 유효시간(시간)")
+    ap.add_argument("--cache-max", type=int, default=2000, help="캐시 최대 항목 수 (LRU)")
+    ap.add_argument("--offline", action="store_true", help="API 호출 없이 캐시로만 동작")
+    ap.add_argument("--timeout", type=float, default=10.0, help="HTTP 읽기 타임아웃(초)")
+    ap.add_argument("--retries", type=int, default=3, help="429/5xx/연결 오류 재시도 횟수")
+    ap.add_argument("--sim-speed", type=float, default=4.0, help="시뮬레이션 순항 속도 m/s")
+    ap.add_argument("--sim-hz", type=float, default=10.0, help="GPS fix 주기")
+    ap.add_argument("--sim-warp", type=float, default=5.0, help="배속 (0이면 대기 없이)")
+    ap.add_argument("--sim-seed", type=int, default=None)
+    ap.add_argument("--hint-port", type=int, default=9871,
+                    help="판단 프로세스로 경로 힌트 송신 UDP 포트 (0이면 끔)")
+    args = ap.parse_args()
+
+    BASE_URL = args.base_url.rstrip("/")
+    cache = None
+    if not args.no_cache:
+        cache = NavCache(args.cache, ttl_s=args.cache_ttl_h * 3600, max_entries=args.cache_max,
+                         offline=args.offline)
+
+    client = NavApiClient(APP_KEY, base_url=BASE_URL, cache=cache,
+                          timeout=(3.05, args.timeout), retries=args.retries)
+
+    # 출발지와 도착지 검색어를 먼저 받고 두 검색을 동시에
+    start_kw = input("출발 위치를 입력하세요: ")
+    end_kw = input("도착 위치를 입력하세요: ")
+    start_results, end_results = client.search_many([start_kw, end_kw])
+
+    start_location = select_location("출발", start_results)
+    if not start_location:
+        return
+
+    # 도착 후보를 보여주는 동안 1번 후보까지 경로를 미리 요청
+    prefetch = {}
+
+    def _prefetch(results):
+        top = results[0]
+        prefetch[(top["lon"], top["lat"])] = client.prefetch_route(
+            start_location["lon"], start_location["lat"], top["lon"], top["lat"])
+
+    end_location = select_location("도착", end_results, on_show=_prefetch)
+    if not end_location:
+        return
+
+    startX = start_location["lon"]
+    startY = start_location["lat"]
+    endX = end_location["lon"]
+    endY = end_location["lat"]
+
+    fut = prefetch.get((endX, endY))
+    features = fut.result() if fut is not None else request_route(startX, startY, endX, endY)
+    if features is None:
+        return
+
+    waypoints = extract_waypoints(features)
+    print(f"회전 포인트 개수: {len(waypoints)}개")
+    print("[HTTP]", client.stats())
+    if cache is not None:
+        print("[CACHE]", cache.stats())
+
+    hint_pub = RouteHintPublisher(port=args.hint_port) if args.hint_port else None
+    simulate(startX, startY, endX, endY, features, speed_mps=args.sim_speed, rate_hz=args.sim_hz,
+             warp=args.sim_warp, seed=args.sim_seed, hint_pub=hint_pub)
+
+
+if __name__ == "__main__":
+    main()
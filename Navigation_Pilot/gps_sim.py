@@ -0,0 +1,239 @@
+# gps_sim.py
+# 가상 시계 기반 GPS 궤적 시뮬레이터 (실시간보다 빠르게, seed 고정 시 결정적)
+#   sim = GpsSimulator.from_features(features, rate_hz=10, seed=1)
+#   for fix in sim.fixes():            # fix: t, lat, lon, valid, s_true, v_mps
+#       st = prog.update(fix["lat"], fix["lon"])
+#
+#   python gps_sim.py --routes 300 --hz 10 --seed 0    # 가짜 경로 여러 개로 회전 안내 회귀 확인
+#
+# - 속도 프로파일: 순항 속도, 가감속 한계, 회전 지점 앞 감속(회전 속도), 도착 시 정지
+# - GPS 잡음: 1차 자기회귀(AR(1)) 상관 잡음 → 실제 수신기처럼 천천히 흔들림
+# - 끊김: 마르코프 2상태(정상/끊김) → 평균 길이가 있는 연속 끊김
+import sys
+import math
+import time
+import random
+import argparse
+
+from route_progress import RouteProgress, polyline_from_features
+
+
+class VirtualClock:
+    """sleep()이 실제로 기다리지 않고 시각만 전진. warp>0이면 1/warp 배속으로 실제 대기."""
+    def __init__(self, t0=0.0, warp=0.0):
+        self.t = float(t0)
+        self.warp = float(warp)
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, dt):
+        self.t += dt
+        if self.warp > 0:
+            time.sleep(dt / self.warp)
+
+
+class SpeedProfile:
+    """
+    cruise_mps : 직선 순항 속도
+    turn_mps   : 회전 지점 통과 속도
+    accel/decel: 가속/감속 한계 (m/s²)
+    jitter     : 순항 속도 변동 비율 (구간마다 seed 기반으로 흔들림)
+    """
+    def __init__(self, cruise_mps=4.0, turn_mps=1.5, accel=0.8, decel=1.2, jitter=0.1):
+        self.cruise_mps = float(cruise_mps)
+        self.turn_mps = float(turn_mps)
+        self.accel = float(accel)
+        self.decel = float(decel)
+        self.jitter = float(jitter)
+
+    def limit(self, v_cruise, d_turn, d_dest):
+        """다음 회전/도착까지 남은 거리로 허용 최대 속도 (v² = v_end² + 2·a·d)."""
+        v = v_cruise
+        if d_turn is not None:
+            v = min(v, math.sqrt(self.turn_mps ** 2 + 2.0 * self.decel * max(0.0, d_turn)))
+        return min(v, math.sqrt(2.0 * self.decel * max(0.0, d_dest)))
+
+
+class GpsSimulator:
+    """
+    polyline: [(lat, lon)], turns: [(lat, lon, turnType)]
+    rate_hz   : fix 주기
+    noise_m   : 잡음 표준편차 (m), noise_tau_s: 잡음 상관 시간
+    dropout_p : 정상→끊김 전이 확률(fix당), dropout_mean_s: 끊김 평균 지속
+    """
+    def __init__(self, polyline, turns=(), rate_hz=10.0, profile=None, noise_m=2.5, noise_tau_s=5.0,
+                 dropout_p=0.005, dropout_mean_s=2.0, seed=None, clock=None):
+        self.prog_ref = RouteProgress(polyline, turns)   # 구간 누적 길이/회전 s 재사용
+        self.frame = self.prog_ref.frame
+        self.dt = 1.0 / float(rate_hz)
+        self.profile = profile or SpeedProfile()
+        self.noise_m = float(noise_m)
+        self.alpha = math.exp(-self.dt / max(1e-6, noise_tau_s))
+        self.dropout_p = float(dropout_p)
+        self.recover_p = min(1.0, self.dt / max(self.dt, dropout_mean_s))
+        self.rng = random.Random(seed)
+        self.clock = clock or VirtualClock()
+        self.turn_s = [t[0] for t in self.prog_ref.turns]
+
+    @classmethod
+    def from_features(cls, features, **kw):
+        pts, turns = polyline_from_features(features)
+        return cls(pts, turns, **kw)
+
+    def _point_at(self, s):
+        """진행거리 s → 경로 위 로컬 좌표 (누적 길이 이분 탐색)."""
+        p = self.prog_ref
+        lo, hi = 0, p.n_seg - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if p.cum[mid] <= s:
+                lo = mid
+            else:
+                hi = mid - 1
+        i = lo
+        seg_len = p.cum[i + 1] - p.cum[i]
+        t = (s - p.cum[i]) / seg_len if seg_len > 0 else 0.0
+        return p.x[i] + t * p.dx[i], p.y[i] + t * p.dy[i]
+
+    def fixes(self, max_s=3600.0, hold_s=3.0):
+        """
+        fix 생성기. 도착 후 hold_s 동안 정지 fix를 더 내고(끊김 중이면 회복까지) 끝남.
+        max_s(가상 시간)를 넘어도 끝남.
+        """
+        p, prof, rng = self.prog_ref, self.profile, self.rng
+        total = p.total
+        s, v = 0.0, 0.0
+        nx = ny = 0.0
+        q = math.sqrt(max(0.0, 1.0 - self.alpha ** 2)) * self.noise_m
+        dropped = False
+        k = 0
+        v_cruise = prof.cruise_mps
+        t_end = self.clock() + max_s
+        t_arrive = None
+        while self.clock() < t_end:
+            d_dest = total - s
+            while k < len(self.turn_s) and self.turn_s[k] <= s:
+                k += 1
+                v_cruise = prof.cruise_mps * (1.0 + rng.uniform(-prof.jitter, prof.jitter))
+            d_turn = self.turn_s[k] - s if k < len(self.turn_s) else None
+            v_lim = prof.limit(v_cruise, d_turn, d_dest)
+            if v < v_lim:
+                v = min(v_lim, v + prof.accel * self.dt)
+            else:
+                v = max(v_lim, v - prof.decel * self.dt)
+            # 도착 직전 제곱근 프로파일이 0으로 수렴하며 끝나지 않는 것 방지
+            step = max(v * self.dt, min(d_dest, 0.05 * self.dt)) if d_dest > 0 else 0.0
+            s = min(total, s + step)
+
+            nx = self.alpha * nx + q * rng.gauss(0.0, 1.0)
+            ny = self.alpha * ny + q * rng.gauss(0.0, 1.0)
+            if dropped:
+                dropped = rng.random() >= self.recover_p
+            else:
+                dropped = rng.random() < self.dropout_p
+
+            x, y = self._point_at(s)
+            lat, lon = self.frame.to_latlon(x + nx, y + ny)
+            self.clock.sleep(self.dt)
+            yield {"t": self.clock(), "lat": lat, "lon": lon, "valid": not dropped,
+                   "s_true": s, "v_mps": v}
+            if s >= total:
+                if t_arrive is None:
+                    t_arrive = self.clock()
+                elif self.clock() - t_arrive >= hold_s and not dropped:
+                    return
+
+
+def run_route(features, announce_m=5.0, **sim_kw):
+    """
+    경로 하나를 시뮬레이션하며 RouteProgress로 회전 안내 → 결과 요약
+    - announced: 안내된 turnType 순서, expected: 경로상 회전 순서
+    - ok: 빠짐/중복/순서 어긋남 없이 모두 안내 + 도착 판정
+    """
+    sim = GpsSimulator.from_features(features, **sim_kw)
+    prog = RouteProgress.from_features(features, announce_m=announce_m)
+    expected = [t[1] for t in prog.turns]
+    announced, overshoot = [], []
+    n_fix = n_valid = 0
+    arrived = False
+    for fix in sim.fixes():
+        n_fix += 1
+        if not fix["valid"]:
+            continue
+        n_valid += 1
+        st = prog.update(fix["lat"], fix["lon"])
+        for ev in st["events"]:
+            announced.append(ev["turnType"])
+            overshoot.append(ev["overshoot_m"])
+        if st["dist_to_dest"] < 5:
+            arrived = True
+    return {
+        "ok": announced == expected and arrived,
+        "expected": expected,
+        "announced": announced,
+        "arrived": arrived,
+        "max_overshoot_m": max(overshoot) if overshoot else 0.0,
+        "sim_s": sim.clock(),
+        "fixes": n_fix,
+        "valid": n_valid,
+        "reacquires": prog.reacquires,
+    }
+
+
+def _random_route(rng, n_legs):
+    """nav_mock_server.fake_route를 이어붙인 지그재그 경로 (회전 여러 개)."""
+    from nav_mock_server import fake_route, BASE_LAT, BASE_LON
+    lon, lat = BASE_LON + rng.uniform(-0.01, 0.01), BASE_LAT + rng.uniform(-0.01, 0.01)
+    feats = []
+    for i in range(n_legs):
+        elon = lon + rng.choice((-1, 1)) * rng.uniform(0.0008, 0.004)
+        elat = lat + rng.choice((-1, 1)) * rng.uniform(0.0008, 0.004)
+        leg = fake_route(lon, lat, elon, elat)["features"]
+        # 중간 다리의 출발(200)/도착(201) Point는 경유지로만 남김
+        if i > 0:
+            leg = leg[1:]
+        if i < n_legs - 1:
+            leg = leg[:-1]
+        feats.extend(leg)
+        lon, lat = elon, elat
+    return feats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="가상 시계 GPS 시뮬레이터 — 회전 안내 회귀 확인")
+    ap.add_argument("--routes", type=int, default=100, help="시뮬레이션할 가짜 경로 수")
+    ap.add_argument("--legs", type=int, default=3, help="경로당 ㄱ자 다리 수")
+    ap.add_argument("--hz", type=float, default=10.0)
+    ap.add_argument("--speed", type=float, default=4.0, help="순항 속도 m/s")
+    ap.add_argument("--noise-m", type=float, default=2.5)
+    ap.add_argument("--dropout", type=float, default=0.005, help="fix당 끊김 시작 확률")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-v", "--verbose", action="store_true", help="실패 경로 상세 출력")
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    n_ok = fixes = 0
+    sim_s = 0.0
+    worst = 0.0
+    for r in range(args.routes):
+        feats = _random_route(rng, args.legs)
+        res = run_route(feats, rate_hz=args.hz, profile=SpeedProfile(cruise_mps=args.speed),
+                        noise_m=args.noise_m, dropout_p=args.dropout, seed=args.seed * 100003 + r)
+        n_ok += res["ok"]
+        fixes += res["fixes"]
+        sim_s += res["sim_s"]
+        worst = max(worst, res["max_overshoot_m"])
+        if not res["ok"] and args.verbose:
+            print(f"[FAIL] route {r}: expected={res['expected']} announced={res['announced']} "
+                  f"arrived={res['arrived']}")
+    wall = time.perf_counter() - t0
+    print(f"routes={args.routes} ok={n_ok} fail={args.routes - n_ok} fixes={fixes} "
+          f"sim={sim_s / 60:.1f}min wall={wall:.2f}s (x{sim_s / max(wall, 1e-9):.0f}) "
+          f"max_overshoot={worst:.1f}m")
+    return 0 if n_ok == args.routes else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# map_match.py
+# GPS fix 묶음을 보행자 경로(LineString 전체 구간)에 한 번에 스냅 (NumPy 벡터 연산)
+#   mm = MapMatcher.from_features(features)
+#   r = mm.match(lats, lons)        # 수천 개 fix를 한 번에
+#   r["seg"], r["offset_m"], r["cross_track_m"], r["snapped_lat"], r["snapped_lon"]
+#   mm.evaluate(lats, lons)         # 기록 trace 오프라인 평가 요약
+#
+#   python map_match.py trace.csv --route route.json   # trace: lat,lon 컬럼 / route: TMap 응답 JSON
+#
+# 좌표는 route_progress.LocalFrame(등장방형, m) 평면에서 계산 (실시간 진행도 엔진과 같은 기준)
+import sys
+import csv
+import json
+import argparse
+
+import numpy as np
+
+from route_progress import LocalFrame, polyline_from_features
+
+
+class MapMatcher:
+    """
+    점-선분 거리를 (fix N × 구간 M) 행렬로 계산해 fix마다 가장 가까운 구간 선택
+    - chunk: 한 번에 처리할 fix 수 상한 (N×M 임시 배열 메모리 제한)
+    - cross_track_m: 부호 있음 (진행 방향 기준 왼쪽 +, 오른쪽 -)
+    """
+    def __init__(self, polyline, frame=None, max_cells=4_000_000):
+        if len(polyline) < 2:
+            raise ValueError("route needs at least 2 points")
+        self.frame = frame or LocalFrame(*polyline[0])
+        ll = np.asarray(polyline, dtype=float)
+        x, y = self._xy(ll[:, 0], ll[:, 1])
+        self.ax, self.ay = x[:-1], y[:-1]
+        self.dx, self.dy = np.diff(x), np.diff(y)
+        self.len2 = self.dx ** 2 + self.dy ** 2
+        seg_len = np.sqrt(self.len2)
+        self.cum = np.concatenate([[0.0], np.cumsum(seg_len)])
+        self.total = float(self.cum[-1])
+        self._inv_len2 = np.divide(1.0, self.len2, out=np.zeros_like(self.len2), where=self.len2 > 0)
+        self.max_cells = int(max_cells)
+
+    @classmethod
+    def from_features(cls, features, **kw):
+        pts, _ = polyline_from_features(features)
+        return cls(pts, **kw)
+
+    def _xy(self, lat, lon):
+        f = self.frame
+        return (np.asarray(lon, float) - f.lon0) * f.kx, (np.asarray(lat, float) - f.lat0) * f.ky
+
+    def match(self, lats, lons):
+        px, py = self._xy(np.atleast_1d(lats), np.atleast_1d(lons))
+        n, m = len(px), len(self.ax)
+        seg = np.empty(n, dtype=np.int64)
+        t_out = np.empty(n)
+        d2_out = np.empty(n)
+        cross = np.empty(n)
+        step = max(1, self.max_cells // max(1, m))
+        for a in range(0, n, step):
+            b = min(n, a + step)
+            rx = px[a:b, None] - self.ax[None, :]           # (k, M)
+            ry = py[a:b, None] - self.ay[None, :]
+            t = np.clip((rx * self.dx + ry * self.dy) * self._inv_len2, 0.0, 1.0)
+            ex = rx - t * self.dx
+            ey = ry - t * self.dy
+            d2 = ex * ex + ey * ey
+            j = np.argmin(d2, axis=1)
+            rows = np.arange(b - a)
+            seg[a:b] = j
+            t_out[a:b] = t[rows, j]
+            d2_out[a:b] = d2[rows, j]
+            cross[a:b] = self.dx[j] * ry[rows, j] - self.dy[j] * rx[rows, j]
+        dist = np.sqrt(d2_out)
+        seg_len = np.sqrt(self.len2[seg])
+        sign = np.where(cross >= 0, 1.0, -1.0)
+        sx = self.ax[seg] + t_out * self.dx[seg]
+        sy = self.ay[seg] + t_out * self.dy[seg]
+        f = self.frame
+        return {
+            "seg": seg,
+            "t": t_out,
+            "offset_m": self.cum[seg] + t_out * seg_len,
+            "cross_track_m": sign * dist,
+            "snapped_lat": f.lat0 + sy / f.ky,
+            "snapped_lon": f.lon0 + sx / f.kx,
+        }
+
+    def match_one(self, lat, lon):
+        r = self.match([lat], [lon])
+        return {k: v[0].item() for k, v in r.items()}
+
+    def evaluate(self, lats, lons, off_route_m=15.0):
+        """기록 trace 평가: 횡오차 통계, 경로 이탈 비율, 진행거리 역행 횟수, 커버리지."""
+        r = self.match(lats, lons)
+        ct = np.abs(r["cross_track_m"])
+        off = r["offset_m"]
+        back = np.diff(off) < -5.0 if len(off) > 1 else np.zeros(0, bool)
+        return {
+            "n": int(len(ct)),
+            "cross_track_rmse_m": float(np.sqrt(np.mean(ct ** 2))) if len(ct) else None,
+            "cross_track_p95_m": float(np.percentile(ct, 95)) if len(ct) else None,
+            "off_route_ratio": float(np.mean(ct > off_route_m)) if len(ct) else None,
+            "backtracks": int(back.sum()),
+            "coverage": float((off.max() - off.min()) / self.total) if len(off) and self.total else None,
+        }
+
+
+def _read_trace(path):
+    lats, lons = [], []
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            try:
+                lats.append(float(row.get("lat") or row["latitude"]))
+                lons.append(float(row.get("lon") or row["longitude"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    return np.asarray(lats), np.asarray(lons)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="GPS trace → 경로 map-matching 평가")
+    ap.add_argument("trace", help="lat,lon 컬럼 CSV")
+    ap.add_argument("--route", required=True, help="TMap 경로 응답 JSON (features 포함)")
+    ap.add_argument("--off-route-m", type=float, default=15.0)
+    ap.add_argument("--out", default=None, help="fix별 매칭 결과 CSV")
+    args = ap.parse_args()
+
+    with open(args.route, "r", encoding="utf-8") as f:
+        route = json.load(f)
+    mm = MapMatcher.from_features(route["features"] if isinstance(route, dict) else route)
+    lats, lons = _read_trace(args.trace)
+    print(json.dumps(mm.evaluate(lats, lons, args.off_route_m), indent=2))
+
+    if args.out:
+        r = mm.match(lats, lons)
+        with open(args.out, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["lat", "lon", "seg", "offset_m", "cross_track_m", "snapped_lat", "snapped_lon"])
+            for i in range(len(lats)):
+                w.writerow([lats[i], lons[i], int(r["seg"][i]), f"{r['offset_m'][i]:.2f}",
+                            f"{r['cross_track_m'][i]:.2f}", f"{r['snapped_lat'][i]:.7f}",
+                            f"{r['snapped_lon'][i]:.7f}"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# nav_bridge.py
+# 내비 → 판단 루프 경로 힌트 브리지 (별도 프로세스, 로컬 UDP)
+#   python nav_bridge.py --route route.json              # 저장된 TMap 경로를 실시간 주행 시뮬레이션하며 송신
+#   python nav_bridge.py --mock                          # 가짜 ㄱ자 경로로 송신 (경로 파일 없이 벤치 확인)
+#   python nav_bridge.py --watch                         # 수신 쪽 확인 (판단 프로세스 대신 힌트 출력)
+#
+# 실제 주행에선 Cap.py가 같은 채널로 송신 (--hint-port). 채널 구현/판단 쪽 수신: Pixel_Code/src/src_refactoring/pi/route_hint.py
+import sys
+import json
+import time
+import argparse
+
+from route_progress import RouteProgress
+from gps_sim import GpsSimulator, SpeedProfile, VirtualClock
+import pi_path  # noqa: F401  (Pixel_Code/src/src_refactoring/pi 공용 모듈)
+from pi.route_hint import RouteHintPublisher, RouteHintReceiver
+
+
+def run(features, pub, speed_mps=4.0, rate_hz=1.0, warp=1.0, seed=None, noise_m=2.5):
+    """GPS 시뮬레이션 fix마다 RouteProgress 상태를 힌트로 송신. 송신 개수 반환."""
+    prog = RouteProgress.from_features(features)
+    sim = GpsSimulator.from_features(features, rate_hz=rate_hz, profile=SpeedProfile(cruise_mps=speed_mps),
+                                     noise_m=noise_m, seed=seed, clock=VirtualClock(warp=warp))
+    for fix in sim.fixes():
+        if not fix["valid"]:
+            continue
+        st = prog.update(fix["lat"], fix["lon"])
+        pub.publish(time.time(), st["dist_to_turn"], st["turn_type"], st["dist_to_dest"],
+                    fix["v_mps"], on_route=st["cross_track_m"] < prog.reacquire_m)
+        for ev in st["events"]:
+            print(f"[{fix['t']:6.1f}s] turn {ev['turnType']}")
+    return pub.sent
+
+
+def watch(port, period_s=0.5):
+    rx = RouteHintReceiver(port=port).start()
+    print(f"[BRIDGE] listening udp://127.0.0.1:{port}  (Ctrl+C로 종료)")
+    try:
+        while True:
+            h = rx.latest()
+            if h is None:
+                print("(no hint)")
+            else:
+                d = "NA" if h["dist_m"] is None else f"{h['dist_m']:.1f}m"
+                print(f"seq={h['seq']} turn={h['turn_type']} dir={h['direction']:+d} dist={d} "
+                      f"dest={h['dist_dest_m'] or 0:.0f}m age={h['age_s'] * 1000:.0f}ms")
+            time.sleep(period_s)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rx.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="내비 경로 힌트 브리지 (로컬 UDP)")
+    ap.add_argument("--port", type=int, default=9871)
+    ap.add_argument("--route", default=None, help="TMap 경로 응답 JSON (features 포함)")
+    ap.add_argument("--mock", action="store_true", help="nav_mock_server 가짜 경로 사용")
+    ap.add_argument("--watch", action="store_true", help="수신 힌트 출력")
+    ap.add_argument("--speed", type=float, default=4.0, help="순항 속도 m/s")
+    ap.add_argument("--hz", type=float, default=1.0, help="GPS fix 주기 (실제 수신기 ~1 Hz)")
+    ap.add_argument("--warp", type=float, default=1.0, help="배속 (0이면 대기 없이)")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+
+    if args.watch:
+        watch(args.port)
+        return 0
+
+    if args.route:
+        with open(args.route, "r", encoding="utf-8") as f:
+            route = json.load(f)
+        features = route["features"] if isinstance(route, dict) else route
+    elif args.mock:
+        from nav_mock_server import fake_route, BASE_LAT, BASE_LON
+        features = fake_route(BASE_LON, BASE_LAT, BASE_LON + 0.0015, BASE_LAT + 0.001)["features"]
+    else:
+        ap.error("--route, --mock, --watch 중 하나가 필요합니다")
+
+    pub = RouteHintPublisher(port=args.port)
+    try:
+        n = run(features, pub, speed_mps=args.speed, rate_hz=args.hz, warp=args.warp, seed=args.seed)
+    except KeyboardInterrupt:
+        n = pub.sent
+    finally:
+        pub.close()
+    print(f"[BRIDGE] sent={n} errors={pub.errors}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# nav_cache.py
+# TMap POI 검색 / 보행자 경로 응답 디스크 캐시 (SQLite, TTL + LRU)
+#   cache = NavCache("nav_cache.sqlite", ttl_s=7*24*3600, max_entries=2000)
+#   hit = cache.get("poi", poi_key("서울역"))
+#   cache.put("poi", poi_key("서울역"), results)
+# 오프라인 모드: 만료된 항목도 반환 (네트워크 없이 캐시로만 동작)
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+
+
+def poi_key(keyword):
+    """검색어 정규화: 유니코드 NFKC, 앞뒤 공백 제거, 소문자, 연속 공백 1개로."""
+    s = unicodedata.normalize("NFKC", keyword or "").strip().lower()
+    return " ".join(s.split())
+
+
+def route_key(start_lat, start_lon, end_lat, end_lon, ndigits=5):
+    """좌표 반올림(소수 5자리 ≈ 1 m) → 같은 출발/도착이면 같은 키."""
+    r = lambda v: f"{round(float(v), ndigits):.{ndigits}f}"
+    return f"{r(start_lat)},{r(start_lon)}->{r(end_lat)},{r(end_lon)}"
+
+
+class NavCache:
+    """
+    SQLite 기반 응답 캐시
+    - (kind, key) → JSON 값, created/last_used 시각 저장
+    - TTL: created 기준 ttl_s 지나면 만료 (offline=True거나 allow_stale=True면 만료돼도 반환)
+    - LRU: 항목 수가 max_entries를 넘으면 last_used 오래된 것부터 삭제
+    - 스레드 간 공유 가능 (연결 하나 + 락)
+    - clock: 시각 함수 (테스트에서 TTL 만료를 기다리지 않도록 주입)
+    """
+    def __init__(self, path="nav_cache.sqlite", ttl_s=7 * 24 * 3600, max_entries=2000, offline=False,
+                 clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.ttl_s = float(ttl_s)
+        self.max_entries = int(max_entries)
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (kind, key))")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON entries(last_used)")
+        self._db.commit()
+
+    def get(self, kind, key, allow_stale=False):
+        now = self.clock()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM entries WHERE kind=? AND key=?",
+                                   (kind, key)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created = row
+            stale = now - created > self.ttl_s
+            if stale and not (allow_stale or self.offline):
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET last_used=? WHERE kind=? AND key=?", (now, kind, key))
+            self._db.commit()
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, kind, key, value):
+        now = self.clock()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                             (kind, key, json.dumps(value, ensure_ascii=False), now, now))
+            n = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if n > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM entries WHERE rowid IN ("
+                    " SELECT rowid FROM entries ORDER BY last_used ASC LIMIT ?)",
+                    (n - self.max_entries,))
+            self._db.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            cur = self._db.execute("DELETE FROM entries WHERE created < ?", (self.clock() - self.ttl_s,))
+            self._db.commit()
+            return cur.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self):
+        return {"entries": len(self), "hits": self.hits, "stale_hits": self.stale_hits,
+                "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
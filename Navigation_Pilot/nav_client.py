@@ -0,0 +1,159 @@
+# nav_client.py
+# TMap API 클라이언트: 연결 풀(keep-alive) + 타임아웃 + 재시도 백오프 + 동시 요청 + 캐시
+#   client = NavApiClient(APP_KEY, base_url=BASE_URL, cache=NavCache(...))
+#   start_res, end_res = client.search_many(["서울역", "시청"])   # 두 검색 동시에
+#   fut = client.prefetch_route(startX, startY, endX, endY)       # 사용자가 고르는 동안 미리 요청
+#   features = fut.result()
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from nav_cache import poi_key, route_key
+
+DEFAULT_BASE_URL = "https://apis.openapi.sk.com"
+
+
+class NavApiClient:
+    """
+    - requests.Session 하나를 공유 (TLS 연결 재사용), pool_size만큼 동시 연결
+    - timeout=(연결, 읽기) 초. 모든 요청에 명시
+    - 429/5xx 및 연결 오류는 지수 백오프로 retries회 재시도 (POST 포함 — 경로 조회는 멱등)
+    - cache(NavCache)가 있으면 먼저 조회, 네트워크 실패 시 만료된 항목으로 폴백
+    - 통계: calls(실제 HTTP), cache_hits, errors, last_ms
+    """
+    def __init__(self, app_key, base_url=DEFAULT_BASE_URL, cache=None,
+                 timeout=(3.05, 10.0), retries=3, backoff=0.3, pool_size=8):
+        self.app_key = app_key
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.timeout = timeout
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.last_ms = None
+        self._lock = threading.Lock()
+
+        retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                      backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET", "POST"]), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"appKey": app_key})
+        self._pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="nav-http")
+
+    # ---------- 내부 ----------
+    def _request(self, method, path, **kw):
+        t0 = time.perf_counter()
+        with self._lock:
+            self.calls += 1
+        try:
+            return self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kw)
+        finally:
+            self.last_ms = (time.perf_counter() - t0) * 1000.0
+
+    def _cached(self, kind, key):
+        if self.cache is None:
+            return None
+        hit = self.cache.get(kind, key)
+        if hit is not None:
+            with self._lock:
+                self.cache_hits += 1
+        return hit
+
+    def _fail(self, kind, key, msg):
+        with self._lock:
+            self.errors += 1
+        print(msg)
+        return self.cache.get(kind, key, allow_stale=True) if self.cache is not None else None
+
+    # ---------- POI 검색 ----------
+    def search_place(self, keyword):
+        key = poi_key(keyword)
+        hit = self._cached("poi", key)
+        if hit is not None:
+            return hit
+        if self.cache is not None and self.cache.offline:
+            print("[오프라인] 캐시에 없는 검색어:", keyword)
+            return []
+
+        params = {
+            "searchKeyword": keyword,
+            "resCoordType": "WGS84GEO",
+            "reqCoordType": "WGS84GEO",
+            "count": 10
+        }
+        try:
+            response = self._request("GET", "/tmap/pois?version=1", params=params)
+        except requests.RequestException as e:
+            return self._fail("poi", key, f"API 호출 실패: {e}") or []
+        if response.status_code != 200:
+            return self._fail("poi", key, f"API 호출 실패: {response.status_code}") or []
+
+        pois = response.json()["searchPoiInfo"]["pois"]["poi"]
+        results = []
+        for poi in pois:
+            address = f'{poi["upperAddrName"]} {poi["middleAddrName"]} {poi["lowerAddrName"]} {poi["detailAddrName"]}'
+            results.append({
+                "name": poi["name"],
+                "address": address,
+                "lat": float(poi["frontLat"]),
+                "lon": float(poi["frontLon"]),
+            })
+        if self.cache is not None and results:
+            self.cache.put("poi", key, results)
+        return results
+
+    def search_many(self, keywords):
+        """여러 검색어를 동시에 조회. 입력 순서대로 결과 리스트 반환."""
+        return list(self._pool.map(self.search_place, keywords))
+
+    # ---------- 경로 ----------
+    def route(self, startX, startY, endX, endY):
+        """보행자 경로 features (실패 시 None)."""
+        key = route_key(startY, startX, endY, endX)
+        hit = self._cached("route", key)
+        if hit is not None:
+            return hit
+        if self.cache is not None and self.cache.offline:
+            print("[오프라인] 캐시에 없는 경로")
+            return None
+
+        payload = {
+            "startX": str(startX),
+            "startY": str(startY),
+            "endX": str(endX),
+            "endY": str(endY),
+            "reqCoordType": "WGS84GEO",
+            "resCoordType": "WGS84GEO",
+            "startName": "출발지",
+            "endName": "도착지"
+        }
+        try:
+            response = self._request("POST", "/tmap/routes/pedestrian?version=1", json=payload)
+        except requests.RequestException as e:
+            return self._fail("route", key, f"Error: {e}")
+        if response.status_code != 200:
+            return self._fail("route", key, f"Error: {response.status_code} {response.text[:200]}")
+
+        features = response.json()["features"]
+        if self.cache is not None:
+            self.cache.put("route", key, features)
+        return features
+
+    def prefetch_route(self, startX, startY, endX, endY):
+        """경로 요청을 백그라운드로 시작 → Future (결과는 캐시에도 저장됨)."""
+        return self._pool.submit(self.route, startX, startY, endX, endY)
+
+    def stats(self):
+        return {"calls": self.calls, "cache_hits": self.cache_hits, "errors": self.errors,
+                "last_ms": None if self.last_ms is None else round(self.last_ms, 1)}
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,172 @@
+# nav_mock_server.py
+# TMap API 로컬 대역 서버 (네트워크/앱키 없이 Cap.py 흐름 확인용)
+#   python nav_mock_server.py --port 8089
+#   python nav_mock_server.py --latency-ms 300 --fail-every 4   # 느린 망 / 간헐 503 흉내
+#   python Cap.py --base-url http://127.0.0.1:8089
+# 코드에서:
+#   with MockTmapServer() as srv:
+#       ... base_url=srv.base_url ...
+#       srv.requests  # 경로별 호출 수
+#
+# 제공 경로
+#   GET  /tmap/pois?searchKeyword=...          → 키워드 기반 가짜 POI 3개 (좌표는 키워드로 결정)
+#   POST /tmap/routes/pedestrian               → 출발→도착 ㄱ자 경로 (LineString + 회전 Point)
+import json
+import time
+import zlib
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_LAT, BASE_LON = 37.5665, 126.9780
+
+
+def fake_pois(keyword):
+    """같은 키워드 → 항상 같은 좌표 (crc32 기반)."""
+    h = zlib.crc32(keyword.encode("utf-8"))
+    lat = BASE_LAT + ((h & 0xFFFF) / 0xFFFF - 0.5) * 0.02
+    lon = BASE_LON + (((h >> 16) & 0xFFFF) / 0xFFFF - 0.5) * 0.02
+    pois = []
+    for i in range(3):
+        pois.append({
+            "name": f"{keyword} {i + 1}",
+            "upperAddrName": "서울", "middleAddrName": "중구",
+            "lowerAddrName": "태평로", "detailAddrName": str(i + 1),
+            "frontLat": f"{lat + i * 0.0005:.7f}", "frontLon": f"{lon + i * 0.0005:.7f}",
+        })
+    return {"searchPoiInfo": {"pois": {"poi": pois}}}
+
+
+def fake_route(sx, sy, ex, ey, n_seg=4):
+    """출발 → (도착 위도, 출발 경도) 꺾임 → 도착. 각 다리를 n_seg 구간 LineString으로."""
+    corner = (sx, ey)
+    feats = [{"type": "Feature", "geometry": {"type": "Point", "coordinates": [sx, sy]},
+              "properties": {"turnType": 200, "description": "출발"}}]
+
+    def leg(a, b):
+        pts = [[a[0] + (b[0] - a[0]) * k / n_seg, a[1] + (b[1] - a[1]) * k / n_seg]
+               for k in range(n_seg + 1)]
+        return {"type": "Feature", "geometry": {"type": "LineString", "coordinates": pts},
+                "properties": {"description": "직진"}}
+
+    feats.append(leg((sx, sy), corner))
+    turn = 212 if (ex - sx) * (ey - sy) > 0 else 211
+    feats.append({"type": "Feature", "geometry": {"type": "Point", "coordinates": list(corner)},
+                  "properties": {"turnType": turn, "description": "회전"}})
+    feats.append(leg(corner, (ex, ey)))
+    feats.append({"type": "Feature", "geometry": {"type": "Point", "coordinates": [ex, ey]},
+                  "properties": {"turnType": 201, "description": "도착"}})
+    return {"type": "FeatureCollection", "features": feats}
+
+
+class MockTmapServer:
+    """
+    백그라운드 스레드로 도는 TMap 대역 서버. port=0이면 빈 포트 자동 할당.
+    - latency_s : 모든 응답 전 지연 (동시 요청/프리페치 효과 확인용)
+    - fail_every: N번째 요청마다 503 (재시도 백오프 확인용, 0이면 끔)
+    - connections: 새로 열린 TCP 연결 수 (keep-alive 재사용 확인용)
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency_s=0.0, fail_every=0):
+        self.requests = Counter()
+        self.latency_s = float(latency_s)
+        self.fail_every = int(fail_every)
+        self.connections = 0
+        self.failures = 0
+        self._n = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _inject(self):
+                """지연 + 간헐 실패. 실패 응답을 보냈으면 True."""
+                if server.latency_s > 0:
+                    time.sleep(server.latency_s)
+                with server._lock:
+                    server._n += 1
+                    fail = server.fail_every > 0 and server._n % server.fail_every == 0
+                    if fail:
+                        server.failures += 1
+                if fail:
+                    self._reply(503, {"error": "injected failure"})
+                return fail
+
+            def _reply(self, code, obj):
+                body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                server.requests[u.path] += 1
+                if self._inject():
+                    return
+                if u.path == "/tmap/pois":
+                    kw = parse_qs(u.query).get("searchKeyword", [""])[0]
+                    return self._reply(200, fake_pois(kw))
+                self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                u = urlparse(self.path)
+                server.requests[u.path] += 1
+                n = int(self.headers.get("Content-Length", 0) or 0)
+                try:
+                    req = json.loads(self.rfile.read(n) or b"{}")
+                    sx, sy = float(req["startX"]), float(req["startY"])
+                    ex, ey = float(req["endX"]), float(req["endY"])
+                except (ValueError, KeyError) as e:
+                    return self._reply(400, {"error": f"bad request: {e}"})
+                if self._inject():
+                    return
+                if u.path == "/tmap/routes/pedestrian":
+                    return self._reply(200, fake_route(sx, sy, ex, ey))
+                self._reply(404, {"error": "not found"})
+
+            def log_message(self, *a):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        h, p = self._httpd.server_address
+        self.base_url = f"http://{h}:{p}"
+        self._th = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="mock-tmap")
+        self._th.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="TMap API 로컬 대역 서버")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연(ms)")
+    ap.add_argument("--fail-every", type=int, default=0, help="N번째 요청마다 503")
+    args = ap.parse_args()
+    srv = MockTmapServer(port=args.port, latency_s=args.latency_ms / 1000.0, fail_every=args.fail_every)
+    print(f"[MOCK] {srv.base_url}  latency={args.latency_ms:.0f}ms fail_every={args.fail_every}  (Ctrl+C로 종료)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.close()
+        print("[MOCK] requests:", dict(srv.requests), "connections:", srv.connections,
+              "failures:", srv.failures)
@@ -0,0 +1,155 @@
+# route_progress.py
+# 경로 진행도 엔진: 위치 fix → 경로상 진행거리 / 다음 회전까지 / 목적지까지 (분할상환 O(1))
+#   prog = RouteProgress.from_features(features)
+#   st = prog.update(lat, lon)
+#   st["dist_to_next_turn"], st["dist_to_dest"], st["events"]  # events: 이번 fix에서 지난/도달한 회전
+#   st["dist_to_turn"], st["turn_type"]     # 아직 지나지 않은(s_turn > s) 첫 회전 — 감속 힌트용
+#
+# - 경로 폴리라인을 출발점 기준 로컬 평면(등장방형, m)으로 한 번만 변환, 구간 길이 누적합 미리 계산
+# - 매 fix는 직전 구간부터 앞쪽 몇 구간만 투영 (정상 주행이면 상수 시간)
+# - 회전 지점도 폴리라인 위 진행거리(s)로 바꿔 두고 s가 넘어서면 이벤트 → 지나쳐도(오버슈트) 놓치지 않음
+# - next_turn(안내)은 announce_m 앞에서 다음 회전으로 넘어감 → 회전까지 거리는 dist_to_turn을 따로 씀
+import math
+from bisect import bisect_right
+
+R_EARTH = 6371000.0
+
+
+class LocalFrame:
+    """원점(lat0, lon0) 기준 등장방형 근사: 수 km 범위에서 오차 ~0.1% 이하."""
+    def __init__(self, lat0, lon0):
+        self.lat0 = lat0
+        self.lon0 = lon0
+        self.kx = math.radians(1.0) * R_EARTH * math.cos(math.radians(lat0))
+        self.ky = math.radians(1.0) * R_EARTH
+
+    def to_xy(self, lat, lon):
+        return (lon - self.lon0) * self.kx, (lat - self.lat0) * self.ky
+
+    def to_latlon(self, x, y):
+        return self.lat0 + y / self.ky, self.lon0 + x / self.kx
+
+
+def polyline_from_features(features):
+    """
+    TMap 보행자 경로 features → (폴리라인 [(lat, lon)], 회전 [(lat, lon, turnType)])
+    LineString 좌표를 순서대로 이어붙이고(연속 중복점 제거), turnType != 0 인 Point를 회전으로.
+    """
+    pts, turns = [], []
+    for f in features:
+        g, props = f["geometry"], f.get("properties", {})
+        if g["type"] == "LineString":
+            for lon, lat in g["coordinates"]:
+                if not pts or pts[-1] != (lat, lon):
+                    pts.append((lat, lon))
+        elif g["type"] == "Point":
+            lon, lat = g["coordinates"]
+            if not pts:
+                pts.append((lat, lon))
+            if props.get("turnType", 0) != 0:
+                turns.append((lat, lon, props["turnType"]))
+    return pts, turns
+
+
+class RouteProgress:
+    """
+    announce_m : 회전 지점 s_turn - announce_m 에 도달하면 이벤트 (기존 5 m 규칙)
+    search_ahead: 매 fix마다 직전 구간부터 앞으로 볼 구간 수
+    reacquire_m : 국소 탐색 결과의 횡오차가 이보다 크면 전체 재탐색 (경로 이탈/점프)
+    """
+    def __init__(self, polyline, turns=(), announce_m=5.0, search_ahead=8, reacquire_m=30.0):
+        if len(polyline) < 2:
+            polyline = list(polyline) * 2 if polyline else [(0.0, 0.0), (0.0, 0.0)]
+        self.frame = LocalFrame(*polyline[0])
+        self.announce_m = float(announce_m)
+        self.search_ahead = int(search_ahead)
+        self.reacquire_m = float(reacquire_m)
+
+        xy = [self.frame.to_xy(lat, lon) for lat, lon in polyline]
+        self.x = [p[0] for p in xy]
+        self.y = [p[1] for p in xy]
+        n = len(xy) - 1
+        self.dx = [self.x[i + 1] - self.x[i] for i in range(n)]
+        self.dy = [self.y[i + 1] - self.y[i] for i in range(n)]
+        self.len2 = [dx * dx + dy * dy for dx, dy in zip(self.dx, self.dy)]
+        self.cum = [0.0] * (n + 1)  # cum[i]: 꼭짓점 i까지 경로 길이
+        for i in range(n):
+            self.cum[i + 1] = self.cum[i] + math.sqrt(self.len2[i])
+        self.total = self.cum[-1]
+        self.n_seg = n
+
+        # 회전 지점 → 진행거리 s (순서 보장 위해 정렬)
+        self.turns = sorted(((self._project_global(*self.frame.to_xy(lat, lon))[1], tt, lat, lon)
+                             for lat, lon, tt in turns), key=lambda t: t[0])
+        self._turn_s = [t[0] for t in self.turns]
+        self.seg = 0
+        self.s = 0.0
+        self.next_turn = 0
+        self.reacquires = 0
+
+    @classmethod
+    def from_features(cls, features, **kw):
+        pts, turns = polyline_from_features(features)
+        return cls(pts, turns, **kw)
+
+    # ---------- 투영 ----------
+    def _project_seg(self, i, px, py):
+        """구간 i에 투영 → (거리², s, t)"""
+        l2 = self.len2[i]
+        if l2 > 0:
+            t = ((px - self.x[i]) * self.dx[i] + (py - self.y[i]) * self.dy[i]) / l2
+            t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+        else:
+            t = 0.0
+        qx = self.x[i] + t * self.dx[i]
+        qy = self.y[i] + t * self.dy[i]
+        return (px - qx) ** 2 + (py - qy) ** 2, self.cum[i] + t * math.sqrt(l2), i
+
+    def _project_global(self, px, py):
+        best = None
+        for i in range(self.n_seg):
+            r = self._project_seg(i, px, py)
+            if best is None or r[0] < best[0]:
+                best = r
+        return best if best is not None else (0.0, 0.0, 0)
+
+    def _project_local(self, px, py):
+        lo = max(0, self.seg - 1)
+        hi = min(self.n_seg, self.seg + self.search_ahead + 1)
+        best = None
+        for i in range(lo, hi):
+            r = self._project_seg(i, px, py)
+            if best is None or r[0] < best[0]:
+                best = r
+        return best
+
+    # ---------- 공개 API ----------
+    def update(self, lat, lon):
+        px, py = self.frame.to_xy(lat, lon)
+        d2, s, seg = self._project_local(px, py)
+        if d2 > self.reacquire_m ** 2:
+            d2, s, seg = self._project_global(px, py)
+            self.reacquires += 1
+        self.seg, self.s = seg, s
+
+        events = []
+        while self.next_turn < len(self.turns) and s >= self.turns[self.next_turn][0] - self.announce_m:
+            s_t, tt, tlat, tlon = self.turns[self.next_turn]
+            events.append({"turnType": tt, "lat": tlat, "lon": tlon, "overshoot_m": max(0.0, s - s_t)})
+            self.next_turn += 1
+
+        nxt = self.turns[self.next_turn] if self.next_turn < len(self.turns) else None
+        k = bisect_right(self._turn_s, s)
+        ahead = self.turns[k] if k < len(self.turns) else None
+        return {
+            "s": s,
+            "seg": seg,
+            "cross_track_m": math.sqrt(d2),
+            "dist_to_next_turn": (nxt[0] - s) if nxt else None,
+            "next_turn_type": nxt[1] if nxt else None,
+            "next_turn_latlon": (nxt[2], nxt[3]) if nxt else None,
+            "dist_to_turn": (ahead[0] - s) if ahead else None,
+            "turn_type": ahead[1] if ahead else None,
+            "dist_to_dest": max(0.0, self.total - s),
+            "events": events,
+        }
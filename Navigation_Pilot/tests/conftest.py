@@ -0,0 +1,9 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+# Navigation_Pilot에서 python -m pytest -q tests 로 실행 (평평한 스크립트 모듈 + pi_path 공용 모듈)
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
@@ -0,0 +1,22 @@
+# tests/test_gps_sim.py
+from gps_sim import GpsSimulator, run_route
+from nav_mock_server import fake_route
+
+FEATS = fake_route(126.9780, 37.5665, 126.9800, 37.5680)["features"]
+
+
+def test_seeded_run_is_ok_and_repeatable():
+    a = run_route(FEATS, seed=7)
+    b = run_route(FEATS, seed=7)
+    assert a["ok"] and a["announced"] == a["expected"] == [200, 212, 201]
+    assert a == b                                   # 가상 시계 + seed → 결정적
+    assert a["fixes"] == round(a["sim_s"] * 10)     # 10 Hz, 실제 시간 안 씀
+    # ~343 m를 순항 4 m/s(회전/도착 감속 포함)로 → 대략 90~200 s
+    assert 900 <= a["fixes"] <= 2000
+
+
+def test_same_seed_same_fixes():
+    fa = list(GpsSimulator.from_features(FEATS, seed=1).fixes())
+    assert fa == list(GpsSimulator.from_features(FEATS, seed=1).fixes())
+    assert fa != list(GpsSimulator.from_features(FEATS, seed=2).fixes())
+    assert run_route(FEATS, seed=2)["ok"]
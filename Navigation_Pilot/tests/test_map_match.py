@@ -0,0 +1,44 @@
+# tests/test_map_match.py
+import numpy as np
+
+from map_match import MapMatcher
+from route_progress import LocalFrame
+
+FRAME = LocalFrame(37.5665, 126.9780)
+# 로컬 좌표(m): 동쪽 100 m → 북쪽 100 m
+XY = [(0.0, 0.0), (100.0, 0.0), (100.0, 100.0)]
+FIXES = [(50.0, 10.0), (30.0, -5.0), (110.0, 50.0), (95.0, 80.0), (-20.0, 0.0)]
+
+
+def _ll(points):
+    return [FRAME.to_latlon(x, y) for x, y in points]
+
+
+def _match(**kw):
+    mm = MapMatcher(_ll(XY), frame=FRAME, **kw)
+    lat, lon = zip(*_ll(FIXES))
+    return mm.match(lat, lon)
+
+
+def test_segment_offset_and_signed_cross_track():
+    r = _match()
+    assert list(r["seg"]) == [0, 0, 1, 1, 0]
+    np.testing.assert_allclose(r["offset_m"], [50.0, 30.0, 150.0, 180.0, 0.0], atol=1e-6)
+    # 진행 방향 왼쪽 +, 오른쪽 - (동쪽 진행: 북 +, 북쪽 진행: 동 -), 출발점 뒤 연장선 위(외적 0)는 +
+    np.testing.assert_allclose(r["cross_track_m"], [10.0, -5.0, -10.0, 5.0, 20.0], atol=1e-6)
+    snapped = np.column_stack(FRAME.to_xy(r["snapped_lat"], r["snapped_lon"]))
+    np.testing.assert_allclose(snapped, [(50, 0), (30, 0), (100, 50), (100, 80), (0, 0)], atol=1e-6)
+
+
+def test_chunking_matches_single_pass():
+    whole = _match()
+    for cells in (1, 2, 5):        # 2구간 → 청크당 fix 1개/1개/2개
+        part = _match(max_cells=cells)
+        for k in whole:
+            np.testing.assert_allclose(part[k], whole[k], atol=1e-9)
+
+
+def test_match_one():
+    mm = MapMatcher(_ll(XY), frame=FRAME)
+    r = mm.match_one(*FRAME.to_latlon(110.0, 50.0))
+    assert r["seg"] == 1 and abs(r["offset_m"] - 150.0) < 1e-6 and abs(r["cross_track_m"] + 10.0) < 1e-6
@@ -0,0 +1,121 @@
+# tests/test_nav_cache.py
+import pytest
+
+from nav_cache import NavCache, poi_key, route_key
+from nav_client import NavApiClient
+from nav_mock_server import MockTmapServer
+
+TTL = 3600.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def srv():
+    with MockTmapServer() as s:
+        yield s
+
+
+@pytest.fixture
+def clk():
+    return FakeClock()
+
+
+def _cache(tmp_path, clk, **kw):
+    kw.setdefault("ttl_s", TTL)
+    return NavCache(str(tmp_path / "nav.sqlite"), clock=clk, **kw)
+
+
+def _client(srv, cache, **kw):
+    kw.setdefault("retries", 0)
+    return NavApiClient("test-key", base_url=srv.base_url, cache=cache, **kw)
+
+
+def test_keys_are_normalized():
+    assert poi_key("  서울역   1번  출구 ") == poi_key("서울역 1번 출구")
+    assert poi_key("ＡＢＣ") == "abc"
+    assert route_key(37.5665001, 126.978, 37.57, 127.0) == route_key(37.5665004, 126.978, 37.57, 127.0)
+
+
+def test_hit_until_ttl_then_refetch(tmp_path, srv, clk):
+    cache = _cache(tmp_path, clk)
+    client = _client(srv, cache)
+    first = client.search_place("서울역")
+    assert len(first) == 3 and srv.requests["/tmap/pois"] == 1
+    clk.t += TTL - 1
+    assert client.search_place(" 서울역 ") == first
+    assert srv.requests["/tmap/pois"] == 1 and cache.hits == 1
+    clk.t += 2                                   # 만료
+    assert client.search_place("서울역") == first
+    assert srv.requests["/tmap/pois"] == 2 and cache.misses == 2
+    client.close()
+    cache.close()
+
+
+def test_route_cached_by_rounded_coords(tmp_path, srv, clk):
+    cache = _cache(tmp_path, clk)
+    client = _client(srv, cache)
+    f1 = client.route(126.9780, 37.5665, 126.9800, 37.5700)
+    f2 = client.route(126.978000001, 37.5665, 126.98, 37.57)
+    assert f1 == f2 and srv.requests["/tmap/routes/pedestrian"] == 1
+    client.close()
+    cache.close()
+
+
+def test_lru_evicts_least_recently_used(tmp_path, clk):
+    cache = _cache(tmp_path, clk, max_entries=2)
+    for k in ("a", "b"):
+        clk.t += 1
+        cache.put("poi", k, [k])
+    clk.t += 1
+    assert cache.get("poi", "a") == ["a"]        # a 사용 → b가 가장 오래됨
+    clk.t += 1
+    cache.put("poi", "c", ["c"])
+    assert len(cache) == 2
+    assert cache.get("poi", "b") is None
+    assert cache.get("poi", "a") == ["a"] and cache.get("poi", "c") == ["c"]
+    cache.close()
+
+
+def test_offline_serves_expired_and_never_calls_api(tmp_path, srv, clk):
+    cache = _cache(tmp_path, clk)
+    client = _client(srv, cache)
+    results = client.search_place("시청")
+    cache.close()
+    client.close()
+
+    clk.t += 10 * TTL
+    offline = _cache(tmp_path, clk, offline=True)
+    client = _client(srv, offline)
+    assert client.search_place("시청") == results       # 만료됐어도 반환
+    assert client.search_place("없는 곳") == []
+    assert client.route(126.97, 37.56, 126.98, 37.57) is None
+    assert srv.requests["/tmap/pois"] == 1 and srv.requests["/tmap/routes/pedestrian"] == 0
+    assert offline.stale_hits == 1
+    client.close()
+    offline.close()
+
+
+def test_stale_fallback_on_network_error(tmp_path, clk):
+    cache = _cache(tmp_path, clk)
+    with MockTmapServer() as ok:
+        client = _client(ok, cache)
+        results = client.search_place("광화문")
+        client.close()
+    clk.t += 2 * TTL
+    with MockTmapServer(fail_every=1) as down:          # 모든 요청 503
+        client = _client(down, cache)
+        assert client.search_place("광화문") == results
+        assert client.search_place("처음 보는 곳") == []
+        assert client.errors == 2 and cache.stale_hits == 1
+        assert down.failures == 2
+        client.close()
+    cache.purge_expired()
+    assert len(cache) == 0
+    cache.close()
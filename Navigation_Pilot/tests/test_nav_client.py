@@ -0,0 +1,61 @@
+# tests/test_nav_client.py
+import time
+
+from nav_cache import NavCache, route_key
+from nav_client import NavApiClient
+from nav_mock_server import MockTmapServer
+
+LAT = 0.3
+
+
+def _client(srv, **kw):
+    kw.setdefault("backoff", 0.0)
+    return NavApiClient("test-key", base_url=srv.base_url, **kw)
+
+
+def test_search_many_overlaps_requests():
+    with MockTmapServer(latency_s=LAT) as srv:
+        client = _client(srv)
+        t0 = time.perf_counter()
+        start, end = client.search_many(["서울역", "시청"])
+        dt = time.perf_counter() - t0
+        client.close()
+    assert start[0]["name"] == "서울역 1" and end[0]["name"] == "시청 1"
+    assert LAT <= dt < 1.7 * LAT                 # 순차면 2 × LAT
+    assert srv.requests["/tmap/pois"] == 2
+
+
+def test_keep_alive_reuses_one_connection():
+    with MockTmapServer() as srv:
+        client = _client(srv)
+        for kw in ("a", "b", "c", "d", "e"):
+            assert len(client.search_place(kw)) == 3
+        client.route(126.97, 37.56, 126.98, 37.57)
+        client.close()
+    assert srv.requests["/tmap/pois"] == 5
+    assert srv.connections == 1
+
+
+def test_503_is_retried():
+    with MockTmapServer(fail_every=2) as srv:
+        client = _client(srv, retries=3)
+        assert client.search_place("a")
+        assert client.search_place("b")               # 2번째 요청 503 → 재시도로 성공
+        assert client.route(126.97, 37.56, 126.98, 37.57) is not None   # POST도 재시도 (4번째 503)
+        client.close()
+    assert srv.failures == 2 and client.errors == 0
+    assert srv.requests["/tmap/pois"] == 3 and srv.requests["/tmap/routes/pedestrian"] == 2
+
+
+def test_prefetch_route_fills_cache(tmp_path):
+    cache = NavCache(str(tmp_path / "nav.sqlite"))
+    with MockTmapServer(latency_s=0.1) as srv:
+        client = _client(srv, cache=cache)
+        fut = client.prefetch_route(126.9780, 37.5665, 126.9800, 37.5700)
+        features = fut.result(timeout=5)
+        assert cache.get("route", route_key(37.5665, 126.9780, 37.5700, 126.9800)) == features
+        assert client.route(126.9780, 37.5665, 126.9800, 37.5700) == features
+        client.close()
+    assert srv.requests["/tmap/routes/pedestrian"] == 1
+    assert client.calls == 1 and client.cache_hits == 1
+    cache.close()
@@ -0,0 +1,53 @@
+# tests/test_route_progress.py
+from nav_mock_server import fake_route
+from route_progress import RouteProgress
+
+SX, SY, EX, EY = 126.9780, 37.5665, 126.9800, 37.5680     # ㄱ자: 북쪽 ~167 m → 동쪽 ~176 m
+
+
+def _prog(**kw):
+    return RouteProgress.from_features(fake_route(SX, SY, EX, EY)["features"], **kw)
+
+
+def _at(prog, s):
+    """경로 위 진행거리 s(m) 지점의 (lat, lon)."""
+    i = max(k for k in range(prog.n_seg) if prog.cum[k] <= s)
+    t = (s - prog.cum[i]) / (prog.cum[i + 1] - prog.cum[i])
+    return prog.frame.to_latlon(prog.x[i] + t * prog.dx[i], prog.y[i] + t * prog.dy[i])
+
+
+def test_dist_to_turn_stays_on_corner_until_passed():
+    prog = _prog()
+    s_corner = prog.turns[1][0]
+    st = prog.update(*_at(prog, s_corner - 3.0))
+    # 안내(next_turn)는 announce_m 앞에서 이미 도착 지점으로 넘어감
+    assert [e["turnType"] for e in st["events"]] == [200, 212]
+    assert st["next_turn_type"] == 201
+    # 감속 힌트용 거리는 아직 앞에 있는 코너 기준
+    assert st["turn_type"] == 212 and abs(st["dist_to_turn"] - 3.0) < 0.05
+    st = prog.update(*_at(prog, s_corner + 1.0))
+    assert st["turn_type"] == 201 and abs(st["dist_to_turn"] - (prog.total - s_corner - 1.0)) < 0.05
+
+
+def test_overshoot_still_fires_turn_event():
+    prog = _prog()
+    s_corner = prog.turns[1][0]
+    prog.update(*_at(prog, s_corner - 20.0))
+    # 다음 fix가 코너를 10 m 지나서 옴 (GPS 끊김/1 Hz) → 안내를 놓치지 않고 오버슈트로 보고
+    st = prog.update(*_at(prog, s_corner + 10.0))
+    assert [e["turnType"] for e in st["events"]] == [212]
+    assert abs(st["events"][0]["overshoot_m"] - 10.0) < 0.05
+    assert prog.reacquires == 0
+
+
+def test_reacquire_after_jump():
+    prog = _prog(search_ahead=1)
+    prog.update(*_at(prog, 10.0))
+    s_far = prog.total - 30.0        # 국소 탐색 범위(직전 구간 + 1) 밖으로 점프
+    st = prog.update(*_at(prog, s_far))
+    assert prog.reacquires == 1
+    assert abs(st["s"] - s_far) < 0.05 and st["cross_track_m"] < 0.05
+    assert [e["turnType"] for e in st["events"]] == [212]
+    # 다시 잡힌 뒤에는 국소 탐색만
+    st = prog.update(*_at(prog, s_far + 5.0))
+    assert prog.reacquires == 1 and abs(st["s"] - (s_far + 5.0)) < 0.05
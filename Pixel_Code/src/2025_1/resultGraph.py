@@ -1,15 +1,11 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+# resultGraph.py
+# 예전 단일 파일 그래프 스크립트 → result_analysis.py 배치 파이프라인으로 대체됨
+#   python resultGraph.py                 # 현재 폴더의 result.csv (기본 감속 3.0 m/s^2)
+#   python resultGraph.py <폴더|CSV...>    # 여러 실험 파일 일괄 분석
+# 그래프는 화면 대신 analysis/decel_<a>.png 로 저장 (헤드리스 Agg)
+import sys
+from result_analysis import main
 
-data = pd.read_csv("result.csv")
-
-plt.figure(figsize=(8,6))
-for result, group in data.groupby('Result'):
-    plt.scatter(group['Distance(m)'], group['Speed(m/s)'], label=result, alpha=0.7)
-
-plt.xlabel('Distance (m)')
-plt.ylabel('Speed (m/s)')
-plt.title('Reult - 3.0(m/s^2)')
-plt.legend()
-plt.grid(True)
-plt.show()
+if __name__ == "__main__":
+    args = sys.argv[1:] or ["result.csv", "--decel", "3.0", "--out", "analysis"]
+    sys.exit(main(args))
@@ -0,0 +1,298 @@
+# result_analysis.py
+# -*- coding: utf-8 -*-
+# 제동 실험 결과 CSV 일괄 분석 (resultGraph.py 대체)
+#
+#   python result_analysis.py <실험폴더> [--out <출력폴더>] [--decel 3.0] [--speed-bin 0.25]
+#
+# 입력 CSV 컬럼: Result, Distance(m), Speed(m/s)  (+ 선택: Decel(m/s^2))
+#   - 감속 설정값: Decel 컬럼 > --decel > 파일명 (result_3.0.csv, decel3.0_*.csv 형식만 → 3.0)
+#   - Result: Success/성공/OK/O → 성공, 나머지는 실패
+# 출력:
+#   summary.json            감속 설정별 경계/포락선/모델 적합 결과
+#   boundary.csv            감속 설정 × 속도 구간별 성공/실패 경계
+#   decel_<a>.png           산점도 + 경계 + 이론 정지거리 곡선 (Agg, 파일로만 저장)
+# 캐시: <출력폴더>/.cache/<sha1>.npz (파일 내용 해시 기준, 바뀐 파일만 다시 파싱)
+import os
+import re
+import csv
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SUCCESS_WORDS = ("success", "성공", "ok", "o", "pass", "stop")
+# 파일명 감속 표기: 이름 전체가 result_<a>, 또는 어디든 decel<a> / decel_<a> / decel-<a>
+#   (run_2025-05-01.csv 같은 날짜/번호는 감속값으로 읽지 않음)
+_DECEL_RX = (re.compile(r"^result_(\d+(?:\.\d+)?)$", re.I),
+             re.compile(r"decel[_-]?(\d+(?:\.\d+)?)(?![\d.])", re.I))
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _col(header, *names):
+    low = [h.strip().lower() for h in header]
+    for n in names:
+        for i, h in enumerate(low):
+            if h.startswith(n):
+                return i
+    return None
+
+
+def decel_from_name(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for rx in _DECEL_RX:
+        m = rx.search(stem)
+        if m:
+            return float(m.group(1))
+    return None
+
+
+def parse_file(path, default_decel=None):
+    """CSV 하나 → (distance, speed, success(bool), decel) 배열."""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        r = csv.reader(f)
+        header = next(r, None) or []
+        i_res = _col(header, "result")
+        i_d = _col(header, "distance")
+        i_v = _col(header, "speed")
+        i_a = _col(header, "decel")
+        if i_res is None or i_d is None or i_v is None:
+            raise ValueError(f"missing Result/Distance/Speed columns: {header}")
+        file_decel = default_decel if default_decel is not None else decel_from_name(path)
+        dist, spd, ok, dec = [], [], [], []
+        for row in r:
+            try:
+                d = float(row[i_d])
+                v = float(row[i_v])
+            except (ValueError, IndexError):
+                continue
+            a = file_decel
+            if i_a is not None:
+                try:
+                    a = float(row[i_a])
+                except (ValueError, IndexError):
+                    pass
+            dist.append(d)
+            spd.append(v)
+            ok.append(row[i_res].strip().lower() in SUCCESS_WORDS)
+            dec.append(np.nan if a is None else a)
+    return (np.asarray(dist, float), np.asarray(spd, float),
+            np.asarray(ok, bool), np.asarray(dec, float))
+
+
+def load_cached(path, cache_dir, default_decel):
+    """파일 해시로 캐시 확인 후 파싱 (프로세스 풀 워커에서 실행)."""
+    # 기본 감속값/파일명 감속값이 바뀌면 결과도 달라지므로 키에 포함
+    key = f"{file_hash(path)}_{default_decel}_{decel_from_name(path)}"
+    cp = os.path.join(cache_dir, key + ".npz")
+    if os.path.exists(cp):
+        try:
+            with np.load(cp) as z:
+                return path, (z["dist"], z["speed"], z["ok"], z["decel"]), True
+        except Exception:
+            pass
+    arrs = parse_file(path, default_decel)
+    tmp = cp + ".tmp.npz"
+    np.savez(tmp, dist=arrs[0], speed=arrs[1], ok=arrs[2], decel=arrs[3])
+    os.replace(tmp, cp)
+    return path, arrs, False
+
+
+def ingest(paths, cache_dir, default_decel=None, workers=None):
+    os.makedirs(cache_dir, exist_ok=True)
+    if workers == 1 or len(paths) <= 1:
+        out = [load_cached(p, cache_dir, default_decel) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            out = list(ex.map(load_cached, paths, [cache_dir] * len(paths),
+                              [default_decel] * len(paths)))
+    cols = [np.concatenate([o[1][k] for o in out]) if out else np.zeros(0) for k in range(4)]
+    src = np.concatenate([np.full(len(o[1][0]), i, np.int32) for i, o in enumerate(out)]) \
+        if out else np.zeros(0, np.int32)
+    cached = sum(1 for o in out if o[2])
+    return cols, src, cached
+
+
+def boundaries(dist, speed, ok, edges):
+    """
+    속도 구간별 성공/실패 경계 (전부 벡터 연산, ufunc.at)
+      fail_max : 실패한 시도 중 가장 먼 시작거리  (이보다 가까우면 실패 구간)
+      succ_min : 성공한 시도 중 가장 가까운 시작거리
+      boundary : 둘 다 있으면 중간값, 한쪽만 있으면 그 값
+    """
+    nb = len(edges) - 1
+    b = np.clip(np.digitize(speed, edges) - 1, 0, nb - 1)
+    fail_max = np.full(nb, -np.inf)
+    succ_min = np.full(nb, np.inf)
+    n_ok = np.bincount(b[ok], minlength=nb)
+    n_fail = np.bincount(b[~ok], minlength=nb)
+    np.maximum.at(fail_max, b[~ok], dist[~ok])
+    np.minimum.at(succ_min, b[ok], dist[ok])
+    has_f, has_s = np.isfinite(fail_max), np.isfinite(succ_min)
+    with np.errstate(invalid="ignore"):  # 빈 구간(±inf)은 아래 where에서 걸러짐
+        mid = (fail_max + succ_min) / 2.0
+    boundary = np.where(has_f & has_s, mid,
+                        np.where(has_f, fail_max, np.where(has_s, succ_min, np.nan)))
+    return {
+        "v_lo": edges[:-1], "v_hi": edges[1:], "n_ok": n_ok, "n_fail": n_fail,
+        "fail_max": np.where(has_f, fail_max, np.nan),
+        "succ_min": np.where(has_s, succ_min, np.nan),
+        "boundary": boundary,
+        "overlap": has_f & has_s & (fail_max > succ_min),  # 같은 구간에서 성공/실패가 섞임
+    }
+
+
+def fit_stopping_model(v, d):
+    """d = t_r*v + v²/(2a) 최소제곱 적합 → (t_r[s], a_eff[m/s²]). 점 부족하면 None."""
+    ok = np.isfinite(v) & np.isfinite(d)
+    if ok.sum() < 2:
+        return None, None
+    A = np.stack([v[ok], v[ok] ** 2], axis=1)
+    (t_r, k), *_ = np.linalg.lstsq(A, d[ok], rcond=None)
+    a_eff = 1.0 / (2.0 * k) if k > 0 else None
+    return float(t_r), (None if a_eff is None else float(a_eff))
+
+
+def envelope(v, decel, t_react):
+    """이론 정지거리 포락선 d(v) = v*t_react + v²/(2a)."""
+    return v * t_react + v * v / (2.0 * decel)
+
+
+def plot_decel(path, a, dist, speed, ok, bnd, t_react, fit):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.scatter(dist[ok], speed[ok], label="Success", alpha=0.7, s=18)
+    ax.scatter(dist[~ok], speed[~ok], label="Fail", alpha=0.7, s=18, marker="x")
+    vc = (bnd["v_lo"] + bnd["v_hi"]) / 2.0
+    m = np.isfinite(bnd["boundary"])
+    ax.plot(bnd["boundary"][m], vc[m], "k.-", label="boundary")
+    if a == a and a > 0:
+        vv = np.linspace(0, max(speed.max() if len(speed) else 1.0, 0.5), 100)
+        ax.plot(envelope(vv, a, t_react), vv, "r--", label=f"theory a={a:g}, t_r={t_react:g}s")
+    if fit[1]:
+        vv = np.linspace(0, max(speed.max() if len(speed) else 1.0, 0.5), 100)
+        ax.plot(envelope(vv, fit[1], max(fit[0], 0.0)), vv, "g:",
+                label=f"fit a_eff={fit[1]:.2f}, t_r={fit[0]:.2f}s")
+    ax.set_xlabel("Distance (m)")
+    ax.set_ylabel("Speed (m/s)")
+    ax.set_title(f"Result - {a:g}(m/s^2)" if a == a else "Result - decel unknown")
+    ax.legend()
+    ax.grid(True)
+    fig.savefig(path, dpi=110, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+
+def analyze(paths, out_dir, default_decel=None, speed_bin=0.25, t_react=0.3,
+            workers=None, plots=True):
+    t0 = time.time()
+    (dist, speed, ok, decel), src, cached = ingest(
+        paths, os.path.join(out_dir, ".cache"), default_decel, workers)
+    t_ingest = time.time() - t0
+
+    vmax = float(np.nanmax(speed)) if len(speed) else 0.0
+    edges = np.arange(0.0, vmax + speed_bin + 1e-9, speed_bin)
+    if len(edges) < 2:
+        edges = np.array([0.0, speed_bin])
+
+    summary = {"files": len(paths), "rows": int(len(dist)), "cached_files": cached,
+               "speed_bin": speed_bin, "t_react": t_react, "decel": {}}
+    rows = []
+    keys = np.unique(np.nan_to_num(decel, nan=-1.0))
+    for key in keys:
+        sel = np.nan_to_num(decel, nan=-1.0) == key
+        a = float("nan") if key < 0 else float(key)
+        d, v, o = dist[sel], speed[sel], ok[sel]
+        bnd = boundaries(d, v, o, edges)
+        vc = (bnd["v_lo"] + bnd["v_hi"]) / 2.0
+        fit = fit_stopping_model(vc, bnd["boundary"])
+        name = "unknown" if a != a else f"{a:g}"
+        summary["decel"][name] = {
+            "n": int(sel.sum()),
+            "success_rate": round(float(o.mean()), 4) if len(o) else None,
+            "fit_t_react_s": fit[0], "fit_a_eff": fit[1],
+            "overlap_bins": int(bnd["overlap"].sum()),
+            "files": sorted({os.path.basename(paths[i]) for i in np.unique(src[sel])}),
+        }
+        for i in range(len(vc)):
+            if bnd["n_ok"][i] + bnd["n_fail"][i] == 0:
+                continue
+            rows.append([name, f"{bnd['v_lo'][i]:.2f}", f"{bnd['v_hi'][i]:.2f}",
+                         int(bnd["n_ok"][i]), int(bnd["n_fail"][i]),
+                         _fmt(bnd["fail_max"][i]), _fmt(bnd["succ_min"][i]), _fmt(bnd["boundary"][i]),
+                         _fmt(envelope(vc[i], a, t_react)) if a == a and a > 0 else ""])
+        if plots:
+            p = plot_decel(os.path.join(out_dir, f"decel_{name}.png"), a, d, v, o, bnd, t_react, fit)
+            if p is None:
+                print("[ANALYSIS] matplotlib 없음 → 그래프 생략")
+                plots = False
+            else:
+                summary["decel"][name]["plot"] = os.path.basename(p)
+
+    with open(os.path.join(out_dir, "boundary.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["decel", "v_lo", "v_hi", "n_success", "n_fail",
+                    "fail_max_m", "success_min_m", "boundary_m", "theory_m"])
+        w.writerows(rows)
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print(f"[ANALYSIS] {len(paths)} files ({cached} cached) / {len(dist)} rows "
+          f"ingest={t_ingest * 1000:.0f}ms total={(time.time() - t0) * 1000:.0f}ms → {out_dir}")
+    for name, s in summary["decel"].items():
+        print(f"  decel={name:<8} n={s['n']:<5} success={s['success_rate']} "
+              f"fit a_eff={s['fit_a_eff']} t_r={s['fit_t_react_s']} overlap_bins={s['overlap_bins']}")
+    return summary
+
+
+def _fmt(x):
+    return "" if not np.isfinite(x) else f"{x:.3f}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="제동 실험 결과 CSV 일괄 분석")
+    ap.add_argument("inputs", nargs="*", default=["."], help="CSV 파일/폴더/glob (기본: 현재 폴더)")
+    ap.add_argument("--out", default=None, help="출력 폴더 (기본: <첫 입력 폴더>/analysis)")
+    ap.add_argument("--decel", type=float, default=None, help="감속 설정 (Decel 컬럼이 없는 파일에 적용, 파일명보다 우선)")
+    ap.add_argument("--speed-bin", type=float, default=0.25, help="속도 구간 폭 (m/s)")
+    ap.add_argument("--t-react", type=float, default=0.3, help="이론 포락선 반응시간 (s)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--no-plot", action="store_true")
+    args = ap.parse_args(argv)
+
+    paths = []
+    for p in args.inputs:
+        if os.path.isdir(p):
+            paths += sorted(glob.glob(os.path.join(p, "*.csv")))
+        else:
+            paths += sorted(glob.glob(p)) or [p]
+    paths = [p for p in paths if os.path.isfile(p)]
+    if not paths:
+        print("[ANALYSIS] no CSV files")
+        return 1
+
+    base = args.inputs[0] if os.path.isdir(args.inputs[0]) else os.path.dirname(paths[0])
+    out_dir = args.out or os.path.join(base or ".", "analysis")
+    os.makedirs(out_dir, exist_ok=True)
+    analyze(paths, out_dir, args.decel, args.speed_bin, args.t_react, args.workers, not args.no_plot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# comm.py
+# -*- coding: utf-8 -*-
+# ESP32 하트비트/모드 직렬 클라이언트 (논블로킹)
+#   c = Comm("/dev/ttyACM0", 115200)
+#   c.start_hb(0.1)                # 전용 타이머 스레드가 HB를 일정 주기로 송신
+#   c.send_mode("NORMAL"); c.send_cmd("SAFE"); c.send_speed_cap(11)
+#   lines = c.poll_events(0.0)     # 수신 버퍼에 쌓인 줄 (timeout_s 동안만 추가 대기)
+#   c.close()
+#
+# 프로토콜 (Pi → ESP32, 줄 단위)
+#   MODE <IDLE|NORMAL|CORNER>   → OK MODE <m>
+#   HB <seq>                    → (응답 없음) 끊기면 펌웨어가 EVT FAILSAFE HB_TIMEOUT
+#   CMD <SAFE|WARN|BRAKE|...>   → OK CMD <c>
+#   SPD_CAP <kmh>               → OK SPD_CAP <kmh>
+# ESP32 → Pi: BOOT ..., OK ..., ERR ..., EVT FAILSAFE ..., EVT FAILSAFE_CLEAR, V:<kmh>
+#
+# 스레드
+#   rx : 직렬 수신 → 줄 단위로 링버퍼(최신 rx_max줄, 넘치면 오래된 줄 버림)
+#   hb : 절대 데드라인(시작 + k*period)으로 HB 송신 → 판단 루프가 잠깐 멈춰도 HB 주기 유지
+#        liveness_s를 주면 판단 루프가 kick()을 그 시간 안에 안 부를 때 HB 중단 → 펌웨어 fail-safe
+#        (루프가 완전히 죽었는데 HB만 계속 나가는 상황 방지)
+import time
+import threading
+from collections import deque
+
+import serial
+
+import pi_path  # noqa: F401  (src_refactoring/pi 공용 모듈)
+from pi.scheduler import Histogram, JITTER_EDGES_MS
+
+MODES = ("IDLE", "NORMAL", "CORNER")
+
+
+class Comm:
+    """
+    port/baud : 직렬 포트 (pyserial)
+    timeout   : 수신 스레드 read 타임아웃(초) — 종료 반응 시간
+    write_timeout: 송신 최대 대기(초). 넘치면 해당 줄은 실패로 세고 버림 (호출자는 막히지 않음)
+    rx_max    : 수신 링버퍼 크기(줄)
+    hb_period_s: 0보다 크면 생성 즉시 HB 스레드 시작 (기본은 수동 send_hb / start_hb)
+    """
+    def __init__(self, port, baud=115200, timeout=0.05, write_timeout=0.05, rx_max=256,
+                 hb_period_s=0.0, liveness_s=None):
+        self.ser = serial.Serial(port, baud, timeout=timeout, write_timeout=write_timeout)
+        self._tx_lock = threading.RLock()  # 수동 send_hb와 HB 스레드가 seq/송신을 함께 씀
+        self._rx = deque(maxlen=int(rx_max))
+        self._rx_cv = threading.Condition()
+        self._alive = True
+
+        self.rx_lines = 0
+        self.rx_dropped = 0
+        self.tx_lines = 0
+        self.tx_errors = 0
+        self.failsafe = False
+        self.failsafe_events = 0
+
+        self.hb_seq = 0
+        self.hb_period_s = 0.0
+        self.hb_skipped = 0        # liveness 미충족으로 건너뛴 HB
+        self.hb_jitter = Histogram(JITTER_EDGES_MS)  # 실제 송신 간격 - 주기 (|ms|)
+        self.hb_max_gap_ms = 0.0
+        self._hb_stop = threading.Event()
+        self._hb_th = None
+        self._liveness_s = liveness_s
+        self._kick_t = time.monotonic()
+
+        self._rx_th = threading.Thread(target=self._rx_loop, daemon=True, name="comm-rx")
+        self._rx_th.start()
+        if hb_period_s > 0:
+            self.start_hb(hb_period_s, liveness_s)
+
+    # ---------- 송신 ----------
+    def _write_line(self, line):
+        """한 줄 송신. 실패하면 False (예외 올리지 않음)."""
+        data = (line + "\n").encode("ascii")
+        with self._tx_lock:
+            try:
+                self.ser.write(data)
+                self.tx_lines += 1
+                return True
+            except (serial.SerialTimeoutException, serial.SerialException, OSError) as e:
+                self.tx_errors += 1
+                if self.tx_errors == 1 or self.tx_errors % 100 == 0:
+                    print(f"[COMM] write failed ({self.tx_errors}): {e}")
+                return False
+
+    def send_mode(self, mode):
+        mode = str(mode).upper()
+        if mode not in MODES:
+            raise ValueError(f"unknown mode: {mode} (choose from {MODES})")
+        return self._write_line(f"MODE {mode}")
+
+    def send_hb(self):
+        with self._tx_lock:
+            self.hb_seq += 1
+            return self._write_line(f"HB {self.hb_seq}")
+
+    def send_cmd(self, cmd):
+        return self._write_line(f"CMD {str(cmd).upper()}")
+
+    def send_speed_cap(self, kmh):
+        return self._write_line(f"SPD_CAP {int(round(kmh))}")
+
+    # ---------- 수신 ----------
+    def _rx_loop(self):
+        buf = b""
+        while self._alive:
+            try:
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError) as e:
+                if self._alive:
+                    print("[COMM] read failed:", e)
+                break
+            if not chunk:
+                continue
+            buf += chunk
+            if b"\n" not in buf:
+                continue
+            *lines, buf = buf.split(b"\n")
+            with self._rx_cv:
+                for raw in lines:
+                    line = raw.decode("ascii", errors="ignore").strip()
+                    if not line:
+                        continue
+                    if line.startswith("EVT FAILSAFE_CLEAR"):
+                        self.failsafe = False
+                    elif line.startswith("EVT FAILSAFE"):
+                        self.failsafe = True
+                        self.failsafe_events += 1
+                    if len(self._rx) == self._rx.maxlen:
+                        self.rx_dropped += 1
+                    self._rx.append(line)
+                    self.rx_lines += 1
+                self._rx_cv.notify_all()
+
+    def poll_events(self, timeout_s=0.0, max_lines=None):
+        """
+        수신 버퍼의 줄을 꺼냄. timeout_s 동안은 새로 오는 줄도 모아서 반환 (0이면 대기 없음)
+        max_lines개가 모이면 시간 전이라도 바로 반환
+        """
+        out = []
+        t_end = time.monotonic() + max(0.0, timeout_s)
+        with self._rx_cv:
+            while True:
+                while self._rx and (max_lines is None or len(out) < max_lines):
+                    out.append(self._rx.popleft())
+                if max_lines is not None and len(out) >= max_lines:
+                    break
+                left = t_end - time.monotonic()
+                if left <= 0 or not self._alive:
+                    break
+                self._rx_cv.wait(left)
+        return out
+
+    # ---------- 하트비트 ----------
+    def kick(self):
+        """판단 루프 생존 신호 (liveness_s를 쓸 때 매 틱 호출)."""
+        self._kick_t = time.monotonic()
+
+    def start_hb(self, period_s=0.1, liveness_s=None):
+        self.stop_hb()
+        self.hb_period_s = float(period_s)
+        self._liveness_s = liveness_s
+        self._kick_t = time.monotonic()
+        self._hb_stop.clear()
+        self._hb_th = threading.Thread(target=self._hb_loop, daemon=True, name="comm-hb")
+        self._hb_th.start()
+
+    def stop_hb(self):
+        if self._hb_th is not None:
+            self._hb_stop.set()
+            self._hb_th.join(timeout=1.0)
+            self._hb_th = None
+
+    def _hb_loop(self):
+        period = self.hb_period_s
+        t_start = time.monotonic()
+        k = 0
+        last_tx = None
+        while not self._hb_stop.is_set():
+            now = time.monotonic()
+            if self._liveness_s is not None and now - self._kick_t > self._liveness_s:
+                self.hb_skipped += 1
+                last_tx = None  # 의도적 중단 구간은 지터에 넣지 않음
+            elif self.send_hb():
+                if last_tx is not None:
+                    gap_ms = (now - last_tx) * 1000.0
+                    self.hb_jitter.add(abs(gap_ms - period * 1000.0))
+                    self.hb_max_gap_ms = max(self.hb_max_gap_ms, gap_ms)
+                last_tx = now
+            else:
+                last_tx = None
+            # 다음 데드라인 (밀렸으면 지난 슬롯은 건너뜀 — 몰아서 보내지 않음)
+            k += 1
+            deadline = t_start + k * period
+            now = time.monotonic()
+            if now > deadline:
+                k = int((now - t_start) / period) + 1
+                deadline = t_start + k * period
+            self._hb_stop.wait(deadline - now)
+
+    def hb_stats(self):
+        j = self.hb_jitter
+        return {
+            "period_ms": round(self.hb_period_s * 1000.0, 3),
+            "sent": self.hb_seq,
+            "skipped": self.hb_skipped,
+            "jitter_ms": {"p50": round(j.quantile(0.5), 3), "p99": round(j.quantile(0.99), 3),
+                          "mean": round(j.mean(), 3), "max": round(j.max, 3)},
+            "max_gap_ms": round(self.hb_max_gap_ms, 3),
+            "tx_errors": self.tx_errors,
+            "rx_dropped": self.rx_dropped,
+            "failsafe_events": self.failsafe_events,
+        }
+
+    def hb_summary(self):
+        s = self.hb_stats()
+        j = s["jitter_ms"]
+        return (f"[COMM] hb period={s['period_ms']}ms sent={s['sent']} skipped={s['skipped']} "
+                f"jitter p50<={j['p50']}ms p99<={j['p99']}ms max={j['max']}ms "
+                f"max_gap={s['max_gap_ms']}ms tx_err={s['tx_errors']} failsafe={s['failsafe_events']}")
+
+    def close(self):
+        self.stop_hb()
+        self._alive = False
+        with self._rx_cv:
+            self._rx_cv.notify_all()
+        try:
+            self.ser.close()
+        except Exception:
+            pass
+        self._rx_th.join(timeout=1.0)
@@ -47,6 +47,19 @@ ANGLE_SMOOTH       = 2
 # 코너 감속 시작 거리(미터)
 CORNER_SLOWDOWN_DIST_M = 2.0  # 코너까지 2 m 이내면 감속
 
+# ====== 경로 힌트(내비 다음 회전) 감속 파라미터 ======
+# 진입 거리 = (v² - v_rec²)/2a + v·lead, [MIN, MAX]로 제한 (pi CornerParams.route_enter_m과 동일 식)
+ROUTE_REC_SPEED_MPS = 10.0 / 3.6
+ROUTE_DECEL_MPS2    = 1.5
+ROUTE_LEAD_S        = 1.5
+ROUTE_MIN_M         = 5.0
+ROUTE_MAX_M         = 40.0
+
+def route_enter_m(speed_mps):
+    v = max(speed_mps or 0.0, ROUTE_REC_SPEED_MPS)
+    d = (v * v - ROUTE_REC_SPEED_MPS ** 2) / (2.0 * ROUTE_DECEL_MPS2) + v * ROUTE_LEAD_S
+    return min(ROUTE_MAX_M, max(ROUTE_MIN_M, d))
+
 def detect_corners_front_180(dist_by_deg):
     """
     정면 180°(±90°) 범위 안에서만 코너 후보를 찾는다.
@@ -93,6 +106,7 @@ class DecisionCore:
       - 코너 검출: 정면 ±90°
       - v_kmh <= V_SAFE_RELEASE_KMH 이면 무조건 SAFE(브레이크 해제)
       - 코너 감속: 코너까지의 거리가 CORNER_SLOWDOWN_DIST_M 이내일 때만 MILD
+      - 경로 힌트: 내비 다음 회전까지 route_enter_m(v) 이내면 라이다 코너 없이도 MILD
     """
     def __init__(self):
         self.dist_queue = deque(maxlen=ROLL_WIN)
@@ -146,12 +160,14 @@ class DecisionCore:
         self._last_valid_time = self._now()
         return d_robust
 
-    def decide(self, dist_by_deg, speed_mps):
+    def decide(self, dist_by_deg, speed_mps, route_hint=None):
         """
         입력: dist_by_deg[0..359] = 각도별 최소거리(mm), speed_mps = m/s
+              route_hint = route_hint.RouteHintReceiver.latest() 결과 또는 None
         출력: (level, info)
           - level: "SAFE" | "MILD" | "STRONG" | "EMERGENCY"
-          - info : { d_min_m, ttc_s, corner:(ang,dist_mm)|None, emergency_ready:bool, state, level }
+          - info : { d_min_m, ttc_s, corner:(ang,dist_mm)|None, route_turn:(dir,dist_m)|None,
+                     emergency_ready:bool, state, level }
         """
         # --- 0) 속도 기반 즉시 해제 ---
         v_kmh = speed_mps * 3.6 if (speed_mps is not None) else None
@@ -163,6 +179,7 @@ class DecisionCore:
                 "d_min_m": self.update_front_min(dist_by_deg),
                 "ttc_s": None,      # v≈0이면 TTC 무의미
                 "corner": None,     # 정지 상태에선 코너 감속 불필요
+                "route_turn": None,
                 "emergency_ready": False,
                 "state": self.state,
                 "level": "SAFE",
@@ -179,6 +196,14 @@ class DecisionCore:
             if _mm_to_m(dist_c_mm) <= CORNER_SLOWDOWN_DIST_M:
                 corner_near = True
 
+        # --- 1-1) 경로 힌트: 라이다에 아직 안 보이는 회전 ---
+        route_turn = None
+        if (route_hint and route_hint.get("on_route") and route_hint.get("direction")
+                and route_hint.get("dist_m") is not None):
+            if route_hint["dist_m"] <= route_enter_m(speed_mps):
+                route_turn = (route_hint["direction"], route_hint["dist_m"])
+        corner_slow = corner_near or route_turn is not None
+
         # --- 2) d_min/TTC 계산 ---
         d_min = self.update_front_min(dist_by_deg)  # m
         ttc = None
@@ -194,19 +219,20 @@ class DecisionCore:
             elif ttc < TTC_WARNING:
                 level = "MILD";      self.state = "WARNING"
             else:
-                if corner_near:
+                if corner_slow:
                     level = "MILD";  self.state = "SLOWDOWN_CORNER"
                 else:
                     level = "SAFE";  self.state = "SAFE"
         else:
             # 거리/속도 불확실 → 보수적 감속
             level = "MILD"
-            self.state = "SLOWDOWN_CORNER" if corner_near else "WARNING"
+            self.state = "SLOWDOWN_CORNER" if corner_slow else "WARNING"
 
         info = {
             "d_min_m": d_min,
             "ttc_s": ttc,
             "corner": corner_info,          # (ang, dist_mm) 또는 None
+            "route_turn": route_turn,       # (방향 -1좌/+1우, 회전까지 m) 또는 None
             "emergency_ready": bool(corner_near),  # 코너 2m 이내면 비상 대기 (브레이크 미작동)
             "state": self.state,
             "level": level,
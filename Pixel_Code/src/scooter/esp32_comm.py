@@ -6,6 +6,8 @@
 
 import time, glob
 import serial
+import pi_path  # noqa: F401  (src_refactoring/pi 공용 모듈)
+from pi.control.device_supervisor import probe_all, probe_esp32
 
 LEVEL_TO_ANGLE = {
     "SAFE":       300,  # 브레이크 풀림
@@ -45,6 +47,10 @@ class ESP32BrakeSerial:
                 ordered.append(p)
         if not ordered:
             raise RuntimeError("ESP32 포트 자동 탐색 실패")
+        # 후보 전체를 동시에 PING → PONG 응답한 포트 선택
+        found = probe_all(ordered, {"esp32": lambda p: probe_esp32(p, self.baud)})
+        if "esp32" in found:
+            return found["esp32"]
         return ordered[0]
 
     def connect(self):
@@ -52,13 +58,22 @@ class ESP32BrakeSerial:
             return
         port = self._auto_pick_port()
         self.ser = serial.Serial(port, self.baud, timeout=self.timeout)
-        time.sleep(1.0)  # 보드 리셋 대기
+        self._wait_ready(1.0)  # 보드 리셋 대기 (READY 배너가 오면 바로 진행)
         self.ser.reset_input_buffer()
         self.port = port
         # 시작 시 현재 맵 요청(선택)
         self._write_line("GET MAP")
         print(f"[ESP32] connected on {self.port}")
 
+    def _wait_ready(self, max_wait: float):
+        """부팅 배너(READY ...)가 올 때까지, 최대 max_wait초 대기."""
+        t0 = time.time()
+        while time.time() - t0 < max_wait:
+            line = self.ser.readline().decode(errors="ignore").strip()
+            if line.upper().startswith("READY"):
+                return True
+        return False
+
     def _write_line(self, line: str):
         if not self.ser or not self.ser.is_open:
             return
@@ -93,6 +108,23 @@ class ESP32BrakeSerial:
         except Exception:
             return ""
 
+    def read_pending(self, max_lines=32):
+        """
+        이미 도착한 줄을 모두 꺼냄 → [(수신 시각 monotonic, 줄), ...] (없으면 빈 리스트, 대기 없음)
+        poll_read()는 틱마다 한 줄만 읽어 V: 줄이 버퍼에 쌓이면 속도가 점점 늦어짐
+        """
+        out = []
+        if not self.ser or not self.ser.is_open:
+            return out
+        try:
+            while len(out) < max_lines and self.ser.in_waiting:
+                line = self.ser.readline().decode(errors="ignore").strip()
+                if line:
+                    out.append((time.monotonic(), line))
+        except Exception:
+            pass
+        return out
+
     def close(self):
         try:
             if self.ser:
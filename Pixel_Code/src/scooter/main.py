@@ -1,8 +1,17 @@
 # -*- coding: utf-8 -*-
-import os, sys, time
+import os, sys, time, signal, threading
+from array import array
 from pyrplidar import PyRPlidar
 from decision import DecisionCore
 from esp32_comm import ESP32BrakeSerial
+import pi_path  # noqa: F401  (src_refactoring/pi 공용 모듈)
+from pi.control.device_supervisor import CANDIDATE_GLOBS, list_candidates, probe_all, probe_rplidar
+from pi.scheduler import LoopScheduler
+from pi.trace import Tracer
+from pi.telemetry import TelemetryPublisher, ConsoleSummary
+from pi.route_hint import RouteHintReceiver
+from pi.fusion import SensorFusion, frame_time
+from pi.sensor.frame import LidarFrame
 
 # ========= 전역 설정 =========
 PRIMARY_PORT = "/dev/ttyUSB0"     # 네 환경 유지
@@ -12,6 +21,11 @@ FALLBACK_PORTS = ["/dev/ttyUSB0", "/dev/ttyUSB1", "/dev/ttyAMA0"]
 
 PWM = 500            # 라이다 모터 PWM
 LOOP_HZ = 20         # 판단 주기(초당 20회)
+OVERRUN_POLICY = "skip"  # 주기 초과 시: skip | catchup | degrade
+TELEMETRY_PORT = 9870    # UDP 상태 패킷 (매 틱, 뷰어: pi.tools.telemetry_view)
+CONSOLE_S = 1.0          # 콘솔 상태 요약 주기(초, 0이면 끔)
+ROUTE_HINT_PORT = 9871   # 내비 경로 힌트 수신 UDP (Navigation_Pilot/Cap.py, 0이면 끔)
+SPEED_STALE_S = 0.5      # 프레임 시각 기준 V: 속도가 이보다 오래되면 마지막 값 유지(보간 안 함)
 
 # ===== 우선순위 정의 =====
 LEVEL_PRIO = {"EMERGENCY": 3, "STRONG": 2, "MILD": 1, "SAFE": 0}
@@ -29,8 +43,12 @@ class LevelHysteresis:
     """
     def __init__(self, esp,
                  min_hold_ms=500, deesc_stable_ms=800, actuation_ms=300,
-                 emergency_clear_v_kmh=0.5, emergency_clear_stable_ms=1000):
+                 emergency_clear_v_kmh=0.5, emergency_clear_stable_ms=1000,
+                 tracer=None):
         self.esp = esp
+        self.tracer = tracer
+        self.trace_id = None        # 현재 update()를 일으킨 라이다 프레임 trace
+        self.last_sent_trace = None  # 마지막 명령을 보낸 trace (OK 응답 대기)
         self.min_hold_ms = min_hold_ms
         self.deesc_stable_ms = deesc_stable_ms
         self.actuation_ms = actuation_ms
@@ -52,6 +70,9 @@ class LevelHysteresis:
 
     def _send(self, level: str, now_ms: int):
         try:
+            if self.tracer is not None:
+                self.tracer.mark(self.trace_id, "cmd")
+                self.last_sent_trace = self.trace_id
             self.esp.send_level(level)
             self.last_sent_level = level
             self.last_sent_ts = now_ms
@@ -87,8 +108,9 @@ class LevelHysteresis:
             self._emer_clear_since = 0
         return False
 
-    def update(self, new_level: str, v_kmh: float):
+    def update(self, new_level: str, v_kmh: float, trace_id=None):
         now = self._now_ms()
+        self.trace_id = trace_id
 
         # 최초 전송
         if self.last_sent_level is None:
@@ -150,49 +172,36 @@ class LevelHysteresis:
 
 # ========= 유틸 =========
 def try_connect_lidar(lidar: PyRPlidar) -> bool:
-    # 1) 최우선 포트
-    try:
-        lidar.connect(port=PRIMARY_PORT, baudrate=PRIMARY_BAUD, timeout=PRIMARY_TIMEOUT)
-        print(f"[LIDAR] 연결 성공: {PRIMARY_PORT}")
-        return True
-    except Exception as e:
-        print(f"[LIDAR] 1차 포트 실패({PRIMARY_PORT}): {e}")
-
-    # 2) 폴백
-    for p in FALLBACK_PORTS:
+    # 1) 후보 포트 전체를 동시에 GET_INFO 프로빙 → 응답한 포트 먼저
+    ports = list_candidates([PRIMARY_PORT] + FALLBACK_PORTS + CANDIDATE_GLOBS)
+    found = probe_all(ports, {"lidar": lambda p: probe_rplidar(p, PRIMARY_BAUD)})
+    order = ([found["lidar"]] if "lidar" in found else []) + [PRIMARY_PORT] + FALLBACK_PORTS
+
+    # 2) 프로빙 결과 → 최우선 포트 → 폴백 순으로 연결
+    tried = set()
+    for p in order:
+        if p in tried:
+            continue
+        tried.add(p)
         try:
             lidar.connect(port=p, baudrate=PRIMARY_BAUD, timeout=PRIMARY_TIMEOUT)
-            print(f"[LIDAR] 폴백 연결 성공: {p}")
+            print(f"[LIDAR] 연결 성공: {p}")
             return True
         except Exception as e:
-            print(f"[LIDAR] 폴백 실패({p}): {e}")
+            print(f"[LIDAR] 연결 실패({p}): {e}")
     return False
 
 
-def main():
-    # -------- LIDAR 준비 --------
-    lidar = PyRPlidar()
-    if not try_connect_lidar(lidar):
-        print("[오류] 라이다 포트 연결 실패. 설정은 바꾸지 않았고, 폴백도 모두 실패했습니다.")
-        sys.exit(1)
-
-    lidar.set_motor_pwm(PWM)
-    time.sleep(2.0)
-    
-    
-
-    # 네 구조 유지: force_scan 사용
-    scan_gen = lidar.force_scan()()
-
-    # -------- Decision Core & ESP32 & Logger --------
-    core = DecisionCore()
+def boot_esp32(box: dict, ready: "threading.Event"):
+    """ESP32 연결 + 서보 테스트 시퀀스 (라이다 스핀업과 병렬로 실행)."""
+    t0 = time.time()
     esp = ESP32BrakeSerial(port="/dev/ttyACM0", timeout=0.2)
     try:
         esp.connect()
     except Exception as e:
         print(f"[경고] ESP32 연결 실패: {e}")
         esp = None
-    
+
     # ★ 시작 시 서보 테스트 시퀀스 (300 → 100 → 300)
     if esp:
         try:
@@ -206,34 +215,86 @@ def main():
             print("[INIT] Servo movement test completed.")
         except Exception as e:
             print(f"[INIT] Servo test failed: {e}")
-    
-    # 히스테리시스(+EMERGENCY 래치)
-    hys = LevelHysteresis(
-        esp,
-        min_hold_ms=500,
-        deesc_stable_ms=800,
-        actuation_ms=300,
-        emergency_clear_v_kmh=0.5,
-        emergency_clear_stable_ms=1000
-    ) if esp else None
-
-    # 각도별 최신 최소 거리(mm) 테이블
-    dist_by_deg = [None] * 360
+
+    box["esp"] = esp
+    box["esp32_ms"] = (time.time() - t0) * 1000.0
+    ready.set()
+
+
+def main():
+    t_boot = time.time()
+
+    # -------- ESP32 (백그라운드) --------
+    # 보드 리셋/서보 테스트(~3s)는 라이다 스핀업과 겹쳐서 진행.
+    # 끝나기 전까지는 브레이크 명령 없이 판단만 수행 (테스트 시퀀스와 명령이 섞이지 않도록)
+    esp_box = {}
+    esp_ready = threading.Event()
+    threading.Thread(target=boot_esp32, args=(esp_box, esp_ready), daemon=True).start()
+
+    # -------- LIDAR 준비 --------
+    lidar = PyRPlidar()
+    if not try_connect_lidar(lidar):
+        print("[오류] 라이다 포트 연결 실패. 설정은 바꾸지 않았고, 폴백도 모두 실패했습니다.")
+        sys.exit(1)
+
+    lidar.set_motor_pwm(PWM)
+    time.sleep(2.0)
+
+    # 네 구조 유지: force_scan 사용
+    scan_gen = lidar.force_scan()()
+    lidar_ms = (time.time() - t_boot) * 1000.0
+
+    # -------- Decision Core --------
+    core = DecisionCore()
+    esp = None
+    hys = None
+
+    # 프레임 번호 (각도별 최소거리 테이블은 프레임마다 LidarFrame.bins()로)
+    seq = 0
 
     print("[RUN] 판단 루프 시작")
-    interval = 1.0 / LOOP_HZ
-    next_t = time.time()
+    sched = LoopScheduler(1.0 / LOOP_HZ, policy=OVERRUN_POLICY)
     last_speed_kmh = 0.0
 
+    # V: 줄(수신 시각) → 라이다 프레임 시각으로 속도 보간
+    fusion = SensorFusion()
+    fusion.channel("speed", max_stale_s=SPEED_STALE_S, clamp_min=0.0)
+
+    telem = TelemetryPublisher(port=TELEMETRY_PORT, rate_hz=LOOP_HZ, source="scooter")
+    console = ConsoleSummary(CONSOLE_S)
+
+    # 내비 경로 힌트 (수신 스레드가 최신 값만 보관)
+    nav = None
+    if ROUTE_HINT_PORT:
+        try:
+            nav = RouteHintReceiver(port=ROUTE_HINT_PORT).start()
+        except OSError as e:
+            print("[경고] 경로 힌트 수신 비활성:", e)
+
+    # 종단 지연 추적 (첫 포인트 → 판단 → 명령 → OK). kill -USR1 <pid> 로 즉시 덤프
+    tracer = Tracer()
+    trace_path = f"trace_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+    def dump_trace(*_):
+        tracer.dump(trace_path)
+        print(tracer.format_report())
+        print("[TRACE] dumped:", trace_path)
     try:
-        while True:
-            # ✅ 프레임 시작 시 초기화: 이번 프레임의 최소값만 계산
-            dist_by_deg = [None] * 360
+        signal.signal(signal.SIGUSR1, dump_trace)
+    except (AttributeError, ValueError):
+        pass
 
-            # ---- 라이다 포인트 소비하여 테이블 업데이트 ----
+    try:
+        while True:
+            # ---- 라이다 포인트 소비 → 이번 프레임의 유효 포인트만 모음 ----
+            angs, dists, quals = [], [], []
+            new_rev = False
             consumed = 0
+            t_first = None
             while consumed < 800:  # 프레임 커버리지 넓게(원하면 500~1500로 조절)
                 m = next(scan_gen)  # PyRPlidarMeasurement
+                if t_first is None:
+                    t_first = time.monotonic()
                 dmm = getattr(m, "distance", 0.0)
                 ang = getattr(m, "angle", 0.0)
 
@@ -247,48 +308,84 @@ def main():
                     consumed += 1
                     continue
 
-                a = int(ang) % 360
-                prev = dist_by_deg[a]
-                if prev is None or dmm < prev:
-                    dist_by_deg[a] = dmm
+                angs.append(ang)
+                dists.append(dmm)
+                quals.append(getattr(m, "quality", 0) or 0)
+                new_rev = new_rev or bool(getattr(m, "start_flag", False))
                 consumed += 1
-
-            # ---- ESP32 속도 수신 ----
-            v_kmh = last_speed_kmh
+            t_last = time.monotonic()
+            seq += 1
+            frame = LidarFrame(seq, t_first, t_last, array("f", angs), array("f", dists),
+                               array("B", quals), new_rev)
+            dist_by_deg = frame.bins()   # 각도(정수)별 최소거리(mm), 읽기 전용 360칸
+            tid = tracer.begin(t_first)
+
+            # ---- ESP32 합류 (백그라운드 기동 완료 시) ----
+            if esp is None and esp_ready.is_set() and esp_box.get("esp"):
+                esp = esp_box["esp"]
+                # 히스테리시스(+EMERGENCY 래치)
+                hys = LevelHysteresis(
+                    esp,
+                    min_hold_ms=500,
+                    deesc_stable_ms=800,
+                    actuation_ms=300,
+                    emergency_clear_v_kmh=0.5,
+                    emergency_clear_stable_ms=1000,
+                    tracer=tracer
+                )
+
+            # ---- ESP32 속도 수신 (쌓인 줄 모두 소비, V:는 수신 시각과 함께 기록) ----
             if esp:
-                line = esp.poll_read()
-                if line and line.startswith("V:"):
-                    try:
-                        v_kmh = float(line.split(":", 1)[1])
-                        last_speed_kmh = v_kmh
-                    except ValueError:
-                        pass
+                for t_rx, line in esp.read_pending():
+                    if line.startswith("V:"):
+                        try:
+                            last_speed_kmh = float(line.split(":", 1)[1])
+                            fusion.add("speed", t_rx, last_speed_kmh)
+                        except ValueError:
+                            pass
+                    elif line.startswith("OK") and hys and hys.last_sent_trace is not None:
+                        tracer.mark(hys.last_sent_trace, "ack", t=t_rx)
+                        hys.last_sent_trace = None
+            # 프레임이 찍힌 시각(첫~마지막 포인트 중간)의 속도, 오래됐으면 마지막 수신값
+            v_kmh, _ = fusion.at("speed", frame_time(t_first, t_last))
+            if v_kmh is None:
+                v_kmh = last_speed_kmh
             v_mps = v_kmh / 3.6
 
             # ---- 의사결정 ----
-            level, info = core.decide(dist_by_deg, v_mps)
+            level, info = core.decide(dist_by_deg, v_mps, route_hint=nav.latest(v_mps) if nav else None)
+            tracer.mark(tid, "decision")
+            tracer.annotate(tid, state=info.get("state"),
+                            d_min_mm=None if info["d_min_m"] is None else info["d_min_m"] * 1000.0)
+
+            if t_boot is not None:
+                esp_ms = esp_box.get("esp32_ms")
+                print(f"[BOOT] lidar={lidar_ms:.0f}ms "
+                      f"esp32={'running' if esp_ms is None else f'{esp_ms:.0f}ms'} "
+                      f"first_decision={(time.time() - t_boot) * 1000.0:.0f}ms")
+                t_boot = None
 
             # ---- 브레이크 명령(히스테리시스/래치) ----
             if esp and hys:
-                hys.update(level, v_kmh)
-
-            # ---- 코너 검출 로그 ----
-            if info.get("corner"):
-                ang_c, dist_c = info["corner"]
-                print(f"코너 검출 (거리: {int(dist_c)}mm, 각도: {int(ang_c)}°) → 감속 준비")
-
-            # ---- 상태 요약 ----
-            dshow = f"{info['d_min_m']:.2f}m" if info['d_min_m'] is not None else "None"
-            tshow = f"{info['ttc_s']:.2f}s" if info['ttc_s'] is not None else "None"
-            print(f"[STATE] v={v_kmh:.1f}km/h d_min={dshow} TTC={tshow} level={info['level']} state={info['state']}")
-
-            # ---- 루프 주기 유지 ----
-            next_t += interval
-            sleep = next_t - time.time()
-            if sleep > 0:
-                time.sleep(sleep)
-            else:
-                next_t = time.time()
+                hys.update(level, v_kmh, trace_id=tid)
+
+            # ---- 상태 송신 (매 틱 UDP) + 콘솔 요약 (CONSOLE_S마다) ----
+            d_mm = None if info["d_min_m"] is None else info["d_min_m"] * 1000.0
+            telem.publish(time.time(), info["state"], d_mm, v_mps, info["ttc_s"],
+                          level=info["level"], corner=bool(info.get("corner") or info.get("route_turn")))
+            if console.due():
+                if info.get("corner"):
+                    ang_c, dist_c = info["corner"]
+                    print(f"코너 검출 (거리: {int(dist_c)}mm, 각도: {int(ang_c)}°) → 감속 준비")
+                if info.get("route_turn"):
+                    dir_r, dist_r = info["route_turn"]
+                    print(f"경로 {'좌' if dir_r < 0 else '우'}회전 {dist_r:.1f}m 전 → 감속")
+                dshow = f"{info['d_min_m']:.2f}m" if info['d_min_m'] is not None else "None"
+                tshow = f"{info['ttc_s']:.2f}s" if info['ttc_s'] is not None else "None"
+                print(f"[STATE] v={v_kmh:.1f}km/h d_min={dshow} TTC={tshow} level={info['level']} state={info['state']}")
+
+            # ---- 루프 주기 유지 (절대 데드라인, 오버런 통계) ----
+            sched.wait()
 
     except KeyboardInterrupt:
         print("\n[종료] 사용자 인터럽트")
@@ -301,10 +398,23 @@ def main():
         except Exception:
             pass
         try:
+            esp = esp or esp_box.get("esp")
             if esp:
                 esp.close()
         except Exception:
             pass
+        telem.close()
+        if nav:
+            nav.stop()
+        print(sched.summary())
+        sp = fusion.report().get("speed")
+        if sp:
+            print(f"[FUSION] speed samples={sp['samples']} stale p50<={sp['stale_ms']['p50']}ms "
+                  f"p99<={sp['stale_ms']['p99']}ms misses={sp['misses']}")
+        try:
+            dump_trace()
+        except Exception:
+            pass
         print("[SAFE EXIT]")
 
 
@@ -0,0 +1,14 @@
+# pi_path.py
+# -*- coding: utf-8 -*-
+# src_refactoring/pi 공용 모듈을 scooter 스크립트에서 쓰기 위한 경로 설정
+#   import pi_path                    # 다른 import보다 먼저
+#   from pi.scheduler import LoopScheduler
+# 뒤에 붙임(append) → 같은 이름이면 scooter 쪽 모듈(decision, camera 등)이 우선
+import os
+import sys
+
+SRC_REFACTORING = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src_refactoring"))
+
+if SRC_REFACTORING not in sys.path:
+    sys.path.append(SRC_REFACTORING)
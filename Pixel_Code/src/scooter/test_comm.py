@@ -1,8 +1,15 @@
 # test_comm.py
+#   python test_comm.py                 # 실제 보드 (/dev/ttyACM0)
+#   python test_comm.py /dev/pts/N      # 펌웨어 대역: python -m pi.tools.fake_esp32 --dialect hb
+import os
+import sys
 import time
+
+# Comm 본체는 2025_2/python_src/comm.py 하나만 둠 (사본 없이 경로로 import)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "2025_2", "python_src"))
 from comm import Comm
 
-c = Comm("/dev/ttyACM0", 115200)
+c = Comm(sys.argv[1] if len(sys.argv) > 1 else "/dev/ttyACM0", 115200)
 
 # 1) 부팅 메시지 수집
 print("=== Boot lines ===")
@@ -27,4 +34,11 @@ print("=== Stop HB for 1.2s to trigger fail-safe ===")
 time.sleep(1.2)
 print("\n".join(c.poll_events(0.5)))
 
+# 4) HB 타이머 스레드 (판단 루프가 멈춰도 주기 유지) → 지터 확인
+print("=== HB thread 100ms for 2s ===")
+c.start_hb(0.1)
+time.sleep(2.0)
+print("\n".join(c.poll_events(0.2)))
+print(c.hb_summary())
+
 c.close()
\ No newline at end of file
@@ -1,127 +1,452 @@
 # -*- coding: utf-8 -*-
 import os
-import csv
 import time
 import yaml
+import json
+import signal
 import argparse
+import threading
+from dataclasses import asdict
 from datetime import datetime
 
-from pi.decision import DecisionFSM, FsmParams, CornerDetector, CornerParams
-from pi.sensor.adapter_rplidar import RPLidarAdapter
-from pi.sensor.hall_thread import HallThread
-from pi.control.esp32_link import open_from_config
+from pi.config import load_config, ConfigError, ConfigWatcher
+from pi.decision import DecisionFSM, CornerDetector, DecisionStep, hint_cols
+from pi.sensor import registry as sensors
+from pi.control.device_supervisor import DeviceSupervisor, probe_esp32, probe_rplidar
+from pi.startup import Startup
+from pi.scheduler import LoopScheduler, POLICIES
+from pi.datalog.binlog import BinLogger
+from pi.metrics import Metrics
+from pi.fusion import SensorFusion, frame_time
+from pi.profile import ProfileManager
+from pi.trace import Tracer
+from pi.telemetry import TelemetryPublisher, ConsoleSummary
+from pi.route_hint import RouteHintReceiver
 
 
 # -------- 유틸 --------
-def load_cfg(path="pi/config.yaml"):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
-
 def fmt_mm(v):
     return f"{v:.0f}mm" if isinstance(v, (int, float)) else "NA"
 
 def fmt_s(v):
     return f"{v:.2f}s" if isinstance(v, (int, float)) else "NA"
 
+def parse_kv(items):
+    """["key=value", ...] → dict (값은 YAML 스칼라로: 10 → int, false → bool)"""
+    out = {}
+    for it in items or []:
+        k, sep, v = it.partition("=")
+        if not sep:
+            raise ValueError(f"expected key=value: {it}")
+        out[k.strip()] = yaml.safe_load(v)
+    return out
+
 
 # -------- 엔트리 --------
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", default="pi/config.yaml")
-    ap.add_argument("--period", type=float, default=None, help="메인 루프 주기(초)")
+    ap.add_argument("--period", type=float, default=None, help="메인 루프 주기(초, 주면 적응 프로파일도 주기는 고정)")
+    ap.add_argument("--no-profile", action="store_true",
+                    help="속도/TTC 적응 프로파일 끄기 (config profile 섹션 무시, 고정 주기/PWM)")
     ap.add_argument("--use-hall", action="store_true", help="ESP32 Hall 속도 스레드 사용")
     ap.add_argument("--no-servo", action="store_true", help="ESP32 서보 제어 비활성화")  # ★ 수정
+    ap.add_argument("--overrun-policy", choices=POLICIES, default=None,
+                    help="주기 초과 시 정책 (skip|catchup|degrade)")
+    ap.add_argument("--runtime", choices=("poll", "async"), default=None,
+                    help="poll: 고정 주기 루프 / async: 새 프레임 즉시 판단 (asyncio)")
+    ap.add_argument("--sensor", choices=sensors.names(), default=None,
+                    help="센서 백엔드 (기본: config sensor.backend, 없으면 rplidar)")
+    ap.add_argument("--sensor-arg", action="append", default=[], metavar="KEY=VALUE",
+                    help="백엔드 인자 덮어쓰기 (예: --sensor replay --sensor-arg csv_path=run.csv)")
+    ap.add_argument("--lidar-proc", action="store_true",
+                    help="라이다 수집/프레임 처리를 별도 프로세스로 (공유메모리 링버퍼, --sensor rplidar-proc와 같음)")
+    ap.add_argument("--record-raw", default=None, metavar="PATH.npz",
+                    help="라이다 원시 프레임 기록 (종료 시 저장, --sensor raw-replay로 재생)")
+    ap.add_argument("--console-s", type=float, default=None,
+                    help="콘솔 상태 요약 주기(초, 0이면 끔). 매 틱 상태는 UDP 텔레메트리로")
+    ap.add_argument("--dump-on-exit", action="store_true",
+                    help="종료 시 <로그>.trace.jsonl / .sched.json 저장 (config app.dump_on_exit, 평소엔 kill -USR1)")
     args = ap.parse_args()
 
-    cfg = load_cfg(args.config)
+    # 한 번 파싱/검증한 Config를 참조로 공유 (Esp32Link, HallThread도 다시 읽지 않음)
+    try:
+        cfg = load_config(args.config)
+    except (ConfigError, OSError) as e:
+        print("[APP ERR] config:", e)
+        return
 
-    # ---- LIDAR 어댑터 ----
+    A = cfg.get("app", {}) or {}
     L = cfg.get("lidar", {})
-    sensor = RPLidarAdapter(
-        port=L.get("port", "/dev/ttyUSB0"),
-        baud=L.get("baud", 460800),
-        pwm=L.get("pwm", 650),
-        max_dist_mm=L.get("max_dist_mm", 4000),
-    )
+    C = cfg.get("comm", {}) or {}
+    S = cfg.get("sensor", {}) or {}
+
+    backend = args.sensor or S.get("backend", "rplidar")
+    if backend == "rplidar" and (args.lidar_proc or L.get("process", False)):
+        backend = "rplidar-proc"
+    runtime = args.runtime or A.get("runtime", "poll")
+
+    # ---- 장치 탐색 (후보 포트 동시 프로빙 + 포트 캐시) ----
+    sup = DeviceSupervisor(cache_path=os.path.join(A.get("log_dir", "pi/logs"), "ports.json"))
+    lidar_baud = L.get("baud", 460800)
+    if sensors.needs_port(backend):
+        sup.register("lidar", lambda p: probe_rplidar(p, baud=lidar_baud), hint=L.get("port"))
+    if not args.no_servo:
+        from pi.control.esp32_link import open_from_config  # pyserial은 ESP32를 쓸 때만
+        sup.register(
+            "esp32",
+            lambda p: probe_esp32(p, baud=int(C.get("baud", 115200))),
+            connect=lambda p: open_from_config(cfg, port=p),
+            close=lambda h: h.close(),
+            hint=C.get("port"),
+        )
+
+    def _resolve_lidar_port():
+        return sup.discover(["lidar"]).get("lidar")
 
     # ---- FSM & Corner ----
     FC = cfg.get("fsm", {}) or {}
-    fsm = DecisionFSM(FsmParams(**FC))
-    corner = CornerDetector(CornerParams())
+    fsm = DecisionFSM(cfg.fsm)
+    corner = CornerDetector(cfg.corner)
+    step = DecisionStep(fsm, corner)   # tools.replay도 같은 판단 스텝으로 재생
+    flt = asdict(cfg.lidar_filter)   # near_cutoff/max_dist/gate/quantile/... (실행 중 교체 가능)
 
-    # ---- Hall 스레드 ----
-    hall = None
-    if args.use_hall:
-        hall = HallThread(cfg_path=args.config, poll_ms=50, stale_s=0.5)
+    # ---- 적응 프로파일 (속도/TTC → 루프 주기, 라이다 PWM/프레임, Hall 폴링) ----
+    profiles = ProfileManager(cfg.profile) if cfg.profile.enabled and not args.no_profile else None
+
+    # ---- 기동 단계 정의 ----
+    def _boot_lidar():
+        if backend == "rplidar-proc":
+            # 자식 프로세스로는 클로저(port_resolver)를 못 넘김 → 자식이 직접 후보 포트 재탐색
+            kw = dict(port=sup.port("lidar") or L.get("port", "/dev/ttyUSB0"),
+                      baud=lidar_baud,
+                      pwm=L.get("pwm", 650),
+                      spinup_s=L.get("spinup_s", 2.0),
+                      slots=L.get("ring_slots", 8),
+                      **flt)
+        elif backend == "rplidar":
+            kw = dict(port=sup.port("lidar") or L.get("port", "/dev/ttyUSB0"),
+                      baud=lidar_baud,
+                      pwm=L.get("pwm", 650),
+                      port_resolver=_resolve_lidar_port,
+                      spinup_s=L.get("spinup_s", 2.0),
+                      **flt)
+        else:
+            # sim / replay / raw-replay: config sensor.<이름> + --sensor-arg
+            kw = dict(S.get(backend.replace("-", "_"), {}) or {})
+            if backend == "raw-replay":
+                kw = dict(flt, **kw)
+            # 폴링 루프는 LoopScheduler가 주기를 맞춤 → 소스까지 자면 틱마다 두 번 대기(오버런으로 집계)
+            # asyncio 런타임은 소스가 프레임 주기를 정함 → 설정값 그대로 (sim은 기본 실시간)
+            if runtime == "poll":
+                kw["realtime"] = False
+            elif backend == "sim":
+                kw.setdefault("realtime", True)
+        kw.update(parse_kv(args.sensor_arg))
+        return sensors.create(backend, **kw)
+
+    def _boot_esp32():
+        # 연결 + PING 셀프테스트. 실패해도 supervisor가 백그라운드 재연결
+        try:
+            if not sup.connect(["esp32"]):
+                raise RuntimeError("esp32 not found → retry in background")
+            link = sup.get("esp32")
+            print("[SERVO] connected, self-test:", link.ping() or "no reply")
+            return link
+        finally:
+            sup.start()
+
+    def _boot_hall():
+        from pi.sensor.hall_thread import HallThread
+        poll_ms = profiles.current.hall_poll_ms if profiles else 50
+        hall = HallThread(cfg=cfg, port=sup.port("esp32"), poll_ms=poll_ms, stale_s=0.5, fusion=fusion)
         hall.start()
-        print("[HALL] thread started (poll=50ms, stale=0.5s)")
+        print(f"[HALL] thread started (poll={poll_ms}ms, stale=0.5s)")
+        return hall
+
+    def _boot_logger():
+        return BinLogger(
+            log_dir=A.get("log_dir", "pi/logs"),
+            prefix=A.get("session_prefix", "run"),
+            max_bytes=int(A.get("log_max_mb", 16)) * 1024 * 1024,
+            meta={"period": A.get("period", 0.1), "fsm": FC},
+        )
+
+    # ---- 센서 시각 정렬: Hall 속도를 라이다 프레임이 찍힌 시각으로 보간 ----
+    fusion = SensorFusion()
+    fusion.channel("speed", max_stale_s=A.get("speed_stale_s", 0.5),
+                   max_extrap_s=A.get("speed_extrap_s", 0.2), clamp_min=0.0)
 
-    # ---- Servo 연결 ----
-    link = None
+    # ---- 병렬 기동: 포트 탐색 → (라이다 스핀업 | ESP32 | Hall) + 로거 ----
+    # 최소 안전 세트(라이다+로거)만 준비되면 루프 시작, ESP32/Hall은 준비되는 대로 합류
+    boot = Startup()
+    boot.add("ports", sup.discover)
+    boot.add("lidar", _boot_lidar, deps=["ports"])
+    boot.add("logger", _boot_logger)
     if not args.no_servo:
-        try:
-            link = open_from_config(args.config)
-            print("[SERVO] connected")
-        except Exception as e:
-            print("[WARN] servo link failed:", e)
+        boot.add("esp32", _boot_esp32, deps=["ports"], required=False)
+    if args.use_hall:
+        boot.add("hall", _boot_hall, deps=["ports"], required=False)
+    boot.start()
 
-    # ---- 주기/로그 ----
-    A = cfg.get("app", {}) or {}
+    if not boot.wait_required():
+        boot.report()
+        print("[APP ERR] startup failed:", boot.error("lidar") or boot.error("logger"))
+        if boot.get("logger"):
+            boot.get("logger").close()
+        sup.stop()
+        return
+
+    sensor = boot.get("lidar")
+    logger = boot.get("logger")
     period = args.period if args.period is not None else A.get("period", 0.1)
-    log_dir = A.get("log_dir", "pi/logs")
-    os.makedirs(log_dir, exist_ok=True)
-    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_path = os.path.join(log_dir, f"{A.get('session_prefix','run')}_{stamp}.csv")
-    f = open(csv_path, "w", newline="")
-    w = csv.writer(f)
-    w.writerow(["ts", "state", "d_min_mm", "v_mps", "ttc_s"])
+    if profiles and args.period is None:
+        period = profiles.current.period_s
+    sched = LoopScheduler(period, policy=args.overrun_policy or A.get("overrun_policy", "skip"))
+
+    def apply_profile(prof):
+        """프로파일 값 반영 (판단 루프에서만 호출). 센서/Hall은 다음 read/폴링부터"""
+        if args.period is None:
+            sched.set_period(prof.period_s)   # async 런타임은 프레임 도착 기준이라 주기 없음
+        sensor.apply_profile(prof)
+        hall = boot.get("hall")
+        if hall:
+            hall.set_poll_ms(prof.hall_poll_ms)
 
-    print(f"[RUN] period={period}s  log={csv_path}")
+    if profiles:
+        apply_profile(profiles.current)
 
+    # ---- 계측 (스테이지 타이머 + 카운터, 루프백 HTTP + 주기 요약) ----
+    m = Metrics(stages=("sensor", "triplet", "decide", "profile", "telemetry", "servo", "log"),
+                summary_s=A.get("metrics_summary_s", 5.0))
+    m.gauge("frames", lambda: sensor.frames)
+    m.gauge("dropped_points", lambda: sensor.dropped_points)
+    m.gauge("serial_retries", lambda: sum(
+        getattr(x, "retries", 0) for x in (sup.get("esp32"), getattr(boot.get("hall"), "link", None)) if x))
+    m.gauge("log_dropped", lambda: logger.dropped)
+    m.gauge("overruns", lambda: sched.overruns)
+    if profiles:
+        m.gauge("profile_switches", lambda: profiles.switches)
+        m.route("/profile", profiles.stats)
+    # ---- 종단 지연 추적 (프레임 → 판단 → 서보 명령 → OK → STAT) ----
+    tracer = Tracer(size=int(A.get("trace_ring", 2048)))
+    m.route("/trace", tracer.report)
+    m.route("/fusion", fusion.report)
+    m.gauge("speed_stale_ms", lambda: None if fusion.last_stale.get("speed") is None
+            else round(fusion.last_stale["speed"] * 1000.0, 2))
+
+    def _dump_trace():
+        path = tracer.dump(logger.path + ".trace.jsonl")
+        print(tracer.format_report())
+        print("[TRACE] dumped:", path)
+
+    # kill -USR1 <pid> → 핸들러는 요청만 표시, 덤프(파일 I/O)는 판단 틱이 끝난 뒤 루프에서
+    # (핸들러는 메인 스레드의 임의 지점에서 실행됨 → 링에 기록하는 도중일 수 있음)
+    dump_req = threading.Event()
     try:
-        last_pwm = None
-        last_flush = time.time()
-        while True:
-            d_min_mm = sensor.read()
-            v_mps = hall.get_speed() if hall else fsm.p.v_est_mps
-            out = fsm.update(d_min_mm, v_mps=v_mps)
-
-            # 코너 감지 (추가)
-            d_front, d_left, d_right, _ = sensor.read_triplet()
-            corner_info = corner.update(d_front, d_left, d_right, v_mps)
-            if corner_info["active"]:
-                out["state"] = "CORNER"
-                out["target_deg"] = fsm.p.warn_deg  # 필요 시 별도 값 설정 가능
-
-            # 상태 기반 PWM 결정
-            pwm_map = {
-                "SAFE": 2500,
-                "WARN": 1600,
-                "FAILSAFE": 2500,
-                "CORNER": 2000,
-                "BRAKE": 1500,
-            }
-            pwm_us = pwm_map.get(out["state"], 2500)
-
-            # 출력
+        signal.signal(signal.SIGUSR1, lambda *_: dump_req.set())
+    except (AttributeError, ValueError):
+        pass
+    dump_on_exit = args.dump_on_exit or A.get("dump_on_exit", False)
+
+    if A.get("metrics_port", 8765):
+        try:
+            host, port = m.serve(int(A.get("metrics_port", 8765)))
+            print(f"[METRICS] http://{host}:{port}/metrics")
+        except OSError as e:
+            print("[WARN] metrics endpoint disabled:", e)
+
+    # ---- 텔레메트리 (UDP, 솎아냄) + 콘솔 요약 (속도 제한) ----
+    telem = TelemetryPublisher(port=int(A.get("telemetry_port", 9870)),
+                               rate_hz=A.get("telemetry_hz", 20))
+    m.gauge("telemetry_sent", lambda: telem.sent)
+    console = ConsoleSummary(args.console_s if args.console_s is not None else A.get("console_s", 1.0))
+
+    # ---- 내비 경로 힌트 (Navigation_Pilot 프로세스 → 로컬 UDP, 수신 스레드) ----
+    nav = None
+    if A.get("route_hint_port", 9871):
+        try:
+            nav = RouteHintReceiver(port=int(A.get("route_hint_port", 9871)),
+                                    stale_s=A.get("route_hint_stale_s", 2.0)).start()
+            m.gauge("route_hints", lambda: nav.received)
+        except OSError as e:
+            print("[WARN] route hint disabled:", e)
+            nav = None
+
+    # ---- 원시 프레임 기록 (--record-raw) ----
+    recorder = None
+    if args.record_raw:
+        from pi.sensor.adapter_raw_replay import RawRecorder
+        recorder = RawRecorder(args.record_raw)
+
+    # ---- 설정 핫리로드: fsm / corner / lidar 필터만, 장치 재연결 없음 ----
+    watcher = None
+    if A.get("config_reload_s", 1.0):
+        watcher = ConfigWatcher(cfg, interval_s=A.get("config_reload_s", 1.0)).start()
+        m.gauge("config_reloads", lambda: watcher.reloads)
+
+    def apply_config(old, new):
+        """틱 사이에 참조 교체 (FSM/코너는 update마다 self.p를 읽음 → 다음 프레임부터 새 값)."""
+        fsm.p = new.fsm
+        corner.p = new.corner
+        what = ["fsm", "corner"]
+        if profiles and new.profile != old.profile:
+            profiles.p = new.profile   # 단계 값이 바뀌었을 수 있으니 현재 단계 다시 반영
+            apply_profile(profiles.current)
+            what.append("profile")
+        if new.lidar_filter != old.lidar_filter:
+            what.append("lidar filter" if sensor.apply_filter(new.lidar_filter)
+                        else "lidar filter (restart needed for this sensor backend)")
+        print(f"[CONFIG] reloaded {args.config}: {', '.join(what)}")
+
+    # ---- 프레임 하나 처리 (폴링 루프 / asyncio 런타임 공용) ----
+    ctx = {"last_pwm": None,
+           "pending_stat": None}  # (trace id, ack 시각): 다음 STAT 대기 중인 trace
+
+    def on_servo_resp(link, pwm_us, tid, resp):
+        if resp.startswith("OK"):
+            tracer.mark(tid, "ack")
+            ctx["pending_stat"] = (tid, time.monotonic())
+        if not link.alive:
+            print("[SERVO ERR]", resp)
+            sup.mark_lost("esp32")
+            ctx["last_pwm"] = None
+
+    def send_servo_sync(link, pwm_us, tid):
+        on_servo_resp(link, pwm_us, tid, link.set_us(pwm_us))
+
+    def process_frame(d_min_mm, frame_t0, frame_t1, triplet=None, t=None,
+                      get_speed=None, send_servo=send_servo_sync, frame=None):
+        """
+        판단 → 텔레메트리 → 서보 → 로그 한 번
+        triplet: 미리 읽어 둔 (d_front, d_left, d_right, drop). None이면 여기서 sensor.read_triplet()
+        get_speed: 프레임 시각이 없을 때(lost frame) 쓰는 최신 Hall 속도 함수 (None이면 HallThread.get_speed())
+        속도는 프레임 시각(frame_t0~t1 중간)으로 보간한 값 → 가감속 중에도 거리와 같은 순간의 속도로 TTC
+        send_servo: 서보 전송 방식 (폴링: 응답까지 대기, asyncio: executor로 넘기고 바로 반환)
+        frame: 이번 판단에 쓴 LidarFrame (읽기 전용, 기록기가 복사 없이 보관)
+        """
+        t = m.now() if t is None else t
+        if watcher is not None:
+            old = watcher.current
+            new = watcher.poll()   # 파싱/검증은 감시 스레드에서 끝남, 여기선 참조만 받음
+            if new is not None:
+                apply_config(old, new)
+        tid = tracer.begin(frame_t0, frame_t1) if d_min_mm is not None else None
+        hall = boot.get("hall")
+        if hall:
+            t_frame = frame_time(frame_t0, frame_t1)
+            if t_frame is not None:
+                v_mps, _ = fusion.at("speed", t_frame)
+                fusion.note("lidar", time.monotonic() - t_frame)
+            else:
+                v_mps = get_speed() if get_speed else hall.get_speed()
+        else:
+            v_mps = fsm.p.v_est_mps
+        # 코너 입력 (섹터 최소거리 + 경로 힌트)
+        d_front, d_left, d_right, _ = triplet if triplet is not None else sensor.read_triplet()
+        t = m.lap("triplet", t)
+        hint = nav.latest(v_mps) if nav else None
+
+        # 판단: FSM → 코너/경로 힌트 → PWM (리플레이와 공용)
+        prev_state = fsm.state
+        out, corner_info, pwm_us = step.decide(d_min_mm, v_mps, (d_front, d_left, d_right),
+                                               hint, trace_id=tid)
+        if out["state"] == "FAILSAFE" and prev_state != "FAILSAFE":
+            m.inc("failsafe_entries")
+        if boot.t_first_decision is None:
+            boot.mark_first_decision()
+            boot.report()
+        t = m.lap("decide", t)
+
+        # 적응 프로파일: 이번 판단의 속도/TTC로 다음 틱 설정 선택 (빠른 쪽은 즉시, 느린 쪽은 hold_s 뒤)
+        prof_name = ""
+        if profiles:
+            prev = profiles.current
+            prof, changed = profiles.update(v_mps, out["ttc"])
+            if changed:
+                apply_profile(prof)
+                print(f"[PROFILE] {prev.name} → {prof.name} "
+                      f"(v={v_mps if isinstance(v_mps, (int, float)) else 'NA'} ttc={fmt_s(out['ttc'])})")
+            prof_name = prof.name
+
+        tracer.mark(tid, "decision")
+        tracer.annotate(tid, state=out["state"], d_min_mm=out["d_min_mm"])
+        t = m.lap("profile", t)
+
+        # 출력: 매 틱은 UDP, 콘솔은 console_s마다 한 줄
+        telem.publish(time.time(), out["state"], out["d_min_mm"], v_mps, out["ttc"],
+                      out.get("target_deg"), pwm_us, corner=corner_info["active"])
+        if console.due():
             print(f"[{out['state']}] d_min={fmt_mm(out['d_min_mm'])} "
                   f"v={v_mps if isinstance(v_mps, (int, float)) else 'NA'}m/s "
-                  f"ttc={fmt_s(out['ttc'])}")
+                  f"ttc={fmt_s(out['ttc'])}" + (f" profile={prof_name}" if prof_name else ""))
+        t = m.lap("telemetry", t)
+
+        # 서보 제어
+        link = None if args.no_servo else sup.get("esp32")
+        if link is None:
+            ctx["last_pwm"] = None  # 재연결 후 현재 상태를 다시 전송
+        elif pwm_us != ctx["last_pwm"]:
+            tracer.mark(tid, "cmd")
+            ctx["last_pwm"] = pwm_us
+            send_servo(link, pwm_us, tid)
 
-            # 서보 제어
-            if (not args.no_servo) and link is not None and pwm_us != last_pwm:
-                try:
-                    link.set_us(pwm_us)
-                    last_pwm = pwm_us
-                except Exception as e:
-                    print("[SERVO ERR]", e)
+        # ack 이후 첫 STAT(Hall 스레드 폴링)의 펌웨어 t= 를 trace에 연결
+        stat_link = getattr(hall, "link", None)
+        pending_stat = ctx["pending_stat"]
+        if pending_stat and stat_link is not None and stat_link.last_stat_host_t is not None:
+            if stat_link.last_stat_host_t >= pending_stat[1]:
+                tracer.mark(pending_stat[0], "stat", t=stat_link.last_stat_host_t)
+                tracer.annotate(pending_stat[0], fw_t_ms=stat_link.last_fw_t_ms)
+                ctx["pending_stat"] = None
+        t = m.lap("servo", t)
 
-            w.writerow([f"{time.time():.3f}", out["state"], out["d_min_mm"], v_mps, out["ttc"]])
-            if time.time() - last_flush >= 1.0:
-                f.flush()
-                last_flush = time.time()
+        hint_dist_m, hint_dir = hint_cols(hint)
+        logger.log(time.time(), out["state"], out["d_min_mm"], v_mps, out["ttc"],
+                   out.get("target_deg"), pwm_us, out.get("reason", ""),
+                   d_front, d_left, d_right, profile=prof_name,
+                   hint_dist_m=hint_dist_m, hint_dir=hint_dir)
+        if recorder is not None and d_min_mm is not None:
+            recorder.add(frame)
+        m.lap("log", t)
+        m.inc("ticks")
+        m.maybe_summary()
+        if dump_req.is_set():
+            dump_req.clear()
+            try:
+                _dump_trace()
+            except Exception as e:
+                print("[TRACE ERR]", e)
 
-            time.sleep(period)
+    rt = None
+    if runtime == "async":
+        import asyncio
+        from pi.runtime_async import AsyncRuntime
+        rt = AsyncRuntime(sensor, None, get_hall=lambda: boot.get("hall"),
+                          watchdog_s=A.get("watchdog_s", 3 * period))
+
+        def _send_servo_async(link, pwm_us, tid):
+            rt.send_servo(link, pwm_us, lambda resp: on_servo_resp(link, pwm_us, tid, resp))
+
+        rt.on_frame = lambda d, t0, t1, tri, frame: process_frame(
+            d, t0, t1, tri, get_speed=rt.speed, send_servo=_send_servo_async, frame=frame)
+        m.gauge("frames_dropped", lambda: rt.frames_dropped)
+        m.gauge("watchdog_fires", lambda: rt.watchdog_fires)
+        print(f"[RUN] runtime=async watchdog={rt.watchdog_s}s  log={logger.path}  "
+              f"telemetry=udp://{telem.addr[0]}:{telem.addr[1]}")
+    else:
+        print(f"[RUN] period={period}s  policy={sched.policy}  log={logger.path}  "
+              f"telemetry=udp://{telem.addr[0]}:{telem.addr[1]}")
+
+    try:
+        if rt is not None:
+            asyncio.run(rt.run())
+        while rt is None and not sensor.exhausted:   # replay 계열은 파일 끝에서 종료
+            t = m.now()
+            d_min_mm = sensor.read()
+            t = m.lap("sensor", t)
+            process_frame(d_min_mm, sensor.frame_t0, sensor.frame_t1, t=t, frame=sensor.frame)
+            sched.wait()
 
     except KeyboardInterrupt:
         print("\n[APP] stopped by user.")
@@ -132,13 +457,39 @@ def main():
             sensor.stop()
         except Exception:
             pass
+        hall = boot.get("hall")
         if hall:
             hall.stop()
+        if recorder is not None:
+            try:
+                print(f"[RAW] saved: {recorder.save()} (frames={len(recorder.frames)})")
+            except Exception as e:
+                print("[RAW ERR]", e)
+        sup.stop()
+        if nav:
+            nav.stop()
+        if watcher:
+            watcher.stop()
         try:
-            f.close()
+            logger.close()
         except Exception:
             pass
-        print("[LOG] saved:", csv_path)
+        m.close()
+        telem.close()
+        print(m.summary())
+        print(tracer.format_report())
+        print(rt.summary() if rt is not None else sched.summary())
+        if profiles:
+            print(profiles.summary())
+        if dump_on_exit:
+            try:
+                _dump_trace()
+                with open(logger.path + ".sched.json", "w", encoding="utf-8") as sf:
+                    json.dump(rt.stats() if rt is not None else sched.stats(), sf, indent=2)
+            except Exception as e:
+                print("[TRACE ERR]", e)
+        print(f"[LOG] saved: {', '.join(logger.paths)} "
+              f"(rows={logger.rows} dropped={logger.dropped})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,356 @@
+# pi/config.py
+# -*- coding: utf-8 -*-
+# config.yaml 한 번 파싱 + 검증 → Config 객체를 참조로 공유 (app, Esp32Link, HallThread)
+#   cfg = load_config("pi/config.yaml")      # 잘못된 값이면 ConfigError (항목 전부 나열)
+#   cfg.fsm / cfg.corner / cfg.lidar_filter   # 판단/필터 파라미터 (타입 변환 완료)
+#   cfg.profile                               # 속도/TTC 적응 프로파일 (pi/profile.py ProfileParams)
+#   cfg.get("app", {})                        # 나머지 섹션은 dict 그대로 (기존 코드 호환)
+#
+# 모든 섹션의 키를 검증: 모르는 섹션/키(오타), 타입, 선택지 → ConfigError
+#   fsm/corner/profile/lidar 필터 : dataclass/생성자 기본값 기준
+#   comm/servo/app/lidar/sensor   : 아래 *_KEYS 표 기준 (값을 읽는 코드의 기본값과 같게 유지)
+#
+# 실행 중 반영 (라이다/ESP32 재연결 없이)
+#   watcher = ConfigWatcher(cfg).start()      # 백그라운드에서 mtime 폴링 + 파싱/검증
+#   new = watcher.poll()                      # 루프 틱 사이에 호출: 새 Config 또는 None
+#   → fsm.p / corner.p / profiles.p / sensor.apply_filter() 교체. 검증 실패 시 이전 값 유지
+import os
+import inspect
+import threading
+from dataclasses import dataclass, fields
+
+import yaml
+
+from pi.decision import FsmParams, CornerParams
+from pi.profile import Profile, ProfileParams, LEVELS
+from pi.sensor import registry as sensors
+
+# 실행 중 교체 가능한 섹션. 나머지(comm, lidar 포트/baud, app 등)는 재시작해야 반영
+# (profile.enabled 켜고 끄기는 재시작 때만, servo 각도는 FsmParams로 들어감)
+HOT_SECTIONS = ("fsm", "servo", "corner", "profile")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class LidarFilter:
+    """RPLidarAdapter 프레임 처리 설정 (config lidar 섹션 중 실행 중 교체 가능한 것)."""
+    near_cutoff_mm: int = 120
+    max_dist_mm: int = 4000
+    front_gate_deg: int = 20
+    quantile: float = 0.20
+    min_inliers: int = 12
+    smooth_window: int = 3
+    angle_offset_deg: float = 0.0
+
+
+LIDAR_FILTER_KEYS = tuple(f.name for f in fields(LidarFilter))
+
+# 섹션별 허용 키 → 기본값 (타입 검사용, None이면 타입 검사 안 함)
+COMM_KEYS = {"port": "/dev/ttyACM0", "baud": 115200, "timeout": 0.1, "write_timeout": 0.1}
+# servo.<상태>_deg → FsmParams 같은 이름 필드 (fsm 섹션과 중복 지정은 오류)
+SERVO_KEYS = {"safe_deg": 0, "warn_deg": 100, "brake_deg": 140, "failsafe_deg": 140}
+# lidar 중 필터(LidarFilter) 외 키: 연결/프로세스 설정 (재시작해야 반영)
+LIDAR_KEYS = {"port": None, "baud": 460800, "pwm": 650, "spinup_s": 2.0,
+              "process": False, "ring_slots": 8}
+APP_KEYS = {
+    "period": 0.1, "overrun_policy": "skip", "runtime": "poll", "watchdog_s": 0.3,
+    "log_dir": "pi/logs", "session_prefix": "run", "log_max_mb": 16,
+    "metrics_port": 8765, "metrics_summary_s": 5.0, "trace_ring": 2048,
+    "telemetry_port": 9870, "telemetry_hz": 20.0, "console_s": 1.0,
+    "route_hint_port": 9871, "route_hint_stale_s": 2.0, "config_reload_s": 1.0,
+    "speed_stale_s": 0.5, "speed_extrap_s": 0.2, "dump_on_exit": False,
+}
+# sensor.<백엔드> → 생성자 인자 (pi/sensor/adapter_*.py)
+SENSOR_ARGS = {
+    "sim": {"scenario": "B", "rate_hz": 10.0, "realtime": False},
+    "replay": {"csv_path": "", "rate_hz": 10.0, "gap_fill": True, "max_gap_frames": 5,
+               "end_policy": "stop", "hold_seconds": 2.0, "realtime": True},
+    "raw_replay": dict({"path": "", "realtime": False, "rate_hz": 10.0, "loop": False},
+                       **{f.name: f.default for f in fields(LidarFilter)}),
+}
+CHOICES = {
+    "app.overrun_policy": ("skip", "catchup", "degrade"),
+    "app.runtime": ("poll", "async"),
+    "sensor.sim.scenario": ("A", "B", "C"),
+    "sensor.replay.end_policy": ("stop", "hold", "loop"),
+}
+SECTIONS = ("comm", "servo", "fsm", "corner", "lidar", "profile", "sensor", "app")
+
+
+def _coerce(section, key, value, default, errors):
+    """기본값 타입으로 변환 (bool/str은 yaml 그대로만 허용)."""
+    if default is None or value is None:
+        return value
+    try:
+        if isinstance(default, str):
+            if not isinstance(value, str):
+                raise ValueError
+            return value
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise ValueError
+            return value
+        if isinstance(default, int):
+            if float(value) != int(float(value)):
+                raise ValueError
+            return int(float(value))
+        if isinstance(default, float):
+            return float(value)
+    except (TypeError, ValueError):
+        errors.append(f"{section}.{key}: expected {type(default).__name__}, got {value!r}")
+        return default
+    return value
+
+
+def _build(section, raw, defaults, errors):
+    """raw dict → 알려진 키만 타입 변환한 kwargs (모르는 키는 오류)."""
+    kw = {}
+    for k, v in (raw or {}).items():
+        if k not in defaults:
+            errors.append(f"{section}.{k}: unknown key")
+            continue
+        kw[k] = _coerce(section, k, v, defaults[k], errors)
+    return kw
+
+
+def _check_section(section, raw, keys, errors):
+    """dict 그대로 쓰는 섹션: 모르는 키/타입/선택지만 검사."""
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict):
+        errors.append(f"{section}: must be a mapping")
+        return {}
+    kw = _build(section, raw, keys, errors)
+    for k, v in kw.items():
+        allowed = CHOICES.get(f"{section}.{k}")
+        if allowed and v not in allowed:
+            errors.append(f"{section}.{k}: {v!r} not in {allowed}")
+    return kw
+
+
+def _check_sensor(raw, errors):
+    raw = raw or {}
+    if not isinstance(raw, dict):
+        errors.append("sensor: must be a mapping")
+        return {}
+    kw = _check_section("sensor", {k: v for k, v in raw.items() if k not in SENSOR_ARGS},
+                        {"backend": "rplidar"}, errors)
+    if "backend" in kw and kw["backend"] not in sensors.names():
+        errors.append(f"sensor.backend: {kw['backend']!r} not in {sensors.names()}")
+    for name, keys in SENSOR_ARGS.items():
+        if name in raw:
+            kw[name] = _check_section(f"sensor.{name}", raw[name], keys, errors)
+    return kw
+
+
+def _corner_defaults():
+    sig = inspect.signature(CornerParams.__init__)
+    return {n: p.default for n, p in sig.parameters.items() if n != "self"}
+
+
+def _build_profile(raw, errors):
+    """profile 섹션 → ProfileParams (levels.<이름>은 기본 단계 값 위에 덮어씀)."""
+    raw = dict(raw or {})
+    if not raw:
+        return ProfileParams()
+    levels_raw = raw.pop("levels", None) or {}
+    defaults = {f.name: f.default for f in fields(ProfileParams) if f.name != "levels"}
+    kw = _build("profile", raw, defaults, errors)
+    kw.setdefault("enabled", True)   # 섹션이 있으면 기본 켬
+    base = ProfileParams().levels
+    levels = []
+    for name, lv in zip(LEVELS, base):
+        lv_defaults = {f.name: getattr(lv, f.name) for f in fields(Profile) if f.name != "name"}
+        lv_kw = _build(f"profile.levels.{name}", levels_raw.get(name), lv_defaults, errors)
+        levels.append(Profile(name, **dict(lv_defaults, **lv_kw)))
+    for name in levels_raw:
+        if name not in LEVELS:
+            errors.append(f"profile.levels.{name}: unknown level (choose from {LEVELS})")
+    return ProfileParams(levels=tuple(levels), **kw)
+
+
+def _validate(fsm, corner_kw, flt, errors):
+    if fsm.brake_ttc_s >= fsm.warn_ttc_s:
+        errors.append(f"fsm: brake_ttc_s({fsm.brake_ttc_s}) must be < warn_ttc_s({fsm.warn_ttc_s})")
+    if fsm.brake_dist_mm >= fsm.brake_release_dist_mm:
+        errors.append(f"fsm: brake_dist_mm({fsm.brake_dist_mm}) must be < "
+                      f"brake_release_dist_mm({fsm.brake_release_dist_mm})")
+    for k in ("lost_frames_to_fail", "ok_frames_to_recover", "brake_exit_frames"):
+        if getattr(fsm, k) < 1:
+            errors.append(f"fsm.{k}: must be >= 1")
+    c = dict(_corner_defaults(), **corner_kw)
+    if c["enter_dist_mm"] >= c["leave_dist_mm"]:
+        errors.append("corner: enter_dist_mm must be < leave_dist_mm")
+    if c["route_decel_mps2"] <= 0:
+        errors.append("corner.route_decel_mps2: must be > 0")
+    if not 0.0 <= flt.quantile <= 1.0:
+        errors.append(f"lidar.quantile: must be in [0, 1], got {flt.quantile}")
+    if flt.near_cutoff_mm >= flt.max_dist_mm:
+        errors.append("lidar: near_cutoff_mm must be < max_dist_mm")
+    if flt.smooth_window < 1 or flt.min_inliers < 1:
+        errors.append("lidar: smooth_window and min_inliers must be >= 1")
+
+
+def _validate_profile(pp, errors):
+    if pp.idle_enter_mps > pp.idle_exit_mps:
+        errors.append("profile: idle_enter_mps must be <= idle_exit_mps")
+    if pp.approach_enter_ttc_s > pp.approach_exit_ttc_s:
+        errors.append("profile: approach_enter_ttc_s must be <= approach_exit_ttc_s")
+    if pp.hold_s < 0:
+        errors.append("profile.hold_s: must be >= 0")
+    for lv in pp.levels:
+        if lv.period_s <= 0 or lv.frame_points < 1 or lv.frame_ms < 1 or lv.hall_poll_ms < 1:
+            errors.append(f"profile.levels.{lv.name}: period_s/frame_points/frame_ms/hall_poll_ms must be > 0")
+        if not 0 <= lv.pwm <= 1023:
+            errors.append(f"profile.levels.{lv.name}.pwm: must be in [0, 1023], got {lv.pwm}")
+
+
+class Config:
+    """
+    검증된 설정 (읽기 전용으로 취급 — 바꾸려면 파일을 고치고 ConfigWatcher로 새 객체 받기)
+    data: 섹션별 dict (키 검증·타입 변환 완료), fsm: FsmParams (servo 각도 포함),
+    corner: CornerParams, lidar_filter: LidarFilter, profile: ProfileParams
+    """
+    def __init__(self, data, path=None, mtime=None):
+        errors = []
+        data = data or {}
+        if not isinstance(data, dict):
+            raise ConfigError(f"{path}: top level must be a mapping")
+        for k in data:
+            if k not in SECTIONS:
+                errors.append(f"{k}: unknown section (choose from {SECTIONS})")
+        fsm_defaults = {f.name: f.default for f in fields(FsmParams)}
+        # 타입 변환된 값을 섹션별로 모아 data를 대신함 (cfg.get("app")["period"]도 float)
+        typed = {}
+        fsm_kw = typed["fsm"] = _build("fsm", data.get("fsm"), fsm_defaults, errors)
+        servo_kw = typed["servo"] = _check_section("servo", data.get("servo"), SERVO_KEYS, errors)
+        for k in servo_kw:
+            if k in fsm_kw:
+                errors.append(f"servo.{k}: also set as fsm.{k} (keep one)")
+        fsm_kw = dict(servo_kw, **fsm_kw)
+        corner_kw = typed["corner"] = _build("corner", data.get("corner"), _corner_defaults(), errors)
+        L = data.get("lidar") or {}
+        flt_defaults = {f.name: f.default for f in fields(LidarFilter)}
+        typed["lidar"] = _build("lidar", L, dict(LIDAR_KEYS, **flt_defaults), errors)
+        flt_kw = {k: v for k, v in typed["lidar"].items() if k in LIDAR_FILTER_KEYS}
+        typed["comm"] = _check_section("comm", data.get("comm"), COMM_KEYS, errors)
+        typed["app"] = _check_section("app", data.get("app"), APP_KEYS, errors)
+        typed["sensor"] = _check_sensor(data.get("sensor"), errors)
+
+        self.fsm = FsmParams(**fsm_kw)
+        self.lidar_filter = LidarFilter(**flt_kw)
+        self.profile = _build_profile(data.get("profile"), errors)
+        _validate(self.fsm, corner_kw, self.lidar_filter, errors)
+        _validate_profile(self.profile, errors)
+        if errors:
+            raise ConfigError(f"{path or 'config'}: " + "; ".join(errors))
+        self.corner = CornerParams(**corner_kw)
+        # 파일에 있던 섹션만 (없는 섹션은 get()이 기본값을 돌려주도록). profile은 self.profile로만 읽음
+        self.data = {k: (typed[k] if k in typed else v) for k, v in data.items()}
+        self.path = path
+        self.mtime = mtime
+
+    # dict 호환 (open_from_config, HallThread, 기존 cfg.get(...) 코드)
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def changed_sections(self, other):
+        """other 대비 값이 바뀐 최상위 섹션 이름들."""
+        keys = set(self.data) | set(other.data)
+        return sorted(k for k in keys if self.data.get(k) != other.data.get(k))
+
+    def restart_required(self, other):
+        """other → self로 바뀐 것 중 실행 중 반영 안 되는 항목 (lidar는 필터 키 외 변경만)."""
+        out = []
+        for k in self.changed_sections(other):
+            if k in HOT_SECTIONS:
+                continue
+            if k == "lidar":
+                a = {x: v for x, v in (self.data.get(k) or {}).items() if x not in LIDAR_FILTER_KEYS}
+                b = {x: v for x, v in (other.data.get(k) or {}).items() if x not in LIDAR_FILTER_KEYS}
+                if a == b:
+                    continue
+            out.append(k)
+        return out
+
+
+def load_config(path="pi/config.yaml"):
+    with open(path, "r", encoding="utf-8") as f:
+        st = os.fstat(f.fileno())
+        try:
+            data = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"{path}: {e}") from None
+    return Config(data, path=path, mtime=st.st_mtime_ns)
+
+
+class ConfigWatcher:
+    """
+    mtime 폴링 스레드 (inotify는 pi 이미지에 없어도 동작하도록 stat만 사용)
+    - 파일이 바뀌면 백그라운드에서 파싱/검증 → 성공한 Config만 pending에 둠
+    - 판단 루프는 poll()로 틱 사이에 받아감 (참조 교체 한 번, 루프 안에서 파싱/IO 없음)
+    - 저장 중간 상태(빈 파일/깨진 YAML)를 읽으면 오류 출력 후 다음 mtime 변화까지 대기
+    """
+    def __init__(self, cfg, interval_s=1.0):
+        self.current = cfg
+        self.path = cfg.path
+        self.interval_s = float(interval_s)
+        self.reloads = 0
+        self.errors = 0
+        self._seen = cfg.mtime
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._th = None
+
+    def start(self):
+        self._th = threading.Thread(target=self._run, daemon=True, name="config-watch")
+        self._th.start()
+        return self
+
+    def check(self):
+        """mtime이 바뀌었으면 다시 읽기. 새 Config를 pending에 두면 True."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._seen:
+            return False
+        self._seen = mtime
+        try:
+            new = load_config(self.path)
+        except (ConfigError, OSError) as e:
+            self.errors += 1
+            print("[CONFIG] reload rejected (keeping current):", e)
+            return False
+        with self._lock:
+            self._pending = new
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.check()
+
+    def poll(self):
+        """루프 틱 사이에 호출 → 새 Config(한 번만) 또는 None."""
+        if self._pending is None:
+            return None
+        with self._lock:
+            new, self._pending = self._pending, None
+        if new is None:
+            return None
+        stale = new.restart_required(self.current)
+        if stale:
+            print(f"[CONFIG] changed but needs restart: {', '.join(stale)}")
+        self.current = new
+        self.reloads += 1
+        return new
+
+    def stop(self):
+        self._stop.set()
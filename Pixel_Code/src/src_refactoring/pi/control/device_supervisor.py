@@ -0,0 +1,421 @@
+# pi/control/device_supervisor.py
+# -*- coding: utf-8 -*-
+import os
+import glob
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _serial():
+    """pyserial (프로빙할 때만 import → sim/replay 실행은 serial 없이). 없으면 None."""
+    try:
+        import serial
+        return serial
+    except ImportError:
+        return None
+
+
+# 탐색 대상 포트 패턴 (by-id 우선: 재부팅/재연결에도 이름이 안정적)
+CANDIDATE_GLOBS = [
+    "/dev/serial/by-id/*",
+    "/dev/ttyACM*",
+    "/dev/ttyUSB*",
+]
+
+# RPLIDAR GET_INFO 요청/응답 디스크립터
+RPLIDAR_GET_INFO = b"\xA5\x50"
+RPLIDAR_INFO_DESC = b"\xA5\x5A\x14\x00\x00\x00\x04"
+
+
+def list_candidates(globs=CANDIDATE_GLOBS):
+    """
+    후보 포트 목록.
+    - by-id 심볼릭 링크와 실제 tty가 같은 장치를 가리키면 하나만 남김(by-id 이름 우선)
+    """
+    ordered, seen = [], set()
+    for pat in globs:
+        for p in sorted(glob.glob(pat)):
+            real = os.path.realpath(p)
+            if real in seen:
+                continue
+            seen.add(real)
+            ordered.append(p)
+    return ordered
+
+
+def _open_quiet(port, baud, timeout):
+    """
+    DTR/RTS를 내린 상태로 포트를 연다.
+    (기본 open은 DTR을 올려 ESP32를 리셋시키므로 프로빙이 부팅 시간만큼 늦어짐)
+    """
+    ser = _serial().Serial()
+    ser.port = port
+    ser.baudrate = baud
+    ser.timeout = timeout
+    ser.write_timeout = timeout
+    ser.dtr = False
+    ser.rts = False
+    ser.open()
+    return ser
+
+
+def probe_esp32(port, baud=115200, timeout=0.15):
+    """PING → PONG 왕복으로 ESP32 여부 판정. 성공 시 {"kind": "esp32"}."""
+    if _serial() is None:
+        return None
+    try:
+        ser = _open_quiet(port, baud, 0.02)
+    except Exception:
+        return None
+    try:
+        ser.reset_input_buffer()
+        ser.write(b"PING\n")
+        t0 = time.time()
+        buf = bytearray()
+        while time.time() - t0 < timeout:
+            chunk = ser.read(64)
+            if not chunk:
+                continue
+            buf.extend(chunk)
+            if b"PONG" in buf:
+                return {"kind": "esp32"}
+        return None
+    except Exception:
+        return None
+    finally:
+        try: ser.close()
+        except Exception: pass
+
+
+def probe_rplidar(port, baud=460800, timeout=0.15):
+    """GET_INFO 요청으로 RPLIDAR 여부 판정. 성공 시 모델/펌웨어/시리얼 반환."""
+    if _serial() is None:
+        return None
+    try:
+        ser = _open_quiet(port, baud, 0.02)
+    except Exception:
+        return None
+    try:
+        ser.reset_input_buffer()
+        ser.write(RPLIDAR_GET_INFO)
+        t0 = time.time()
+        buf = bytearray()
+        need = len(RPLIDAR_INFO_DESC) + 20
+        while time.time() - t0 < timeout:
+            chunk = ser.read(need)
+            if chunk:
+                buf.extend(chunk)
+            i = buf.find(RPLIDAR_INFO_DESC)
+            if i >= 0 and len(buf) - i >= need:
+                body = bytes(buf[i + len(RPLIDAR_INFO_DESC): i + need])
+                return {
+                    "kind": "rplidar",
+                    "model": body[0],
+                    "firmware": f"{body[2]}.{body[1]:02d}",
+                    "hardware": body[3],
+                    "serial": body[4:20].hex().upper(),
+                }
+        return None
+    except Exception:
+        return None
+    finally:
+        try: ser.close()
+        except Exception: pass
+
+
+def probe_all(ports, probes, max_workers=8):
+    """
+    ports 전체를 동시에 프로빙. probes = {name: probe(port) -> info 또는 None}
+    한 포트 안에서는 프로브를 차례로 시도 (같은 포트를 동시에 열지 않음)
+    반환: {name: port} (못 찾은 장치는 빠짐). 캐시/재연결 없이 한 번만 찾을 때 (scooter 스크립트)
+    """
+    def run(port):
+        for name, probe in probes.items():
+            if probe(port):
+                return name, port
+        return None
+
+    found = {}
+    if not ports:
+        return found
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ports))) as ex:
+        for r in ex.map(run, ports):
+            if r and r[0] not in found:
+                found[r[0]] = r[1]
+    return found
+
+
+class _Device:
+    def __init__(self, name, probe, connect=None, close=None, hint=None):
+        self.name = name
+        self.hint = hint
+        self.probe = probe
+        self.connect = connect
+        self.close = close
+        self.port = None
+        self.info = None
+        self.handle = None
+        self.lost = True
+        self.last_try = 0.0
+
+
+class DeviceSupervisor:
+    """
+    라이다/ESP32 장치 탐색 + 백그라운드 재연결
+    - 모든 후보 포트를 동시에 프로빙(ESP32: PING/PONG, 라이다: GET_INFO)
+    - 식별자→포트 매핑을 캐시(json)하여 다음 부팅 땐 캐시 포트부터 확인
+    - 잃어버린 장치는 별도 스레드에서 재탐색/재연결 (메인 루프는 FAILSAFE로 계속 동작)
+    - 탐색 전용 장치(connect 없음, 예: 라이다)는 찾은 순간부터 포트 주인이 사용 중으로 취급
+      → 백그라운드 스레드가 다시 프로빙하지 않음 (재연결은 주인이 discover()를 직접 호출)
+
+    사용 예)
+      sup = DeviceSupervisor(cache_path="pi/logs/ports.json")
+      sup.register("esp32", probe_esp32, connect=lambda p: Esp32Link(p), close=lambda h: h.close())
+      sup.register("lidar", probe_rplidar)          # 탐색만 (연결은 어댑터가 담당)
+      sup.discover()
+      sup.start()
+      link = sup.get("esp32")   # 끊긴 동안은 None
+    """
+    def __init__(self, cache_path=None, globs=CANDIDATE_GLOBS,
+                 retry_s=0.5, max_workers=8, verbose=True):
+        self.cache_path = cache_path
+        self.globs = list(globs)
+        self.retry_s = float(retry_s)
+        self.max_workers = int(max_workers)
+        self.verbose = verbose
+
+        self._devs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._th = None
+        self._cache = self._load_cache()
+
+    # ---------- 캐시 ----------
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f) or {}
+        except Exception:
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            d = os.path.dirname(self.cache_path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, indent=2)
+            os.replace(tmp, self.cache_path)
+        except Exception:
+            pass
+
+    def _log(self, *a):
+        if self.verbose:
+            print("[DEV]", *a)
+
+    # ---------- 등록/조회 ----------
+    def register(self, name, probe, connect=None, close=None, hint=None):
+        """
+        probe(port) -> dict|None : 해당 포트가 이 장치인지 판정
+        connect(port) -> handle  : (옵션) 포트를 찾으면 핸들 생성
+        close(handle)            : (옵션) 끊김 처리 시 핸들 정리
+        hint                     : (옵션) config에 적힌 포트. 캐시보다 먼저 확인
+        """
+        with self._lock:
+            self._devs[name] = _Device(name, probe, connect, close, hint)
+
+    def port(self, name):
+        with self._lock:
+            d = self._devs.get(name)
+            return d.port if d else None
+
+    def info(self, name):
+        with self._lock:
+            d = self._devs.get(name)
+            return d.info if d else None
+
+    def get(self, name):
+        """연결된 핸들(없거나 끊긴 상태면 None)."""
+        with self._lock:
+            d = self._devs.get(name)
+            return None if (d is None or d.lost) else d.handle
+
+    def is_ready(self, name):
+        with self._lock:
+            d = self._devs.get(name)
+            return bool(d and not d.lost)
+
+    # ---------- 탐색 ----------
+    def _probe_port(self, port, names):
+        """한 포트에 대해 등록된 프로브를 차례로 시도 (같은 포트를 동시에 열지 않도록)."""
+        for n in names:
+            info = self._devs[n].probe(port)
+            if info:
+                return n, port, info
+        return None
+
+    def _owned_ports(self, exclude=()):
+        """다른 주인(핸들/어댑터)이 열고 있는 포트 (realpath). 호출 시 _lock 보유."""
+        return {os.path.realpath(d.port) for d in self._devs.values()
+                if d.port and not d.lost and d.name not in exclude}
+
+    def _probe_known(self, name, ports):
+        for p in ports:
+            r = self._probe_port(p, [name])
+            if r:
+                return r
+        return None
+
+    def discover(self, names=None):
+        """
+        names 장치들의 포트를 찾아 매핑 갱신. 반환: {name: port}
+        1) hint/캐시 포트 동시 확인 (보통 여기서 끝)
+        2) 남은 장치는 모든 후보 포트를 동시에 프로빙
+        """
+        with self._lock:
+            names = [n for n in (names or list(self._devs)) if n in self._devs]
+            owned = self._owned_ports(exclude=names)
+        found = {}
+        t0 = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            # 1) hint/캐시 포트 (다른 장치가 열고 있는 포트는 제외)
+            futs = []
+            for n in names:
+                known = [self._devs[n].hint, (self._cache.get(n) or {}).get("port")]
+                known = [p for i, p in enumerate(known)
+                         if p and p not in known[:i] and os.path.exists(p)
+                         and os.path.realpath(p) not in owned]
+                if known:
+                    futs.append(ex.submit(self._probe_known, n, known))
+            for fu in futs:
+                r = fu.result()
+                if r:
+                    found[r[0]] = (r[1], r[2])
+
+            # 2) 전체 후보 포트
+            left = [n for n in names if n not in found]
+            if left:
+                # 이미 찾았거나, 다른 장치가 사용 중인 포트는 건드리지 않음
+                taken = owned | {os.path.realpath(p) for p, _ in found.values()}
+                ports = [p for p in list_candidates(self.globs)
+                         if os.path.realpath(p) not in taken]
+                futs = [ex.submit(self._probe_port, p, left) for p in ports]
+                for fu in futs:
+                    r = fu.result()
+                    if r and r[0] not in found:
+                        found[r[0]] = (r[1], r[2])
+
+        with self._lock:
+            for n, (p, info) in found.items():
+                d = self._devs[n]
+                d.port, d.info = p, info
+                if d.connect is None:
+                    d.lost = False   # 탐색 전용: 이제 호출자(어댑터)가 이 포트의 주인
+                self._cache[n] = {"port": p, "info": info}
+        if found:
+            self._save_cache()
+
+        self._log(f"discover {names} → "
+                  f"{ {n: p for n, (p, _) in found.items()} } ({(time.time()-t0)*1000:.0f}ms)")
+        return {n: p for n, (p, _) in found.items()}
+
+    def connect(self, names=None):
+        """
+        connect 팩토리가 있는 장치는 즉시 연결 시도. 반환: 연결 성공한 이름 목록.
+        포트를 아직 모르는 장치만 탐색 (기동 때 discover()가 찾은 포트는 다시 프로빙하지 않음)
+        """
+        with self._lock:
+            names = [n for n in (names or list(self._devs)) if n in self._devs]
+            unknown = [n for n in names if self._devs[n].port is None]
+        if unknown:
+            self.discover(unknown)
+        ok = []
+        for n in names:
+            if self._try_connect(n):
+                ok.append(n)
+        return ok
+
+    def _try_connect(self, name):
+        with self._lock:
+            d = self._devs[name]
+            d.last_try = time.time()
+            port, connect = d.port, d.connect
+        if port is None:
+            return False
+        if connect is None:
+            with self._lock:
+                d.lost = False
+            return True
+        try:
+            h = connect(port)
+        except Exception as e:
+            self._log(f"{name} connect failed on {port}: {e}")
+            return False
+        with self._lock:
+            d.handle, d.lost = h, False
+        self._log(f"{name} ready on {port}")
+        return True
+
+    # ---------- 끊김/재연결 ----------
+    def mark_lost(self, name):
+        """장치 끊김 통보 → 핸들 정리 후 백그라운드 재연결 대상으로 전환."""
+        with self._lock:
+            d = self._devs.get(name)
+            if d is None or d.lost:
+                return
+            d.lost = True
+            h, close = d.handle, d.close
+            d.handle = None
+        if h is not None and close is not None:
+            try:
+                close(h)
+            except Exception:
+                pass
+        self._log(f"{name} lost → reconnect in background")
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                # 탐색 전용 장치는 제외: 포트는 어댑터가 열고 있고, 재연결도 어댑터가 discover()로 직접
+                lost = [n for n, d in self._devs.items()
+                        if d.lost and d.connect is not None
+                        and time.time() - d.last_try >= self.retry_s]
+            if lost:
+                # 캐시 포트가 살아 있으면 그쪽부터, 아니면 전체 재탐색
+                self.discover(lost)
+                for n in lost:
+                    self._try_connect(n)
+            self._wake.wait(self.retry_s)
+            self._wake.clear()
+
+    def start(self):
+        if self._th is None:
+            self._th = threading.Thread(target=self._run, daemon=True)
+            self._th.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._th is not None:
+            self._th.join(timeout=1.0)
+            self._th = None
+        with self._lock:
+            devs = list(self._devs.values())
+        for d in devs:
+            if d.handle is not None and d.close is not None:
+                try:
+                    d.close(d.handle)
+                except Exception:
+                    pass
+            d.handle, d.lost = None, True
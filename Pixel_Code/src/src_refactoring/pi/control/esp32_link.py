@@ -1,15 +1,19 @@
 # pi/control/esp32_link.py
 # -*- coding: utf-8 -*-
+import re
 import time
 import yaml
 import serial
 
+FW_T_RX = re.compile(r"\bt=(\d+)")
+
 class Esp32Link:
     """
     ESP32와의 직렬 통신 래퍼
     - 짧은 타임아웃/논블로킹 읽기
     - GET_STAT 입력버퍼 purge 후 즉시 응답 대기
     - 마지막 정상 응답을 캐시하여 끊김 시 반환
+    - 직렬 I/O 예외가 나면 alive=False (DeviceSupervisor 재연결 판단용)
     """
     def __init__(self, port, baud=115200, timeout=0.1, write_timeout=0.1):
         self.ser = serial.Serial(
@@ -19,8 +23,16 @@ class Esp32Link:
             write_timeout=write_timeout
         )
         self._last_stat = ""  # 마지막 STAT 라인 캐시
+        self.alive = True     # I/O 예외 발생 시 False
+        self.retries = 0      # GET_STAT 재시도 횟수(계측용)
+        self.last_fw_t_ms = None     # 마지막 STAT의 펌웨어 t= (millis)
+        self.last_stat_host_t = None # 그 STAT 수신 시각(time.monotonic)
 
     # ---------- 내부 유틸 ----------
+    def _io_err(self, e):
+        self.alive = False
+        return f"ERR {e}"
+
     def _write_line(self, s: str):
         self.ser.write((s + "\n").encode("ascii"))
 
@@ -48,7 +60,7 @@ class Esp32Link:
             line = self._read_line(timeout)
             return line or ""
         except Exception as e:
-            return f"ERR {e}"
+            return self._io_err(e)
 
     def quiet(self, on: bool = True, timeout=0.2):
         """
@@ -61,7 +73,7 @@ class Esp32Link:
             line = self._read_line(timeout)
             return line or ""
         except Exception as e:
-            return f"ERR {e}"
+            return self._io_err(e)
 
     def set_deg(self, deg: int, timeout=0.2):
         try:
@@ -69,7 +81,7 @@ class Esp32Link:
             line = self._read_line(timeout)
             return line or ""
         except Exception as e:
-            return f"ERR {e}"
+            return self._io_err(e)
 
     def set_us(self, us: int, timeout=0.2):
         """
@@ -84,7 +96,7 @@ class Esp32Link:
             line = self._read_line(timeout)
             return line or ""
         except Exception as e:
-            return f"ERR {e}"
+            return self._io_err(e)
 
     def get_stat(self, timeout=0.15, retries=1, purge=True):
         """
@@ -98,13 +110,19 @@ class Esp32Link:
             self._write_line("GET_STAT")
             line = self._read_line(timeout)
             if (not line) and retries > 0:
+                self.retries += 1
                 self._write_line("GET_STAT")
                 line = self._read_line(timeout)
             if line:
                 self._last_stat = line
+                m = FW_T_RX.search(line)
+                if m:
+                    self.last_fw_t_ms = int(m.group(1))
+                    self.last_stat_host_t = time.monotonic()
             return self._last_stat
-        except Exception:
+        except Exception as e:
             # 예외 시에도 캐시 반환
+            self._io_err(e)
             return self._last_stat or ""
 
     def close(self):
@@ -114,9 +132,11 @@ class Esp32Link:
             pass
 
 
-def open_from_config(cfg_path: str):
+def open_from_config(cfg_path, port: str = None):
     """
     config.yaml 의 comm 섹션을 읽어 Esp32Link 생성
+    cfg_path에 이미 파싱한 dict / pi.config.Config를 주면 파일을 다시 읽지 않음
+    port를 주면 config의 포트 대신 사용 (장치 탐색 결과 등)
     예)
     comm:
       port: /dev/serial/by-id/usb-...
@@ -124,11 +144,14 @@ def open_from_config(cfg_path: str):
       timeout: 0.1
       write_timeout: 0.1
     """
-    with open(cfg_path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f) or {}
+    if not isinstance(cfg_path, str):
+        cfg = cfg_path
+    else:
+        with open(cfg_path, "r", encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
     c = (cfg.get("comm") or {})
-    port = c.get("port", "/dev/ttyACM0")
+    port = port or c.get("port", "/dev/ttyACM0")
     baud = int(c.get("baud", 115200))
     timeout = float(c.get("timeout", 0.1))
     wtimeout = float(c.get("write_timeout", 0.1))
-    return Esp32Link(port=port, baud=baud, timeout=timeout, write_timeout=wtimeout)
\ No newline at end of file
+    return Esp32Link(port=port, baud=baud, timeout=timeout, write_timeout=wtimeout)
@@ -0,0 +1,285 @@
+# pi/datalog/binlog.py
+# -*- coding: utf-8 -*-
+# 세션 로그 바이너리 포맷 (.pxl) + 비동기 배치 로거
+#
+# 파일 구조 (append-only)
+#   [헤더]  b"PXLG" | u8 version | u32 json_len | json
+#           json = {"schema": [[name, typecode, kind], ...], "enums": {...},
+#                   "byteorder": "little"|"big", "created": ts, "meta": {...}}
+#   [청크]* b"CHNK" | u32 n_rows | u16 n_new_str | (u16 id, u8 len, utf8)*n_new_str
+#           | 컬럼별 연속 배열 (schema 순서, 각 n_rows개)
+#   - kind="enum": 헤더의 enums[name] 인덱스 (알 수 없는 값은 "OTHER")
+#   - kind="str" : 파일 단위 문자열 사전 id (새 문자열은 처음 등장한 청크에 정의, reason/profile 공용)
+#   - float 컬럼의 None은 NaN으로 저장
+import os
+import sys
+import json
+import time
+import struct
+import threading
+from array import array
+from collections import deque
+from datetime import datetime
+
+MAGIC = b"PXLG"
+CHUNK_MAGIC = b"CHNK"
+VERSION = 1
+
+STATES = ("SAFE", "WARN", "BRAKE", "FAILSAFE", "CORNER", "OTHER")
+
+# (이름, array typecode, 종류)
+SCHEMA = (
+    ("ts",         "d", "num"),
+    ("state",      "B", "enum"),
+    ("d_min_mm",   "f", "num"),
+    ("v_mps",      "f", "num"),
+    ("ttc_s",      "f", "num"),
+    ("target_deg", "h", "num"),
+    ("pwm_us",     "H", "num"),
+    ("reason",     "H", "str"),
+    ("d_front_mm", "f", "num"),   # read_triplet() 섹터 최소거리 (리플레이용 코너 입력)
+    ("d_left_mm",  "f", "num"),
+    ("d_right_mm", "f", "num"),
+    ("profile",    "H", "str"),   # 적응 프로파일 이름 (pi/profile.py, 끄면 "")
+    ("hint_dist_m", "f", "num"),  # 코너 판단에 쓴 경로 힌트 (pipeline.hint_cols, 없으면 NaN/0)
+    ("hint_dir",   "b", "num"),
+)
+FIELDS = tuple(n for n, _, _ in SCHEMA)
+
+NAN = float("nan")
+_HDR = struct.Struct("<4sBI")
+_CHK = struct.Struct("<4sIH")
+
+
+# ---------------- Writer ----------------
+class BinLogger:
+    """
+    비동기 배치 세션 로거
+    - log(...)는 튜플 하나를 deque에 넣고 끝 (락 없음, 포맷팅/디스크 I/O 없음)
+    - 백그라운드 스레드가 batch_rows개 또는 flush_s마다 모아서 컬럼 청크로 기록
+    - 파일이 max_bytes를 넘으면 다음 파일로 회전 (<prefix>_<stamp>_001.pxl ...)
+    - 큐가 max_queue를 넘으면 새 레코드는 버리고 dropped 카운트 (루프 블록 없음)
+    """
+    def __init__(self, log_dir="pi/logs", prefix="run", batch_rows=64, flush_s=0.5,
+                 max_bytes=16 * 1024 * 1024, max_queue=100000, meta=None):
+        os.makedirs(log_dir, exist_ok=True)
+        self.log_dir = log_dir
+        self.stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.prefix = prefix
+        self.batch_rows = int(batch_rows)
+        self.flush_s = float(flush_s)
+        self.max_bytes = int(max_bytes)
+        self.max_queue = int(max_queue)
+        self.meta = meta or {}
+
+        self.rows = 0
+        self.dropped = 0
+        self.chunks = 0
+        self.paths = []
+
+        self._q = deque()
+        self._wake = threading.Event()
+        self._alive = True
+        self._f = None
+        self._str_ids = {}
+        self._state_ids = {s: i for i, s in enumerate(STATES)}
+        self._open_next()
+
+        self._th = threading.Thread(target=self._run, daemon=True, name="binlog")
+        self._th.start()
+
+    @property
+    def path(self):
+        return self.paths[-1] if self.paths else None
+
+    # ---------- 생산자(제어 루프) ----------
+    def log(self, ts, state, d_min_mm=None, v_mps=None, ttc_s=None,
+            target_deg=None, pwm_us=None, reason="",
+            d_front_mm=None, d_left_mm=None, d_right_mm=None, profile="",
+            hint_dist_m=None, hint_dir=0):
+        q = self._q
+        if len(q) >= self.max_queue:
+            self.dropped += 1
+            return
+        q.append((ts, state, d_min_mm, v_mps, ttc_s, target_deg, pwm_us, reason,
+                  d_front_mm, d_left_mm, d_right_mm, profile, hint_dist_m, hint_dir))
+        if len(q) >= self.batch_rows:
+            self._wake.set()
+
+    # ---------- 파일 ----------
+    def _open_next(self):
+        if self._f is not None:
+            self._f.close()
+        n = len(self.paths)
+        name = f"{self.prefix}_{self.stamp}.pxl" if n == 0 else f"{self.prefix}_{self.stamp}_{n:03d}.pxl"
+        path = os.path.join(self.log_dir, name)
+        self._f = open(path, "ab")
+        self._str_ids = {}  # 문자열 사전은 파일 단위
+        hdr = {
+            "schema": [list(x) for x in SCHEMA],
+            "enums": {"state": list(STATES)},
+            "byteorder": sys.byteorder,
+            "created": time.time(),
+            "part": n,
+            "meta": self.meta,
+        }
+        js = json.dumps(hdr).encode("utf-8")
+        self._f.write(_HDR.pack(MAGIC, VERSION, len(js)) + js)
+        self._f.flush()
+        self.paths.append(path)
+
+    # ---------- 소비자(백그라운드) ----------
+    def _encode(self, batch):
+        n = len(batch)
+        cols = [array(tc) for _, tc, _ in SCHEMA]
+        c_ts, c_st, c_d, c_v, c_ttc, c_tgt, c_pwm, c_rs, c_df, c_dl, c_dr, c_pf, c_hd, c_hr = cols
+        new_strs = []
+        sid = self._state_ids
+        other = sid["OTHER"]
+        strs = self._str_ids
+        def str_id(x):
+            x = x or ""
+            i = strs.get(x)
+            if i is None:
+                i = strs[x] = len(strs)
+                new_strs.append((i, x.encode("utf-8")[:255]))
+            return i
+
+        for ts, st, d, v, ttc, tgt, pwm, rs, df, dl, dr, pf, hd, hr in batch:
+            c_ts.append(ts)
+            c_st.append(sid.get(st, other))
+            c_d.append(NAN if d is None else d)
+            c_v.append(NAN if v is None else v)
+            c_ttc.append(NAN if ttc is None else ttc)
+            c_tgt.append(-1 if tgt is None else int(tgt))
+            c_pwm.append(0 if pwm is None else int(pwm))
+            c_rs.append(str_id(rs))
+            c_df.append(NAN if df is None else df)
+            c_dl.append(NAN if dl is None else dl)
+            c_dr.append(NAN if dr is None else dr)
+            c_pf.append(str_id(pf))
+            c_hd.append(NAN if hd is None else hd)
+            c_hr.append(hr or 0)
+        out = [_CHK.pack(CHUNK_MAGIC, n, len(new_strs))]
+        for i, b in new_strs:
+            out.append(struct.pack("<HB", i, len(b)) + b)
+        out.extend(c.tobytes() for c in cols)
+        return b"".join(out)
+
+    def _drain(self):
+        q = self._q
+        while q:
+            batch = []
+            while q and len(batch) < 4096:
+                batch.append(q.popleft())
+            if self._f.tell() >= self.max_bytes:
+                self._open_next()  # 회전은 쓸 데이터가 있을 때만 (빈 파트 방지)
+            self._f.write(self._encode(batch))
+            self.rows += len(batch)
+            self.chunks += 1
+        self._f.flush()
+
+    def _run(self):
+        while self._alive:
+            self._wake.wait(self.flush_s)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception as e:
+                print("[LOG ERR]", e)
+                time.sleep(self.flush_s)
+
+    def close(self):
+        self._alive = False
+        self._wake.set()
+        self._th.join(timeout=2.0)
+        try:
+            self._drain()
+        finally:
+            self._f.close()
+
+
+# ---------------- Reader ----------------
+def read_header(f):
+    magic, ver, n = _HDR.unpack(f.read(_HDR.size))
+    if magic != MAGIC:
+        raise ValueError("not a .pxl session log")
+    if ver != VERSION:
+        raise ValueError(f"unsupported .pxl version {ver}")
+    return json.loads(f.read(n).decode("utf-8"))
+
+
+def read_binlog(path):
+    """
+    .pxl 파일 하나를 컬럼 단위로 읽는다.
+    반환: (header, cols)  cols = {name: array}, reason/state는 코드값 그대로
+          header["strings"] = reason id → 문자열 목록
+    (잘린 마지막 청크는 무시)
+    """
+    with open(path, "rb") as f:
+        hdr = read_header(f)
+        schema = hdr["schema"]
+        swap = hdr.get("byteorder", "little") != sys.byteorder
+        cols = {name: array(tc) for name, tc, _ in schema}
+        strings = {}
+        while True:
+            raw = f.read(_CHK.size)
+            if len(raw) < _CHK.size:
+                break
+            magic, n, n_new = _CHK.unpack(raw)
+            if magic != CHUNK_MAGIC:
+                raise ValueError(f"corrupt chunk in {path}")
+            ok = True
+            for _ in range(n_new):
+                h = f.read(3)
+                if len(h) < 3:
+                    ok = False
+                    break
+                i, ln = struct.unpack("<HB", h)
+                strings[i] = f.read(ln).decode("utf-8", errors="replace")
+            if not ok:
+                break
+            parts = []
+            for name, tc, _ in schema:
+                a = array(tc)
+                b = f.read(a.itemsize * n)
+                if len(b) < a.itemsize * n:
+                    ok = False
+                    break
+                a.frombytes(b)
+                if swap:
+                    a.byteswap()
+                parts.append((name, a))
+            if not ok:
+                break
+            for name, a in parts:
+                cols[name].extend(a)
+        hdr["strings"] = [strings.get(i, "") for i in range(len(strings))]
+        return hdr, cols
+
+
+def iter_rows(path):
+    """디코딩된 행 dict를 순서대로 (state/reason은 문자열, NaN/-1/0은 None)."""
+    hdr, cols = read_binlog(path)
+    states = hdr["enums"]["state"]
+    strings = hdr["strings"]
+    names = [n for n, _, _ in hdr["schema"]]
+    kinds = {n: k for n, _, k in hdr["schema"]}
+    n_rows = len(cols[names[0]]) if names else 0
+    for r in range(n_rows):
+        row = {}
+        for n in names:
+            v = cols[n][r]
+            k = kinds[n]
+            if k == "enum":
+                v = states[v] if v < len(states) else "OTHER"
+            elif k == "str":
+                v = strings[v] if v < len(strings) else ""
+            elif isinstance(v, float) and v != v:
+                v = None
+            elif n == "target_deg" and v == -1:
+                v = None
+            elif n == "pwm_us" and v == 0:
+                v = None
+            row[n] = v
+        yield row
@@ -0,0 +1,325 @@
+# pi/datalog/store.py
+# -*- coding: utf-8 -*-
+import os
+import csv
+import glob
+import json
+import time
+
+import numpy as np
+
+from pi.datalog.binlog import read_binlog
+
+CACHE_NAME = ".session_store.npz"
+
+# 통합 컬럼 (이름, dtype, 결측값)
+COLUMNS = (
+    ("ts",            np.float64, np.nan),
+    ("state",         np.int16,   -1),     # states 테이블 인덱스
+    ("d_min_mm",      np.float32, np.nan),
+    ("v_mps",         np.float32, np.nan),
+    ("ttc_s",         np.float32, np.nan),
+    ("target_deg",    np.int16,   -1),
+    ("pwm_us",        np.int16,   -1),
+    ("reason",        np.int16,   -1),     # reasons 테이블 인덱스
+    ("corner_active", np.int8,    -1),
+    ("corner_score",  np.float32, np.nan),
+    ("d_front_mm",    np.float32, np.nan),   # 코너 입력(read_triplet), .pxl에만 있음
+    ("d_left_mm",     np.float32, np.nan),
+    ("d_right_mm",    np.float32, np.nan),
+    ("hint_dist_m",   np.float32, np.nan),   # 코너 판단에 쓴 경로 힌트 (pipeline.hint_cols)
+    ("hint_dir",      np.int8,    0),
+)
+
+# 세션별 CSV 헤더 차이 흡수 (예전 로그는 d_q_mm)
+_ALIASES = {"d_q_mm": "d_min_mm"}
+
+
+def session_paths(log_dir):
+    """
+    log_dir의 세션 파일 (*.csv + *.pxl, 이름순)
+    같은 이름의 .pxl이 있는 .csv(binlog2csv 변환본)는 같은 세션이므로 빼고 .pxl만
+    """
+    pxl = glob.glob(os.path.join(log_dir, "*.pxl"))
+    have = {os.path.splitext(p)[0] for p in pxl}
+    csvs = [p for p in glob.glob(os.path.join(log_dir, "*.csv"))
+            if os.path.splitext(p)[0] not in have]
+    return sorted(csvs + pxl)
+
+
+def _num(v):
+    if v in (None, "", "NA", "None", "nan"):
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+def _bool(v):
+    if v in ("True", "true", "1"):
+        return 1
+    if v in ("False", "false", "0"):
+        return 0
+    return None
+
+
+class SessionStore:
+    """
+    pi/logs 세션(CSV 여러 스키마 + .pxl)을 한 번만 파싱해서 통합 컬럼 배열로 보관
+    - cols[name]: 전체 세션을 이어붙인 NumPy 배열, session: 행별 세션 인덱스
+    - 세션 경계: offsets[i]:offsets[i+1]
+    - state/reason은 문자열 테이블(states/reasons) 인덱스
+    - 디스크 캐시(.session_store.npz)는 파일별 (mtime, size)로 검증하고,
+      바뀐/추가된 파일만 다시 파싱
+
+    사용 예)
+      st = SessionStore.load("pi/logs")
+      eps = st.episodes("BRAKE", d_min_lt=400)
+      hist = st.dwell_histogram()
+      ttr = st.time_to_release(release_mm=1000)
+    """
+    def __init__(self, paths, cols, offsets, states, reasons):
+        self.paths = list(paths)
+        self.cols = cols
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.states = list(states)
+        self.reasons = list(reasons)
+        n = int(self.offsets[-1]) if len(self.offsets) else 0
+        self.session = np.repeat(np.arange(len(self.paths), dtype=np.int32),
+                                 np.diff(self.offsets)) if n else np.zeros(0, np.int32)
+        self._ep = None
+
+    def __len__(self):
+        return int(self.offsets[-1]) if len(self.offsets) else 0
+
+    # ---------------- 적재 ----------------
+    @staticmethod
+    def _manifest(paths):
+        m = {}
+        for p in paths:
+            st = os.stat(p)
+            m[os.path.basename(p)] = [st.st_mtime_ns, st.st_size]
+        return m
+
+    @classmethod
+    def load(cls, log_dir="pi/logs", use_cache=True, verbose=False):
+        t0 = time.time()
+        paths = session_paths(log_dir)
+        manifest = cls._manifest(paths)
+        cache_path = os.path.join(log_dir, CACHE_NAME)
+
+        cached = cls._read_cache(cache_path) if use_cache else None
+        reused = {}
+        if cached is not None:
+            old, old_manifest = cached
+            for i, p in enumerate(old.paths):
+                name = os.path.basename(p)
+                if manifest.get(name) == old_manifest.get(name):
+                    reused[name] = (old, i)
+
+        per_session = []
+        states, reasons = {}, {}
+        parsed = 0
+        for p in paths:
+            name = os.path.basename(p)
+            if name in reused:
+                old, i = reused[name]
+                per_session.append(old._session_slice(i, states, reasons))
+            else:
+                per_session.append(parse_session(p, states, reasons))
+                parsed += 1
+
+        cols = {}
+        offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(s["ts"]) for s in per_session])
+        for name, dt, fill in COLUMNS:
+            if per_session:
+                cols[name] = np.concatenate([np.asarray(s[name], dtype=dt) for s in per_session])
+            else:
+                cols[name] = np.zeros(0, dtype=dt)
+
+        store = cls(paths, cols, offsets,
+                    sorted(states, key=states.get), sorted(reasons, key=reasons.get))
+        if use_cache and (parsed or cached is None or len(reused) != len(cached[0].paths)):
+            store._write_cache(cache_path, manifest)
+        if verbose:
+            print(f"[STORE] {len(paths)} sessions / {len(store)} rows "
+                  f"(parsed {parsed}, cached {len(paths) - parsed}) in {(time.time()-t0)*1000:.0f}ms")
+        return store
+
+    def _session_slice(self, i, states, reasons):
+        """캐시된 세션 i를 새 문자열 테이블 기준으로 다시 코딩해서 반환."""
+        a, b = self.offsets[i], self.offsets[i + 1]
+        out = {name: self.cols[name][a:b] for name, _, _ in COLUMNS}
+        for key, table, mine in (("state", states, self.states), ("reason", reasons, self.reasons)):
+            remap = np.array([table.setdefault(s, len(table)) for s in mine] + [-1], dtype=np.int16)
+            out[key] = remap[out[key]]  # -1 → 마지막 원소(-1)
+        return out
+
+    @classmethod
+    def _read_cache(cls, path):
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                meta = json.loads(str(z["meta"]))
+                cols = {name: z[name] for name, _, _ in COLUMNS}
+                store = cls(meta["paths"], cols, z["offsets"], meta["states"], meta["reasons"])
+            return store, meta["manifest"]
+        except Exception:
+            return None
+
+    def _write_cache(self, path, manifest):
+        meta = {"paths": [os.path.basename(p) for p in self.paths], "manifest": manifest,
+                "states": self.states, "reasons": self.reasons}
+        tmp = path + ".tmp.npz"
+        try:
+            np.savez(tmp, meta=np.array(json.dumps(meta)), offsets=self.offsets, **self.cols)
+            os.replace(tmp, path)
+        except Exception as e:
+            print("[STORE] cache write failed:", e)
+
+    # ---------------- 조회 ----------------
+    def state_code(self, name):
+        return self.states.index(name) if name in self.states else -2
+
+    def session_name(self, i):
+        return os.path.basename(self.paths[i])
+
+    def _episodes(self):
+        """연속 동일 state 구간 (세션 경계에서 끊음). 결과는 캐시."""
+        if self._ep is not None:
+            return self._ep
+        st, sess, ts = self.cols["state"], self.session, self.cols["ts"]
+        n = len(st)
+        if n == 0:
+            self._ep = {k: np.zeros(0) for k in ("start", "end", "state", "session", "t0", "t1", "dur")}
+            return self._ep
+        chg = np.empty(n, dtype=bool)
+        chg[0] = True
+        chg[1:] = (st[1:] != st[:-1]) | (sess[1:] != sess[:-1])
+        start = np.flatnonzero(chg)
+        end = np.append(start[1:], n)                  # exclusive
+        # 구간 종료 시각: 같은 세션의 다음 행 시작 시각 (세션 끝이면 마지막 행)
+        nxt = np.minimum(end, n - 1)
+        same = (end < n) & (sess[nxt] == sess[start])
+        t1 = np.where(same, ts[nxt], ts[end - 1])
+        self._ep = {
+            "start": start, "end": end,
+            "state": st[start], "session": sess[start],
+            "t0": ts[start], "t1": t1, "dur": t1 - ts[start],
+        }
+        return self._ep
+
+    def episodes(self, state="BRAKE", d_min_lt=None):
+        """
+        state 구간 목록. d_min_lt를 주면 구간 내 최소 d_min_mm < d_min_lt 인 것만.
+        반환: dict of arrays (session, t0, t1, dur, d_min_mm, start, end)
+        """
+        ep = self._episodes()
+        sel = ep["state"] == self.state_code(state)
+        d = self.cols["d_min_mm"]
+        if len(d):
+            # NaN 무시 최소값 (구간 전체가 NaN이면 NaN)
+            dmin = np.fmin.reduceat(d, ep["start"]) if len(ep["start"]) else np.zeros(0, np.float32)
+        else:
+            dmin = np.zeros(0, np.float32)
+        if d_min_lt is not None:
+            sel &= dmin < d_min_lt
+        return {
+            "session": ep["session"][sel], "t0": ep["t0"][sel], "t1": ep["t1"][sel],
+            "dur": ep["dur"][sel], "d_min_mm": dmin[sel],
+            "start": ep["start"][sel], "end": ep["end"][sel],
+        }
+
+    def dwell_histogram(self, bins=(0, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30, 60, np.inf)):
+        """state별 체류 시간(초) 히스토그램. 반환: {state: (counts, edges)}"""
+        ep = self._episodes()
+        edges = np.asarray(bins, dtype=float)
+        out = {}
+        for code, name in enumerate(self.states):
+            dur = ep["dur"][ep["state"] == code]
+            out[name] = (np.histogram(dur, bins=edges)[0], edges)
+        return out
+
+    def time_to_release(self, state="BRAKE", release_mm=1000.0):
+        """
+        state 구간마다, d_min_mm가 처음 release_mm를 넘은 시각 → 구간 종료까지 걸린 시간(초).
+        구간 안에서 한 번도 안 넘었으면 NaN.
+        """
+        ep = self.episodes(state)
+        d, ts = self.cols["d_min_mm"], self.cols["ts"]
+        over = np.nan_to_num(d, nan=-1.0) > release_mm
+        # 각 행 이후(포함) 첫 over 행 인덱스
+        idx = np.where(over, np.arange(len(d)), len(d))
+        first_after = np.minimum.accumulate(idx[::-1])[::-1] if len(d) else idx
+        out = np.full(len(ep["start"]), np.nan)
+        if len(d):
+            f = first_after[ep["start"]]
+            ok = f < ep["end"]
+            out[ok] = ep["t1"][ok] - ts[f[ok]]
+        return out
+
+    def state_counts(self):
+        st = self.cols["state"]
+        cnt = np.bincount(st[st >= 0], minlength=len(self.states))
+        return dict(zip(self.states, cnt.tolist()))
+
+
+def parse_session(path, states, reasons):
+    """
+    세션 파일 하나 → 통합 컬럼 리스트 dict (state/reason은 전역 테이블로 코딩)
+    SessionStore 없이 한 세션만 읽을 때(tools.replay 워커)도 사용. 결측값은 COLUMNS의 fill
+    """
+    cols = {name: [] for name, _, _ in COLUMNS}
+    if path.endswith(".pxl"):
+        hdr, c = read_binlog(path)
+        enum = hdr["enums"]["state"]
+        strings = hdr["strings"]
+        n = len(c["ts"])
+        cols["ts"] = list(c["ts"])
+        cols["state"] = [states.setdefault(enum[s], len(states)) for s in c["state"]]
+        for k in ("d_min_mm", "v_mps", "ttc_s"):
+            cols[k] = list(c[k])
+        cols["target_deg"] = list(c["target_deg"])
+        cols["pwm_us"] = [p if p else -1 for p in c["pwm_us"]]
+        cols["reason"] = [reasons.setdefault(strings[r], len(reasons)) if strings[r] else -1
+                          for r in c["reason"]]
+        cols["corner_active"] = [1 if enum[s] == "CORNER" else 0 for s in c["state"]]
+        cols["corner_score"] = [np.nan] * n
+        for k in ("d_front_mm", "d_left_mm", "d_right_mm", "hint_dist_m"):
+            cols[k] = list(c[k]) if k in c else [np.nan] * n  # 예전 .pxl엔 없음
+        cols["hint_dir"] = list(c["hint_dir"]) if "hint_dir" in c else [0] * n
+        return cols
+
+    with open(path, "r", newline="") as f:
+        r = csv.reader(f)
+        header = next(r, None) or []
+        idx = {_ALIASES.get(h, h): i for i, h in enumerate(header)}
+        g = lambda row, k: row[idx[k]] if k in idx and idx[k] < len(row) else None
+        for row in r:
+            if not row:
+                continue
+            ts = _num(g(row, "ts"))
+            if ts is None:
+                continue
+            s = g(row, "state")
+            cols["ts"].append(ts)
+            cols["state"].append(states.setdefault(s, len(states)) if s else -1)
+            for k in ("d_min_mm", "v_mps", "ttc_s", "corner_score",
+                      "d_front_mm", "d_left_mm", "d_right_mm"):
+                v = _num(g(row, k))
+                cols[k].append(np.nan if v is None else v)
+            for k in ("target_deg", "pwm_us"):
+                v = _num(g(row, k))
+                cols[k].append(-1 if v is None else int(v))
+            v = _num(g(row, "hint_dist_m"))
+            cols["hint_dist_m"].append(np.nan if v is None else v)
+            v = _num(g(row, "hint_dir"))
+            cols["hint_dir"].append(0 if v is None else int(v))
+            rs = g(row, "reason")
+            cols["reason"].append(reasons.setdefault(rs, len(reasons)) if rs else -1)
+            ca = _bool(g(row, "corner_active"))
+            cols["corner_active"].append(-1 if ca is None else ca)
+    return cols
@@ -0,0 +1,3 @@
+from .fsm import DecisionFSM, FsmParams
+from .corner import CornerDetector, CornerParams
+from .pipeline import PWM_MAP, DecisionStep, apply_corner, pwm_for, hint_cols, hint_from_cols
@@ -11,12 +11,26 @@ class CornerParams:
                  leave_dist_mm=1500,         # 충분히 멀어지면 해제
                  side_imbalance_mm=1200,      # 좌/우 거리 차이로 코너 판단 기준
                  front_drop_mmps=200,        # 정면 거리 감소율로 접근 판단
-                 rec_speed_kmh=10.0):        # 감속 목표속도(km/h)
+                 rec_speed_kmh=10.0,         # 감속 목표속도(km/h)
+                 route_decel_mps2=1.5,       # 경로 힌트: 목표속도까지 감속 가정(m/s²)
+                 route_lead_s=1.5,           # 경로 힌트: 반응/GPS 오차 여유 시간
+                 route_min_m=5.0,            # 경로 힌트: 진입 거리 하한/상한
+                 route_max_m=40.0):
         self.enter_dist_mm = enter_dist_mm
         self.leave_dist_mm = leave_dist_mm
         self.side_imbalance_mm = side_imbalance_mm
         self.front_drop_mmps = front_drop_mmps
         self.rec_speed_mps = rec_speed_kmh / 3.6
+        self.route_decel_mps2 = route_decel_mps2
+        self.route_lead_s = route_lead_s
+        self.route_min_m = route_min_m
+        self.route_max_m = route_max_m
+
+    def route_enter_m(self, v_mps):
+        """경로상 회전까지 이 거리 이내면 감속 시작: (v² - v_rec²)/2a + v·lead, [min, max]로 제한."""
+        v = max(v_mps or 0.0, self.rec_speed_mps)
+        d = (v * v - self.rec_speed_mps ** 2) / (2.0 * self.route_decel_mps2) + v * self.route_lead_s
+        return min(self.route_max_m, max(self.route_min_m, d))
 
 
 class CornerDetector:
@@ -24,15 +38,26 @@ class CornerDetector:
     코너 감속 판정기
     - LIDAR 섹터 거리 기반으로 코너 접근 감지
     - FSM 충돌방지와 독립 동작 (state 오버라이드용)
+    - route_hint(pi.route_hint.RouteHintReceiver.latest())가 있으면 라이다에 코너가 보이기 전에도
+      경로상 다음 회전까지 거리로 미리 감속 (라이다 판정 히스테리시스와 별개로 OR)
     """
 
-    def __init__(self, p: CornerParams):
+    def __init__(self, p: CornerParams, clock=time.time):
         self.p = p
+        self.clock = clock  # 리플레이 시 가상 시계 주입
         self.active = False
         self.last_side_diff = 0.0
         self.last_update_t = 0.0
 
-    def update(self, d_front, d_left, d_right, v_mps):
+    def _route_near(self, hint, v_mps):
+        # 경로 이탈(on_route=False) 중의 힌트는 지금 달리는 길과 무관 → 무시
+        if not hint or not hint.get("on_route") or not hint.get("direction") or hint.get("dist_m") is None:
+            return None
+        if hint["dist_m"] > self.p.route_enter_m(v_mps):
+            return None
+        return "route_turn_left" if hint["direction"] < 0 else "route_turn_right"
+
+    def update(self, d_front, d_left, d_right, v_mps, route_hint=None):
         """
         코너 감속 판정 업데이트
         returns dict:
@@ -40,15 +65,18 @@ class CornerDetector:
                 "active": bool,
                 "rec_speed_mps": float,
                 "score": float,
-                "reason": str
+                "reason": str,
+                "route": bool      # 경로 힌트로 활성
             }
         """
-        now = time.time()
+        now = self.clock()
         dt = now - self.last_update_t if self.last_update_t else 0.1
         self.last_update_t = now
+        route_reason = self._route_near(route_hint, v_mps)
 
         if any(v is None for v in [d_front, d_left, d_right]):
-            return {"active": self.active, "rec_speed_mps": self.p.rec_speed_mps, "score": 0.0, "reason": "no_data"}
+            return {"active": self.active or bool(route_reason), "rec_speed_mps": self.p.rec_speed_mps,
+                    "score": 0.0, "reason": route_reason or "no_data", "route": bool(route_reason)}
 
         side_diff = abs(d_left - d_right)
         side_bias = "left" if d_left < d_right else "right"
@@ -77,10 +105,13 @@ class CornerDetector:
                 reason = "corner_hold"
 
         self.last_side_diff = side_diff
+        if route_reason and not self.active:
+            reason = route_reason
 
         return {
-            "active": self.active,
+            "active": self.active or bool(route_reason),
             "rec_speed_mps": self.p.rec_speed_mps,
             "score": total_score,
-            "reason": reason
-        }
\ No newline at end of file
+            "reason": reason,
+            "route": bool(route_reason)
+        }
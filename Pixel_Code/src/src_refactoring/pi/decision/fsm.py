@@ -40,10 +40,11 @@ class FsmParams:
     dmin_floor_mm: int = 1               # 0 또는 음수 거리 보호
 
 class DecisionFSM:
-    def __init__(self, params: Optional[FsmParams] = None):
+    def __init__(self, params: Optional[FsmParams] = None, clock=time.time):
         self.p = params or FsmParams()
+        self.clock = clock  # 리플레이 시 가상 시계 주입
         self.state: str = "SAFE"
-        self.last_change: float = time.time()
+        self.last_change: float = clock()
 
         # 센서 유효/무효 카운터
         self._lost_cnt: int = 0
@@ -62,7 +63,7 @@ class DecisionFSM:
             if self.p.verbose:
                 print(f"[FSM] {self.state} → {s}  ({reason})")
             self.state = s
-            self.last_change = time.time()
+            self.last_change = self.clock()
             if s != "BRAKE":
                 self._brake_exit_ok_cnt = 0
 
@@ -101,9 +102,11 @@ class DecisionFSM:
 
     # ---------- 외부 API ----------
     def reset(self):
-        self.__init__(self.p)
+        self.__init__(self.p, self.clock)
 
-    def update(self, d_min_mm: Optional[float], v_mps: Optional[float] = None) -> Dict[str, Any]:
+    def update(self, d_min_mm: Optional[float], v_mps: Optional[float] = None,
+               trace_id: Optional[int] = None) -> Dict[str, Any]:
+        # trace_id: 지연 추적용 프레임 id (출력 dict에 그대로 전달)
         # 유효/무효 카운팅
         if d_min_mm is None or d_min_mm <= 0:
             self._lost_cnt += 1
@@ -126,6 +129,7 @@ class DecisionFSM:
                 "v_mps": v_mps,
                 "ttc": None,
                 "reason": "sensor_lost",
+                "trace_id": trace_id,
             }
 
         # TTC 계산
@@ -190,4 +194,5 @@ class DecisionFSM:
             "v_mps": v_mps,
             "ttc": None if ttc is None else round(ttc, 2),
             "reason": reason,
+            "trace_id": trace_id,
         }
\ No newline at end of file
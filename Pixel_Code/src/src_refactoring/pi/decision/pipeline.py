@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# app.py 판단 한 스텝 (실주행/리플레이 공용)
+#   step = DecisionStep(fsm, corner)
+#   out, corner_info, pwm_us = step.decide(d_min_mm, v_mps, (d_front, d_left, d_right), hint)
+#   = fsm.update → corner.update(route_hint) → apply_corner → pwm_for
+
+# 상태 → 서보 펄스폭(us)
+PWM_MAP = {
+    "SAFE": 2500,
+    "WARN": 1600,
+    "FAILSAFE": 2500,
+    "CORNER": 2000,
+    "BRAKE": 1500,
+}
+
+
+def apply_corner(out, corner_info, p):
+    """
+    코너 감속 활성 시 FSM 출력 상태를 CORNER로 덮어씀 (제자리 수정 후 반환).
+    SAFE에서만 올림 — WARN/BRAKE/FAILSAFE(충돌 회피, 라이다 끊김)는 코너/경로 힌트보다 우선
+    """
+    if corner_info["active"] and out["state"] == "SAFE":
+        out["state"] = "CORNER"
+        out["target_deg"] = p.warn_deg  # 필요 시 별도 값 설정 가능
+    return out
+
+
+def pwm_for(state):
+    return PWM_MAP.get(state, 2500)
+
+
+def hint_cols(hint):
+    """판단에 쓴 경로 힌트 → 로그 컬럼 (hint_dist_m, hint_dir). 경로 이탈/없음이면 (None, 0)."""
+    if not hint or not hint.get("on_route") or hint.get("dist_m") is None:
+        return None, 0
+    return hint["dist_m"], int(hint.get("direction") or 0)
+
+
+def hint_from_cols(dist_m, direction):
+    """hint_cols의 역변환 (리플레이에서 기록된 힌트를 CornerDetector에 다시 넣을 때)."""
+    if dist_m is None or not direction:
+        return None
+    return {"dist_m": dist_m, "direction": direction, "on_route": True}
+
+
+class DecisionStep:
+    """
+    프레임 하나의 판단 (app.process_frame과 tools.replay가 같은 코드를 탐)
+    fsm/corner는 호출자가 만든 객체를 그대로 씀 → 핫리로드(fsm.p/corner.p 교체)·가상 시계 주입은 호출자 몫
+    """
+    def __init__(self, fsm, corner):
+        self.fsm = fsm
+        self.corner = corner
+
+    def decide(self, d_min_mm, v_mps, triplet, hint=None, trace_id=None, corner_info=None):
+        """
+        triplet: (d_front, d_left, d_right) 섹터 최소거리
+        corner_info: 주면 코너 감지 대신 이 값을 사용 (코너 입력 없이 판정만 기록된 예전 로그)
+        반환: (out, corner_info, pwm_us)
+        """
+        out = self.fsm.update(d_min_mm, v_mps=v_mps, trace_id=trace_id)
+        if corner_info is None:
+            d_front, d_left, d_right = triplet
+            corner_info = self.corner.update(d_front, d_left, d_right, v_mps, route_hint=hint)
+        apply_corner(out, corner_info, self.fsm.p)
+        return out, corner_info, pwm_for(out["state"])
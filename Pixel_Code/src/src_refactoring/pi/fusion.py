@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# 시각 정렬 센서 융합 버퍼: 센서별 (시각, 값) 링버퍼 → 라이다 프레임 시각의 값으로 보간
+#   fusion = SensorFusion()
+#   fusion.add("speed", t_mono, v_mps)                  # Hall 스레드 등 어디서든
+#   v, stale_s = fusion.at("speed", frame_time(t0, t1)) # 프레임이 찍힌 순간의 속도
+#
+# - 구간 안: 선형 보간, stale_s = 가장 가까운 실제 샘플까지 시간
+# - 마지막 샘플 뒤: 마지막 두 샘플 기울기로 max_extrap_s까지만 외삽, 그 뒤는 유지. stale_s = t - t_last
+# - stale_s가 max_stale_s를 넘으면 값 None (오래된 속도로 TTC 계산하지 않음)
+# 시각은 모두 time.monotonic (라이다 frame_t0/t1, Hall 수신 시각과 같은 시계)
+import bisect
+import threading
+from collections import deque
+
+from pi.scheduler import Histogram
+
+# 입력 지연(stale) 히스토그램 경계(ms)
+STALE_EDGES_MS = (1, 5, 10, 20, 50, 100, 200, 500)
+
+
+def frame_time(t0, t1):
+    """프레임 대표 시각 = 첫 샘플 ~ 완성의 중간 (없으면 있는 쪽)."""
+    if t0 is None:
+        return t1
+    if t1 is None:
+        return t0
+    return 0.5 * (t0 + t1)
+
+
+class TimedSeries:
+    """
+    (시각, 값) 링버퍼. 쓰기 스레드(Hall)와 읽기(판단 루프)는 짧은 락으로 스냅샷만 주고받음
+    maxlen: 보관 샘플 수 (Hall 20 Hz × 64 ≈ 3 s)
+    """
+    def __init__(self, maxlen=64, max_extrap_s=0.2, max_stale_s=0.5, clamp_min=None):
+        self._t = deque(maxlen=maxlen)
+        self._v = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.max_extrap_s = float(max_extrap_s)
+        self.max_stale_s = float(max_stale_s)
+        self.clamp_min = clamp_min
+        self.stale = Histogram(STALE_EDGES_MS)
+        self.misses = 0
+
+    def add(self, t, v):
+        with self._lock:
+            if self._t and t < self._t[-1]:
+                return  # 시각 역행 샘플은 버림
+            self._t.append(t)
+            self._v.append(v)
+
+    def latest(self):
+        with self._lock:
+            return (self._t[-1], self._v[-1]) if self._t else (None, None)
+
+    def __len__(self):
+        return len(self._t)
+
+    def at(self, t):
+        """t 시각의 값 → (값 또는 None, stale_s 또는 None)."""
+        with self._lock:
+            ts = list(self._t)
+            vs = list(self._v)
+        if not ts or t is None:
+            self.misses += 1
+            return None, None
+        i = bisect.bisect_right(ts, t)
+        if i == 0:
+            v, stale = vs[0], ts[0] - t
+        elif i == len(ts):
+            stale = t - ts[-1]
+            v = vs[-1]
+            if len(ts) >= 2 and ts[-1] > ts[-2]:
+                slope = (vs[-1] - vs[-2]) / (ts[-1] - ts[-2])
+                v = vs[-1] + slope * min(stale, self.max_extrap_s)
+        else:
+            t_a, t_b = ts[i - 1], ts[i]
+            w = (t - t_a) / (t_b - t_a) if t_b > t_a else 1.0
+            v = vs[i - 1] + (vs[i] - vs[i - 1]) * w
+            stale = min(t - t_a, t_b - t)
+        self.stale.add(stale * 1000.0)
+        if stale > self.max_stale_s:
+            self.misses += 1
+            return None, stale
+        if self.clamp_min is not None and v < self.clamp_min:
+            v = self.clamp_min
+        return v, stale
+
+
+class SensorFusion:
+    """센서 이름별 TimedSeries 묶음 + 입력 지연 통계 (Metrics.route('/fusion')로 노출)."""
+    def __init__(self):
+        self.series = {}
+        self.last_stale = {}
+
+    def channel(self, name, **kw):
+        if name not in self.series:
+            self.series[name] = TimedSeries(**kw)
+        return self.series[name]
+
+    def add(self, name, t, v):
+        self.channel(name).add(t, v)
+
+    def at(self, name, t):
+        s = self.series.get(name)
+        if s is None:
+            return None, None
+        v, stale = s.at(t)
+        self.last_stale[name] = stale
+        return v, stale
+
+    def note(self, name, stale_s):
+        """보간 없이 지연만 기록하는 입력 (예: 라이다 프레임 → 판단 시각)."""
+        s = self.channel(name)
+        if stale_s is not None:
+            s.stale.add(stale_s * 1000.0)
+        self.last_stale[name] = stale_s
+
+    def report(self):
+        out = {}
+        for name, s in self.series.items():
+            st = s.stale
+            out[name] = {
+                "samples": len(s), "misses": s.misses,
+                "stale_ms": {"p50": round(st.quantile(0.5), 3), "p99": round(st.quantile(0.99), 3),
+                             "mean": round(st.mean(), 3), "max": round(st.max, 3)},
+                "last_stale_ms": None if self.last_stale.get(name) is None
+                else round(self.last_stale[name] * 1000.0, 2),
+            }
+        return out
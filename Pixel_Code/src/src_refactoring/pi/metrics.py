@@ -0,0 +1,127 @@
+# pi/metrics.py
+# -*- coding: utf-8 -*-
+import json
+import time
+import threading
+
+from pi.scheduler import Histogram
+
+# 스테이지 처리시간 버킷(ms)
+STAGE_EDGES_MS = (0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Metrics:
+    """
+    저오버헤드 핫패스 계측
+    - 스테이지 타이머: perf_counter 기반, 스테이지별 고정 버킷 히스토그램(미리 할당)
+        t = m.now()
+        d = sensor.read();  t = m.lap("sensor", t)
+        out = fsm.update(d); t = m.lap("fsm", t)
+    - 카운터: m.inc("frames"), 게이지: m.gauge("dropped_points", lambda: sensor.dropped_points)
+      (게이지 함수는 내보낼 때만 호출 → 루프 비용 없음)
+    - 내보내기: 루프백 HTTP (GET /metrics → JSON) + 주기적 한 줄 요약(maybe_summary)
+    """
+    def __init__(self, stages=(), summary_s=5.0):
+        self.now = time.perf_counter
+        self.hist = {s: Histogram(STAGE_EDGES_MS) for s in stages}
+        self.counters = {}
+        self._lock = threading.Lock()   # counters: 루프 스레드 inc ↔ HTTP 스레드 snapshot
+        self.gauges = {}
+        self.summary_s = float(summary_s)
+        self.t_start = time.time()
+        self._last_summary = time.monotonic()
+        self._server = None
+        self.routes = {}
+
+    # ---------- 핫패스 ----------
+    def lap(self, stage, t0):
+        """stage 처리시간(t0→지금)을 기록하고 지금 시각 반환 (다음 스테이지의 t0)."""
+        t1 = self.now()
+        h = self.hist.get(stage)
+        if h is None:
+            h = self.hist[stage] = Histogram(STAGE_EDGES_MS)
+        h.add((t1 - t0) * 1000.0)
+        return t1
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, fn):
+        self.gauges[name] = fn
+
+    # ---------- 내보내기 ----------
+    def snapshot(self):
+        g = {}
+        for k, fn in list(self.gauges.items()):
+            try:
+                g[k] = fn()
+            except Exception:
+                g[k] = None
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "uptime_s": round(time.time() - self.t_start, 1),
+            "counters": counters,
+            "gauges": g,
+            "stages_ms": {s: dict(h.as_dict(), p50=round(h.quantile(0.5), 3),
+                                  p99=round(h.quantile(0.99), 3))
+                          for s, h in list(self.hist.items())},
+        }
+
+    def summary(self):
+        snap = self.snapshot()   # GET / (HTTP 스레드)에서도 불림 → 카운터는 락 잡고 복사한 것으로
+        parts = [f"{s}={h.mean():.2f}/{h.max:.1f}" for s, h in list(self.hist.items()) if h.n]
+        cnt = " ".join(f"{k}={v}" for k, v in snap["counters"].items())
+        g = " ".join(f"{k}={v}" for k, v in snap["gauges"].items())
+        return f"[METRICS] ms(mean/max) {' '.join(parts)} | {cnt} {g}".rstrip()
+
+    def maybe_summary(self):
+        """summary_s마다 한 줄 요약 출력 (0이면 끔)."""
+        if self.summary_s <= 0:
+            return
+        now = time.monotonic()
+        if now - self._last_summary >= self.summary_s:
+            self._last_summary = now
+            print(self.summary())
+
+    def route(self, path, fn):
+        """추가 JSON 엔드포인트 등록 (예: m.route("/trace", tracer.report))."""
+        self.routes[path] = fn
+
+    def serve(self, port=8765, host="127.0.0.1"):
+        """GET /metrics (JSON), GET / (한 줄 요약), route()로 등록한 경로를 루프백에서 제공."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # metrics_port 0(오프라인 실행)이면 import 안 함
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fn = metrics.routes.get(self.path)
+                if fn is not None:
+                    body = json.dumps(fn()).encode()
+                    ctype = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = json.dumps(metrics.snapshot()).encode()
+                    ctype = "application/json"
+                else:
+                    body = (metrics.summary() + "\n").encode()
+                    ctype = "text/plain; charset=utf-8"
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *a):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="metrics").start()
+        return self._server.server_address
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,112 @@
+# pi/profile.py
+# -*- coding: utf-8 -*-
+# 속도/TTC 적응 프로파일: 루프 주기, 라이다 모터 PWM, 프레임 크기, Hall 폴링 주기를 상황에 맞춰 선택
+#   idle     : 정지/저속 → 낮은 주기·모터 속도 (CPU/전력 절약)
+#   cruise   : 평상 주행 (기존 고정값과 같음)
+#   approach : TTC가 짧음 → 높은 주기·회전수, 짧은 프레임 (장애물 접근 중 반응 시간 단축)
+#
+#   mgr = ProfileManager(cfg.profile)
+#   prof, changed = mgr.update(v_mps, ttc_s)   # 판단 후 매 틱
+#   if changed: sched.set_period(prof.period_s); sensor.apply_profile(prof); hall.set_poll_ms(...)
+#
+# 히스테리시스
+#   - 진입/이탈 임계값을 따로 둠 (idle: enter < exit 속도, approach: enter < exit TTC)
+#   - 높은 단계(빠른 쪽)로는 즉시, 낮은 단계로는 조건이 hold_s 동안 유지돼야 전환
+import time
+from dataclasses import dataclass
+
+LEVELS = ("idle", "cruise", "approach")
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str = "cruise"
+    period_s: float = 0.1      # 폴링 루프 주기 (LoopScheduler)
+    pwm: int = 650             # 라이다 모터 PWM
+    frame_points: int = 720    # 프레임당 최대 포인트
+    frame_ms: int = 100        # 프레임 수집 시간 상한 (루프 주기보다 길면 주기를 못 맞춤)
+    hall_poll_ms: int = 50     # HallThread GET_STAT 간격
+
+
+DEFAULT_LEVELS = (
+    Profile("idle", period_s=0.2, pwm=450, frame_points=360, frame_ms=150, hall_poll_ms=100),
+    Profile("cruise", period_s=0.1, pwm=650, frame_points=720, frame_ms=100, hall_poll_ms=50),
+    Profile("approach", period_s=0.05, pwm=850, frame_points=540, frame_ms=45, hall_poll_ms=25),
+)
+
+
+@dataclass(frozen=True)
+class ProfileParams:
+    enabled: bool = False          # config에 profile 섹션이 없으면 기존 고정값 그대로
+    idle_enter_mps: float = 0.2    # 이 속도 미만 → idle
+    idle_exit_mps: float = 0.5     # idle 중에는 이 속도 이상이어야 벗어남
+    approach_enter_ttc_s: float = 3.0
+    approach_exit_ttc_s: float = 4.5
+    hold_s: float = 1.0            # 낮은 단계 조건이 이 시간 유지돼야 내려감
+    levels: tuple = DEFAULT_LEVELS  # LEVELS 순서
+
+    def level(self, name):
+        return self.levels[LEVELS.index(name)]
+
+
+class ProfileManager:
+    """
+    update()는 판단 루프에서만 호출 (락 없음). p는 핫리로드 때 참조 교체
+    - 속도 None(Hall 없음/오래됨)은 주행 중으로 취급 → idle로 내려가지 않음
+    - TTC None(접근 중 아님/프레임 없음)은 무한대로 취급
+    ticks: 프로파일별 틱 수, switches: 전환 횟수
+    """
+    def __init__(self, params, start="cruise", clock=time.monotonic):
+        self.p = params
+        self._clock = clock
+        self.level = LEVELS.index(start)
+        self.switches = 0
+        self.ticks = {n: 0 for n in LEVELS}
+        self._down_since = None
+
+    @property
+    def current(self):
+        return self.p.levels[self.level]
+
+    def target(self, v_mps, ttc_s):
+        """지금 값으로 원하는 단계 (현재 단계에 따라 이탈 임계값 적용)."""
+        p = self.p
+        cur = self.level
+        ttc_lim = p.approach_exit_ttc_s if cur == 2 else p.approach_enter_ttc_s
+        if ttc_s is not None and ttc_s < ttc_lim:
+            return 2
+        v_lim = p.idle_exit_mps if cur == 0 else p.idle_enter_mps
+        if v_mps is not None and v_mps < v_lim:
+            return 0
+        return 1
+
+    def update(self, v_mps, ttc_s):
+        """→ (Profile, 바뀌었는지)"""
+        want = self.target(v_mps, ttc_s)
+        changed = False
+        if want > self.level:
+            self.level = want
+            self._down_since = None
+            changed = True
+        elif want < self.level:
+            now = self._clock()
+            if self._down_since is None:
+                self._down_since = now
+            elif now - self._down_since >= self.p.hold_s:
+                self.level = want
+                self._down_since = None
+                changed = True
+        else:
+            self._down_since = None
+        if changed:
+            self.switches += 1
+        prof = self.p.levels[self.level]
+        self.ticks[prof.name] += 1
+        return prof, changed
+
+    def stats(self):
+        return {"profile": self.current.name, "switches": self.switches, "ticks": dict(self.ticks)}
+
+    def summary(self):
+        t = " ".join(f"{n}={c}" for n, c in self.ticks.items())
+        return f"[PROFILE] now={self.current.name} switches={self.switches} ticks {t}"
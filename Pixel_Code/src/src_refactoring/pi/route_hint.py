@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# 내비게이션 → 판단 루프 경로 힌트 (다음 회전까지 거리/방향), 로컬 UDP
+#   내비 프로세스:  pub = RouteHintPublisher(port=9871)
+#                   pub.publish(ts, dist_turn_m, turn_type, dist_dest_m, v_mps)
+#   판단 프로세스:  rx = RouteHintReceiver(port=9871); rx.start()
+#                   hint = rx.latest(v_mps)   # 오래됐으면 None, dist_m은 수신 후 이동거리만큼 보정
+#
+# 수신은 별도 스레드가 받아 최신 값 하나만 보관 → 제어 루프는 속성 읽기만 함
+# (Navigation_Pilot, scooter 스크립트도 pi_path.py로 이 모듈을 그대로 import)
+import math
+import time
+import socket
+import struct
+import threading
+
+MAGIC = b"PXN1"
+
+# magic | seq u32 | ts f64 | dist_turn_m f32 | dist_dest_m f32 | v_mps f32
+# | turn_type u16 | direction i8 | flags u8   (= 32 bytes)
+PACKET = struct.Struct("<4sIdfffHbB")
+FLAG_ON_ROUTE = 0x01
+
+NAN = float("nan")
+
+# turnType → 방향 (-1 좌, +1 우, 0 회전 아님)
+# 211/212는 Cap.announce_turn 규칙(211 우회전, 212 좌회전), 나머지는 TMap 일반 회전 코드
+TURN_DIR = {
+    211: 1, 212: -1,
+    12: -1, 13: 1, 16: -1, 17: -1, 18: 1, 19: 1,
+}
+
+
+def turn_direction(turn_type):
+    return TURN_DIR.get(int(turn_type or 0), 0)
+
+
+def decode(data):
+    """패킷 → dict (잘못된 패킷이면 None). NaN/0은 None으로."""
+    if len(data) != PACKET.size or data[:4] != MAGIC:
+        return None
+    _, seq, ts, d_turn, d_dest, v, tt, direction, flags = PACKET.unpack(data)
+    return {
+        "seq": seq, "ts": ts,
+        "dist_turn_m": None if d_turn != d_turn else d_turn,
+        "dist_dest_m": None if d_dest != d_dest else d_dest,
+        "v_mps": None if v != v else v,
+        "turn_type": tt or None,
+        "direction": direction,
+        "on_route": bool(flags & FLAG_ON_ROUTE),
+    }
+
+
+def _f(v):
+    return NAN if v is None else float(v)
+
+
+class RouteHintPublisher:
+    """내비 쪽 송신. 논블로킹 UDP, 수신자가 없어도 실패는 카운트만."""
+    def __init__(self, host="127.0.0.1", port=9871):
+        self.addr = (host, int(port))
+        self.sent = 0
+        self.errors = 0
+        self._seq = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def publish(self, ts, dist_turn_m, turn_type, dist_dest_m=None, v_mps=None, on_route=True):
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        try:
+            pkt = PACKET.pack(MAGIC, self._seq, ts, _f(dist_turn_m), _f(dist_dest_m), _f(v_mps),
+                              int(turn_type or 0) & 0xFFFF, turn_direction(turn_type),
+                              FLAG_ON_ROUTE if on_route else 0)
+            self._sock.sendto(pkt, self.addr)
+            self.sent += 1
+            return True
+        except (OSError, struct.error):
+            self.errors += 1
+            return False
+
+    def close(self):
+        try:
+            self._sock.close()
+        except Exception:
+            pass
+
+
+class RouteHintReceiver:
+    """
+    판단 쪽 수신 스레드
+    - 최신 패킷 하나만 보관 (seq가 뒤로 가면 버림, 내비 재시작 시 seq 작아지면 stale_s 후 다시 받음)
+    - latest(v_mps): stale_s 넘게 새 힌트가 없으면 None
+                     dist_m = dist_turn_m - (수신 후 경과 × 속도)  (GPS 1 Hz 사이 보간)
+    """
+    def __init__(self, host="127.0.0.1", port=9871, stale_s=2.0, clock=time.monotonic):
+        self.addr = (host, int(port))
+        self.stale_s = float(stale_s)
+        self.clock = clock
+        self.received = 0
+        self.bad = 0
+        self._last = None      # (수신 시각, dict)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._th = None
+        self._sock = None
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.addr)
+        self._sock.settimeout(0.5)
+        self._th = threading.Thread(target=self._run, daemon=True, name="route-hint")
+        self._th.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                data, _ = self._sock.recvfrom(256)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.feed(data)
+
+    def feed(self, data, t=None):
+        """패킷 하나 반영 (수신 스레드/테스트 공용)."""
+        h = decode(data)
+        if h is None:
+            self.bad += 1
+            return None
+        t = self.clock() if t is None else t
+        with self._lock:
+            if self._last is not None and h["seq"] <= self._last[1]["seq"] \
+                    and t - self._last[0] <= self.stale_s:
+                return None
+            self._last = (t, h)
+            self.received += 1
+        return h
+
+    def latest(self, v_mps=None):
+        with self._lock:
+            last = self._last
+        if last is None:
+            return None
+        t_rx, h = last
+        age = self.clock() - t_rx
+        if age > self.stale_s:
+            return None
+        v = v_mps if isinstance(v_mps, (int, float)) and not math.isnan(v_mps) else h["v_mps"]
+        d = h["dist_turn_m"]
+        if d is not None and v:
+            d = max(0.0, d - v * age)
+        out = dict(h)
+        out["dist_m"] = d
+        out["age_s"] = age
+        return out
+
+    def stop(self):
+        self._stop.set()
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+        if self._th is not None:
+            self._th.join(timeout=1.0)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# asyncio 이벤트 구동 런타임 (app.py --runtime async)
+#   주기 폴링 대신 "새 프레임이 오면 바로 판단"
+#   rt = AsyncRuntime(sensor, on_frame, get_hall=..., watchdog_s=0.3)
+#   asyncio.run(rt.run())
+#
+# 스트림
+#   frames : 라이다 read()는 블로킹 → 전용 스레드가 계속 읽고 call_soon_threadsafe로 큐에 넣음
+#            (큐는 최신 1개만 유지: 판단이 밀리면 오래된 프레임은 버림)
+#   speed  : HallThread.on_update 콜백 → 이벤트 루프로 전달, 최신 속도/시각 보관
+#   acks   : 서보 명령은 단일 스레드 executor에서 set_us (순서 보장) → 응답을 루프에서 콜백
+#   watchdog: watchdog_s 동안 프레임이 없으면 on_frame(None) → FSM lost frame → FAILSAFE
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pi.scheduler import Histogram
+
+# 프레임 완성 → 판단 완료 지연 히스토그램 경계(ms)
+LATENCY_EDGES_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# 프레임 없음(읽기 실패/워치독): FSM에는 lost frame
+_LOST = (None, None, None, (None, None, None, 0.0), None)
+
+
+class AsyncRuntime:
+    """
+    on_frame(d_min_mm, frame_t0, frame_t1, triplet, frame): 판단 한 번 (app.py의 프레임 처리 함수)
+        - 루프 스레드에서 호출. 프레임 시각/섹터값/LidarFrame은 읽기 스레드가 read() 직후 함께 잡아 둔 값
+          (다음 read()가 센서 속성을 덮어써도 짝이 어긋나지 않음)
+        - 속도는 on_frame 안에서 rt.speed()로 (Hall 콜백으로 갱신된 최신 값)
+    get_hall: 현재 HallThread(없으면 None)를 돌려주는 콜백 (기동 중 늦게 합류할 수 있음)
+    """
+    def __init__(self, sensor, on_frame, get_hall=None, watchdog_s=0.3, speed_stale_s=0.5):
+        self.sensor = sensor
+        self.on_frame = on_frame
+        self.get_hall = get_hall or (lambda: None)
+        self.watchdog_s = float(watchdog_s)
+        self.speed_stale_s = float(speed_stale_s)
+
+        self.frames = 0
+        self.frames_dropped = 0      # 판단이 밀려 버린 프레임
+        self.watchdog_fires = 0
+        self.speed_updates = 0
+        self.acks = 0
+        self.latency = Histogram(LATENCY_EDGES_MS)
+
+        self._v = None
+        self._v_t = 0.0
+        self._hall_bound = None
+        self._loop = None
+        self._q = None
+        self._stop = threading.Event()
+        self._servo_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="servo")
+
+    # ---------- 스레드 → 루프 브리지 ----------
+    def _reader(self):
+        """라이다 블로킹 read를 계속 돌림 (루프와 독립)."""
+        while not self._stop.is_set():
+            try:
+                d = self.sensor.read()
+                s = self.sensor
+                item = (d, s.frame_t0, s.frame_t1, s.read_triplet(), s.frame if d is not None else None)
+            except Exception as e:
+                print("[ASYNC] sensor read error:", e)
+                item = _LOST
+                time.sleep(0.05)
+            try:
+                self._loop.call_soon_threadsafe(self._push_frame, item)
+            except RuntimeError:   # 루프 종료됨
+                return
+
+    def _push_frame(self, item):
+        if self._q.full():
+            self._q.get_nowait()
+            self.frames_dropped += 1
+        self._q.put_nowait(item)
+
+    def _on_speed(self, v_mps, ts=None):
+        """HallThread 스레드에서 호출됨."""
+        try:
+            self._loop.call_soon_threadsafe(self._set_speed, v_mps)
+        except RuntimeError:
+            pass
+
+    def _set_speed(self, v_mps):
+        self._v = v_mps
+        self._v_t = time.monotonic()
+        self.speed_updates += 1
+
+    def speed(self):
+        """최신 Hall 속도 (stale_s 넘으면 None)."""
+        if self._v is None or time.monotonic() - self._v_t > self.speed_stale_s:
+            return None
+        return self._v
+
+    def _bind_hall(self):
+        hall = self.get_hall()
+        if hall is not None and hall is not self._hall_bound:
+            hall.on_update = self._on_speed
+            self._hall_bound = hall
+
+    # ---------- 서보 (ack 스트림) ----------
+    def send_servo(self, link, pwm_us, on_resp):
+        """set_us를 executor로, 응답이 오면 루프에서 on_resp(resp) 호출. 판단 루프는 기다리지 않음."""
+        fut = self._loop.run_in_executor(self._servo_pool, link.set_us, pwm_us)
+
+        def _done(f):
+            try:
+                resp = f.result()
+            except Exception as e:
+                resp = f"ERR {e}"
+            self.acks += 1
+            on_resp(resp)
+        fut.add_done_callback(_done)
+        return fut
+
+    # ---------- 메인 ----------
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._q = asyncio.Queue(maxsize=1)
+        th = threading.Thread(target=self._reader, daemon=True, name="lidar-reader")
+        th.start()
+        try:
+            while not self.sensor.exhausted:   # replay 계열은 파일 끝에서 종료
+                self._bind_hall()
+                try:
+                    d, t0, t1, tri, frame = await asyncio.wait_for(self._q.get(), timeout=self.watchdog_s)
+                except asyncio.TimeoutError:
+                    self.watchdog_fires += 1
+                    d, t0, t1, tri, frame = _LOST
+                self.on_frame(d, t0, t1, tri, frame)
+                if d is not None:
+                    self.frames += 1
+                    if t1 is not None:
+                        self.latency.add((time.monotonic() - t1) * 1000.0)
+                # 콜백(ack/속도) 처리 기회
+                await asyncio.sleep(0)
+        finally:
+            self._stop.set()
+            self._servo_pool.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "frames_dropped": self.frames_dropped,
+            "watchdog_fires": self.watchdog_fires,
+            "speed_updates": self.speed_updates,
+            "acks": self.acks,
+            "frame_to_decision_ms": {
+                "p50": round(self.latency.quantile(0.5), 3), "p99": round(self.latency.quantile(0.99), 3),
+                "mean": round(self.latency.mean(), 3), "max": round(self.latency.max, 3),
+            },
+        }
+
+    def summary(self):
+        s = self.stats()
+        lat = s["frame_to_decision_ms"]
+        return (f"[ASYNC] frames={s['frames']} dropped={s['frames_dropped']} "
+                f"watchdog={s['watchdog_fires']} speed_updates={s['speed_updates']} acks={s['acks']} "
+                f"frame->decision p50<={lat['p50']}ms p99<={lat['p99']}ms mean={lat['mean']}ms")
@@ -0,0 +1,201 @@
+# pi/scheduler.py
+# -*- coding: utf-8 -*-
+import time
+import bisect
+
+# 히스토그램 버킷 경계(ms). 마지막 버킷은 상한 없음
+JITTER_EDGES_MS = (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100)
+OVERRUN_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+POLICIES = ("skip", "catchup", "degrade")
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (버킷 배열 미리 할당, add는 O(log n) 이진탐색)."""
+    def __init__(self, edges):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, v):
+        self.counts[bisect.bisect_left(self.edges, v)] += 1
+        self.n += 1
+        self.total += v
+        if v > self.max:
+            self.max = v
+
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        """버킷 상한 기준 근사 분위수 (실제 최대값을 넘지 않게 max로 자름)."""
+        if not self.n:
+            return 0.0
+        want = q * self.n
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= want:
+                return min(self.edges[i], self.max) if i < len(self.edges) else self.max
+        return self.max
+
+    def as_dict(self):
+        labels = [f"<={e}" for e in self.edges] + [f">{self.edges[-1]}"]
+        return {"n": self.n, "mean": round(self.mean(), 3), "max": round(self.max, 3),
+                "buckets": dict(zip(labels, self.counts))}
+
+
+class LoopScheduler:
+    """
+    절대 데드라인 기반 주기 스케줄러
+    - 데드라인 = 시작시각 + k*period (처리시간만큼 주기가 늘어나지 않음)
+    - 오버런(처리시간 > period) 정책
+        skip    : 놓친 슬롯은 건너뛰고 다음 격자 데드라인에 맞춤
+        catchup : 놓친 슬롯만큼 즉시 연달아 실행 (max_catchup 초과 시 재동기화)
+        degrade : 연속 오버런이 degrade_after회 이상이면 주기를 늘리고,
+                  여유가 충분히 유지되면 원래 주기로 복귀
+    - 반복별 지터(깨어난 시각 - 데드라인)와 오버런 크기를 히스토그램으로 누적
+
+    사용 예)
+      sched = LoopScheduler(0.1, policy="skip")
+      while True:
+          ...한 번의 처리...
+          sched.wait()
+      print(sched.summary())
+    """
+    def __init__(self, period_s, policy="skip",
+                 max_catchup=3,
+                 degrade_after=3, degrade_factor=1.5, max_period_s=None,
+                 recover_after=20,
+                 clock=time.monotonic, sleep=time.sleep):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown overrun policy: {policy} (choose from {POLICIES})")
+        self.base_period = float(period_s)
+        self.period = float(period_s)
+        self.policy = policy
+        self.max_catchup = int(max_catchup)
+        self.degrade_after = int(degrade_after)
+        self.degrade_factor = float(degrade_factor)
+        self.max_period = float(max_period_s) if max_period_s else self.base_period * 4
+        self.recover_after = int(recover_after)
+        self._clock = clock
+        self._sleep = sleep
+
+        self.jitter = Histogram(JITTER_EDGES_MS)
+        self.overrun = Histogram(OVERRUN_EDGES_MS)
+        self.iterations = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.degrades = 0
+
+        self._next = None        # 다음 반복의 계획 시작 시각
+        self._iter_start = None
+        self._over_streak = 0
+        self._slack_streak = 0
+
+    def start(self):
+        """첫 데드라인 기준점 설정 (wait()이 처음 불릴 때 자동 호출)."""
+        now = self._clock()
+        self._iter_start = now
+        self._next = now + self.period
+
+    # ---------- 내부 ----------
+    def _on_overrun(self, now, late):
+        self.overruns += 1
+        self.overrun.add(late * 1000.0)
+        self._over_streak += 1
+        self._slack_streak = 0
+
+        if self.policy == "skip":
+            # 놓친 슬롯 건너뛰고 now 이후 첫 격자점에서 시작
+            missed = int(late // self.period) + 1
+            self.skipped += missed
+            self._next += missed * self.period
+        elif self.policy == "catchup":
+            # 데드라인을 유지(과거) → 다음 반복을 즉시 실행해서 따라잡기
+            if late > self.max_catchup * self.period:
+                self.skipped += int(late // self.period)
+                self._next = now  # 너무 밀림 → 재동기화
+        else:  # degrade
+            if self._over_streak >= self.degrade_after and self.period < self.max_period:
+                self.period = min(self.max_period, self.period * self.degrade_factor)
+                self.degrades += 1
+                self._over_streak = 0
+            self._next = now
+
+    def _on_slack(self, work):
+        self._over_streak = 0
+        if self.policy != "degrade" or self.period <= self.base_period:
+            return
+        # 한 단계 짧은 주기로도 30% 이상 여유가 있으면 복귀 카운트
+        if work < (self.period / self.degrade_factor) * 0.7:
+            self._slack_streak += 1
+            if self._slack_streak >= self.recover_after:
+                self.period = max(self.base_period, self.period / self.degrade_factor)
+                self._slack_streak = 0
+        else:
+            self._slack_streak = 0
+
+    # ---------- 공개 API ----------
+    def wait(self):
+        """한 반복의 끝에서 호출: 다음 데드라인까지 대기. 반환: 이번 반복 처리시간(s)."""
+        if self._next is None:
+            self.start()
+        now = self._clock()
+        work = now - self._iter_start
+        self.iterations += 1
+
+        late = now - self._next
+        if late > 0:
+            self._on_overrun(now, late)
+        else:
+            self._on_slack(work)
+
+        target = self._next
+        delay = target - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+        woke = self._clock()
+        self.jitter.add(max(0.0, woke - target) * 1000.0)
+
+        self._iter_start = woke
+        self._next = target + self.period
+        return work
+
+    def set_period(self, period_s):
+        """
+        기준 주기 변경 (적응 프로파일). 이번 반복 시작 기준으로 다음 데드라인을 다시 잡음
+        degrade로 늘어난 주기/연속 카운트는 새 주기 기준으로 초기화
+        """
+        period_s = float(period_s)
+        if period_s == self.base_period:
+            return
+        ratio = self.max_period / self.base_period
+        self.base_period = self.period = period_s
+        self.max_period = period_s * ratio
+        self._over_streak = 0
+        self._slack_streak = 0
+        if self._iter_start is not None:
+            self._next = self._iter_start + period_s
+
+    def stats(self):
+        return {
+            "policy": self.policy,
+            "base_period_s": self.base_period,
+            "period_s": round(self.period, 6),
+            "iterations": self.iterations,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "degrades": self.degrades,
+            "jitter_ms": self.jitter.as_dict(),
+            "overrun_ms": self.overrun.as_dict(),
+        }
+
+    def summary(self):
+        j = self.jitter
+        return (f"[SCHED] policy={self.policy} period={self.period*1000:.0f}ms "
+                f"iters={self.iterations} overruns={self.overruns} skipped={self.skipped} "
+                f"degrades={self.degrades} jitter p50={j.quantile(0.5):.1f}ms "
+                f"p99={j.quantile(0.99):.1f}ms max={j.max:.1f}ms")
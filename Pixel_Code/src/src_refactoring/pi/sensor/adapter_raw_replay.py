@@ -0,0 +1,137 @@
+# pi/sensor/adapter_raw_replay.py
+# -*- coding: utf-8 -*-
+# 원시 스캔 포인트 재생: 기록한 프레임을 RPLidarAdapter의 프레임 처리(게이트/분위수/평활/섹터)에 그대로 통과
+#   sensor = RawReplaySensor("scan.npz")                  # 최대 속도 (오프라인 대량 실행)
+#   sensor = RawReplaySensor("scan.csv", realtime=True)   # 기록 주기(rate_hz)대로
+#
+# 파일 형식
+#   .npz : angle(float32), dist(float32), offsets(int64, 프레임 시작 인덱스 + 끝)   ← save_raw()
+#   .csv : frame,angle,distance 헤더 (frame 번호가 바뀌면 새 프레임)
+# 기록: app.py --record-raw scan.npz (실제 라이다 프레임을 RawRecorder로 모아 종료 시 저장)
+import csv
+import time
+
+from pi.sensor.adapter_rplidar import RPLidarAdapter
+
+
+class _Pt:
+    """PyRPlidarMeasurement 대용 (angle/distance만, quality는 기록에 없음)."""
+    __slots__ = ("angle", "distance")
+
+    def __init__(self, angle, distance):
+        self.angle = angle
+        self.distance = distance
+
+
+def load_raw(path):
+    """→ 프레임 목록 [[(angle, dist), ...], ...]"""
+    if path.endswith(".npz"):
+        import numpy as np
+        z = np.load(path)
+        ang, dist, off = z["angle"].tolist(), z["dist"].tolist(), z["offsets"].tolist()
+        return [list(zip(ang[a:b], dist[a:b])) for a, b in zip(off[:-1], off[1:])]
+    frames, cur, last = [], [], None
+    with open(path, "r") as f:
+        for row in csv.DictReader(f):
+            k = row["frame"]
+            if last is not None and k != last and cur:
+                frames.append(cur)
+                cur = []
+            last = k
+            cur.append((float(row["angle"]), float(row["distance"])))
+    if cur:
+        frames.append(cur)
+    return frames
+
+
+def save_raw(path, frames):
+    """frames: [(angles, dists), ...] → .npz"""
+    import numpy as np
+    offsets = [0]
+    for a, _ in frames:
+        offsets.append(offsets[-1] + len(a))
+    np.savez_compressed(
+        path,
+        angle=np.concatenate([np.asarray(a, np.float32) for a, _ in frames]) if frames else np.empty(0, np.float32),
+        dist=np.concatenate([np.asarray(d, np.float32) for _, d in frames]) if frames else np.empty(0, np.float32),
+        offsets=np.asarray(offsets, np.int64))
+    return path
+
+
+class RawRecorder:
+    """
+    판단에 쓴 LidarFrame을 참조로 모아 두었다가 save()에서 .npz로 (메모리 보관, 짧은 캡처용)
+    프레임은 읽기 전용이라 복사하지 않음 → 프레임당 포인트 수 × 9바이트
+    (LidarProcess의 공유메모리 슬롯 view만 detach()로 한 번 복사, 이미 덮어써졌으면 버림)
+    """
+    def __init__(self, path, max_frames=36000):
+        self.path = path
+        self.max_frames = int(max_frames)
+        self.frames = []
+
+    def add(self, frame):
+        if frame is not None and len(self.frames) < self.max_frames and len(frame):
+            frame = frame.detach()
+            if frame is not None:
+                self.frames.append(frame)
+
+    def save(self):
+        return save_raw(self.path, [(f.angles, f.dists) for f in self.frames])
+
+
+class RawReplaySensor(RPLidarAdapter):
+    """
+    path    : .npz / .csv (load_raw 참고)
+    realtime: True면 rate_hz 주기로 대기, False면 대기 없이 (리플레이 대량 실행)
+    loop    : 끝나면 처음부터 (False면 이후 read()는 None → FSM lost frame)
+    adapter_kw: RPLidarAdapter 프레임 처리 인자 (near_cutoff_mm, max_dist_mm, front_gate_deg, quantile, ...)
+    """
+    def __init__(self, path, realtime=False, rate_hz=10.0, loop=False, **adapter_kw):
+        self.path = path
+        self.raw_frames = load_raw(path)
+        self.realtime = realtime
+        self.period = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        self.loop = loop
+        self.exhausted = False
+        self._k = 0
+        self._cur = iter(())
+        self._next = time.monotonic()
+        adapter_kw.setdefault("spinup_s", 0)
+        adapter_kw["frame_ms"] = 10 ** 9   # 프레임 경계는 기록 그대로 (시간으로 자르지 않음)
+        super().__init__(**adapter_kw)
+
+    def _connect(self):
+        # read()마다 현재 기록 프레임의 포인트만 돌려줌 → 프레임 경계가 기록과 일치
+        self._scan_iter_factory = lambda: self._cur
+
+    def _reconnect(self):
+        # 프레임 중간에 포인트가 끝남 (RPLidarAdapter는 여기서 재연결 스레드를 띄움) → 다음 프레임으로
+        pass
+
+    def read(self, frame_points=None):
+        if self._k >= len(self.raw_frames):
+            if not self.loop or not self.raw_frames:
+                self.exhausted = True
+                return None
+            self._k = 0
+        if self.realtime and self.period:
+            now = time.monotonic()
+            if now < self._next:
+                time.sleep(self._next - now)
+            self._next = max(self._next + self.period, time.monotonic())
+        fr = self.raw_frames[self._k]
+        self._k += 1
+        # 무효점(0mm 등)은 어댑터가 버리고 프레임 포인트 수에 안 셈 → 유효점 수만큼만 읽게 함
+        n_valid = sum(1 for _, d in fr if 0 < d < 60000)
+        self._cur = (_Pt(a, d) for a, d in fr)
+        if n_valid == 0:
+            self.dropped_points += len(fr)
+            return None
+        return super().read(frame_points=n_valid)
+
+    def apply_profile(self, prof):
+        # 프레임 경계/밀도는 기록 그대로 (모터도 없음)
+        return False
+
+    def stop(self):
+        pass
@@ -1,18 +1,26 @@
 # -*- coding: utf-8 -*-
 import csv, time, math, os
+from pi.sensor.base import SensorAdapter
 
-class ReplaySensor:
+class ReplaySensor(SensorAdapter):
+    """
+    세션 기록(d_min_mm 열) 재생. csv_path: binlog2csv CSV 또는 .pxl 세션 로그 그대로
+    d_front_mm/d_left_mm/d_right_mm 열이 있으면 read_triplet()으로 돌려줌 (코너 판단 재현)
+    """
     def __init__(self, csv_path, rate_hz=10.0,
                  gap_fill=True,             # 🔹 NA 보정 켜기
                  max_gap_frames=5,          # 🔹 연속 NA ≤5프레임까지만 보정
                  end_policy="stop",         # 🔹 "stop"|"hold"|"loop"
-                 hold_seconds=2.0):         # end_policy="hold"일 때 유지 시간
+                 hold_seconds=2.0,          # end_policy="hold"일 때 유지 시간
+                 realtime=True):            # False면 sleep 없이 즉시 반환 (AFAP 리플레이)
         assert os.path.exists(csv_path), f"no file: {csv_path}"
-        self.rows = []
-        with open(csv_path, "r") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                self.rows.append(row)
+        if csv_path.endswith(".pxl"):
+            from pi.datalog.binlog import iter_rows
+            self.rows = list(iter_rows(csv_path))
+        else:
+            with open(csv_path, "r") as f:
+                self.rows = list(csv.DictReader(f))
+        self._row = None
         self.dt = 1.0 / max(1e-3, rate_hz)
         self.i = 0
         self.gap_fill = gap_fill
@@ -21,6 +29,7 @@ class ReplaySensor:
         self.hold_frames = int(hold_seconds / self.dt)
         self._last_valid = None
         self._hold_left = 0
+        self.realtime = realtime
 
     def _parse_mm(self, v):
         try:
@@ -28,6 +37,10 @@ class ReplaySensor:
         except:
             return None
 
+    def _tick(self):
+        if self.realtime:
+            time.sleep(self.dt)
+
     def read(self):
         # 파일 끝 처리
         if self.i >= len(self.rows):
@@ -37,14 +50,16 @@ class ReplaySensor:
                 if self._hold_left <= 0:
                     self._hold_left = self.hold_frames
                 self._hold_left -= 1
-                time.sleep(self.dt)
+                self._tick()
                 return self._last_valid
             else:  # stop(default)
-                time.sleep(self.dt)
+                self.exhausted = True
+                self._tick()
                 return None
 
         # 현재 프레임
         row = self.rows[self.i]; self.i += 1
+        self._row = row
         d = self._parse_mm(row.get("d_min_mm"))
 
         # 🔹 갭-필: 최근값 홀드(최대 max_gap 프레임)
@@ -62,7 +77,14 @@ class ReplaySensor:
         if d is not None:
             self._last_valid = d
 
-        time.sleep(self.dt)
+        self._tick()
+        self.frame_t0 = self.frame_t1 = time.monotonic()
+        self.frames += 1
         return d
 
-    def stop(self): pass
\ No newline at end of file
+    def read_triplet(self):
+        row = self._row
+        if row is None:
+            return None, None, None, 0.0
+        return (self._parse_mm(row.get("d_front_mm")), self._parse_mm(row.get("d_left_mm")),
+                self._parse_mm(row.get("d_right_mm")), 0.0)
\ No newline at end of file
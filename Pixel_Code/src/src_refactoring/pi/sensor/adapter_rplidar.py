@@ -1,11 +1,15 @@
 # pi/sensor/adapter_rplidar.py
 # -*- coding: utf-8 -*-
 import time
+import threading
+from array import array
 from collections import deque
 from statistics import median
-from pyrplidar import PyRPlidar
 
-class RPLidarAdapter:
+from pi.sensor.base import SensorAdapter
+from pi.sensor.frame import LidarFrame, EMPTY
+
+class RPLidarAdapter(SensorAdapter):
     """
     config.yaml(lidar) 키 지원:
       - port, baud, pwm
@@ -16,6 +20,9 @@ class RPLidarAdapter:
       - smooth_window
       - front_gate_deg (옵션, 없으면 20)
       - quantile (옵션, 없으면 0.20)
+      - spinup_s (옵션, 모터 안정화 대기. 없으면 2.0)
+    port_resolver: (옵션) 재연결 시 현재 라이다 포트를 돌려주는 콜백
+                   (DeviceSupervisor 재탐색 결과 사용)
     """
     def __init__(
         self,
@@ -29,9 +36,13 @@ class RPLidarAdapter:
         min_inliers=12,
         smooth_window=3,
         front_gate_deg=20,
-        quantile=0.20
+        quantile=0.20,
+        port_resolver=None,
+        spinup_s=2.0
     ):
         self.port = port
+        self.port_resolver = port_resolver
+        self.spinup_s = float(spinup_s)
         self.baud = baud
         self.pwm = pwm
 
@@ -44,12 +55,16 @@ class RPLidarAdapter:
         self.front_gate_deg = int(front_gate_deg)
         self.quantile = float(quantile)
 
-        self.lidar = PyRPlidar()
+        self.frame_points = 720
+        self.lidar = None
+        self._pending_filter = None
+        self._pending_profile = None
+        self._reconnecting = threading.Event()
+        self._stop = threading.Event()   # stop() 후 재연결 스레드가 다시 붙지 않도록
         self._connect()
 
-        # 최근 프레임(코너 보조/디버그)
-        self.last_angles = []
-        self.last_dists = []
+        # 최근 프레임(코너 보조/기록/디버그, LidarFrame 하나를 공유)
+        self.frame = None
 
         # 시간/변화율 추적
         self._front_t = None
@@ -58,25 +73,119 @@ class RPLidarAdapter:
         # 출력 평활화(롤링 미디안)
         self._dq_hist = deque(maxlen=self.smooth_window)
 
+        # 계측용 누적 카운터
+        self.frames = 0
+        self.dropped_points = 0
+
+        # 마지막 프레임 시각(time.monotonic): 첫 샘플 / 완성
+        self.frame_t0 = None
+        self.frame_t1 = None
+
     # ---------------- Core I/O ----------------
     def _connect(self):
+        # pyrplidar는 실제 장치 연결 시에만 import (sim/replay 기동 시간에 포함되지 않도록)
+        from pyrplidar import PyRPlidar
+        if self.lidar is None:
+            self.lidar = PyRPlidar()
         print(f"[LIDAR] connecting {self.port} @ {self.baud}")
         self.lidar.connect(port=self.port, baudrate=self.baud, timeout=3)
         self.lidar.set_motor_pwm(self.pwm)
-        time.sleep(2.0)
+        time.sleep(self.spinup_s)
         # force_scan은 callble generator를 리턴함
         self._scan_iter_factory = self.lidar.force_scan()
         print("[LIDAR] connected & force_scan ready.")
 
-    def _reconnect(self):
+    def _reconnect_worker(self):
         try:
-            self.lidar.stop()
-            self.lidar.set_motor_pwm(0)
-            self.lidar.disconnect()
-        except Exception:
-            pass
-        time.sleep(0.4)
-        self._connect()
+            try:
+                self.lidar.stop()
+                self.lidar.set_motor_pwm(0)
+                self.lidar.disconnect()
+            except Exception:
+                pass
+            while not self._stop.is_set():
+                if self.port_resolver is not None:
+                    try:
+                        self.port = self.port_resolver() or self.port
+                    except Exception as e:
+                        print("[LIDAR] port resolve failed:", e)
+                try:
+                    self._connect()
+                except Exception as e:
+                    print(f"[LIDAR] reconnect failed ({e}) → retry")
+                    self._stop.wait(0.4)
+                    continue
+                if self._stop.is_set():
+                    # 연결 중에 stop()이 불림 → 방금 켠 모터를 다시 끔
+                    self._disconnect()
+                return
+        finally:
+            self._reconnecting.clear()
+
+    def _reconnect(self):
+        """
+        재연결은 백그라운드 스레드에서 진행 (메인 루프 블록 방지).
+        진행 중에는 read()가 None을 반환 → FSM이 FAILSAFE로 전환.
+        """
+        if self._reconnecting.is_set() or self._stop.is_set():
+            return
+        self._reconnecting.set()
+        threading.Thread(target=self._reconnect_worker, daemon=True).start()
+
+    @property
+    def reconnecting(self):
+        return self._reconnecting.is_set()
+
+    def apply_filter(self, flt):
+        """
+        프레임 처리 설정 교체 예약 (pi.config.LidarFilter). 다음 read() 시작에 한꺼번에 반영
+        → asyncio 런타임처럼 read()가 다른 스레드여도 한 프레임 안에서 옛/새 값이 섞이지 않음
+        """
+        self._pending_filter = flt
+        return True
+
+    def _swap_filter(self):
+        flt, self._pending_filter = self._pending_filter, None
+        if flt is None:
+            return
+        # 연결/스캔은 그대로, 평활 창 크기가 바뀌면 기존 이력을 새 창에 이어 담음
+        self.near_cutoff_mm = int(flt.near_cutoff_mm)
+        self.max_dist_mm = int(flt.max_dist_mm)
+        self.angle_offset_deg = float(flt.angle_offset_deg) % 360.0
+        self.min_inliers = int(flt.min_inliers)
+        self.front_gate_deg = int(flt.front_gate_deg)
+        self.quantile = float(flt.quantile)
+        if int(flt.smooth_window) != self.smooth_window:
+            self.smooth_window = max(1, int(flt.smooth_window))
+            self._dq_hist = deque(self._dq_hist, maxlen=self.smooth_window)
+
+    def apply_profile(self, prof):
+        """모터 PWM/프레임 크기 교체 예약 (pi.profile.Profile). 다음 read() 시작에 반영 (스캔 스레드에서 명령 전송)"""
+        self._pending_profile = prof
+        return True
+
+    def _swap_profile(self):
+        prof, self._pending_profile = self._pending_profile, None
+        if prof is None:
+            return
+        self.frame_points = int(prof.frame_points)
+        self.frame_ms = int(prof.frame_ms)
+        if int(prof.pwm) != self.pwm:
+            self.pwm = int(prof.pwm)   # 재연결 시에도 이 값으로 스핀업
+            try:
+                # 스캔은 유지한 채 모터 속도만 (회전수 안정까지 몇 프레임은 포인트 밀도가 흔들림)
+                self.lidar.set_motor_pwm(self.pwm)
+            except Exception as e:
+                print("[LIDAR] set_motor_pwm failed:", e)
+
+    # 예전 이름 (복사 없이 마지막 프레임의 view)
+    @property
+    def last_angles(self):
+        return self.frame.angles if self.frame is not None else EMPTY
+
+    @property
+    def last_dists(self):
+        return self.frame.dists if self.frame is not None else EMPTY
 
     # ---------------- Utils ----------------
     @staticmethod
@@ -99,21 +208,35 @@ class RPLidarAdapter:
         return a
 
     # ---------------- Public API ----------------
-    def read(self, frame_points=720):
+    def read(self, frame_points=None):
         """
         - 스캔 포인트를 모아 정면 게이트(±front_gate_deg)로 제한
         - 거리 inlier 범위(near_cutoff_mm ~ max_dist_mm) 필터
         - inlier 분위수(quantile)로 대표 거리 계산
         - inlier 부족 시 전체 inlier로 폴백(여전히 분위수)
         - smooth_window>1이면 롤링 미디안으로 시간 평활화
+        frame_points: None이면 self.frame_points (적응 프로파일이 바꿈)
         반환: 대표거리(mm) 또는 None
         """
-        pts = []
+        if self._reconnecting.is_set():
+            return None
+        if self._pending_filter is not None:
+            self._swap_filter()
+        if self._pending_profile is not None:
+            self._swap_profile()
+        if frame_points is None:
+            frame_points = self.frame_points
+
+        # 수집은 리스트 append (포인트당 가장 쌈) → 프레임 완성 시 한 번에 float32/uint8 배열로
+        angles = []
+        dists = []
+        quals = []
+        new_rev = False
         t0 = time.time()
         try:
             it = self._scan_iter_factory()
             # frame_ms 내에서 frame_points 근사치 수집
-            while len(pts) < frame_points:
+            while len(dists) < frame_points:
                 scan = next(it)
                 a = getattr(scan, "angle", None)
                 d = getattr(scan, "distance", None)
@@ -124,43 +247,59 @@ class RPLidarAdapter:
 
                 # 일부 드라이버는 비정상 큰 단위로 올 수 있어 상한 60,000mm 가드
                 if d <= 0 or d >= 60000:
+                    self.dropped_points += 1
                     if (time.time() - t0) * 1000.0 > self.frame_ms:
                         break
                     continue
 
                 a = self._apply_angle_offset(float(a))
-                pts.append((a, float(d)))
+                if not dists:
+                    t_first = time.monotonic()
+                angles.append(a)
+                dists.append(d)
+                quals.append(getattr(scan, "quality", 0) or 0)   # pyrplidar: 6비트
+                if not new_rev and getattr(scan, "start_flag", False):
+                    new_rev = True
 
                 if (time.time() - t0) * 1000.0 > self.frame_ms:
                     break
 
         except StopIteration:
-            print("[LIDAR] generator exhausted → reconnect")
+            print("[LIDAR] generator exhausted → reconnect (background)")
+            self._reconnect()
+            return None
+        except OSError as e:
+            # 케이블 분리/USB 리셋: serial.SerialException은 OSError(IOError) 하위 → 포트를 다시 열어야 함
+            print(f"[LIDAR] I/O error ({e}) → reconnect (background)")
             self._reconnect()
             return None
         except Exception as e:
+            # 패킷 파싱 오류 등: 포트는 살아 있음 → 이번 프레임만 버리고 계속
             print("[LIDAR] read exception:", e)
             return None
 
-        if not pts:
+        if not dists:
             return None
-
-        # 프레임 저장(코너/디버그용)
-        self.last_angles = [a for a, _ in pts]
-        self.last_dists  = [d for _, d in pts]
+        self.frames += 1
+        f = LidarFrame(self.frames, t_first, time.monotonic(),
+                       array("f", angles), array("f", dists), array("B", quals), new_rev)
+        self.frame = f
+        self.frame_t0 = f.t0
+        self.frame_t1 = f.t1
 
         # 정면 게이트(예: 340~360 or 0~20)
         fg = self.front_gate_deg
+        lo_mm, hi_mm = self.near_cutoff_mm, self.max_dist_mm
         front_vals = []
-        for a, d in pts:
-            if not (self.near_cutoff_mm <= d <= self.max_dist_mm):
+        for a, d in zip(angles, dists):   # 수집 리스트 그대로 (이 함수 안에서만, 프레임에는 배열만 남음)
+            if not (lo_mm <= d <= hi_mm):
                 continue
             if self._in_gate(a, 360 - fg, 360) or self._in_gate(a, 0, fg):
                 front_vals.append(d)
 
         # inlier 부족 시 전체로 폴백(여전히 분위수 사용)
         inliers = front_vals if len(front_vals) >= self.min_inliers else [
-            d for _, d in pts if self.near_cutoff_mm <= d <= self.max_dist_mm
+            d for d in dists if lo_mm <= d <= hi_mm
         ]
         if not inliers:
             return None
@@ -173,17 +312,6 @@ class RPLidarAdapter:
         return float(d_out)
 
     # ---- 코너/보조 ----
-    def _sector_min(self, angles_deg, dists_mm, lo, hi):
-        vals = []
-        for a, d in zip(angles_deg, dists_mm):
-            if d <= 0 or d > self.max_dist_mm:
-                continue
-            if lo <= hi:
-                if lo <= a <= hi: vals.append(d)
-            else:
-                if (a >= lo) or (a <= hi): vals.append(d)
-        return min(vals) if vals else None
-
     def read_triplet(self):
         """
         마지막 read() 프레임 기준:
@@ -192,15 +320,15 @@ class RPLidarAdapter:
           - d_right: 270~315°
           - drop   : 정면 거리의 초당 감소량(mm/s, 양수=다가옴)
         """
-        if not self.last_angles or not self.last_dists:
+        f = self.frame
+        if f is None or not len(f):
             return None, None, None, 0.0
 
-        angles = self.last_angles
-        dists  = self.last_dists
-
-        d_front = self._sector_min(angles, dists, 335, 25)
-        d_left  = self._sector_min(angles, dists, 45, 90)
-        d_right = self._sector_min(angles, dists, 270, 315)
+        # 프레임 캐시 → 같은 프레임을 다른 단계(기록/코너)가 다시 물어도 재계산 없음
+        mx = self.max_dist_mm
+        d_front = f.sector_min(335, 25, mx)
+        d_left  = f.sector_min(45, 90, mx)
+        d_right = f.sector_min(270, 315, mx)
 
         now = time.time()
         drop = 0.0
@@ -213,11 +341,15 @@ class RPLidarAdapter:
         return d_front, d_left, d_right, drop
 
     # ---------------- Teardown ----------------
-    def stop(self):
+    def _disconnect(self):
         try:
             self.lidar.stop()
             self.lidar.set_motor_pwm(0)
             self.lidar.disconnect()
             print("[LIDAR] stopped.")
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+    def stop(self):
+        self._stop.set()
+        self._disconnect()
\ No newline at end of file
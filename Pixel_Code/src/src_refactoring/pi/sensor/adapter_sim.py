@@ -1,19 +1,33 @@
 # pi/sensor/adapter_sim.py
 import time, math, random
+from pi.sensor.base import SensorAdapter
 
-class SimulatedSensor:
+class SimulatedSensor(SensorAdapter):
     """
     전방 거리(d_min_mm)를 가짜로 생성하는 시뮬레이터.
     시나리오:
       - A: 항상 SAFE
       - B: 장애물이 접근(WARN→BRAKE)
       - C: 센서 장애 (랜덤 dropout)
+    realtime: True면 rate_hz 주기에 맞춰 대기 (asyncio 런타임에서 read()가 바로 돌아와 헛도는 것 방지)
+              False(기본)면 대기 없이 → 폴링 루프에선 LoopScheduler가 주기를 맞춤
     """
-    def __init__(self, scenario="B"):
+    def __init__(self, scenario="B", rate_hz=10.0, realtime=False):
         self.scenario = scenario
         self.t0 = time.time()
+        self.realtime = realtime
+        self.period = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        self._next = time.monotonic()
 
     def read(self):
+        if self.realtime and self.period:
+            # 절대 데드라인: 호출 쪽 루프가 이미 기다렸으면 추가 대기 없음
+            now = time.monotonic()
+            if now < self._next:
+                time.sleep(self._next - now)
+            self._next = max(self._next + self.period, time.monotonic())
+        self.frame_t0 = self.frame_t1 = time.monotonic()
+        self.frames += 1
         t = time.time() - self.t0
         if self.scenario == "A":
             d = 2000 + 200*math.sin(t/5)
@@ -0,0 +1,41 @@
+# pi/sensor/base.py
+# -*- coding: utf-8 -*-
+# 라이다 계열 센서 어댑터 공통 인터페이스 (app.py / runtime_async / 리플레이가 기대하는 것)
+#   d = sensor.read()                       # 대표 거리(mm) 또는 None (프레임 없음 → FSM lost frame)
+#   d_front, d_left, d_right, drop = sensor.read_triplet()
+#   sensor.frame_t0, sensor.frame_t1        # 마지막 프레임 첫 샘플/완성 시각 (time.monotonic)
+#   sensor.frame                            # 마지막 프레임 pi.sensor.frame.LidarFrame (포인트 없는 백엔드는 None)
+#   sensor.frames, sensor.dropped_points    # 계측용 누적 카운터
+#   sensor.stop()
+#   sensor.exhausted                        # 재생 백엔드가 끝까지 읽었으면 True
+#   sensor.apply_filter(flt)                # (선택) 필터 설정 실행 중 교체
+#   sensor.apply_profile(prof)              # (선택) 모터 PWM/프레임 크기 교체 (pi.profile)
+# 새 백엔드는 이 클래스를 상속하고 pi/sensor/registry.py에 등록
+
+
+class SensorAdapter:
+    """기본값: 섹터 정보 없음, 재연결 없음, 정리할 자원 없음."""
+    frame = None
+    frames = 0
+    dropped_points = 0
+    frame_t0 = None
+    frame_t1 = None
+    reconnecting = False
+    exhausted = False     # 재생 계열: 더 읽을 프레임 없음 (app 루프 종료 조건)
+
+    def read(self):
+        raise NotImplementedError
+
+    def read_triplet(self):
+        return None, None, None, 0.0
+
+    def apply_filter(self, flt):
+        """pi.config.LidarFilter 실행 중 교체. 반영 못 하는 백엔드는 False."""
+        return False
+
+    def apply_profile(self, prof):
+        """pi.profile.Profile의 pwm/frame_points/frame_ms 교체. 반영 못 하는 백엔드는 False."""
+        return False
+
+    def stop(self):
+        pass
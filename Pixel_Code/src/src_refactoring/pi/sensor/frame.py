@@ -0,0 +1,100 @@
+# pi/sensor/frame.py
+# -*- coding: utf-8 -*-
+# 라이다 프레임 한 장 (읽기 전용, 단계 간 복사 없이 같은 객체를 공유)
+#   f = sensor.frame                          # read() 성공 시 새 LidarFrame, 이전 프레임은 그대로 유지됨
+#   f.angles / f.dists / f.qualities          # 읽기 전용 memoryview (float32 / float32 / uint8)
+#   f.seq, f.t0, f.t1, f.new_rev              # 일련번호, 첫 샘플/완성 시각(time.monotonic), 새 회전 시작 포함 여부
+#   f.sector_min(335, 25, max_mm)             # 섹터 최소거리 (인자별 캐시 → read_triplet/코너/기록이 다시 훑지 않음)
+#   f.bins()                                  # 1° 단위 최소거리 360칸 튜플 (없으면 None, 캐시)
+#   f.valid()                                 # 원본 버퍼가 아직 이 프레임인지 (공유메모리 링 슬롯 view일 때만 의미)
+#   f.detach()                                # 오래 보관할 때: 자기 소유 배열로 복사한 프레임 (이미 소유면 self)
+#
+# 포인트당 9바이트(float32 ×2 + uint8) — (angle, dist) 튜플 리스트(포인트당 ~100바이트)보다 작고 크기 예측 가능
+# 파생값 캐시는 처음 묻는 단계에서 계산 (단일 판단 스레드 기준, 다른 스레드가 같이 계산해도 값은 같음)
+# source가 있으면(LidarProcess: 링 슬롯 view) 계산 후 seqlock 재확인 → 그새 덮어써졌으면 캐시하지 않고 None
+from array import array
+
+EMPTY = memoryview(array("f")).toreadonly()
+
+
+class LidarFrame:
+    __slots__ = ("seq", "t0", "t1", "new_rev", "angles", "dists", "qualities",
+                 "_bins", "_sectors", "_source")
+
+    def __init__(self, seq, t0, t1, angles, dists, qualities=None, new_rev=False, source=None):
+        """
+        angles/dists/qualities: array 또는 버퍼 지원 객체 (numpy view 포함). 복사하지 않고 읽기 전용 view로 감쌈.
+        source: 버퍼 주인이 덮어쓸 수 있으면 valid()를 가진 객체 (pi.sensor.frame_ring.Frame)
+        """
+        s = object.__setattr__
+        s(self, "seq", seq)
+        s(self, "t0", t0)
+        s(self, "t1", t1)
+        s(self, "new_rev", bool(new_rev))
+        s(self, "angles", memoryview(angles).toreadonly())
+        s(self, "dists", memoryview(dists).toreadonly())
+        s(self, "qualities", EMPTY if qualities is None else memoryview(qualities).toreadonly())
+        s(self, "_bins", None)
+        s(self, "_sectors", {})
+        s(self, "_source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"LidarFrame is read-only ({name})")
+
+    def __len__(self):
+        return len(self.dists)
+
+    @property
+    def nbytes(self):
+        return self.angles.nbytes + self.dists.nbytes + self.qualities.nbytes
+
+    def valid(self):
+        """포인트 view가 아직 이 프레임 내용인지 (자기 소유 배열이면 항상 True)."""
+        return self._source is None or self._source.valid()
+
+    def detach(self):
+        """공유 버퍼 view → 자기 소유 배열로 한 번 복사 (덮어써졌으면 None). 보관용 (RawRecorder 등)."""
+        if self._source is None:
+            return self
+        angles, dists, quals = (array(v.format, v.tobytes()) for v in (self.angles, self.dists, self.qualities))
+        if not self._source.valid():
+            return None
+        f = LidarFrame(self.seq, self.t0, self.t1, angles, dists, quals, self.new_rev)
+        object.__setattr__(f, "_bins", self._bins)
+        f._sectors.update(self._sectors)
+        return f
+
+    def sector_min(self, lo, hi, max_mm=None):
+        """lo~hi(°, 랩어라운드 지원) 안 0 < d ≤ max_mm 최소거리, 없으면 None."""
+        key = (lo, hi, max_mm)
+        cache = self._sectors
+        if key in cache:
+            return cache[key]
+        best = None
+        wrap = lo > hi
+        for a, d in zip(self.angles, self.dists):
+            if d <= 0 or (max_mm is not None and d > max_mm):
+                continue
+            if ((a >= lo) or (a <= hi)) if wrap else (lo <= a <= hi):
+                if best is None or d < best:
+                    best = d
+        if not self.valid():
+            return None
+        cache[key] = best
+        return best
+
+    def bins(self):
+        """각도(정수 내림) → 최소거리(mm) 360칸 튜플."""
+        b = self._bins
+        if b is None:
+            out = [None] * 360
+            for a, d in zip(self.angles, self.dists):
+                i = int(a) % 360
+                p = out[i]
+                if p is None or d < p:
+                    out[i] = d
+            b = tuple(out)
+            if not self.valid():
+                return None
+            object.__setattr__(self, "_bins", b)
+        return b
@@ -0,0 +1,175 @@
+# pi/sensor/frame_ring.py
+# -*- coding: utf-8 -*-
+# 라이다 프레임 공유메모리 링버퍼 (프로세스 간, 단일 writer / 다수 reader)
+#   writer(인식 프로세스): ring = FrameRing.attach(name); ring.write(angles, dists, t0, t1, d_out, tri, quals, new_rev)
+#   reader(판단 프로세스): f = ring.read_latest(after_seq)   # 복사 없이 numpy view
+#
+# 슬롯마다 seq_begin / seq_end (seqlock): 쓰기 시작에 begin, 끝에 end 갱신
+#   → reader는 begin == end == seq 인 슬롯만 사용, 사용 후 f.valid()로 덮어쓰기 여부 확인 가능
+import math
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAGIC = 0x50584652  # "PXFR"
+
+HEADER = np.dtype([
+    ("magic", "<u4"), ("slots", "<u4"), ("max_points", "<u4"), ("flags", "<u4"),
+    ("seq", "<u8"),            # 마지막으로 완성된 프레임 seq (0 = 아직 없음)
+    ("frames", "<u8"), ("dropped_points", "<u8"),
+])
+FLAG_READY = 0x01          # writer 준비 완료(라이다 연결)
+FLAG_RECONNECTING = 0x02   # writer 쪽 재연결 중
+
+NAN = float("nan")
+
+
+def slot_dtype(max_points):
+    return np.dtype([
+        ("seq_begin", "<u8"), ("seq_end", "<u8"),
+        ("t0", "<f8"), ("t1", "<f8"),           # time.monotonic (프로세스 간 공통 시계)
+        ("n", "<u4"),
+        ("d_out", "<f4"),                        # 대표 거리(mm), 없으면 NaN
+        ("d_front", "<f4"), ("d_left", "<f4"), ("d_right", "<f4"),
+        ("new_rev", "<u4"),                      # 새 회전 시작 포인트 포함 (LidarFrame.new_rev)
+        ("angles", "<f4", (max_points,)),
+        ("dists", "<f4", (max_points,)),
+        ("qualities", "u1", (max_points,)),
+    ])
+
+
+def _none(v):
+    v = float(v)
+    return None if math.isnan(v) else v
+
+
+class Frame:
+    """링 슬롯 하나의 view (angles/dists는 공유메모리 그대로, 복사 없음)."""
+    __slots__ = ("seq", "t0", "t1", "d_out", "d_front", "d_left", "d_right", "new_rev",
+                 "angles", "dists", "qualities", "_slot")
+
+    def __init__(self, slot, seq):
+        self._slot = slot
+        self.seq = seq
+        self.t0 = float(slot["t0"])
+        self.t1 = float(slot["t1"])
+        self.d_out = _none(slot["d_out"])
+        self.d_front = _none(slot["d_front"])
+        self.d_left = _none(slot["d_left"])
+        self.d_right = _none(slot["d_right"])
+        self.new_rev = bool(slot["new_rev"])
+        n = int(slot["n"])
+        self.angles = slot["angles"][:n]
+        self.dists = slot["dists"][:n]
+        self.qualities = slot["qualities"][:n]
+
+    def valid(self):
+        """view를 쓰는 동안 writer가 이 슬롯을 덮어쓰지 않았는지."""
+        return int(self._slot["seq_begin"]) == self.seq
+
+
+class FrameRing:
+    """
+    slots     : 슬롯 수 (10 Hz 기준 8개 = 0.8 s 분량, reader가 그 안에만 읽으면 됨)
+    max_points: 프레임당 최대 포인트 수 (넘치면 잘림)
+    """
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), dtype=HEADER, buffer=shm.buf, offset=0)
+        if owner:
+            return
+        if int(self.header["magic"]) != MAGIC:
+            raise ValueError(f"not a frame ring: {shm.name}")
+        self._map(int(self.header["slots"]), int(self.header["max_points"]))
+
+    def _map(self, slots, max_points):
+        self.n_slots = slots
+        self.max_points = max_points
+        self.slots = np.ndarray((slots,), dtype=slot_dtype(max_points), buffer=self.shm.buf,
+                                offset=HEADER.itemsize)
+
+    @classmethod
+    def create(cls, slots=8, max_points=1024, name=None):
+        size = HEADER.itemsize + slots * slot_dtype(max_points).itemsize
+        ring = cls(shared_memory.SharedMemory(name=name, create=True, size=size), owner=True)
+        ring.shm.buf[:size] = bytes(size)
+        ring._map(slots, max_points)
+        h = ring.header
+        h["slots"], h["max_points"] = slots, max_points
+        h["magic"] = MAGIC
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        # 3.13+: 붙기만 하는 쪽은 resource_tracker에 등록 안 함.
+        # 그 이전은 multiprocessing 자식이면 부모와 같은 tracker를 써서 unlink는 부모 close()에서 한 번만 일어남
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def seq(self):
+        return int(self.header["seq"])
+
+    # ---------- writer ----------
+    def write(self, angles, dists, t0, t1, d_out=None, triplet=(None, None, None),
+              qualities=None, new_rev=False):
+        seq = self.seq + 1
+        s = self.slots[seq % self.n_slots]
+        s["seq_begin"] = seq
+        n = min(len(angles), self.max_points)
+        s["angles"][:n] = angles[:n]
+        s["dists"][:n] = dists[:n]
+        if qualities is not None and len(qualities) >= n:
+            s["qualities"][:n] = qualities[:n]
+        else:
+            s["qualities"][:n] = 0
+        s["new_rev"] = 1 if new_rev else 0
+        s["n"] = n
+        s["t0"] = t0 if t0 is not None else NAN
+        s["t1"] = t1 if t1 is not None else NAN
+        s["d_out"] = NAN if d_out is None else d_out
+        s["d_front"], s["d_left"], s["d_right"] = (NAN if v is None else v for v in triplet)
+        s["seq_end"] = seq
+        self.header["seq"] = seq
+        return seq
+
+    def set_flag(self, flag, on=True):
+        f = int(self.header["flags"])
+        self.header["flags"] = (f | flag) if on else (f & ~flag)
+
+    def flag(self, flag):
+        return bool(int(self.header["flags"]) & flag)
+
+    # ---------- reader ----------
+    def read_latest(self, after_seq=0):
+        """after_seq보다 새 완성 프레임이 있으면 Frame, 없거나 쓰는 중이면 None."""
+        seq = self.seq
+        if seq <= after_seq:
+            return None
+        s = self.slots[seq % self.n_slots]
+        if int(s["seq_end"]) != seq:
+            return None
+        f = Frame(s, seq)
+        return f if f.valid() else None
+
+    def close(self):
+        # numpy view가 남아 있으면 close가 BufferError → view 먼저 해제
+        self.header = None
+        self.slots = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
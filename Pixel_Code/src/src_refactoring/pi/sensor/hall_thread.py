@@ -5,14 +5,21 @@ from pi.control.esp32_link import open_from_config
 STAT_RX = re.compile(r"\brpm=(?P<rpm>[-+]?\d+(?:\.\d+)?)\b.*?\bv=(?P<v>[-+]?\d+(?:\.\d+)?)\b", re.I)
 
 class HallThread(threading.Thread):
-    def __init__(self, cfg_path="pi/config.yaml", poll_ms=50, stale_s=0.5):
+    def __init__(self, cfg_path="pi/config.yaml", poll_ms=50, stale_s=0.5, cfg=None, port=None,
+                 fusion=None):
+        """
+        cfg: 이미 파싱한 config (pi.config.Config 또는 dict, 있으면 cfg_path를 다시 읽지 않음)
+        fusion: (선택) pi.fusion.SensorFusion — 샘플마다 ("speed", 측정 시각, v) 기록
+        """
         super().__init__(daemon=True)
         self._stop = threading.Event()
         self._v_mps = None
         self._ts = 0.0
         self._poll_ms = poll_ms
         self._stale_s = stale_s
-        self.link = open_from_config(cfg_path)
+        self.on_update = None  # (선택) 새 속도마다 호출: on_update(v_mps, ts) — asyncio 런타임 알림용
+        self.fusion = fusion
+        self.link = open_from_config(cfg if cfg is not None else cfg_path, port=port)
 
     def run(self):
         # (선택) QUIET 모드로 전환
@@ -20,15 +27,27 @@ class HallThread(threading.Thread):
         except: pass
         while not self._stop.is_set():
             try:
+                t_req = time.monotonic()
                 line = self.link.get_stat(timeout=0.12, retries=1, purge=True)
                 m = STAT_RX.search(line or "")
                 if m:
                     self._v_mps = float(m.group("v"))
                     self._ts = time.time()
+                    t_rx = self.link.last_stat_host_t
+                    if self.fusion is not None and t_rx is not None and t_rx >= t_req:
+                        # 펌웨어가 STAT을 찍은 시각 ≈ 요청~응답 왕복의 중간 (monotonic, 라이다 프레임 시각과 같은 시계)
+                        self.fusion.add("speed", 0.5 * (t_req + t_rx), self._v_mps)
+                    cb = self.on_update
+                    if cb is not None:
+                        cb(self._v_mps, self._ts)
             except:
                 pass
             self._stop.wait(self._poll_ms / 1000.0)
 
+    def set_poll_ms(self, poll_ms):
+        """GET_STAT 간격 변경 (적응 프로파일). 다음 대기부터 반영"""
+        self._poll_ms = poll_ms
+
     def get_speed(self):
         """신선한 값만 반환, 오래되면 None"""
         if self._v_mps is None: return None
@@ -0,0 +1,215 @@
+# pi/sensor/lidar_proc.py
+# -*- coding: utf-8 -*-
+# 라이다 수집/프레임 처리를 별도 프로세스로 (GIL 분리, 코어 하나 전담)
+#   sensor = LidarProcess(port=..., baud=..., pwm=..., max_dist_mm=...)
+#   d = sensor.read()              # RPLidarAdapter.read()와 같은 의미 (새 프레임 대기, 없으면 None)
+#   sensor.read_triplet()          # 자식 프로세스가 미리 계산해 둔 섹터 최소값
+#   sensor.frame                   # pi.sensor.frame.LidarFrame (링 슬롯의 읽기 전용 view, 복사 없음)
+#
+# 자식: RPLidarAdapter.read() → frame_ring.FrameRing에 (포인트, 대표거리, 섹터 최소값) 기록
+# 부모: 링 슬롯 view를 LidarFrame으로 감쌈 (seqlock으로 완성된 슬롯만, 복사 없음)
+#       슬롯은 slots개 프레임 뒤에 덮어써짐 (10 Hz·8슬롯 = 0.8 s) → 판단 한 틱 안에서는 그대로 쓰고,
+#       더 오래 보관하는 쪽은 frame.detach()로 복사 (덮어써진 뒤의 파생값 계산은 None)
+import time
+import threading
+import multiprocessing as mp
+
+from pi.sensor.base import SensorAdapter
+from pi.sensor.frame import LidarFrame, EMPTY
+from pi.sensor.frame_ring import FrameRing, FLAG_READY, FLAG_RECONNECTING
+
+
+def resolve_rplidar_port(baud=460800):
+    """자식 프로세스 재연결용 포트 재탐색 (DeviceSupervisor 클로저는 spawn으로 못 넘김)."""
+    from pi.control.device_supervisor import list_candidates, probe_rplidar
+    for p in list_candidates():
+        if probe_rplidar(p, baud=baud):
+            return p
+    return None
+
+
+class _PortResolver:
+    """pickle 가능한 port_resolver (spawn 자식에 넘김)."""
+    def __init__(self, baud):
+        self.baud = baud
+
+    def __call__(self):
+        return resolve_rplidar_port(self.baud)
+
+
+def _lidar_main(ring_name, adapter_kw, frame_points, stop, ready):
+    """자식 프로세스 본체. 종료는 stop 이벤트 또는 부모 종료(daemon)."""
+    from pi.sensor.adapter_rplidar import RPLidarAdapter
+    ring = FrameRing.attach(ring_name)
+    sensor = None
+    try:
+        sensor = RPLidarAdapter(**adapter_kw)
+        ring.set_flag(FLAG_READY)
+        ready.set()
+        last_frames = 0
+        # 재기동된 자식이면 이전 자식의 누적값에 이어서 셈
+        base_frames = int(ring.header["frames"])
+        base_dropped = int(ring.header["dropped_points"])
+        while not stop.is_set():
+            d = sensor.read(frame_points=frame_points)
+            ring.set_flag(FLAG_RECONNECTING, sensor.reconnecting)
+            ring.header["dropped_points"] = base_dropped + sensor.dropped_points
+            if sensor.frames == last_frames:
+                # 재연결 중이거나 포인트 없음 → 바쁜 대기 방지
+                time.sleep(0.02)
+                continue
+            last_frames = sensor.frames
+            d_front, d_left, d_right, _ = sensor.read_triplet()
+            f = sensor.frame
+            ring.write(f.angles, f.dists, f.t0, f.t1, d_out=d, triplet=(d_front, d_left, d_right),
+                       qualities=f.qualities, new_rev=f.new_rev)
+            ring.header["frames"] = base_frames + sensor.frames
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print("[LIDAR PROC ERR]", e)
+    finally:
+        ring.set_flag(FLAG_READY, False)
+        if sensor is not None:
+            sensor.stop()
+        ring.close()
+
+
+class LidarProcess(SensorAdapter):
+    """
+    RPLidarAdapter 호환 어댑터 (read / read_triplet / frames / dropped_points / frame_t0 / frame_t1 / stop)
+    - timeout_s   : read()가 새 프레임을 기다리는 최대 시간 (넘으면 None → FSM lost frame)
+    - start_timeout_s: 자식의 라이다 연결(스핀업 포함) 대기. 실패하면 RuntimeError
+    - 자식이 죽으면 read()는 None을 돌려주고 백그라운드로 다시 띄움
+    - adapter_kw  : RPLidarAdapter 인자 (pickle 가능한 값만). port_resolver 대신 resolve_port=True
+    """
+    def __init__(self, frame_points=720, slots=8, max_points=1024, timeout_s=0.5,
+                 start_timeout_s=15.0, resolve_port=True, **adapter_kw):
+        self.frame_points = int(frame_points)
+        self.timeout_s = float(timeout_s)
+        self.start_timeout_s = float(start_timeout_s)
+        self.adapter_kw = dict(adapter_kw)
+        if resolve_port:
+            self.adapter_kw["port_resolver"] = _PortResolver(self.adapter_kw.get("baud", 460800))
+        self.ring = FrameRing.create(slots=slots, max_points=max_points)
+        self._ctx = mp.get_context("spawn")   # 부모의 스레드/시리얼 핸들을 물려받지 않도록 fork 대신 spawn
+        self._stop = self._ctx.Event()
+        self._respawning = threading.Event()
+        self.restarts = 0
+        self.proc = None
+        self._final = (0, 0)
+
+        self._last_seq = 0
+        self._frame = None
+        self.frame = None
+        self._front_t = None
+        self._front_d = None
+        self.frame_t0 = None
+        self.frame_t1 = None
+
+        if not self._spawn():
+            self.stop()
+            raise RuntimeError("lidar process failed to start")
+
+    def _spawn(self):
+        ready = self._ctx.Event()
+        self.proc = self._ctx.Process(
+            target=_lidar_main, name="lidar",
+            args=(self.ring.name, self.adapter_kw, self.frame_points, self._stop, ready),
+            daemon=True)
+        self.proc.start()
+        t_end = time.monotonic() + self.start_timeout_s
+        while time.monotonic() < t_end:
+            if ready.wait(0.05):
+                print(f"[LIDAR] process pid={self.proc.pid} ready")
+                return True
+            if not self.proc.is_alive():
+                break
+        return False
+
+    def _respawn_worker(self):
+        try:
+            while not self._stop.is_set():
+                if self.proc is not None:
+                    self.proc.join(timeout=0.5)
+                self.restarts += 1
+                if self._spawn():
+                    return
+                time.sleep(0.4)
+        finally:
+            self._respawning.clear()
+
+    @property
+    def reconnecting(self):
+        return self._respawning.is_set() or self.ring.flag(FLAG_RECONNECTING)
+
+    @property
+    def frames(self):
+        return int(self.ring.header["frames"]) if self.ring.header is not None else self._final[0]
+
+    @property
+    def dropped_points(self):
+        return int(self.ring.header["dropped_points"]) if self.ring.header is not None else self._final[1]
+
+    # 코너/디버그용 (RPLidarAdapter와 같은 이름, 마지막 LidarFrame의 view)
+    @property
+    def last_angles(self):
+        return self.frame.angles if self.frame is not None else EMPTY
+
+    @property
+    def last_dists(self):
+        return self.frame.dists if self.frame is not None else EMPTY
+
+    def read(self, frame_points=None):
+        """새 프레임을 timeout_s까지 기다림 → 대표거리(mm) 또는 None."""
+        if self.proc is None or not self.proc.is_alive():
+            if not self._respawning.is_set() and not self._stop.is_set():
+                print("[LIDAR] process died → respawn (background)")
+                self._respawning.set()
+                threading.Thread(target=self._respawn_worker, daemon=True).start()
+            return None
+
+        t_end = time.monotonic() + self.timeout_s
+        while True:
+            f = self.ring.read_latest(self._last_seq)
+            if f is not None:
+                break
+            if time.monotonic() >= t_end:
+                return None
+            time.sleep(0.001)
+
+        self._last_seq = f.seq
+        self._frame = f
+        # 슬롯 view 그대로 (복사 없음). 쓰는 쪽은 f.valid()/파생값 None으로 덮어쓰기를 알 수 있고
+        # 틱을 넘겨 보관하는 쪽(RawRecorder)만 detach()로 복사
+        self.frame = LidarFrame(f.seq, f.t0, f.t1, f.angles, f.dists, f.qualities, f.new_rev, source=f)
+        self.frame_t0, self.frame_t1 = f.t0, f.t1
+        return f.d_out
+
+    def read_triplet(self):
+        f = self._frame
+        if f is None:
+            return None, None, None, 0.0
+        d_front = f.d_front
+        now = time.time()
+        drop = 0.0
+        if self._front_t is not None and self._front_d is not None and d_front is not None:
+            dt = max(1e-3, now - self._front_t)
+            drop = (self._front_d - d_front) / dt
+        self._front_t = now
+        self._front_d = d_front
+        return d_front, f.d_left, f.d_right, drop
+
+    def stop(self):
+        self._stop.set()
+        if self.proc is not None:
+            self.proc.join(timeout=3.0)
+            if self.proc.is_alive():
+                self.proc.terminate()
+                self.proc.join(timeout=1.0)
+        self._frame = None
+        self.frame = None
+        if self.ring.header is not None:
+            self._final = (self.frames, self.dropped_points)  # 종료 후 요약 출력용
+            self.ring.close()
+        print("[LIDAR] process stopped.")
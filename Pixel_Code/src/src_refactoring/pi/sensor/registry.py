@@ -0,0 +1,44 @@
+# pi/sensor/registry.py
+# -*- coding: utf-8 -*-
+# 센서 백엔드 레지스트리 (config sensor.backend 또는 app.py --sensor)
+#   sensor = create("sim", scenario="B")
+#   sensor = create("rplidar", port=..., baud=...)
+#
+# 백엔드 모듈은 create() 시점에만 import → sim/replay 실행은 pyrplidar/numpy/multiprocessing을 안 불러옴
+# 모든 백엔드는 pi.sensor.base.SensorAdapter 인터페이스 (read / read_triplet / stop / frame_t0 / frame_t1)
+import importlib
+
+# 이름 → (모듈, 클래스, 실제 라이다 포트가 필요한지)
+SENSORS = {
+    "rplidar":      ("pi.sensor.adapter_rplidar", "RPLidarAdapter", True),
+    "rplidar-proc": ("pi.sensor.lidar_proc", "LidarProcess", True),
+    "sim":          ("pi.sensor.adapter_sim", "SimulatedSensor", False),
+    "replay":       ("pi.sensor.adapter_replay", "ReplaySensor", False),
+    "raw-replay":   ("pi.sensor.adapter_raw_replay", "RawReplaySensor", False),
+}
+
+
+def register(name, module, cls, needs_port=False):
+    """외부 백엔드 추가 (모듈 경로 문자열만 저장, import는 create 때)."""
+    SENSORS[name] = (module, cls, needs_port)
+
+
+def names():
+    return tuple(SENSORS)
+
+
+def needs_port(name):
+    return SENSORS[name][2]
+
+
+def load(name):
+    """백엔드 클래스 (여기서 처음 import)."""
+    try:
+        module, cls, _ = SENSORS[name]
+    except KeyError:
+        raise ValueError(f"unknown sensor backend: {name} (choose from {names()})") from None
+    return getattr(importlib.import_module(module), cls)
+
+
+def create(name, **kw):
+    return load(name)(**kw)
@@ -0,0 +1,125 @@
+# pi/startup.py
+# -*- coding: utf-8 -*-
+import time
+import threading
+
+
+class _Task:
+    def __init__(self, name, fn, deps, required):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.required = required
+        self.ready = threading.Event()   # 성공/실패와 무관하게 "끝남"
+        self.result = None
+        self.error = None
+        self.t_start = None
+        self.t_end = None
+
+
+class Startup:
+    """
+    병렬 기동 오케스트레이터
+    - 각 단계(라이다 스핀업, ESP32 리셋/셀프테스트, Hall 스레드, 로거 등)를 스레드로 동시에 실행
+    - deps로 선후관계 지정 (선행 단계가 끝나야 시작, 선행 실패 시 건너뜀)
+    - wait(필수 단계)로 "최소 안전 세트"만 기다린 뒤 루프 시작, 나머지는 루프 중 get()으로 합류
+    - report()로 단계별 소요 시간 출력
+
+    사용 예)
+      boot = Startup()
+      boot.add("ports",  sup.discover)
+      boot.add("lidar",  make_lidar, deps=["ports"])
+      boot.add("esp32",  make_link,  deps=["ports"], required=False)
+      boot.start()
+      if not boot.wait_required(timeout=10): ...
+      link = boot.get("esp32")   # 아직 준비 안 됐으면 None
+    """
+    def __init__(self, verbose=True):
+        self.verbose = verbose
+        self._tasks = {}
+        self.t0 = None
+        self.t_first_decision = None
+
+    # ---------- 등록/실행 ----------
+    def add(self, name, fn, deps=(), required=True):
+        """fn()의 반환값이 해당 단계의 결과(get(name))가 된다."""
+        self._tasks[name] = _Task(name, fn, deps, required)
+        return self
+
+    def _run(self, t: _Task):
+        for d in t.deps:
+            dep = self._tasks[d]
+            dep.ready.wait()
+            if dep.error is not None:
+                t.error = RuntimeError(f"dependency '{d}' failed")
+                t.t_start = t.t_end = time.time()
+                t.ready.set()
+                return
+        t.t_start = time.time()
+        try:
+            t.result = t.fn()
+        except Exception as e:
+            t.error = e
+            if self.verbose:
+                print(f"[BOOT] {t.name} failed: {e}")
+        t.t_end = time.time()
+        t.ready.set()
+
+    def start(self):
+        self.t0 = time.time()
+        for t in self._tasks.values():
+            threading.Thread(target=self._run, args=(t,), daemon=True,
+                             name=f"boot-{t.name}").start()
+        return self
+
+    # ---------- 대기/조회 ----------
+    def wait(self, names, timeout=None):
+        """names가 모두 성공하면 True (하나라도 실패/타임아웃이면 False)."""
+        deadline = None if timeout is None else time.time() + timeout
+        for n in names:
+            t = self._tasks[n]
+            left = None if deadline is None else max(0.0, deadline - time.time())
+            if not t.ready.wait(left) or t.error is not None:
+                return False
+        return True
+
+    def wait_required(self, timeout=None):
+        return self.wait([n for n, t in self._tasks.items() if t.required], timeout)
+
+    def is_ready(self, name):
+        t = self._tasks.get(name)
+        return bool(t and t.ready.is_set() and t.error is None)
+
+    def get(self, name):
+        """성공적으로 끝난 단계의 결과, 아니면 None (블록하지 않음)."""
+        t = self._tasks.get(name)
+        if t is None or not t.ready.is_set() or t.error is not None:
+            return None
+        return t.result
+
+    def error(self, name):
+        t = self._tasks.get(name)
+        return t.error if t else None
+
+    def mark_first_decision(self):
+        if self.t_first_decision is None:
+            self.t_first_decision = time.time()
+
+    # ---------- 리포트 ----------
+    def report(self):
+        """단계별 시작/종료 오프셋(ms)과 첫 판단까지 걸린 시간 출력."""
+        if self.t0 is None:
+            return
+        print("[BOOT] ---- startup breakdown ----")
+        for t in sorted(self._tasks.values(), key=lambda x: (x.t_start or 1e18)):
+            if t.t_start is None:
+                print(f"[BOOT] {t.name:<8} pending")
+                continue
+            if t.t_end is None:
+                print(f"[BOOT] {t.name:<8} start={(t.t_start - self.t0)*1000:7.0f}ms  running")
+                continue
+            st = "ok" if t.error is None else f"FAIL({t.error})"
+            print(f"[BOOT] {t.name:<8} start={(t.t_start - self.t0)*1000:7.0f}ms "
+                  f"dur={(t.t_end - t.t_start)*1000:7.0f}ms  {st}")
+        if self.t_first_decision is not None:
+            print(f"[BOOT] first decision at {(self.t_first_decision - self.t0)*1000:.0f}ms")
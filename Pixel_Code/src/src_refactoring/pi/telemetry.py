@@ -0,0 +1,118 @@
+# pi/telemetry.py
+# -*- coding: utf-8 -*-
+# 고정 레이아웃 상태 패킷 UDP 송신 (제어 루프는 stdout 대신 여기로 보냄)
+#   pub = TelemetryPublisher(port=9870, rate_hz=20)
+#   pub.publish(ts, state, d_min_mm, v_mps, ttc_s, target_deg, pwm_us)
+#   뷰어: python -m pi.tools.telemetry_view --port 9870
+import time
+import socket
+import struct
+
+MAGIC = b"PXT1"
+
+# 두 엔트리포인트(pi/app.py, scooter/main.py)의 상태 이름을 한 테이블로
+STATES = ("SAFE", "WARN", "BRAKE", "FAILSAFE", "CORNER",
+          "WARNING", "DECELERATE", "EMERGENCY_STOP", "SLOWDOWN_CORNER", "OTHER")
+LEVELS = ("", "SAFE", "MILD", "STRONG", "EMERGENCY")
+SOURCES = ("pi", "scooter")
+
+# magic | seq u32 | ts f64 | src u8 | state u8 | level u8 | flags u8
+# | d_min_mm f32 | v_mps f32 | ttc_s f32 | target_deg i16 | pwm_us u16   (= 36 bytes)
+PACKET = struct.Struct("<4sIdBBBBfffhH")
+FLAG_CORNER = 0x01
+
+NAN = float("nan")
+_STATE_IDS = {s: i for i, s in enumerate(STATES)}
+_LEVEL_IDS = {s: i for i, s in enumerate(LEVELS)}
+
+
+def decode(data):
+    """패킷 → dict (잘못된 패킷이면 None). NaN/-1/0은 None으로."""
+    if len(data) != PACKET.size or data[:4] != MAGIC:
+        return None
+    _, seq, ts, src, st, lv, flags, d, v, ttc, tgt, pwm = PACKET.unpack(data)
+    return {
+        "seq": seq, "ts": ts,
+        "source": SOURCES[src] if src < len(SOURCES) else str(src),
+        "state": STATES[st] if st < len(STATES) else "OTHER",
+        "level": LEVELS[lv] if lv < len(LEVELS) else "",
+        "corner": bool(flags & FLAG_CORNER),
+        "d_min_mm": None if d != d else d,
+        "v_mps": None if v != v else v,
+        "ttc_s": None if ttc != ttc else ttc,
+        "target_deg": None if tgt == -1 else tgt,
+        "pwm_us": pwm or None,
+    }
+
+
+class TelemetryPublisher:
+    """
+    UDP 상태 패킷 송신
+    - rate_hz로 솎아냄(decimation): 루프가 더 빨라도 초당 rate_hz개만 전송
+      (상태가 바뀐 틱은 솎아내지 않고 바로 전송)
+    - 논블로킹 소켓, 송신 실패는 카운트만 (수신자 없어도 루프에 영향 없음)
+    """
+    def __init__(self, host="127.0.0.1", port=9870, rate_hz=20.0, source="pi", clock=time.monotonic):
+        self.addr = (host, int(port))
+        self.clock = clock
+        self.min_dt = 1.0 / rate_hz if rate_hz and rate_hz > 0 else 0.0
+        self.src = SOURCES.index(source) if source in SOURCES else 0
+        self.sent = 0
+        self.decimated = 0
+        self.errors = 0
+        self._seq = 0
+        self._last_t = 0.0
+        self._last_state = None
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def publish(self, ts, state, d_min_mm=None, v_mps=None, ttc_s=None,
+                target_deg=None, pwm_us=None, level="", corner=False):
+        now = self.clock()
+        if now - self._last_t < self.min_dt and state == self._last_state:
+            self.decimated += 1
+            return False
+        self._last_t = now
+        self._last_state = state
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        try:
+            pkt = PACKET.pack(
+                MAGIC, self._seq, ts, self.src,
+                _STATE_IDS.get(state, _STATE_IDS["OTHER"]), _LEVEL_IDS.get(level, 0),
+                FLAG_CORNER if corner else 0,
+                NAN if d_min_mm is None else d_min_mm,
+                NAN if v_mps is None else v_mps,
+                NAN if ttc_s is None else ttc_s,
+                -1 if target_deg is None else int(target_deg),
+                0 if pwm_us is None else int(pwm_us),
+            )
+            self._sock.sendto(pkt, self.addr)
+            self.sent += 1
+            return True
+        except (OSError, struct.error):
+            self.errors += 1
+            return False
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class ConsoleSummary:
+    """콘솔 출력 속도 제한: every_s마다 한 줄만 (0이면 끔). 루프가 stdout을 기다리지 않도록."""
+    def __init__(self, every_s=1.0):
+        self.every_s = float(every_s)
+        self.suppressed = 0
+        self._last = 0.0
+
+    def due(self):
+        if self.every_s <= 0:
+            return False
+        now = time.monotonic()
+        if now - self._last >= self.every_s:
+            self._last = now
+            return True
+        self.suppressed += 1
+        return False
@@ -0,0 +1,432 @@
+# pi/tools/bench.py
+# -*- coding: utf-8 -*-
+# 인지/판단/링크 핫패스 오프라인 벤치마크
+#   python -m pi.tools.bench                         # 전체 실행 + pi/bench/bench_<stamp>.json 저장
+#   python -m pi.tools.bench --only fsm,corner       # 일부만
+#   python -m pi.tools.bench --compare pi/bench/baseline.json --threshold 0.15
+#       → best-of-N(min)이 기준 min +15%와 기준 실행의 max를 모두 넘은 항목을 다시 재고(--confirm),
+#         그래도 느리면 REGRESSION으로 표시, 하나라도 있으면 exit 1
+#
+# 입력 데이터
+#   - 라이다 프레임: 시드 고정 합성 스캔 (벽 + 정면 장애물 + 노이즈/무효점)
+#   - FSM 입력: pi/logs 세션의 (d_min_mm, v_mps) 기록 (없으면 합성 램프)
+#   - 직렬: pi.tools.fake_esp32 pty 대역 (하드웨어 불필요)
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import itertools
+from datetime import datetime
+from statistics import median
+
+SCOOTER_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "scooter"))
+
+
+class _Meas:
+    """PyRPlidarMeasurement 대용 (angle/distance만)."""
+    __slots__ = ("angle", "distance", "quality")
+
+    def __init__(self, angle, distance, quality=15):
+        self.angle = angle
+        self.distance = distance
+        self.quality = quality
+
+
+def synth_frames(n_frames=20, points=720, seed=0):
+    """좌우 벽(복도) + 정면 장애물이 다가오는 합성 스캔. 일부는 무효점(0mm)."""
+    rnd = random.Random(seed)
+    frames = []
+    for k in range(n_frames):
+        obstacle = 3000.0 - k * 100.0
+        pts = []
+        for i in range(points):
+            a = i * 360.0 / points
+            if a <= 15 or a >= 345:
+                d = obstacle
+            elif 60 <= a <= 120:
+                d = 900.0       # 왼쪽 벽
+            elif 240 <= a <= 300:
+                d = 2400.0      # 오른쪽(열린 쪽)
+            else:
+                d = 5000.0
+            d += rnd.gauss(0, 15)
+            if rnd.random() < 0.03:
+                d = 0.0
+            pts.append(_Meas(a, d))
+        frames.append(pts)
+    return frames
+
+
+def dist_table(frame):
+    """scooter/main.py와 같은 방식의 각도별 최소거리 테이블(전방 0~80°, 279~359°)."""
+    t = [None] * 360
+    for m in frame:
+        ang, dmm = m.angle, m.distance
+        if not ((0.0 <= ang <= 80.0) or (279.0 <= ang <= 359.9)):
+            continue
+        if not (80.0 <= dmm <= 8000.0):
+            continue
+        a = int(ang) % 360
+        if t[a] is None or dmm < t[a]:
+            t[a] = dmm
+    return t
+
+
+def fsm_inputs(log_dir="pi/logs", limit=5000):
+    try:
+        from pi.datalog.store import SessionStore
+        st = SessionStore.load(log_dir)
+        d, v = st.cols["d_min_mm"], st.cols["v_mps"]
+        rows = [(None if dd != dd else float(dd), None if vv != vv else float(vv))
+                for dd, vv in zip(d[:limit], v[:limit])]
+        if rows:
+            return rows, f"{log_dir} ({len(rows)} rows)"
+    except Exception as e:
+        print("[BENCH] log input unavailable:", e)
+    rows = [(3000.0 - (i % 300) * 10.0, 2.0) for i in range(limit)]
+    return rows, "synthetic ramp"
+
+
+# ---------------- 케이스 ----------------
+# 각 케이스: setup(ctx) → (fn, teardown|None). fn()은 1회 연산.
+class Skip(Exception):
+    pass
+
+
+def case_rplidar_read(ctx):
+    try:
+        from pi.sensor.adapter_rplidar import RPLidarAdapter
+    except ImportError as e:
+        raise Skip(f"pyrplidar 없음 ({e})")
+
+    frames = ctx["frames"]
+
+    class _OfflineLidar(RPLidarAdapter):
+        def _connect(self):
+            pts = itertools.cycle(itertools.chain.from_iterable(frames))
+            self._scan_iter_factory = lambda: pts
+
+    ad = _OfflineLidar(spinup_s=0, frame_ms=1000)
+    ctx["lidar"] = ad
+    return (lambda: ad.read(frame_points=len(frames[0]))), None
+
+
+def case_read_triplet(ctx):
+    ad = ctx.get("lidar")
+    if ad is None:
+        raise Skip("rplidar_read 선행 필요")
+    ad.read(frame_points=len(ctx["frames"][0]))
+    from pi.sensor.frame import LidarFrame
+    f = ad.frame
+
+    def fn():
+        # 섹터 값은 프레임별 캐시 → 매번 캐시 없는 새 프레임(배열은 공유)으로 첫 계산 비용을 잼
+        ad.frame = LidarFrame(f.seq, f.t0, f.t1, f.angles, f.dists)
+        return ad.read_triplet()
+    return fn, None
+
+
+def case_fsm(ctx):
+    from pi.decision import DecisionFSM, FsmParams
+    fsm = DecisionFSM(FsmParams())
+    it = itertools.cycle(ctx["fsm_rows"])
+
+    def fn():
+        d, v = next(it)
+        fsm.update(d, v_mps=v)
+    return fn, None
+
+
+def case_corner(ctx):
+    from pi.decision import CornerDetector, CornerParams
+    cd = CornerDetector(CornerParams())
+    seq = itertools.cycle([(800.0 + 50 * (i % 10), 700.0, 2600.0 - 40 * (i % 10), 1.5)
+                           for i in range(20)])
+    return (lambda: cd.update(*next(seq))), None
+
+
+def _scooter_decision():
+    if SCOOTER_DIR not in sys.path:
+        sys.path.insert(0, SCOOTER_DIR)
+    import decision
+    return decision
+
+
+def case_detect_corners(ctx):
+    dec = _scooter_decision()
+    tables = itertools.cycle(ctx["tables"])
+    return (lambda: dec.detect_corners_front_180(next(tables))), None
+
+
+def case_decision_core(ctx):
+    dec = _scooter_decision()
+    core = dec.DecisionCore()
+    tables = itertools.cycle(ctx["tables"])
+    return (lambda: core.decide(next(tables), 3.0)), None
+
+
+def case_frame_ring(ctx):
+    # 인식 프로세스 → 판단 프로세스 프레임 전달 비용 (한 프로세스 안에서 write + read_latest)
+    from pi.sensor.frame_ring import FrameRing
+    ring = FrameRing.create(slots=8, max_points=1024)
+    frames = [([m.angle for m in f], [m.distance for m in f]) for f in ctx["frames"]]
+    it = itertools.cycle(frames)
+
+    def fn():
+        angles, dists = next(it)
+        seq = ring.write(angles, dists, 0.0, 0.0, d_out=1000.0, triplet=(1.0, 2.0, 3.0))
+        if ring.read_latest(seq - 1) is None:
+            raise RuntimeError("frame not visible")
+    return fn, ring.close
+
+
+def case_link_set_us(ctx):
+    from pi.tools.fake_esp32 import FakeEsp32
+    from pi.control.esp32_link import Esp32Link
+    fw = FakeEsp32("pi")
+    link = Esp32Link(fw.port, timeout=0.05)
+    link._read_line(0.2)  # 부팅 배너 소비
+    us = itertools.cycle((1200, 1800))
+
+    def fn():
+        if not link.set_us(next(us)).startswith("OK"):
+            raise RuntimeError("no OK from fake firmware")
+
+    def teardown():
+        link.close()
+        fw.close()
+    return fn, teardown
+
+
+def case_link_get_stat(ctx):
+    from pi.tools.fake_esp32 import FakeEsp32
+    from pi.control.esp32_link import Esp32Link
+    fw = FakeEsp32("pi")
+    link = Esp32Link(fw.port, timeout=0.05)
+
+    def fn():
+        link.get_stat(retries=0)
+
+    def teardown():
+        link.close()
+        fw.close()
+    return fn, teardown
+
+
+def case_scooter_send_angle(ctx):
+    from pi.tools.fake_esp32 import FakeEsp32
+    if SCOOTER_DIR not in sys.path:
+        sys.path.insert(0, SCOOTER_DIR)
+    from esp32_comm import ESP32BrakeSerial
+    fw = FakeEsp32("scooter")
+    esp = ESP32BrakeSerial(port=fw.port, timeout=0.05)
+    esp.connect()
+    esp.poll_read()  # GET MAP 응답 소비
+    ang = itertools.cycle((100, 300))
+
+    def fn():
+        # 명령 → OK 응답까지 왕복
+        esp.send_angle(next(ang), force=True)
+        while not esp.poll_read().startswith("OK"):
+            pass
+
+    def teardown():
+        esp.close()
+        fw.close()
+    return fn, teardown
+
+
+CASES = (
+    ("rplidar_read",         case_rplidar_read),
+    ("read_triplet",         case_read_triplet),
+    ("fsm",                  case_fsm),
+    ("corner",               case_corner),
+    ("detect_corners_180",   case_detect_corners),
+    ("decision_core",        case_decision_core),
+    ("frame_ring",           case_frame_ring),
+    ("link_set_us",          case_link_set_us),
+    ("link_get_stat",        case_link_get_stat),
+    ("scooter_send_angle",   case_scooter_send_angle),
+)
+
+
+# pty 왕복 케이스는 두 스레드의 스케줄링에 좌우돼 실행(프로세스)마다 min도 ±40% 흔들림
+# → 회귀 판정 비율을 따로 (2배 넘게 느려져야 회귀), 나머지는 --threshold
+CASE_THRESHOLD = {
+    "link_set_us": 1.0,
+    "link_get_stat": 1.0,
+    "scooter_send_angle": 1.0,
+}
+
+
+# ---------------- 측정 ----------------
+def measure(fn, repeat=5, min_round_s=0.05):
+    """timeit autorange 방식: 한 라운드가 min_round_s 이상 되도록 number를 늘린 뒤 repeat회 측정."""
+    fn()  # 워밍업
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_round_s or number >= 1 << 20:
+            break
+        number *= 2 if dt <= 0 else max(2, min(10, int(min_round_s / dt) + 1))
+    per_op = [dt / number]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_op.append((time.perf_counter() - t0) / number)
+    us = sorted(x * 1e6 for x in per_op)
+    return {"median_us": round(median(us), 3), "min_us": round(us[0], 3),
+            "max_us": round(us[-1], 3), "number": number, "repeat": repeat}
+
+
+def run(names=None, repeat=5, min_round_s=0.05, log_dir="pi/logs"):
+    frames = synth_frames()
+    rows, src = fsm_inputs(log_dir)
+    ctx = {"frames": frames, "tables": [dist_table(f) for f in frames], "fsm_rows": rows}
+    print(f"[BENCH] fsm input: {src}")
+    results = {}
+    for name, setup in CASES:
+        if names and name not in names:
+            continue
+        teardown = None
+        try:
+            fn, teardown = setup(ctx)
+            r = measure(fn, repeat=repeat, min_round_s=min_round_s)
+            results[name] = r
+            print(f"[BENCH] {name:<20} {r['median_us']:>10.2f} us/op  "
+                  f"(min {r['min_us']:.2f}, max {r['max_us']:.2f}, n={r['number']}x{r['repeat']})")
+        except Skip as e:
+            print(f"[BENCH] {name:<20} SKIP: {e}")
+        except Exception as e:
+            print(f"[BENCH] {name:<20} ERROR: {e}")
+        finally:
+            if teardown:
+                teardown()
+    if ctx.get("lidar") is not None:
+        ctx["lidar"].lidar = None  # 가짜 연결이라 stop() 불필요
+    return results
+
+
+def _best(r):
+    """비교 기준값: repeat 라운드 중 최솟값 (잡음은 시간을 늘리기만 하므로 median보다 안정적)."""
+    return r.get("min_us", r["median_us"])
+
+
+def _limit(b, threshold):
+    """
+    회귀 판정 상한: 기준 min × (1 + threshold)와 기준 실행의 max 중 큰 쪽
+    → 기준 측정 자체의 흔들림(pty 왕복처럼 스케줄링에 좌우되는 케이스) 안의 값은 회귀가 아님
+    """
+    return max(_best(b) * (1.0 + threshold), b.get("max_us", 0.0))
+
+
+def compare(results, baseline, threshold=0.15, remeasure=None, confirm=2):
+    """
+    반환: 회귀 항목 이름 목록.
+    - best-of-N(min_us)끼리 비교, 상한은 _limit()
+    - 상한을 넘은 항목은 remeasure(name)로 confirm회까지 다시 재서 가장 빠른 값으로 판정
+      (한 번 튄 측정은 REGRESSION이 아님, 매번 느려야 회귀)
+    """
+    base = baseline.get("results", {})
+    regressions = []
+    print(f"[COMPARE] threshold=+{threshold * 100:.0f}% (pty 케이스는 CASE_THRESHOLD, best-of-N min 기준, "
+          f"기준 실행 max 이내는 잡음, 초과 시 최대 {confirm}회 재측정)")
+    for name, r in results.items():
+        b = base.get(name)
+        if not b:
+            print(f"  {name:<20} (기준 없음)")
+            continue
+        ref = _best(b)
+        limit = _limit(b, max(threshold, CASE_THRESHOLD.get(name, 0.0)))
+        cur = _best(r)
+        tries = 0
+        while cur > limit and remeasure is not None and tries < confirm:
+            tries += 1
+            again = remeasure(name)
+            if again:
+                cur = min(cur, _best(again))
+        ratio = cur / ref if ref else float("inf")
+        if cur > limit:
+            tag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1.0 - threshold:
+            tag = "faster"
+        else:
+            tag = "ok"
+        note = f" (재측정 {tries}회)" if tries else ""
+        print(f"  {name:<20} {ref:>10.2f} → {cur:>10.2f} us  "
+              f"({(ratio - 1) * 100:+.1f}%, 상한 {limit:.2f})  {tag}{note}")
+    for name in base:
+        if name not in results:
+            print(f"  {name:<20} (이번 실행에 없음)")
+    return regressions
+
+
+def _with_deps(names):
+    """read_triplet은 rplidar_read가 만든 프레임을 씀."""
+    if names and "read_triplet" in names:
+        names = set(names) | {"rplidar_read"}
+    return names
+
+
+def main():
+    ap = argparse.ArgumentParser(description="인지/판단/링크 핫패스 오프라인 벤치마크")
+    ap.add_argument("--only", default="", help="쉼표로 구분한 케이스 이름")
+    ap.add_argument("--list", action="store_true", help="케이스 목록")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--min-round-s", type=float, default=0.05)
+    ap.add_argument("--log-dir", default="pi/logs", help="FSM 입력으로 쓸 세션 로그")
+    ap.add_argument("--save", default=None, help="결과 JSON 경로 (기본: pi/bench/bench_<stamp>.json)")
+    ap.add_argument("--no-save", action="store_true")
+    ap.add_argument("--compare", default=None, help="기준 JSON과 비교")
+    ap.add_argument("--threshold", type=float, default=0.15, help="회귀 판정 비율 (0.15 = +15%%)")
+    ap.add_argument("--confirm", type=int, default=2, help="회귀로 보이면 해당 케이스를 다시 재는 최대 횟수")
+    args = ap.parse_args()
+
+    if args.list:
+        for name, _ in CASES:
+            print(name)
+        return 0
+
+    names = _with_deps({n.strip() for n in args.only.split(",") if n.strip()} or None)
+    results = run(names, repeat=args.repeat, min_round_s=args.min_round_s, log_dir=args.log_dir)
+
+    doc = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if not args.no_save:
+        path = args.save or os.path.join("pi", "bench", f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print("[BENCH] saved:", path)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != doc["machine"]:
+            print(f"[COMPARE] 주의: 기준 머신({baseline.get('machine')})과 다름")
+        def remeasure(name):
+            return run(_with_deps({name}), repeat=args.repeat, min_round_s=args.min_round_s,
+                       log_dir=args.log_dir).get(name)
+        reg = compare(results, baseline, args.threshold, remeasure, args.confirm)
+        if reg:
+            print("[COMPARE] regressions:", ", ".join(reg))
+            return 1
+        print("[COMPARE] no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import argparse, csv, glob, os, sys
+from pi.datalog.binlog import iter_rows, FIELDS
+
+def convert(src, dst):
+    n = 0
+    with open(dst, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(FIELDS)
+        for row in iter_rows(src):
+            w.writerow(["" if row.get(k) is None else
+                        (f"{row[k]:.3f}" if k == "ts" else row[k]) for k in FIELDS])
+            n += 1
+    return n
+
+def main():
+    ap = argparse.ArgumentParser(description=".pxl 세션 로그 → CSV 변환")
+    ap.add_argument("inputs", nargs="+", help=".pxl 파일 또는 glob (예: pi/logs/*.pxl)")
+    ap.add_argument("--out-dir", help="출력 폴더 (기본: 입력 폴더 아래 csv/ — pi/logs에 .pxl과 같은 세션이 두 번 잡히지 않도록)")
+    args = ap.parse_args()
+
+    paths = []
+    for p in args.inputs:
+        paths += sorted(glob.glob(p)) or [p]
+
+    for src in paths:
+        base = os.path.splitext(os.path.basename(src))[0] + ".csv"
+        out_dir = args.out_dir or os.path.join(os.path.dirname(src), "csv")
+        dst = os.path.join(out_dir, base)
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            n = convert(src, dst)
+            print(f"[OK] {src} → {dst} ({n} rows)")
+        except Exception as e:
+            print(f"[ERR] {src}: {e}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
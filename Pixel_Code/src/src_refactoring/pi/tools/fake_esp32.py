@@ -0,0 +1,258 @@
+# pi/tools/fake_esp32.py
+# -*- coding: utf-8 -*-
+# pty 기반 ESP32 펌웨어 대역 (하드웨어 없이 직렬 클라이언트 실행/벤치마크용)
+#   python -m pi.tools.fake_esp32 --dialect pi        # 출력된 포트로 app/cli_servo 연결
+#   python -m pi.tools.fake_esp32 --dialect scooter   # scooter/esp32_comm.py용
+#   python -m pi.tools.fake_esp32 --dialect hb        # 2025_2/python_src/comm.py (scooter/test_comm.py, tests/test_comm.py)용
+#
+# dialect
+#   pi      : src_refactoring/esp32/main.ino  (PING, GET_STAT, SET_DEG, SET_US, QUIET)
+#   scooter : scooter/esp32/src/main.cpp      (A:<deg>, GET MAP, SPEED?, PULSES?, RESET, PING)
+#   hb      : 하트비트/모드 프로토콜 (MODE, HB, CMD, SPD_CAP) — hb_timeout_s 동안 HB 없으면
+#             EVT FAILSAFE HB_TIMEOUT <ms>, 다음 HB에 EVT FAILSAFE_CLEAR (첫 HB 전에는 감시 안 함)
+import os
+import tty
+import time
+import select
+import argparse
+import threading
+
+DIALECTS = ("pi", "scooter", "hb")
+HB_MODES = ("IDLE", "NORMAL", "CORNER")
+
+
+class FakeEsp32:
+    """
+    pty 한 쌍을 열고 백그라운드 스레드에서 펌웨어 프로토콜로 응답
+    - port: 클라이언트가 열 슬레이브 장치 경로 (/dev/pts/N)
+    - latency_s: 응답 전 지연 (USB-CDC 왕복 흉내)
+    - push_hz: 주기적 푸시 (pi: STAT, scooter: V:), 0이면 끔
+    - rx_lines: 받은 명령 줄 수 (계측용)
+    - hb_timeout_s: (hb) HB 감시 시간, hb_gaps_ms: 받은 HB 간격 기록 (클라이언트 지터 확인용)
+    """
+    def __init__(self, dialect="pi", latency_s=0.0, push_hz=0.0, v_kmh=0.0, banner=True,
+                 hb_timeout_s=0.5):
+        if dialect not in DIALECTS:
+            raise ValueError(f"unknown dialect: {dialect} (choose from {DIALECTS})")
+        self.dialect = dialect
+        self.latency_s = float(latency_s)
+        self.push_hz = float(push_hz)
+        self.v_kmh = float(v_kmh)
+
+        self.angle = 0
+        self.us = 500
+        self.quiet = False
+        self.hb = 0
+        self.pulses = 0
+        self.rx_lines = 0
+        self.t0 = time.monotonic()
+
+        self.mode = "IDLE"
+        self.cmd = "SAFE"
+        self.spd_cap = None
+        self.hb_timeout_s = float(hb_timeout_s)
+        self.hb_last_t = None
+        self.hb_gaps_ms = []
+        self.failsafe = False
+        self.failsafe_events = 0
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._alive = True
+        # hb: 포트 열 때 보드 리셋 → 부팅 메시지가 조금 뒤에 오는 것 흉내 (열기 전 출력은 클라이언트가 버림)
+        self._boot_at = time.monotonic() + 0.2 if (banner and dialect == "hb") else None
+        self._th = threading.Thread(target=self._run, daemon=True, name="fake-esp32")
+        self._th.start()
+        if banner and dialect != "hb":
+            self._send("ready" if dialect == "pi" else
+                       "READY MG996R (A:<deg>, GET MAP, SPEED?, PULSES?, RESET, PING)")
+
+    # ---------- 응답 ----------
+    def _send(self, line):
+        try:
+            os.write(self._master, (line + "\n").encode("ascii"))
+        except OSError:
+            pass
+
+    def _millis(self):
+        return int((time.monotonic() - self.t0) * 1000)
+
+    def _stat(self):
+        v = self.v_kmh / 3.6
+        return (f"STAT hb={self.hb} angle={self.angle} us={self.us} t={self._millis()} "
+                f"err=0 rpm={v * 60 / 0.69:.2f} v={v:.2f}")
+
+    def _handle_pi(self, line):
+        cmd, _, arg = line.partition(" ")
+        if cmd == "PING":
+            return "PONG"
+        if cmd == "GET_STAT":
+            return self._stat()
+        if cmd == "SET_DEG":
+            self.angle = int(arg or 0)
+            self.us = 500 + int(self.angle * 2000 / 180)
+            return f"OK angle={self.angle} us={self.us}"
+        if cmd == "SET_US":
+            self.us = max(500, min(2500, int(arg or 0)))
+            return f"OK us={self.us}"
+        if cmd == "QUIET":
+            self.quiet = int(arg or 0) != 0
+            return f"OK quiet={int(self.quiet)}"
+        return None
+
+    def _handle_scooter(self, line):
+        line = line.upper()
+        if line.startswith("A:"):
+            try:
+                self.angle = max(0, min(360, int(line[2:])))
+            except ValueError:
+                return "ERR FORMAT (A:<int>)"
+            self.us = 500 + int(min(self.angle, 180) * 2000 / 180)
+            return f"OK {self.angle} {self.us}us"
+        if line == "GET MAP":
+            return "MAP SERVO=MG996R DEG=0-180 US=500-2500 SCALE_360=HALF PIN=18"
+        if line == "SPEED?":
+            return f"V:{self.v_kmh:.3f}"
+        if line == "PULSES?":
+            return f"P:{self.pulses}"
+        if line == "RESET":
+            return "OK RESET"
+        if line == "PING":
+            return "PONG"
+        return "ERR UNKNOWN"
+
+    def _handle_hb(self, line):
+        cmd, _, arg = line.upper().partition(" ")
+        arg = arg.strip()
+        if cmd == "HB":
+            now = time.monotonic()
+            if self.hb_last_t is not None:
+                self.hb_gaps_ms.append((now - self.hb_last_t) * 1000.0)
+            self.hb_last_t = now
+            self.hb += 1
+            if self.failsafe:
+                self.failsafe = False
+                return "EVT FAILSAFE_CLEAR"
+            return None
+        if cmd == "MODE":
+            if arg not in HB_MODES:
+                return f"ERR MODE {arg}"
+            self.mode = arg
+            return f"OK MODE {arg}"
+        if cmd == "CMD":
+            if self.failsafe:
+                return f"ERR FAILSAFE CMD {arg}"   # fail-safe 중엔 브레이크 유지
+            self.cmd = arg
+            return f"OK CMD {arg}"
+        if cmd == "SPD_CAP":
+            try:
+                self.spd_cap = int(arg)
+            except ValueError:
+                return "ERR FORMAT (SPD_CAP <kmh>)"
+            return f"OK SPD_CAP {self.spd_cap}"
+        if cmd == "PING":
+            return "PONG"
+        return "ERR UNKNOWN"
+
+    def _check_hb(self):
+        if self.hb_last_t is None or self.failsafe:
+            return
+        gap = time.monotonic() - self.hb_last_t
+        if gap > self.hb_timeout_s:
+            self.failsafe = True
+            self.failsafe_events += 1
+            self.cmd = "BRAKE"
+            self._send(f"EVT FAILSAFE HB_TIMEOUT {int(gap * 1000)}")
+
+    def _push(self):
+        if self.dialect != "hb":
+            self.hb += 1
+        if self.dialect == "pi":
+            if not self.quiet:
+                self._send(self._stat())
+        else:
+            self._send(f"V:{self.v_kmh:.3f}")
+
+    # ---------- 루프 ----------
+    def _run(self):
+        buf = b""
+        handle = {"pi": self._handle_pi, "scooter": self._handle_scooter, "hb": self._handle_hb}[self.dialect]
+        next_push = time.monotonic() + (1.0 / self.push_hz if self.push_hz > 0 else 1e9)
+        while self._alive:
+            timeout = max(0.0, min(0.05, next_push - time.monotonic()))
+            try:
+                r, _, _ = select.select([self._master], [], [], timeout)
+            except (OSError, ValueError):
+                break
+            if r:
+                try:
+                    chunk = os.read(self._master, 1024)
+                except OSError:
+                    break
+                buf += chunk
+                while b"\n" in buf:
+                    raw, buf = buf.split(b"\n", 1)
+                    line = raw.decode("ascii", errors="ignore").strip()
+                    if not line:
+                        continue
+                    self.rx_lines += 1
+                    resp = handle(line)
+                    if resp is not None:
+                        if self.latency_s > 0:
+                            time.sleep(self.latency_s)
+                        self._send(resp)
+            if self.push_hz > 0 and time.monotonic() >= next_push:
+                self._push()
+                next_push += 1.0 / self.push_hz
+            if self.dialect == "hb":
+                if self._boot_at is not None and time.monotonic() >= self._boot_at:
+                    self._boot_at = None
+                    self._send(f"BOOT PIXEL-HB hb_timeout={int(self.hb_timeout_s * 1000)}ms")
+                    self._send(f"EVT MODE {self.mode}")
+                self._check_hb()
+
+    def close(self):
+        self._alive = False
+        self._th.join(timeout=1.0)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="pty ESP32 펌웨어 대역")
+    ap.add_argument("--dialect", choices=DIALECTS, default="pi")
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--push-hz", type=float, default=0.0, help="주기 푸시 (pi: STAT, scooter: V:)")
+    ap.add_argument("--v-kmh", type=float, default=0.0, help="보고할 속도")
+    ap.add_argument("--hb-timeout-ms", type=float, default=500.0, help="(hb) 이 시간 HB 없으면 fail-safe")
+    args = ap.parse_args()
+
+    fw = FakeEsp32(args.dialect, latency_s=args.latency_ms / 1000.0,
+                   push_hz=args.push_hz, v_kmh=args.v_kmh, hb_timeout_s=args.hb_timeout_ms / 1000.0)
+    print(f"[FAKE-ESP32] dialect={args.dialect} port={fw.port}  (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fw.close()
+        print(f"[FAKE-ESP32] rx_lines={fw.rx_lines}")
+        if fw.dialect == "hb" and fw.hb_gaps_ms:
+            g = sorted(fw.hb_gaps_ms)
+            print(f"[FAKE-ESP32] hb={fw.hb} gap p50={g[len(g) // 2]:.1f}ms max={g[-1]:.1f}ms "
+                  f"failsafe={fw.failsafe_events}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse, time
+import numpy as np
+from pi.datalog.store import SessionStore
+
+def main():
+    ap = argparse.ArgumentParser(description="pi/logs 세션 통합 조회")
+    ap.add_argument("--log-dir", default="pi/logs")
+    ap.add_argument("--state", default="BRAKE", help="구간 조회 대상 state")
+    ap.add_argument("--d-min-lt", type=float, default=None, help="구간 최소 d_min_mm < 값 (mm)")
+    ap.add_argument("--release-mm", type=float, default=1000.0, help="time-to-release 기준 거리")
+    ap.add_argument("--dwell", action="store_true", help="state별 체류시간 히스토그램")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--list", action="store_true", help="구간 목록 출력")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    st = SessionStore.load(args.log_dir, use_cache=not args.no_cache, verbose=True)
+    print("[STORE] state rows:", st.state_counts())
+
+    eps = st.episodes(args.state, d_min_lt=args.d_min_lt)
+    cond = f" d_min<{args.d_min_lt:.0f}mm" if args.d_min_lt is not None else ""
+    print(f"[{args.state}{cond}] episodes={len(eps['dur'])} "
+          f"sessions={len(np.unique(eps['session']))} "
+          f"dur p50={np.median(eps['dur']) if len(eps['dur']) else 0:.2f}s")
+    if args.list:
+        for s, t, d, dm in zip(eps["session"], eps["t0"], eps["dur"], eps["d_min_mm"]):
+            print(f"  {st.session_name(s)}  t0={t:.3f}  dur={d:.2f}s  d_min={dm:.0f}mm")
+
+    ttr = st.time_to_release(args.state, release_mm=args.release_mm)
+    ok = ttr[~np.isnan(ttr)]
+    if len(ok):
+        print(f"[{args.state}] time-to-release(>{args.release_mm:.0f}mm): n={len(ok)} "
+              f"p50={np.percentile(ok, 50):.2f}s p95={np.percentile(ok, 95):.2f}s max={ok.max():.2f}s")
+
+    if args.dwell:
+        for name, (cnt, edges) in st.dwell_histogram().items():
+            cells = " ".join(f"<{e:g}:{c}" for e, c in zip(edges[1:], cnt))
+            print(f"[DWELL] {name:<12} {cells}")
+
+    print(f"[DONE] {(time.time() - t0) * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# pi/tools/replay.py
+# -*- coding: utf-8 -*-
+# 기록 세션 전체를 app.py와 같은 판단 스텝(pi.decision.DecisionStep: FSM → 코너/경로 힌트 → PWM)으로
+# 가상 시계 기반 최대 속도 재생(sleep 없음) → 세션별 기록 상태 vs 재생 상태 diff
+# 파라미터는 pi.config.load_config로 읽고(--fsm/--corner 덮어쓰기도 Config 검증을 거침)
+#
+#   python -m pi.tools.replay                              # pi/logs 전체, 워커 = CPU 수
+#   python -m pi.tools.replay --fsm brake_dist_mm=700      # 파라미터 변경 영향 확인
+#   python -m pi.tools.replay --config my.yaml --out diff.json --examples 10
+#
+# 입력 매핑 (세션 스키마마다 있는 것만 사용)
+#   d_min_mm → fsm.update,  v_mps: 기록값(= app.py가 Hall 융합으로 판단에 쓴 속도),
+#                                   없으면 fsm.v_est_mps (Hall 없을 때 app.py와 동일)
+#   코너: d_front/left/right_mm가 있으면 CornerDetector 재실행 (hint_dist_m/hint_dir 기록이 있으면 경로 힌트도),
+#         없고 corner_active만 있으면 기록값을 코너 판정으로 사용, 둘 다 없으면 코너 없음
+import os
+import glob
+import json
+import time
+import argparse
+from collections import Counter
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from pi.config import Config, ConfigError, load_config
+from pi.decision import DecisionFSM, CornerDetector, DecisionStep, hint_from_cols
+from pi.datalog.store import parse_session, session_paths
+
+
+class VirtualClock:
+    """기록 ts를 그대로 돌려주는 시계 (FSM/코너의 clock 인자로 주입)."""
+    def __init__(self, t=0.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _f(v):
+    return None if v != v else float(v)  # NaN → None
+
+
+def replay_session(path, cfg=None, max_examples=5):
+    """세션 하나 재생 → diff 요약 dict (프로세스 풀 워커에서 실행). cfg: Config (None이면 기본값)."""
+    t0 = time.perf_counter()
+    cfg = cfg or Config({})
+    states, reasons = {}, {}
+    cols = parse_session(path, states, reasons)
+    names = sorted(states, key=states.get)
+
+    clock = VirtualClock()
+    fsm = DecisionFSM(cfg.fsm, clock=clock)
+    step = DecisionStep(fsm, CornerDetector(cfg.corner, clock=clock))
+
+    n = len(cols["ts"])
+    compared = agree = pwm_cmp = pwm_agree = 0
+    confusion = Counter()
+    examples = []
+    corner_src = Counter()
+    for i in range(n):
+        clock.t = cols["ts"][i]
+        d = _f(cols["d_min_mm"][i])
+        v = _f(cols["v_mps"][i])
+        if v is None:
+            v = fsm.p.v_est_mps
+
+        df, dl, dr = (_f(cols[k][i]) for k in ("d_front_mm", "d_left_mm", "d_right_mm"))
+        hint = hint_from_cols(_f(cols["hint_dist_m"][i]), int(cols["hint_dir"][i]))
+        ca = cols["corner_active"][i]
+        logged_corner = None
+        if df is not None or dl is not None or dr is not None or hint is not None:
+            corner_src["triplet"] += 1
+            if hint is not None:
+                corner_src["route_hint"] += 1
+        elif ca >= 0:
+            logged_corner = {"active": bool(ca)}
+            corner_src["logged"] += 1
+        else:
+            corner_src["none"] += 1
+        out, _, pwm_us = step.decide(d, v, (df, dl, dr), hint, corner_info=logged_corner)
+
+        code = cols["state"][i]
+        if code < 0:
+            continue  # 상태 없는 예전 스키마(d_q_mm,note)
+        logged = names[code]
+        compared += 1
+        if logged == out["state"]:
+            agree += 1
+        else:
+            confusion[f"{logged}->{out['state']}"] += 1
+            if len(examples) < max_examples:
+                examples.append({"row": i, "ts": round(clock.t, 3), "d_min_mm": d, "v_mps": v,
+                                 "logged": logged, "replayed": out["state"],
+                                 "reason": out.get("reason")})
+        if cols["pwm_us"][i] >= 0:
+            pwm_cmp += 1
+            pwm_agree += int(cols["pwm_us"][i] == pwm_us)
+
+    return {
+        "session": os.path.basename(path),
+        "rows": n,
+        "compared": compared,
+        "agree": agree,
+        "mismatch": compared - agree,
+        "agree_ratio": round(agree / compared, 4) if compared else None,
+        "pwm_compared": pwm_cmp,
+        "pwm_mismatch": pwm_cmp - pwm_agree,
+        "confusion": dict(confusion.most_common()),
+        "corner_input": dict(corner_src),
+        "examples": examples,
+        "ms": round((time.perf_counter() - t0) * 1000.0, 1),
+    }
+
+
+def replay_all(paths, cfg=None, workers=None, max_examples=5):
+    if workers == 1:
+        return [replay_session(p, cfg, max_examples) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(replay_session, p, cfg, max_examples) for p in paths]
+        return [f.result() for f in futs]
+
+
+def _overrides(pairs):
+    out = {}
+    for kv in pairs:
+        k, _, v = kv.partition("=")
+        out[k.strip()] = yaml.safe_load(v)
+    return out
+
+
+def build_config(path=None, fsm=None, corner=None):
+    """설정 파일(없으면 기본값) + fsm/corner 덮어쓰기 → 검증된 Config (잘못된 키/값은 ConfigError)."""
+    data = dict(load_config(path).data) if path and os.path.exists(path) else {}
+    for sec, over in (("fsm", fsm), ("corner", corner)):
+        if over:
+            data[sec] = dict(data.get(sec) or {}, **over)
+    return Config(data, path=path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="기록 세션 AFAP 리플레이 + 상태 diff")
+    ap.add_argument("inputs", nargs="*", help="세션 파일/glob (기본: <log-dir>/*.csv, *.pxl)")
+    ap.add_argument("--log-dir", default="pi/logs")
+    ap.add_argument("--config", default="pi/config.yaml", help="fsm/servo/corner 섹션 (load_config로 검증)")
+    ap.add_argument("--fsm", nargs="*", default=[], metavar="KEY=VAL", help="FsmParams 덮어쓰기")
+    ap.add_argument("--corner", nargs="*", default=[], metavar="KEY=VAL", help="CornerParams 덮어쓰기")
+    ap.add_argument("--workers", type=int, default=None, help="프로세스 수 (1이면 단일 프로세스)")
+    ap.add_argument("--examples", type=int, default=3, help="세션별 불일치 예시 수")
+    ap.add_argument("--only-diff", action="store_true", help="불일치 있는 세션만 출력")
+    ap.add_argument("--out", default=None, help="세션별 diff JSON 저장 경로")
+    args = ap.parse_args()
+
+    paths = []
+    for p in args.inputs:
+        paths += sorted(glob.glob(p)) or [p]
+    if not args.inputs:
+        paths = session_paths(args.log_dir)
+    if not paths:
+        print("[REPLAY] no sessions")
+        return
+
+    try:
+        cfg = build_config(args.config, _overrides(args.fsm), _overrides(args.corner))
+    except ConfigError as e:
+        print("[REPLAY] config error:", e)
+        return
+
+    t0 = time.perf_counter()
+    results = replay_all(paths, cfg, args.workers, args.examples)
+    wall = time.perf_counter() - t0
+
+    tot = Counter()
+    for r in results:
+        tot["rows"] += r["rows"]
+        tot["compared"] += r["compared"]
+        tot["mismatch"] += r["mismatch"]
+        tot["pwm_mismatch"] += r["pwm_mismatch"]
+        if args.only_diff and not r["mismatch"]:
+            continue
+        ratio = "  n/a " if r["agree_ratio"] is None else f"{r['agree_ratio'] * 100:5.1f}%"
+        top = ", ".join(f"{k}:{v}" for k, v in list(r["confusion"].items())[:3])
+        print(f"{r['session']:<32} rows={r['rows']:>6} agree={ratio} "
+              f"mismatch={r['mismatch']:>5}  {top}")
+        for ex in r["examples"]:
+            print(f"    row {ex['row']:>6} ts={ex['ts']} d={ex['d_min_mm']} v={ex['v_mps']} "
+                  f"{ex['logged']} → {ex['replayed']} ({ex['reason']})")
+
+    diff_sessions = sum(1 for r in results if r["mismatch"])
+    print(f"[REPLAY] {len(results)} sessions / {tot['rows']} rows in {wall:.2f}s "
+          f"({tot['rows'] / max(wall, 1e-9):,.0f} rows/s) | compared={tot['compared']} "
+          f"mismatch={tot['mismatch']} in {diff_sessions} sessions, pwm_mismatch={tot['pwm_mismatch']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"fsm": asdict(cfg.fsm), "corner": vars(cfg.corner), "sessions": results},
+                      f, indent=2)
+        print("[REPLAY] saved:", args.out)
+
+
+if __name__ == "__main__":
+    main()
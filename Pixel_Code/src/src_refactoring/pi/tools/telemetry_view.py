@@ -0,0 +1,79 @@
+# pi/tools/telemetry_view.py
+# -*- coding: utf-8 -*-
+# 텔레메트리 UDP 뷰어 (제어 루프와 별개 프로세스, 자체 주기로 화면 갱신)
+#   python -m pi.tools.telemetry_view --port 9870 --hz 5
+#   python -m pi.tools.telemetry_view --raw          # 패킷마다 한 줄
+import time
+import socket
+import select
+import argparse
+
+from pi.telemetry import PACKET, decode
+
+
+def fmt(v, unit="", nd=0):
+    return "NA" if v is None else f"{v:.{nd}f}{unit}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="텔레메트리 UDP 뷰어")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9870)
+    ap.add_argument("--hz", type=float, default=5.0, help="화면 갱신 주기")
+    ap.add_argument("--raw", action="store_true", help="패킷마다 출력")
+    args = ap.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.setblocking(False)
+    print(f"[VIEW] listening udp://{args.host}:{args.port}")
+
+    last = None
+    n = lost = bad = 0
+    prev_seq = None
+    win_n, win_t0 = 0, time.monotonic()
+    next_draw = time.monotonic()
+    try:
+        while True:
+            r, _, _ = select.select([sock], [], [], max(0.0, next_draw - time.monotonic()))
+            if r:
+                while True:
+                    try:
+                        data = sock.recv(PACKET.size * 2)
+                    except BlockingIOError:
+                        break
+                    pkt = decode(data)
+                    if pkt is None:
+                        bad += 1
+                        continue
+                    if prev_seq is not None and pkt["seq"] > prev_seq + 1:
+                        lost += pkt["seq"] - prev_seq - 1
+                    prev_seq = pkt["seq"]
+                    n += 1
+                    win_n += 1
+                    last = pkt
+                    if args.raw:
+                        print(pkt)
+            now = time.monotonic()
+            if now >= next_draw:
+                next_draw = now + 1.0 / max(0.1, args.hz)
+                if last is None or args.raw:
+                    continue
+                rate = win_n / max(1e-6, now - win_t0)
+                win_n, win_t0 = 0, now
+                age = time.time() - last["ts"]
+                lv = f" level={last['level']}" if last["level"] else ""
+                print(f"[{last['source']}] {last['state']:<15}{lv} d_min={fmt(last['d_min_mm'], 'mm')} "
+                      f"v={fmt(last['v_mps'], 'm/s', 2)} ttc={fmt(last['ttc_s'], 's', 2)} "
+                      f"pwm={last['pwm_us'] or 'NA'}{' CORNER' if last['corner'] else ''} | "
+                      f"{rate:.1f} pkt/s lost={lost} bad={bad} age={age * 1000:.0f}ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        print(f"[VIEW] packets={n} lost={lost} bad={bad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# pi/trace.py
+# -*- coding: utf-8 -*-
+import json
+import time
+
+# 추적 단계 (모두 time.monotonic 기준, stat만 호스트 수신 시각)
+#   sample   : 프레임 첫 라이다 샘플 수신
+#   frame    : 프레임 완성(read() 반환)
+#   decision : FSM/코너 판단 완료
+#   cmd      : 서보 명령 송신 직전
+#   ack      : ESP32 OK 응답 수신
+#   stat     : ack 이후 첫 STAT 수신 (펌웨어 t= 값 함께 기록)
+STAGES = ("sample", "frame", "decision", "cmd", "ack", "stat")
+_IDX = {s: i for i, s in enumerate(STAGES)}
+_N = len(STAGES)
+
+
+def _pct(vals, q):
+    if not vals:
+        return None
+    vals = sorted(vals)
+    i = max(0, min(len(vals) - 1, int(round(q * (len(vals) - 1)))))
+    return vals[i]
+
+
+class Tracer:
+    """
+    장애물 → 브레이크 종단 지연 추적
+    - 라이다 프레임마다 trace id 발급(begin), 단계별 시각 기록(mark)
+    - 고정 크기 링버퍼(미리 할당된 슬롯 재사용) → 오래된 trace는 덮어씀
+    - report(): 단계별(sample 기준 누적 / 직전 단계 대비) p50/p95/p99 (ms)
+    - dump(path): 링버퍼 내용을 JSON lines로 저장
+    """
+    def __init__(self, size=2048, clock=time.monotonic):
+        self.size = int(size)
+        self.clock = clock
+        # 슬롯: [tid, t_sample..t_stat(6), fw_t_ms, state, d_min_mm]
+        self._ring = [[-1] + [None] * (_N + 3) for _ in range(self.size)]
+        self._next_id = 0
+
+    # ---------- 기록 ----------
+    def begin(self, t_sample=None, t_frame=None):
+        tid = self._next_id
+        self._next_id += 1
+        slot = self._ring[tid % self.size]
+        slot[0] = tid
+        for i in range(1, _N + 4):
+            slot[i] = None
+        slot[1] = t_sample
+        slot[2] = t_frame if t_frame is not None else self.clock()
+        return tid
+
+    def _slot(self, tid):
+        if tid is None or tid < 0:
+            return None
+        slot = self._ring[tid % self.size]
+        return slot if slot[0] == tid else None  # 이미 덮어쓴 trace는 무시
+
+    def mark(self, tid, stage, t=None):
+        slot = self._slot(tid)
+        if slot is not None:
+            slot[1 + _IDX[stage]] = self.clock() if t is None else t
+
+    def annotate(self, tid, state=None, d_min_mm=None, fw_t_ms=None):
+        slot = self._slot(tid)
+        if slot is None:
+            return
+        if fw_t_ms is not None:
+            slot[1 + _N] = fw_t_ms
+        if state is not None:
+            slot[2 + _N] = state
+        if d_min_mm is not None:
+            slot[3 + _N] = d_min_mm
+
+    def has(self, tid, stage):
+        slot = self._slot(tid)
+        return slot is not None and slot[1 + _IDX[stage]] is not None
+
+    # ---------- 조회 ----------
+    def traces(self):
+        out = []
+        for slot in sorted((s for s in self._ring if s[0] >= 0), key=lambda s: s[0]):
+            d = {"id": slot[0]}
+            for s in STAGES:
+                d[s] = slot[1 + _IDX[s]]
+            d["fw_t_ms"], d["state"], d["d_min_mm"] = slot[1 + _N], slot[2 + _N], slot[3 + _N]
+            out.append(d)
+        return out
+
+    def report(self, only_commanded=True):
+        """
+        단계별 지연 분위수(ms).
+        only_commanded=True면 서보 명령까지 간 trace만 (= 실제 제동 반응 경로)
+        반환: {"n": int, "from_sample": {stage: {p50,p95,p99}}, "step": {...}}
+        """
+        tr = [t for t in self.traces() if (t["cmd"] is not None or not only_commanded)]
+        cum, step = {}, {}
+        for i, s in enumerate(STAGES[1:], start=1):
+            prev = STAGES[i - 1]
+            c = [(t[s] - t["sample"]) * 1000.0 for t in tr
+                 if t[s] is not None and t["sample"] is not None]
+            d = [(t[s] - t[prev]) * 1000.0 for t in tr
+                 if t[s] is not None and t[prev] is not None]
+            cum[s] = {q: _pct(c, v) for q, v in (("p50", .5), ("p95", .95), ("p99", .99))}
+            cum[s]["n"] = len(c)
+            step[f"{prev}->{s}"] = {q: _pct(d, v) for q, v in (("p50", .5), ("p95", .95), ("p99", .99))}
+            step[f"{prev}->{s}"]["n"] = len(d)
+        return {"n": len(tr), "from_sample": cum, "step": step}
+
+    def format_report(self):
+        r = self.report()
+        f = lambda v: "NA" if v is None else f"{v:.1f}"
+        lines = [f"[TRACE] commanded traces={r['n']} (ms, p50/p95/p99)"]
+        for k, v in r["step"].items():
+            lines.append(f"[TRACE]   {k:<16} {f(v['p50'])}/{f(v['p95'])}/{f(v['p99'])}  n={v['n']}")
+        e2e = r["from_sample"].get("ack", {})
+        lines.append(f"[TRACE]   sample->ack      {f(e2e.get('p50'))}/{f(e2e.get('p95'))}/{f(e2e.get('p99'))}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for t in self.traces():
+                f.write(json.dumps(t) + "\n")
+        return path
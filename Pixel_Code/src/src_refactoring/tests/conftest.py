@@ -0,0 +1,12 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+# src_refactoring에서 python -m pytest -q 로 실행 (pi 패키지 + 2025_2/python_src의 comm 모듈)
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+for p in (ROOT, os.path.join(ROOT, "..", "2025_2", "python_src")):
+    p = os.path.normpath(p)
+    if p not in sys.path:
+        sys.path.append(p)
@@ -0,0 +1,42 @@
+# tests/test_bench.py
+from pi.tools.bench import compare
+
+
+def _r(mn, mx=None, med=None):
+    return {"min_us": mn, "max_us": mx if mx is not None else mn * 1.05,
+            "median_us": med if med is not None else mn * 1.02}
+
+
+BASE = {"results": {"fsm": _r(10.0), "link_set_us": _r(100.0, 150.0)}}
+
+
+def test_one_slow_run_is_not_a_regression():
+    calls = []
+
+    def remeasure(name):
+        calls.append(name)
+        return _r(10.2)                     # 다시 재면 평소 속도
+
+    reg = compare({"fsm": _r(13.0)}, BASE, 0.15, remeasure)
+    assert reg == []
+    assert calls == ["fsm"]
+
+
+def test_repeated_slowdown_is_a_regression():
+    reg = compare({"fsm": _r(13.0)}, BASE, 0.15, lambda name: _r(12.5), confirm=2)
+    assert reg == ["fsm"]
+
+
+def test_within_baseline_spread_and_pty_threshold():
+    calls = []
+    # 기준 실행 max(150) 이내, pty 케이스는 2배까지 허용 → 재측정도 안 함
+    reg = compare({"link_set_us": _r(140.0)}, BASE, 0.15, lambda n: calls.append(n))
+    assert reg == [] and calls == []
+    reg = compare({"link_set_us": _r(230.0)}, BASE, 0.15, lambda n: _r(225.0))
+    assert reg == ["link_set_us"]
+
+
+def test_median_only_baseline_still_compares():
+    old = {"results": {"fsm": {"median_us": 10.0}}}
+    assert compare({"fsm": _r(10.5)}, old, 0.15) == []
+    assert compare({"fsm": _r(20.0)}, old, 0.15) == ["fsm"]
@@ -0,0 +1,82 @@
+# tests/test_binlog.py
+import csv
+import os
+import time
+
+from pi.datalog.binlog import BinLogger, read_binlog, iter_rows, FIELDS
+from pi.tools.binlog2csv import convert
+
+
+def _write(tmp_path, rows, **kw):
+    lg = BinLogger(log_dir=str(tmp_path), flush_s=0.05, **kw)
+    for r in rows:
+        lg.log(**r)
+    lg.close()
+    return lg
+
+
+ROWS = [
+    dict(ts=1.0, state="SAFE", d_min_mm=1500.0, v_mps=2.0, ttc_s=None,
+         target_deg=None, pwm_us=None, reason="", profile="cruise"),
+    dict(ts=1.1, state="BRAKE", d_min_mm=380.0, v_mps=2.5, ttc_s=0.15,
+         target_deg=40, pwm_us=1700, reason="ttc<0.5", d_front_mm=380.0,
+         d_left_mm=900.0, d_right_mm=None, profile="approach"),
+    dict(ts=1.2, state="???", reason="ttc<0.5"),
+]
+
+
+def test_round_trip(tmp_path):
+    lg = _write(tmp_path, ROWS)
+    assert lg.rows == 3 and lg.dropped == 0
+    rows = list(iter_rows(lg.path))
+    assert len(rows) == 3
+    a, b, c = rows
+    assert a["state"] == "SAFE" and a["ttc_s"] is None and a["target_deg"] is None
+    assert a["profile"] == "cruise" and a["reason"] == ""
+    assert b["state"] == "BRAKE" and b["reason"] == "ttc<0.5" and b["profile"] == "approach"
+    assert b["target_deg"] == 40 and b["pwm_us"] == 1700
+    assert abs(b["ttc_s"] - 0.15) < 1e-6 and b["d_right_mm"] is None
+    assert c["state"] == "OTHER" and c["reason"] == "ttc<0.5"
+
+
+def _log_chunks(lg, rows):
+    """행마다 청크 하나 (batch_rows=1 → 백그라운드 스레드가 바로 기록할 때까지 대기)."""
+    for r in rows:
+        n = lg.chunks
+        lg.log(**r)
+        t_end = time.monotonic() + 2.0
+        while lg.chunks == n and time.monotonic() < t_end:
+            time.sleep(0.005)
+    lg.close()
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    lg = BinLogger(log_dir=str(tmp_path), batch_rows=1, flush_s=5.0)
+    _log_chunks(lg, ROWS[:2])
+    assert lg.chunks == 2
+    # 두 번째 청크 중간에서 잘린 파일 (전원 차단) → 완전한 첫 청크만
+    size = os.path.getsize(lg.path)
+    with open(lg.path, "r+b") as f:
+        f.truncate(size - 5)
+    _, cols = read_binlog(lg.path)
+    assert list(cols["ts"]) == [1.0]
+
+
+def test_rotation(tmp_path):
+    lg = BinLogger(log_dir=str(tmp_path), batch_rows=1, flush_s=5.0)
+    lg.max_bytes = os.path.getsize(lg.path) + 1   # 헤더 + 청크 하나면 다음 파일로
+    _log_chunks(lg, ROWS)
+    assert len(lg.paths) == 3
+    assert [list(read_binlog(p)[1]["ts"]) for p in lg.paths] == [[1.0], [1.1], [1.2]]
+    assert [r["reason"] for p in lg.paths for r in iter_rows(p)] == ["", "ttc<0.5", "ttc<0.5"]
+
+
+def test_binlog2csv(tmp_path):
+    lg = _write(tmp_path, ROWS)
+    dst = tmp_path / "out.csv"
+    assert convert(lg.path, str(dst)) == 3
+    with open(dst, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0].keys()) == FIELDS
+    assert rows[1]["state"] == "BRAKE" and rows[1]["ts"] == "1.100"
+    assert rows[0]["ttc_s"] == ""
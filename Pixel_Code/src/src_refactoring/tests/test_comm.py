@@ -0,0 +1,89 @@
+# tests/test_comm.py
+# 2025_2/python_src/comm.py (conftest.py가 경로 추가) ↔ pi.tools.fake_esp32 (dialect hb)
+import time
+
+import pytest
+
+from comm import Comm
+from pi.tools.fake_esp32 import FakeEsp32
+
+
+@pytest.fixture
+def fw():
+    f = FakeEsp32("hb", hb_timeout_s=0.2)
+    yield f
+    f.close()
+
+
+@pytest.fixture
+def comm(fw):
+    c = Comm(fw.port, 115200)
+    yield c
+    c.close()
+
+
+def _wait_line(c, prefix, timeout=1.0):
+    t_end = time.monotonic() + timeout
+    while time.monotonic() < t_end:
+        for line in c.poll_events(0.05):
+            if line.startswith(prefix):
+                return line
+    return None
+
+
+def test_boot_and_commands(comm, fw):
+    assert _wait_line(comm, "BOOT PIXEL-HB")
+    assert comm.send_mode("normal")
+    assert _wait_line(comm, "OK MODE NORMAL")
+    assert comm.send_speed_cap(10.6)
+    assert _wait_line(comm, "OK SPD_CAP 11")
+    assert comm.send_cmd("warn")
+    assert _wait_line(comm, "OK CMD WARN")
+    assert fw.mode == "NORMAL" and fw.spd_cap == 11 and fw.cmd == "WARN"
+    with pytest.raises(ValueError):
+        comm.send_mode("TURBO")
+
+
+def test_poll_events_is_time_bounded(comm):
+    t0 = time.monotonic()
+    comm.poll_events(0.0)                         # 대기 없음 (부팅 줄이 이미 왔을 수도 있음)
+    assert time.monotonic() - t0 < 0.05
+    assert _wait_line(comm, "EVT MODE")
+    t0 = time.monotonic()
+    assert comm.poll_events(0.1) == []
+    assert 0.09 <= time.monotonic() - t0 < 0.5
+
+
+def test_missed_heartbeat_trips_failsafe_and_next_hb_clears(comm, fw):
+    assert comm.send_hb()
+    assert _wait_line(comm, "EVT FAILSAFE HB_TIMEOUT")      # hb_timeout 0.2 s 넘게 HB 없음
+    assert comm.failsafe and comm.failsafe_events == 1
+    assert fw.cmd == "BRAKE"
+    comm.send_cmd("SAFE")
+    assert _wait_line(comm, "ERR FAILSAFE CMD SAFE")        # fail-safe 중엔 명령 거부
+    comm.send_hb()
+    assert _wait_line(comm, "EVT FAILSAFE_CLEAR")
+    assert not comm.failsafe
+
+
+def test_hb_thread_keeps_link_alive_while_caller_stalls(comm, fw):
+    comm.start_hb(0.05)
+    time.sleep(0.6)                                          # 판단 루프가 멈춘 상황
+    comm.stop_hb()
+    assert fw.failsafe_events == 0
+    assert fw.hb >= 8
+    s = comm.hb_stats()
+    assert s["sent"] == fw.hb
+    assert s["jitter_ms"]["p99"] <= s["jitter_ms"]["max"]
+    assert max(fw.hb_gaps_ms) < 200
+
+
+def test_liveness_stops_hb_when_loop_is_dead(comm, fw):
+    comm.start_hb(0.05, liveness_s=0.1)
+    for _ in range(4):                                       # 살아 있는 동안은 kick
+        comm.kick()
+        time.sleep(0.05)
+    assert _wait_line(comm, "EVT FAILSAFE HB_TIMEOUT", timeout=1.5)  # kick 끊김 → HB 중단
+    assert comm.hb_skipped > 0
+    comm.kick()
+    assert _wait_line(comm, "EVT FAILSAFE_CLEAR")
@@ -0,0 +1,126 @@
+# tests/test_config.py
+import copy
+import os
+
+import pytest
+import yaml
+
+from pi.config import Config, ConfigError, ConfigWatcher, load_config
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SHIPPED = os.path.join(HERE, "..", "pi", "config.yaml")
+
+
+@pytest.fixture
+def base():
+    with open(SHIPPED, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _err(data):
+    with pytest.raises(ConfigError) as e:
+        Config(data)
+    return str(e.value)
+
+
+def test_shipped_config_is_valid():
+    cfg = load_config(SHIPPED)
+    assert cfg.lidar_filter.near_cutoff_mm == 80
+    assert cfg.fsm.brake_deg == 140
+    assert cfg.profile.enabled
+
+
+@pytest.mark.parametrize("section, key", [
+    ("lidar", "quantille"), ("lidar", "min_points_front"), ("comm", "bogus"),
+    ("app", "perod"), ("servo", "brake_angle"), ("fsm", "warn_ttc"), ("corner", "enter_mm"),
+    ("profile", "hold"),
+])
+def test_unknown_key_in_any_section(base, section, key):
+    d = copy.deepcopy(base)
+    d[section][key] = 1
+    assert f"{section}.{key}: unknown key" in _err(d)
+
+
+def test_unknown_section_and_nested_sensor_keys(base):
+    d = copy.deepcopy(base)
+    d["hall"] = {"poll_ms": 50}
+    d["sensor"]["sim"]["scenaro"] = "A"
+    msg = _err(d)
+    assert "hall: unknown section" in msg
+    assert "sensor.sim.scenaro: unknown key" in msg
+
+
+def test_types_and_choices(base):
+    d = copy.deepcopy(base)
+    d["comm"]["baud"] = "fast"
+    d["app"]["runtime"] = "realtime"
+    d["sensor"]["backend"] = "lidar"
+    d["lidar"]["process"] = "yes"
+    msg = _err(d)
+    for part in ("comm.baud: expected int", "app.runtime: 'realtime'",
+                 "sensor.backend: 'lidar'", "lidar.process: expected bool"):
+        assert part in msg
+    # 모든 오류를 한 번에 나열
+    assert msg.count(";") >= 3
+
+
+def test_section_values_are_coerced_in_data():
+    cfg = Config({"app": {"period": "0.1", "log_max_mb": 8.0}, "comm": {"baud": "115200"},
+                  "lidar": {"pwm": "650", "max_dist_mm": "4000"},
+                  "sensor": {"backend": "sim", "sim": {"rate_hz": 20}}})
+    assert cfg.get("app")["period"] == 0.1 and isinstance(cfg.get("app")["log_max_mb"], int)
+    assert cfg.get("comm")["baud"] == 115200
+    assert cfg["lidar"] == {"pwm": 650, "max_dist_mm": 4000}
+    assert cfg["sensor"]["sim"]["rate_hz"] == 20.0 and isinstance(cfg["sensor"]["sim"]["rate_hz"], float)
+    assert cfg.get("servo") is None                 # 파일에 없던 섹션은 그대로 없음
+
+
+def test_servo_angles_feed_fsm(base):
+    d = copy.deepcopy(base)
+    d["servo"]["brake_deg"] = 120
+    assert Config(d).fsm.brake_deg == 120
+    d["fsm"]["brake_deg"] = 130
+    assert "servo.brake_deg: also set as fsm.brake_deg" in _err(d)
+
+
+def test_cross_field_rules(base):
+    d = copy.deepcopy(base)
+    d["fsm"]["brake_ttc_s"] = 3.0
+    d["lidar"]["quantile"] = 1.5
+    d["profile"]["idle_enter_mps"] = 0.9
+    msg = _err(d)
+    assert "brake_ttc_s" in msg and "lidar.quantile" in msg and "idle_enter_mps" in msg
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))   # mtime이 확실히 바뀌도록
+
+
+def test_watcher_hot_reload_and_reject(tmp_path, base, capsys):
+    p = str(tmp_path / "config.yaml")
+    _write(p, base)
+    w = ConfigWatcher(load_config(p))
+    assert w.poll() is None
+
+    d = copy.deepcopy(base)
+    d["fsm"]["brake_dist_mm"] = 500
+    _write(p, d)
+    assert w.check()
+    new = w.poll()
+    assert new.fsm.brake_dist_mm == 500 and w.reloads == 1
+    assert w.poll() is None
+
+    d["comm"]["bogus"] = 1                     # 검증 실패 → 이전 값 유지
+    _write(p, d)
+    assert not w.check()
+    assert w.errors == 1 and w.current is new
+
+    del d["comm"]["bogus"]
+    d["comm"]["baud"] = 9600                   # 재시작해야 반영되는 섹션
+    _write(p, d)
+    assert w.check()
+    w.poll()
+    assert "needs restart: comm" in capsys.readouterr().out
@@ -0,0 +1,61 @@
+# tests/test_corner.py
+from pi.decision import (DecisionFSM, FsmParams, CornerDetector, CornerParams,
+                         apply_corner, pwm_for)
+
+HINT = {"direction": 1, "dist_m": 4.0, "on_route": True}   # 우회전 4 m 앞
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def _step(fsm, corner, clk, d_min_mm, triplet, v_mps=3.0, hint=HINT):
+    clk.t += 0.1
+    out = fsm.update(d_min_mm, v_mps=v_mps)
+    info = corner.update(*triplet, v_mps, route_hint=hint)
+    apply_corner(out, info, fsm.p)
+    return out, info
+
+
+def _pair():
+    clk = FakeClock()
+    return DecisionFSM(FsmParams(), clock=clk), CornerDetector(CornerParams(), clock=clk), clk
+
+
+def test_route_hint_escalates_safe_to_corner():
+    fsm, corner, clk = _pair()
+    out, info = _step(fsm, corner, clk, 5000.0, (5000.0, 3000.0, 3000.0), v_mps=1.0)
+    assert info["route"] and out["state"] == "CORNER" and pwm_for(out["state"]) == 2000
+
+
+def test_route_hint_never_overrides_brake():
+    fsm, corner, clk = _pair()
+    out, info = _step(fsm, corner, clk, 400.0, (400.0, 3000.0, 3000.0))
+    assert info["active"]
+    assert out["state"] == "BRAKE" and pwm_for(out["state"]) == 1500
+
+
+def test_route_hint_never_overrides_failsafe():
+    fsm, corner, clk = _pair()
+    for _ in range(fsm.p.lost_frames_to_fail):
+        out, info = _step(fsm, corner, clk, None, (None, None, None))
+    assert info["active"] and info["reason"].startswith("route_turn")
+    assert out["state"] == "FAILSAFE"
+
+
+def test_lidar_corner_does_not_override_warn():
+    fsm, corner, clk = _pair()
+    # 2 m, 1.5 m/s → TTC 1.33 s (WARN), 좌/우 차이 큼 + 정면 가까움 → 라이다 코너
+    out, info = _step(fsm, corner, clk, 2000.0, (900.0, 300.0, 2500.0), v_mps=1.5, hint=None)
+    assert info["active"] and out["state"] == "WARN"
+
+
+def test_off_route_hint_is_ignored():
+    fsm, corner, clk = _pair()
+    out, info = _step(fsm, corner, clk, 5000.0, (5000.0, 3000.0, 3000.0), v_mps=1.0,
+                      hint=dict(HINT, on_route=False))
+    assert not info["route"] and out["state"] == "SAFE"
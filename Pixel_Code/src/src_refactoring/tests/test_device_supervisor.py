@@ -0,0 +1,87 @@
+# tests/test_device_supervisor.py
+import os
+import pty
+import time
+import tty
+import threading
+
+from pi.control.device_supervisor import (
+    DeviceSupervisor, probe_esp32, probe_rplidar, RPLIDAR_GET_INFO, RPLIDAR_INFO_DESC)
+
+
+class FakePort:
+    """pty 한 쌍: esp(PING→PONG) / lidar(GET_INFO→응답) / none(무응답). 받은 프로브 수를 셈."""
+    def __init__(self, kind):
+        self.kind = kind
+        self.probes = 0
+        self._m, self._s = pty.openpty()
+        tty.setraw(self._s)
+        self.port = os.ttyname(self._s)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        buf = b""
+        while True:
+            try:
+                buf += os.read(self._m, 64)
+            except OSError:
+                return
+            if self.kind == "esp" and b"PING\n" in buf:
+                self.probes += 1
+                os.write(self._m, b"PONG\n")
+                buf = b""
+            elif self.kind == "lidar" and RPLIDAR_GET_INFO in buf:
+                self.probes += 1
+                os.write(self._m, RPLIDAR_INFO_DESC + bytes([0x18, 29, 1, 7]) + bytes(range(16)))
+                buf = b""
+
+    def close(self):
+        for fd in (self._m, self._s):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def test_probe_only_device_is_not_reprobed_by_background_thread(tmp_path):
+    esp, lidar = FakePort("esp"), FakePort("lidar")
+    sup = DeviceSupervisor(cache_path=str(tmp_path / "ports.json"), globs=[esp.port, lidar.port],
+                           retry_s=0.05, verbose=False)
+    try:
+        sup.register("lidar", probe_rplidar)
+        sup.register("esp32", probe_esp32, connect=lambda p: ("link", p), close=lambda h: None)
+        # app.py와 같은 순서: 전체 탐색(기동 단계 "ports") → ESP32만 연결
+        sup.discover()
+        assert sup.connect(["esp32"]) == ["esp32"]
+        assert esp.probes == 1                   # 기동 탐색 결과 재사용 (연결 전에 다시 PING 안 함)
+        assert sup.port("lidar") == lidar.port
+        assert sup.is_ready("lidar")
+        probes = lidar.probes
+
+        sup.start()
+        sup.mark_lost("esp32")
+        t_end = time.monotonic() + 2.0
+        while sup.get("esp32") is None and time.monotonic() < t_end:
+            time.sleep(0.02)
+        time.sleep(0.2)
+
+        assert sup.get("esp32") == ("link", esp.port)
+        # 라이다 포트는 어댑터가 열고 있음 → 백그라운드 재탐색이 GET_INFO를 보내면 안 됨
+        assert lidar.probes == probes
+    finally:
+        sup.stop()
+        esp.close()
+        lidar.close()
+
+
+def test_owner_can_rediscover_its_own_port(tmp_path):
+    lidar = FakePort("lidar")
+    sup = DeviceSupervisor(cache_path=str(tmp_path / "ports.json"), globs=[lidar.port], verbose=False)
+    try:
+        sup.register("lidar", probe_rplidar)
+        assert sup.discover(["lidar"]) == {"lidar": lidar.port}
+        # 어댑터 재연결(port_resolver) 경로: 자기 포트는 다시 확인 가능
+        assert sup.discover(["lidar"]) == {"lidar": lidar.port}
+    finally:
+        sup.stop()
+        lidar.close()
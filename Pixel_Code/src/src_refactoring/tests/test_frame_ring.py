@@ -0,0 +1,109 @@
+# tests/test_frame_ring.py
+import pytest
+
+from pi.sensor.frame import LidarFrame
+from pi.sensor.frame_ring import FrameRing, FLAG_READY, FLAG_RECONNECTING
+from pi.sensor.adapter_raw_replay import RawRecorder
+
+
+@pytest.fixture
+def rings():
+    w = FrameRing.create(slots=4, max_points=16)
+    r = FrameRing.attach(w.name)
+    yield w, r
+    r.close()
+    w.close()
+
+
+def test_reader_sees_latest_complete_frame(rings):
+    w, r = rings
+    assert r.read_latest() is None
+    w.write([1.0, 2.0], [100.0, 200.0], 1.0, 1.1, d_out=150.0, triplet=(100.0, None, 300.0),
+            qualities=[10, 20], new_rev=True)
+    seq = w.write([3.0, 4.0, 5.0], [300.0, 400.0, 500.0], 2.0, 2.1)
+    f = r.read_latest()
+    assert f.seq == seq == 2
+    assert list(f.angles) == [3.0, 4.0, 5.0] and list(f.dists) == [300.0, 400.0, 500.0]
+    assert list(f.qualities) == [0, 0, 0] and not f.new_rev
+    assert f.d_out is None and f.d_front is None
+    assert r.read_latest(after_seq=seq) is None
+
+
+def test_fields_and_truncation(rings):
+    w, r = rings
+    w.write(list(range(20)), [float(i) for i in range(20)], None, 5.0, d_out=7.0,
+            triplet=(1.0, 2.0, None), qualities=list(range(20)), new_rev=True)
+    f = r.read_latest()
+    assert len(f.dists) == 16                  # max_points에서 잘림
+    assert list(f.qualities[:3]) == [0, 1, 2]
+    assert f.new_rev and f.d_out == 7.0
+    assert (f.d_front, f.d_left, f.d_right) == (1.0, 2.0, None)
+    assert f.t0 != f.t0 and f.t1 == 5.0        # None → NaN
+
+
+def test_half_written_slot_is_skipped(rings):
+    w, r = rings
+    w.write([1.0], [100.0], 1.0, 1.1)
+    # writer가 다음 슬롯을 쓰는 도중 (begin만 갱신, header.seq는 아직 전 프레임)
+    s = w.slots[2 % w.n_slots]
+    s["seq_begin"] = 2
+    assert r.read_latest().seq == 1
+    # header.seq가 먼저 보였지만 seq_end가 아직이면 None (찢어진 프레임 안 줌)
+    w.header["seq"] = 2
+    assert r.read_latest() is None
+
+
+def test_view_invalidated_when_slot_is_reused(rings):
+    w, r = rings
+    w.write([1.0], [100.0], 1.0, 1.1)
+    f = r.read_latest()
+    for i in range(w.n_slots - 1):
+        w.write([2.0], [200.0], 2.0, 2.1)
+        assert f.valid()                       # 다른 슬롯만 씀
+    w.write([9.0], [900.0], 3.0, 3.1)          # 한 바퀴 → f의 슬롯 덮어씀
+    assert not f.valid()
+    assert list(f.dists) == [900.0]            # view라서 새 내용이 보임 → valid()로 걸러야 함
+
+
+def _wrap(f):
+    # LidarProcess.read와 같은 방식 (슬롯 view 그대로)
+    return LidarFrame(f.seq, f.t0, f.t1, f.angles, f.dists, f.qualities, f.new_rev, source=f)
+
+
+def test_lidar_frame_over_slot_is_zero_copy_until_detached(rings):
+    w, r = rings
+    w.write([10.0, 350.0], [500.0, 400.0], 1.0, 1.1, qualities=[7, 8])
+    lf = _wrap(r.read_latest())
+    assert lf.valid() and list(lf.dists) == [500.0, 400.0]
+    assert lf.sector_min(335, 25) == 400.0
+    w.slots[1]["dists"][0] = 123.0             # 같은 메모리 → view에 바로 보임 (복사 안 함)
+    assert lf.dists[0] == 123.0
+    kept = lf.detach()
+    assert kept is not lf and kept.valid() and kept.detach() is kept
+    assert list(kept.qualities) == [7, 8] and kept.sector_min(335, 25) == 400.0   # 캐시도 넘김
+    for _ in range(w.n_slots):
+        w.write([1.0], [900.0], 2.0, 2.1)
+    assert not lf.valid() and lf.detach() is None
+    assert lf.sector_min(0, 90) is None and lf.bins() is None   # 덮어써진 뒤 파생값은 버림
+    assert list(kept.dists) == [123.0, 400.0]
+
+
+def test_raw_recorder_keeps_detached_copies(rings):
+    w, r = rings
+    rec = RawRecorder("unused.npz")
+    w.write([1.0], [100.0], 1.0, 1.1)
+    rec.add(_wrap(r.read_latest()))
+    stale = _wrap(r.read_latest())
+    for i in range(w.n_slots):
+        w.write([2.0], [200.0 + i], 2.0, 2.1)
+    rec.add(stale)                             # 이미 덮어써짐 → 버림
+    assert len(rec.frames) == 1 and list(rec.frames[0].dists) == [100.0]
+
+
+def test_flags(rings):
+    w, r = rings
+    w.set_flag(FLAG_READY)
+    w.set_flag(FLAG_RECONNECTING)
+    assert r.flag(FLAG_READY) and r.flag(FLAG_RECONNECTING)
+    w.set_flag(FLAG_RECONNECTING, False)
+    assert r.flag(FLAG_READY) and not r.flag(FLAG_RECONNECTING)
@@ -0,0 +1,61 @@
+# tests/test_fusion.py
+import pytest
+
+from pi.fusion import SensorFusion, TimedSeries, frame_time
+
+
+def test_frame_time_is_midpoint():
+    assert frame_time(1.0, 1.1) == pytest.approx(1.05)
+    assert frame_time(None, 2.0) == 2.0
+    assert frame_time(3.0, None) == 3.0
+
+
+def test_interpolates_between_samples():
+    s = TimedSeries()
+    s.add(10.0, 2.0)
+    s.add(10.1, 3.0)
+    v, stale = s.at(10.075)
+    assert v == pytest.approx(2.75)
+    assert stale == pytest.approx(0.025)      # 가까운 샘플(10.1)까지
+
+
+def test_extrapolation_is_capped_then_held():
+    s = TimedSeries(max_extrap_s=0.1, max_stale_s=0.5)
+    s.add(0.0, 1.0)
+    s.add(0.1, 2.0)                           # 기울기 10/s
+    v, stale = s.at(0.15)
+    assert v == pytest.approx(2.5) and stale == pytest.approx(0.05)
+    v, _ = s.at(0.4)                          # 외삽은 0.1 s까지만
+    assert v == pytest.approx(3.0)
+
+
+def test_stale_value_is_dropped():
+    s = TimedSeries(max_stale_s=0.2)
+    s.add(0.0, 5.0)
+    v, stale = s.at(0.5)
+    assert v is None and stale == pytest.approx(0.5)
+    assert s.misses == 1
+
+
+def test_out_of_order_samples_and_clamp():
+    s = TimedSeries(clamp_min=0.0)
+    s.add(1.0, 0.5)
+    s.add(0.9, 9.0)                           # 시각 역행 → 버림
+    s.add(1.1, 0.1)
+    assert len(s) == 2
+    v, _ = s.at(1.2)                          # 외삽하면 음수 → 0으로
+    assert v == 0.0
+
+
+def test_sensor_fusion_report():
+    f = SensorFusion()
+    assert f.at("speed", 1.0) == (None, None)
+    f.add("speed", 1.0, 2.0)
+    f.add("speed", 2.0, 4.0)
+    assert f.at("speed", 1.5)[0] == pytest.approx(3.0)
+    f.note("lidar", 0.004)
+    rep = f.report()
+    assert rep["speed"]["samples"] == 2
+    assert rep["speed"]["last_stale_ms"] == pytest.approx(500.0)
+    assert rep["lidar"]["stale_ms"]["max"] == pytest.approx(4.0)
+    assert rep["lidar"]["stale_ms"]["p99"] <= rep["lidar"]["stale_ms"]["max"]
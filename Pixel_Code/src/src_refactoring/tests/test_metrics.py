@@ -0,0 +1,34 @@
+# tests/test_metrics.py
+import json
+import urllib.request
+
+from pi.metrics import Metrics
+
+
+def _get(addr, path):
+    with urllib.request.urlopen(f"http://{addr[0]}:{addr[1]}{path}", timeout=2.0) as r:
+        return r.headers["Content-Type"], r.read().decode()
+
+
+def test_http_metrics_endpoint():
+    m = Metrics(stages=("sensor", "decide"), summary_s=0)
+    t = m.now()
+    m.lap("sensor", t)
+    m.inc("ticks", 3)
+    m.gauge("frames", lambda: 7)
+    m.gauge("broken", lambda: 1 / 0)
+    m.route("/trace", lambda: {"n": 1})
+    addr = m.serve(port=0)
+    try:
+        ctype, body = _get(addr, "/metrics")
+        snap = json.loads(body)
+        assert ctype == "application/json"
+        assert snap["counters"] == {"ticks": 3}
+        assert snap["gauges"] == {"frames": 7, "broken": None}
+        assert snap["stages_ms"]["sensor"]["n"] == 1 and snap["stages_ms"]["decide"]["n"] == 0
+        assert json.loads(_get(addr, "/trace")[1]) == {"n": 1}
+        ctype, body = _get(addr, "/")
+        assert ctype.startswith("text/plain") and "ticks=3" in body and "frames=7" in body
+    finally:
+        m.close()
+
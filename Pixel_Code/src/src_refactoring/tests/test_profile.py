@@ -0,0 +1,88 @@
+# tests/test_profile.py
+import pytest
+
+from pi.config import Config, ConfigError
+from pi.profile import ProfileManager, ProfileParams
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _mgr(start="cruise", **kw):
+    clk = FakeClock()
+    return ProfileManager(ProfileParams(enabled=True, **kw), start=start, clock=clk), clk
+
+
+def test_up_is_immediate():
+    m, _ = _mgr()
+    prof, changed = m.update(3.0, 2.0)        # TTC < approach_enter(3.0)
+    assert changed and prof.name == "approach"
+    m, _ = _mgr(start="idle")
+    prof, changed = m.update(1.0, None)       # idle_exit(0.5) 이상
+    assert changed and prof.name == "cruise"
+
+
+def test_down_waits_hold_s():
+    m, clk = _mgr(hold_s=1.0)
+    m.update(3.0, 2.0)
+    assert m.current.name == "approach"
+    for t in (0.0, 0.5, 0.99):
+        clk.t = t
+        prof, changed = m.update(3.0, None)
+        assert not changed and prof.name == "approach"
+    clk.t = 1.0
+    prof, changed = m.update(3.0, None)
+    assert changed and prof.name == "cruise"
+    assert m.switches == 2
+
+
+def test_down_timer_resets_when_condition_breaks():
+    m, clk = _mgr(hold_s=1.0)
+    m.update(0.1, None)                      # idle 후보, 타이머 시작
+    clk.t = 0.8
+    m.update(1.0, None)                      # 다시 cruise 조건 → 타이머 초기화
+    clk.t = 1.2
+    prof, changed = m.update(0.1, None)
+    assert not changed and prof.name == "cruise"
+    clk.t = 2.2
+    prof, changed = m.update(0.1, None)
+    assert changed and prof.name == "idle"
+
+
+def test_speed_none_never_goes_idle():
+    m, clk = _mgr(hold_s=0.0)
+    for t in range(5):
+        clk.t = float(t)
+        prof, _ = m.update(None, None)
+        assert prof.name == "cruise"
+    assert m.switches == 0
+
+
+def test_exit_thresholds_hold_current_level():
+    m, clk = _mgr(start="idle", hold_s=0.0)
+    prof, changed = m.update(0.3, None)      # enter(0.2) 초과지만 exit(0.5) 미만 → idle 유지
+    assert not changed and prof.name == "idle"
+    m, clk = _mgr(hold_s=0.0)
+    m.update(3.0, 2.5)
+    clk.t = 1.0
+    m.update(3.0, 4.0)                       # enter(3.0) 초과지만 exit(4.5) 미만 → approach 유지
+    clk.t = 2.0
+    prof, changed = m.update(3.0, 4.0)
+    assert not changed and prof.name == "approach"
+    assert m.ticks == {"idle": 0, "cruise": 0, "approach": 3}
+
+
+def test_config_profile_levels_override_and_unknown_level():
+    cfg = Config({"profile": {"hold_s": 0.5, "levels": {"idle": {"pwm": 400}}}})
+    assert cfg.profile.enabled and cfg.profile.hold_s == 0.5
+    assert cfg.profile.level("idle").pwm == 400
+    assert cfg.profile.level("cruise").pwm == 650
+    with pytest.raises(ConfigError, match="unknown level"):
+        Config({"profile": {"levels": {"turbo": {"pwm": 900}}}})
+    with pytest.raises(ConfigError, match="idle_enter_mps"):
+        Config({"profile": {"idle_enter_mps": 1.0, "idle_exit_mps": 0.5}})
@@ -0,0 +1,44 @@
+# tests/test_replay.py
+import pytest
+
+from pi.config import Config, ConfigError
+from pi.datalog.binlog import BinLogger
+from pi.decision import DecisionFSM, CornerDetector, DecisionStep, hint_cols
+from pi.tools.replay import VirtualClock, build_config, replay_session
+
+
+def _record(tmp_path, with_hint=True):
+    """app.process_frame과 같은 순서로 판단 → 기록 (경로 힌트로 CORNER가 나오는 구간 포함)."""
+    cfg = Config({})
+    clock = VirtualClock(100.0)
+    step = DecisionStep(DecisionFSM(cfg.fsm, clock=clock), CornerDetector(cfg.corner, clock=clock))
+    lg = BinLogger(log_dir=str(tmp_path), flush_s=0.05)
+    for i in range(40):
+        clock.t = 100.0 + i * 0.1
+        d = 5000.0 if i < 30 else 450.0                  # 마지막엔 BRAKE
+        hint = {"direction": 1, "dist_m": 4.0, "on_route": True} if 10 <= i < 20 else None
+        out, _, pwm_us = step.decide(d, 1.0, (d, 3000.0, 3000.0), hint)
+        hd, hr = hint_cols(hint) if with_hint else (None, 0)
+        lg.log(clock.t, out["state"], out["d_min_mm"], 1.0, out["ttc"], out.get("target_deg"),
+               pwm_us, out.get("reason", ""), d, 3000.0, 3000.0, hint_dist_m=hd, hint_dir=hr)
+    lg.close()
+    return lg.path
+
+
+def test_replay_matches_recorded_decisions(tmp_path):
+    r = replay_session(_record(tmp_path))
+    assert r["compared"] == 40 and r["mismatch"] == 0 and r["pwm_mismatch"] == 0
+    assert r["corner_input"]["route_hint"] == 10
+
+
+def test_replay_without_logged_hint_misses_route_corners(tmp_path):
+    # 힌트가 기록에 없으면(예전 .pxl) 경로 힌트로 낸 CORNER를 재현 못 함 → 힌트 컬럼이 실제로 쓰임
+    r = replay_session(_record(tmp_path, with_hint=False))
+    assert r["confusion"] == {"CORNER->SAFE": 10}
+
+
+def test_build_config_validates_overrides(tmp_path):
+    cfg = build_config(None, fsm={"brake_dist_mm": 700}, corner={"route_lead_s": 1.0})
+    assert cfg.fsm.brake_dist_mm == 700 and cfg.corner.route_lead_s == 1.0
+    with pytest.raises(ConfigError):
+        build_config(None, fsm={"bogus": 1})
@@ -0,0 +1,119 @@
+# tests/test_rplidar_adapter.py
+import time
+
+from pi.sensor.adapter_rplidar import RPLidarAdapter
+
+
+class _Meas:
+    def __init__(self, angle, distance):
+        self.angle = angle
+        self.distance = distance
+        self.quality = 15
+        self.start_flag = False
+
+
+class ScriptedLidar(RPLidarAdapter):
+    """pyrplidar 없이: 연결마다 script에서 스캔 동작 하나를 꺼내 씀 ("ok" / 예외 인스턴스)."""
+    def __init__(self, script, **kw):
+        self.script = list(script)
+        self.connects = 0
+        kw.setdefault("spinup_s", 0)
+        super().__init__(**kw)
+
+    def _connect(self):
+        self.connects += 1
+        step = self.script.pop(0) if self.script else "ok"
+
+        def scan():
+            if isinstance(step, BaseException):
+                raise step
+            a = 0.0
+            while True:
+                yield _Meas(a, 1000.0)
+                a = (a + 1.0) % 360.0
+        it = scan()
+        self._scan_iter_factory = lambda: it
+
+
+def _wait_reconnected(ad, timeout=2.0):
+    t_end = time.monotonic() + timeout
+    while ad.reconnecting and time.monotonic() < t_end:
+        time.sleep(0.01)
+    return not ad.reconnecting
+
+
+def test_serial_error_triggers_background_reconnect():
+    # 첫 연결의 스캔은 OSError(= serial.SerialException) → 재연결 후 정상
+    ad = ScriptedLidar([OSError(5, "device reports readiness to read but returned no data")])
+    assert ad.read(frame_points=50) is None
+    assert _wait_reconnected(ad)
+    assert ad.connects == 2
+    assert ad.read(frame_points=50) == 1000.0
+
+
+def test_parse_error_does_not_reconnect():
+    ad = ScriptedLidar([ValueError("bad descriptor")])
+    assert ad.read(frame_points=50) is None
+    assert not ad.reconnecting
+    assert ad.connects == 1
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.pwm = []
+
+    def stop(self):
+        pass
+
+    def set_motor_pwm(self, pwm):
+        self.pwm.append(pwm)
+
+    def disconnect(self):
+        pass
+
+
+class FlakyLidar(ScriptedLidar):
+    """첫 연결 뒤로는 down인 동안 연결 실패, 연결되면 모터 켬 (set_motor_pwm 기록)."""
+    def __init__(self, script, **kw):
+        self.down = True
+        self.drv = _FakeDriver()
+        super().__init__(script, **kw)
+        self.lidar = self.drv
+
+    def _connect(self):
+        if self.connects and self.down:
+            self.connects += 1
+            raise OSError(2, "No such file or directory")
+        super()._connect()
+        self.drv.set_motor_pwm(self.pwm)
+
+
+def test_stop_ends_reconnect_retries():
+    ad = FlakyLidar([OSError(5, "unplugged")])
+    assert ad.read(frame_points=50) is None
+    time.sleep(0.05)
+    assert ad.reconnecting
+    ad.stop()
+    assert _wait_reconnected(ad, timeout=1.0)    # 재시도 루프 종료
+    n = ad.connects
+    ad.down = False
+    time.sleep(0.6)
+    assert ad.connects == n
+    assert ad.drv.pwm[-1] == 0                   # 다시 켜지지 않음
+    assert ad.read(frame_points=50) is None and not ad.reconnecting   # stop 후엔 재연결 안 띄움
+
+
+def test_connect_finishing_after_stop_turns_motor_off():
+    ad = FlakyLidar([OSError(5, "unplugged")])
+    orig = FlakyLidar._connect
+
+    def slow_connect(self):
+        time.sleep(0.2)                          # 재연결 중에 stop()
+        self.down = False
+        orig(self)
+    ad._connect = slow_connect.__get__(ad)
+    ad.read(frame_points=50)
+    time.sleep(0.05)
+    ad.stop()
+    assert _wait_reconnected(ad, timeout=1.0)
+    assert ad.drv.pwm[-2:] == [650, 0]           # 연결되며 켜진 모터를 바로 끔
@@ -0,0 +1,178 @@
+# tests/test_runtime_async.py
+import time
+import asyncio
+import threading
+
+from pi.decision import DecisionFSM, FsmParams
+from pi.runtime_async import AsyncRuntime
+
+
+class StalledSensor:
+    """첫 read()부터 프레임이 안 옴 (USB 끊김) → 워치독만 판단을 돌림."""
+    def __init__(self):
+        self.exhausted = False
+        self.frame_t0 = self.frame_t1 = self.frame = None
+        self.release = threading.Event()
+
+    def read(self):
+        self.release.wait(5.0)
+        return None
+
+    def read_triplet(self):
+        return None, None, None, 0.0
+
+
+class StreamSensor:
+    """
+    period_s마다 프레임이 완성되는 라이다 흉내 (생산 스레드)
+    read(): 다음 새 프레임까지 블록 (AsyncRuntime 읽기 스레드용)
+    latest(): 블록 없이 마지막 완성 프레임 (폴링 루프용)
+    """
+    def __init__(self, period_s=0.02):
+        self.period_s = period_s
+        self.exhausted = False
+        self.frame = None
+        self.frame_t0 = self.frame_t1 = None
+        self.seq = 0
+        self._cv = threading.Condition()
+        self._stop = threading.Event()
+        threading.Thread(target=self._produce, daemon=True).start()
+
+    def _produce(self):
+        while not self._stop.is_set():
+            time.sleep(self.period_s)
+            with self._cv:
+                self.seq += 1
+                self._t1 = time.monotonic()
+                self._cv.notify_all()
+
+    def read(self):
+        with self._cv:
+            seq = self.seq
+            self._cv.wait_for(lambda: self.seq != seq or self._stop.is_set(), timeout=1.0)
+            self.frame_t0 = self.frame_t1 = self._t1
+            return 1000.0 + self.seq
+
+    def latest(self):
+        with self._cv:
+            return (1000.0 + self.seq, self._t1) if self.seq else (None, None)
+
+    def read_triplet(self):
+        return 1000.0, 2000.0, 2000.0, 0.0
+
+    def stop(self):
+        self._stop.set()
+
+
+def test_watchdog_drives_fsm_to_failsafe():
+    sensor = StalledSensor()
+    fsm = DecisionFSM(FsmParams())
+    states = []
+
+    def on_frame(d, t0, t1, tri, frame):
+        states.append(fsm.update(d)["state"])
+        if states[-1] == "FAILSAFE":
+            sensor.exhausted = True
+
+    rt = AsyncRuntime(sensor, on_frame, watchdog_s=0.05)
+    t0 = time.monotonic()
+    asyncio.run(asyncio.wait_for(rt.run(), timeout=3.0))
+    sensor.release.set()
+    n = fsm.p.lost_frames_to_fail
+    assert states[-1] == "FAILSAFE" and len(states) == n
+    assert rt.watchdog_fires == n and rt.frames == 0
+    assert time.monotonic() - t0 >= n * rt.watchdog_s * 0.9
+
+
+def test_queue_keeps_only_latest_frame():
+    rt = AsyncRuntime(StalledSensor(), None)
+
+    async def main():
+        rt._q = asyncio.Queue(maxsize=1)
+        for i in range(3):
+            rt._push_frame((float(i), None, None, None, None))
+        return rt._q.get_nowait()
+
+    assert asyncio.run(main())[0] == 2.0
+    assert rt.frames_dropped == 2
+
+
+def test_slow_decision_skips_stale_frames():
+    sensor = StreamSensor(period_s=0.005)
+    seen = []
+
+    def on_frame(d, t0, t1, tri, frame):
+        if d is not None:
+            seen.append(d)
+        time.sleep(0.03)              # 판단이 프레임 주기보다 느림 → 밀린 프레임은 버림
+        if len(seen) >= 5:
+            sensor.exhausted = True
+
+    rt = AsyncRuntime(sensor, on_frame, watchdog_s=0.5)
+    asyncio.run(asyncio.wait_for(rt.run(), timeout=3.0))
+    sensor.stop()
+    assert rt.frames_dropped > 0
+    assert all(b - a > 1 for a, b in zip(seen, seen[1:]))   # 매번 최신 프레임으로 건너뜀
+
+
+class FakeLink:
+    def __init__(self):
+        self.sent = []
+        self.threads = set()
+
+    def set_us(self, pwm_us):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.01)
+        self.sent.append(pwm_us)
+        if pwm_us < 0:
+            raise IOError("write timeout")
+        return f"OK {pwm_us}"
+
+
+def test_servo_acks_come_back_on_loop_in_order():
+    rt = AsyncRuntime(StalledSensor(), None)
+    link = FakeLink()
+    got = []
+
+    async def main():
+        rt._loop = asyncio.get_running_loop()
+        loop_thread = threading.get_ident()
+        t0 = time.monotonic()
+        futs = [rt.send_servo(link, pwm, lambda r: got.append((r, threading.get_ident())))
+                for pwm in (1500, 2000, -1)]
+        sent_in = time.monotonic() - t0          # 판단 루프는 응답을 기다리지 않음
+        await asyncio.gather(*futs, return_exceptions=True)
+        await asyncio.sleep(0)                   # done 콜백은 루프에서 실행
+        return loop_thread, sent_in
+
+    loop_thread, sent_in = asyncio.run(main())
+    assert sent_in < 0.01
+    assert [r for r, _ in got] == ["OK 1500", "OK 2000", "ERR write timeout"]
+    assert {th for _, th in got} == {loop_thread}
+    assert loop_thread not in link.threads and rt.acks == 3
+
+
+def test_event_driven_latency_beats_polling():
+    period_s = 0.05                                # app.py 폴링 주기 (기본 sched period)
+    sensor = StreamSensor(period_s=0.02)
+
+    # 폴링: 주기마다 마지막 완성 프레임을 판단 → 프레임 나이만큼 늦음
+    poll = []
+    t_end = time.monotonic() + 0.6
+    while time.monotonic() < t_end:
+        d, t1 = sensor.latest()
+        if d is not None:
+            poll.append((time.monotonic() - t1) * 1000.0)
+        time.sleep(period_s)
+
+    # 이벤트 구동: 프레임 완성 즉시 판단
+    def on_frame(d, t0, t1, tri, frame):
+        if rt.frames >= 30:
+            sensor.exhausted = True
+
+    rt = AsyncRuntime(sensor, on_frame, watchdog_s=0.5)
+    asyncio.run(asyncio.wait_for(rt.run(), timeout=3.0))
+    sensor.stop()
+    poll_mean = sum(poll) / len(poll)
+    assert rt.frames >= 30
+    assert rt.latency.mean() < poll_mean / 2, (rt.stats(), poll_mean)
@@ -0,0 +1,80 @@
+# tests/test_scheduler.py
+from pi.scheduler import Histogram, LoopScheduler
+
+
+class FakeClock:
+    """time.monotonic/sleep 대역: sleep은 시각만 앞당김, work()로 처리시간 흉내."""
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, s):
+        self.t += s
+
+    def work(self, s):
+        self.t += s
+
+
+def test_quantile_never_exceeds_max():
+    h = Histogram((1, 10, 100))
+    for v in (2.0, 2.5, 3.0):
+        h.add(v)
+    # 모두 (1, 10] 버킷 → 상한 10이 아니라 실제 최대 3.0
+    assert h.quantile(0.99) == 3.0
+    assert h.quantile(0.5) == 3.0
+    h.add(50.0)
+    assert h.quantile(0.5) == 10
+    assert h.quantile(0.99) == 50.0
+    assert Histogram((1,)).quantile(0.5) == 0.0
+
+
+def test_deadline_does_not_drift():
+    clk = FakeClock()
+    s = LoopScheduler(0.1, clock=clk, sleep=clk.sleep)
+    s.start()
+    for _ in range(10):
+        clk.work(0.03)
+        s.wait()
+    # 처리시간이 주기에 더해지지 않음: 10번째 반복 끝 = 시작 + 10*period
+    assert abs(clk.t - 1.0) < 1e-9
+    assert s.overruns == 0
+
+
+def test_skip_policy_skips_missed_slots():
+    clk = FakeClock()
+    s = LoopScheduler(0.1, policy="skip", clock=clk, sleep=clk.sleep)
+    s.start()
+    clk.work(0.25)          # 첫 데드라인(0.1)보다 0.15 늦음 → 슬롯 2개 놓침
+    s.wait()
+    assert s.overruns == 1
+    assert s.skipped == 2
+    assert abs(clk.t - 0.3) < 1e-9
+
+
+def test_degrade_stretches_then_recovers():
+    clk = FakeClock()
+    s = LoopScheduler(0.1, policy="degrade", degrade_after=3, recover_after=2,
+                      clock=clk, sleep=clk.sleep)
+    s.start()
+    for _ in range(3):
+        clk.work(0.2)
+        s.wait()
+    assert s.degrades == 1
+    assert abs(s.period - 0.15) < 1e-9
+    for _ in range(2):
+        clk.work(0.01)
+        s.wait()
+    assert abs(s.period - 0.1) < 1e-9
+
+
+def test_set_period_reanchors_next_deadline():
+    clk = FakeClock()
+    s = LoopScheduler(0.1, clock=clk, sleep=clk.sleep)
+    s.wait()
+    s.set_period(0.05)
+    clk.work(0.01)
+    s.wait()
+    assert abs(clk.t - 0.15) < 1e-9
+    assert s.overruns == 0
@@ -0,0 +1,21 @@
+# tests/test_sim_sensor.py
+import time
+
+from pi.sensor import registry
+
+
+def test_sim_does_not_pace_itself_by_default():
+    s = registry.create("sim", scenario="A", rate_hz=10)
+    t0 = time.monotonic()
+    for _ in range(20):
+        assert s.read() is not None
+    assert time.monotonic() - t0 < 0.5       # 대기는 LoopScheduler 몫
+    assert s.frames == 20
+
+
+def test_sim_realtime_paces_to_rate():
+    s = registry.create("sim", scenario="A", rate_hz=50, realtime=True)
+    t0 = time.monotonic()
+    for _ in range(6):
+        s.read()
+    assert time.monotonic() - t0 >= 0.09     # 첫 프레임은 바로, 이후 20 ms 간격
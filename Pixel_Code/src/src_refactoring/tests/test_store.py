@@ -0,0 +1,70 @@
+# tests/test_store.py
+import os
+import time
+
+import numpy as np
+
+from pi.datalog.binlog import BinLogger
+from pi.datalog.store import SessionStore, session_paths, CACHE_NAME
+from pi.tools.binlog2csv import convert
+
+
+def _csv(path, rows, header="ts,state,d_min_mm,v_mps,ttc_s"):
+    with open(path, "w") as f:
+        f.write(header + "\n")
+        for r in rows:
+            f.write(",".join(r) + "\n")
+
+
+def _pxl(log_dir, states):
+    lg = BinLogger(log_dir=str(log_dir), prefix="bin", flush_s=0.05)
+    for i, s in enumerate(states):
+        lg.log(ts=100.0 + i * 0.1, state=s, d_min_mm=500.0 + i, reason="r" if s == "BRAKE" else "")
+    lg.close()
+    return lg.path
+
+
+def test_csv_next_to_pxl_is_not_double_counted(tmp_path):
+    p = _pxl(tmp_path, ["SAFE", "BRAKE", "BRAKE", "SAFE"])
+    convert(p, os.path.splitext(p)[0] + ".csv")       # 예전 binlog2csv 기본 위치
+    _csv(tmp_path / "run_a.csv", [("1.0", "SAFE", "900", "1", ""), ("1.1", "WARN", "800", "1", "")])
+    assert [os.path.basename(x) for x in session_paths(str(tmp_path))] == \
+        [os.path.basename(p), "run_a.csv"]
+    st = SessionStore.load(str(tmp_path), use_cache=False)
+    assert len(st.paths) == 2
+    assert len(st) == 6
+    assert st.state_counts()["BRAKE"] == 2
+
+
+def test_cache_reparses_only_changed_files(tmp_path):
+    _csv(tmp_path / "run_a.csv", [("1.0", "SAFE", "900", "1", ""), ("1.1", "BRAKE", "300", "1", "0.3")])
+    # 예전 헤더 이름(d_q_mm)도 같은 컬럼으로
+    _csv(tmp_path / "run_b.csv", [("2.0", "WARN", "700", "1", "")], header="ts,state,d_q_mm,v_mps,ttc_s")
+    st = SessionStore.load(str(tmp_path))
+    assert os.path.exists(tmp_path / CACHE_NAME)
+    assert len(st) == 3
+    assert np.isclose(st.cols["d_min_mm"][2], 700.0)
+
+    time.sleep(0.01)
+    _csv(tmp_path / "run_b.csv", [("2.0", "WARN", "700", "1", ""), ("2.1", "BRAKE", "200", "1", "0.2")])
+    st2 = SessionStore.load(str(tmp_path))
+    assert len(st2) == 4
+    # 캐시에서 온 세션(run_a)도 새 문자열 테이블 기준으로 다시 코딩됨
+    assert st2.state_counts() == {"SAFE": 1, "BRAKE": 2, "WARN": 1}
+    assert list(st2.episodes("BRAKE")["session"]) == [0, 1]
+
+
+def test_episodes_and_time_to_release(tmp_path):
+    _csv(tmp_path / "run_a.csv", [
+        ("0.0", "SAFE", "2000", "1", ""),
+        ("0.1", "BRAKE", "300", "1", "0.3"),
+        ("0.2", "BRAKE", "1200", "0", ""),
+        ("0.5", "SAFE", "1500", "0", ""),
+    ])
+    st = SessionStore.load(str(tmp_path), use_cache=False)
+    ep = st.episodes("BRAKE", d_min_lt=400)
+    assert len(ep["t0"]) == 1
+    assert np.isclose(ep["dur"][0], 0.4)
+    assert np.isclose(ep["d_min_mm"][0], 300.0)
+    ttr = st.time_to_release("BRAKE", release_mm=1000)
+    assert np.isclose(ttr[0], 0.3)
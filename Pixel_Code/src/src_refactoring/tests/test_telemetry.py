@@ -0,0 +1,56 @@
+# tests/test_telemetry.py
+import socket
+
+from pi.telemetry import TelemetryPublisher, decode
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def _rx():
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(("127.0.0.1", 0))
+    s.settimeout(1.0)
+    return s
+
+
+def _drain(sock):
+    out = []
+    sock.settimeout(0.2)
+    try:
+        while True:
+            out.append(decode(sock.recvfrom(256)[0]))
+    except socket.timeout:
+        return out
+
+
+def test_loopback_decimation_and_state_change():
+    rx = _rx()
+    clk = FakeClock()
+    pub = TelemetryPublisher(port=rx.getsockname()[1], rate_hz=10, clock=clk)
+    ticks = [  # (경과 s, 상태)
+        (0.00, "SAFE"), (0.02, "SAFE"), (0.04, "SAFE"),    # 0.1 s 안 같은 상태 → 솎아냄
+        (0.05, "BRAKE"),                                   # 상태 변화 → 바로
+        (0.07, "BRAKE"), (0.16, "BRAKE"),                  # 변화 시각부터 다시 0.1 s
+    ]
+    for dt, state in ticks:
+        clk.t = 100.0 + dt
+        pub.publish(1000.0 + dt, state, 420.0, 1.5, None, 140, 1500, corner=state == "SAFE")
+    pub.close()
+    pkts = _drain(rx)
+    rx.close()
+    assert [(p["seq"], p["state"]) for p in pkts] == [(1, "SAFE"), (2, "BRAKE"), (3, "BRAKE")]
+    assert pub.sent == 3 and pub.decimated == 3 and pub.errors == 0
+    p = pkts[1]
+    assert p["ts"] == 1000.05 and p["source"] == "pi" and not p["corner"] and pkts[0]["corner"]
+    assert p["d_min_mm"] == 420.0 and p["ttc_s"] is None and p["target_deg"] == 140 and p["pwm_us"] == 1500
+
+
+def test_decode_rejects_garbage():
+    assert decode(b"PXT1" + b"\0" * 4) is None
+    assert decode(b"XXXX" + b"\0" * 32) is None